@@ -57,6 +57,10 @@ def init_infrastructure(app: Flask):
     def load_user(user_id):
         return User.query.get(int(user_id))
     
+    # Shared worker pool for background jobs
+    from .job_queue import JobQueue
+    JobQueue.init_app(app)
+    
     if not app.debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
         try:
             scheduler.init_app(app)
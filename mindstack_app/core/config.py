@@ -44,6 +44,14 @@ class Config:
     VAPID_PUBLIC_KEY = os.environ.get('VAPID_PUBLIC_KEY')
     VAPID_EMAIL = os.environ.get('VAPID_EMAIL')
 
+    # In-process background job queue (core/job_queue.py)
+    JOB_QUEUE_WORKERS = 4
+    JOB_QUEUE_MAX_SIZE = 1000
+    # Max jobs of one type running at once (types not listed: up to JOB_QUEUE_WORKERS)
+    JOB_QUEUE_TYPE_LIMITS = {'ai': 1, 'ai_autogen': 1, 'content_generation': 1}
+    JOB_QUEUE_STATE_INTERVAL_SECONDS = 2
+    JOB_QUEUE_SHUTDOWN_TIMEOUT = 10
+
     @classmethod
     def init_app(cls, app):
         """Khởi tạo các thư mục cần thiết."""
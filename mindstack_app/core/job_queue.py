@@ -0,0 +1,325 @@
+# File: mindstack_app/core/job_queue.py
+# Infrastructure Layer: In-process background job queue
+"""
+One fixed pool of worker threads for the fire-and-forget work of the app
+(signal listeners, generation sessions, AI batches) instead of a new thread
+per event.
+
+- Jobs are ordered by priority (lower first), then by submission order.
+- `JOB_QUEUE_TYPE_LIMITS` caps how many jobs of one type run at the same time.
+- A `key` dedupes: a job whose key is already queued or running is dropped.
+- `delay` postpones a job without holding a worker.
+- A full queue raises `JobQueueFull` (after waiting up to `timeout`).
+- `shutdown()` stops accepting jobs and drains the queue (registered with atexit).
+
+Each job runs inside an app context with a fresh DB session. The state of
+each job type lives in a `BackgroundTask` row named ``job_queue:<type>``:
+progress/total of the current burst, queued/running/failed counters in
+`message`. Setting `stop_requested` on that row cancels the queued jobs of
+the type.
+"""
+
+import atexit
+import heapq
+import itertools
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 10
+
+
+class JobQueueError(Exception):
+    """The queue does not accept jobs (not started or shutting down)."""
+
+
+class JobQueueFull(JobQueueError):
+    """Backpressure: the queue is at JOB_QUEUE_MAX_SIZE."""
+
+
+@dataclass(order=True)
+class Job:
+    priority: int
+    seq: int
+    job_type: str = field(compare=False)
+    func: Callable = field(compare=False)
+    args: Tuple = field(compare=False, default=())
+    kwargs: Dict[str, Any] = field(compare=False, default_factory=dict)
+    key: Optional[str] = field(compare=False, default=None)
+    not_before: float = field(compare=False, default=0.0)
+    job_id: str = field(compare=False, default='')
+
+
+def _new_counters() -> Dict[str, Any]:
+    return {'submitted': 0, 'queued': 0, 'running': 0, 'done': 0, 'failed': 0, 'last_error': None}
+
+
+class JobQueue:
+    """Process-wide job queue (class-level state, like StudyLogWriter)."""
+
+    TASK_PREFIX = 'job_queue:'
+
+    _app = None
+    _cond = threading.Condition()
+    _state_lock = threading.Lock()  # one BackgroundTask writer at a time
+    _heap: List[Job] = []
+    _keys: set = set()
+    _workers: List[threading.Thread] = []
+    _counters: Dict[str, Dict[str, Any]] = {}
+    _last_state_write: Dict[str, float] = {}
+    _seq = itertools.count()
+    _accepting = False
+    _stopped = True
+    _max_size = Config.JOB_QUEUE_MAX_SIZE
+    _type_limits: Dict[str, int] = dict(Config.JOB_QUEUE_TYPE_LIMITS)
+    _state_interval = Config.JOB_QUEUE_STATE_INTERVAL_SECONDS
+    _atexit_registered = False
+
+    @staticmethod
+    def _config(app, key: str):
+        return app.config.get(key, getattr(Config, key))
+
+    @classmethod
+    def init_app(cls, app) -> None:
+        """Start the worker pool (no-op if already running)."""
+        with cls._cond:
+            if cls.is_running():
+                return
+            cls._app = app
+            cls._max_size = max(1, int(cls._config(app, 'JOB_QUEUE_MAX_SIZE')))
+            cls._type_limits = dict(cls._config(app, 'JOB_QUEUE_TYPE_LIMITS') or {})
+            cls._state_interval = float(cls._config(app, 'JOB_QUEUE_STATE_INTERVAL_SECONDS'))
+            cls._stopped = False
+            cls._accepting = True
+            cls._workers = [
+                threading.Thread(target=cls._run, name=f'job-worker-{i}', daemon=True)
+                for i in range(max(1, int(cls._config(app, 'JOB_QUEUE_WORKERS'))))
+            ]
+            for worker in cls._workers:
+                worker.start()
+
+        if not cls._atexit_registered:
+            atexit.register(cls.shutdown)
+            cls._atexit_registered = True
+        logger.info(f"[JobQueue] Started {len(cls._workers)} workers")
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return not cls._stopped and any(worker.is_alive() for worker in cls._workers)
+
+    @classmethod
+    def submit(cls, job_type: str, func: Callable, args: Tuple = (), kwargs: Optional[Dict[str, Any]] = None, *,
+               key: Optional[str] = None, priority: int = PRIORITY_NORMAL, delay: float = 0,
+               timeout: float = 0) -> Optional[str]:
+        """
+        Queue `func(*args, **kwargs)`. Returns the job id, or None if a job with
+        the same key is already queued or running.
+
+        Raises:
+            JobQueueFull: the queue stayed full for `timeout` seconds.
+            JobQueueError: the queue is shutting down.
+        """
+        if cls._stopped:
+            from flask import current_app, has_app_context
+            if not has_app_context():
+                raise JobQueueError("Job queue is not started")
+            cls.init_app(current_app._get_current_object())
+
+        deadline = time.monotonic() + max(0.0, timeout)
+        with cls._cond:
+            if not cls._accepting:
+                raise JobQueueError("Job queue is shutting down")
+            if key is not None and key in cls._keys:
+                return None
+            while len(cls._heap) >= cls._max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise JobQueueFull(f"Job queue is full ({cls._max_size} jobs)")
+                cls._cond.wait(remaining)
+
+            job = Job(
+                priority=priority, seq=next(cls._seq), job_type=job_type, func=func,
+                args=tuple(args), kwargs=dict(kwargs or {}), key=key,
+                not_before=time.monotonic() + delay if delay > 0 else 0.0,
+                job_id=uuid.uuid4().hex,
+            )
+            heapq.heappush(cls._heap, job)
+            if key is not None:
+                cls._keys.add(key)
+            counters = cls._counters.setdefault(job_type, _new_counters())
+            counters['submitted'] += 1
+            counters['queued'] += 1
+            cls._cond.notify_all()
+        return job.job_id
+
+    @classmethod
+    def _next_job(cls) -> Tuple[Optional[Job], Optional[float]]:
+        """Highest-priority job that is due and under its type limit (caller holds the lock)."""
+        now = time.monotonic()
+        skipped: List[Job] = []
+        found = None
+        wait = None
+        while cls._heap:
+            job = heapq.heappop(cls._heap)
+            limit = cls._type_limits.get(job.job_type)
+            if job.not_before > now:
+                wait = min(wait, job.not_before - now) if wait is not None else job.not_before - now
+                skipped.append(job)
+            elif limit is not None and cls._counters[job.job_type]['running'] >= limit:
+                skipped.append(job)
+            else:
+                found = job
+                break
+        for job in skipped:
+            heapq.heappush(cls._heap, job)
+        return found, wait
+
+    @classmethod
+    def _run(cls) -> None:
+        while True:
+            with cls._cond:
+                while True:
+                    if cls._stopped:
+                        return
+                    job, wait = cls._next_job()
+                    if job is not None:
+                        break
+                    cls._cond.wait(wait if wait is not None else 5.0)
+                counters = cls._counters[job.job_type]
+                counters['queued'] -= 1
+                counters['running'] += 1
+
+            error = cls._execute(job)
+
+            with cls._cond:
+                counters['running'] -= 1
+                counters['failed' if error else 'done'] += 1
+                if error:
+                    counters['last_error'] = error
+                if job.key is not None:
+                    cls._keys.discard(job.key)
+                cls._cond.notify_all()
+            cls._sync_state(job.job_type)
+
+    @classmethod
+    def _execute(cls, job: Job) -> Optional[str]:
+        from .extensions import db
+        with cls._app.app_context():
+            try:
+                job.func(*job.args, **job.kwargs)
+                return None
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"[JobQueue] Job {job.job_type}/{job.key or job.job_id} failed: {e}", exc_info=True)
+                return str(e)
+            finally:
+                db.session.remove()
+
+    @classmethod
+    def _sync_state(cls, job_type: str) -> None:
+        """Mirror the counters of a job type into its BackgroundTask row (throttled)."""
+        with cls._cond:
+            counters = dict(cls._counters.get(job_type) or _new_counters())
+            idle = counters['queued'] == 0 and counters['running'] == 0
+            now = time.monotonic()
+            if not idle and now - cls._last_state_write.get(job_type, 0) < cls._state_interval:
+                return
+            cls._last_state_write[job_type] = now
+            if idle:
+                # The next burst starts from zero
+                cls._counters[job_type] = _new_counters()
+
+        from .extensions import db
+        from mindstack_app.models import BackgroundTask
+        with cls._state_lock, cls._app.app_context():
+            try:
+                task_name = f"{cls.TASK_PREFIX}{job_type}"
+                task = BackgroundTask.query.filter_by(task_name=task_name).first()
+                if task is None:
+                    task = BackgroundTask(task_name=task_name, is_enabled=True, stop_requested=False)
+                    db.session.add(task)
+                if task.stop_requested:
+                    cancelled = cls.cancel(job_type)
+                    task.stop_requested = False
+                    logger.info(f"[JobQueue] Stop requested: cancelled {cancelled} queued '{job_type}' jobs")
+                task.status = 'idle' if idle else 'running'
+                task.progress = counters['done'] + counters['failed']
+                task.total = counters['submitted']
+                message = f"queued={counters['queued']} running={counters['running']} failed={counters['failed']}"
+                if counters['last_error']:
+                    message += f" last_error={counters['last_error'][:200]}"
+                task.message = message
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.warning(f"[JobQueue] Failed to store state of '{job_type}': {e}")
+            finally:
+                db.session.remove()
+
+    @classmethod
+    def cancel(cls, job_type: Optional[str] = None, key: Optional[str] = None) -> int:
+        """Drop queued (not running) jobs by type and/or key. Returns the number dropped."""
+        with cls._cond:
+            keep, dropped = [], []
+            for job in cls._heap:
+                matches = (job_type is None or job.job_type == job_type) and (key is None or job.key == key)
+                (dropped if matches else keep).append(job)
+            if not dropped:
+                return 0
+            heapq.heapify(keep)
+            cls._heap = keep
+            for job in dropped:
+                cls._counters[job.job_type]['queued'] -= 1
+                if job.key is not None:
+                    cls._keys.discard(job.key)
+            cls._cond.notify_all()
+            return len(dropped)
+
+    @classmethod
+    def join(cls, timeout: Optional[float] = None) -> bool:
+        """Wait until nothing is queued or running. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with cls._cond:
+            while cls._heap or any(c['running'] for c in cls._counters.values()):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                cls._cond.wait(remaining if remaining is not None else 1.0)
+        return True
+
+    @classmethod
+    def stats(cls) -> Dict[str, Dict[str, Any]]:
+        with cls._cond:
+            return {job_type: dict(counters) for job_type, counters in cls._counters.items()}
+
+    @classmethod
+    def shutdown(cls, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """Stop accepting jobs, let queued jobs finish (up to the timeout) and stop the workers."""
+        if cls._stopped:
+            return
+        with cls._cond:
+            cls._accepting = False
+        if drain:
+            if timeout is None:
+                timeout = float(cls._config(cls._app, 'JOB_QUEUE_SHUTDOWN_TIMEOUT')) if cls._app else 0
+            if not cls.join(timeout):
+                logger.warning(f"[JobQueue] Shutdown timeout, dropping {len(cls._heap)} queued jobs")
+        with cls._cond:
+            cls._stopped = True
+            cls._heap = []
+            cls._keys = set()
+            cls._counters = {}
+            cls._cond.notify_all()
+        for worker in cls._workers:
+            if worker is not threading.current_thread():
+                worker.join(timeout=1.0)
+        cls._workers = []
@@ -13,11 +13,56 @@ Usage:
     @card_reviewed.connect
     def on_card_reviewed(sender, **kwargs):
         ...
+
+Learning signals are sent inside the answer's unit of work: there each
+subscriber runs in its own savepoint, so a failing subscriber (badges,
+rollups...) is logged and undone without rolling back the answer.
 """
-from blinker import Namespace
+import logging
+
+from blinker import NamedSignal, Namespace
+from flask import has_app_context
+
+logger = logging.getLogger(__name__)
+
+
+class EnlistedSignal(NamedSignal):
+    """Signal whose subscribers are isolated in savepoints inside a unit of work."""
+
+    def send(self, sender=None, /, **kwargs):
+        if self.is_muted or not has_app_context():
+            return super().send(sender, **kwargs)
+
+        from mindstack_app.core.extensions import db
+        from mindstack_app.utils.db_session import in_unit_of_work, savepoint
+
+        session = db.session()
+        if not in_unit_of_work(session):
+            return super().send(sender, **kwargs)
+
+        results = []
+        for receiver in self.receivers_for(sender):
+            try:
+                with savepoint(session):
+                    results.append((receiver, receiver(sender, **kwargs)))
+            except Exception as e:
+                logger.error(f"[Signals] {self.name} subscriber {getattr(receiver, '__name__', receiver)} failed: {e}",
+                             exc_info=True)
+                results.append((receiver, None))
+        return results
+
+
+class EnlistedNamespace(Namespace):
+    """Namespace of :class:`EnlistedSignal`."""
+
+    def signal(self, name, doc=None):
+        if name not in self:
+            self[name] = EnlistedSignal(name, doc)
+        return self[name]
+
 
 # Create namespace for learning-related signals
-learning_signals = Namespace()
+learning_signals = EnlistedNamespace()
 
 # Signal: Fired when a card is reviewed (flashcard, quiz, typing)
 # Payload includes: user_id, item_id, quality, is_correct, learning_mode, score_points
@@ -31,6 +76,11 @@ session_completed = learning_signals.signal('session_completed')
 # Payload includes: user_id, amount, reason, new_total, item_type
 score_awarded = learning_signals.signal('score_awarded')
 
+# Signal: Fired when a StudyLog row is recorded (inside the caller's transaction)
+# Payload includes: user_id, item_id, timestamp, learning_mode, is_correct,
+#                   review_duration, points, is_first_review
+study_logged = learning_signals.signal('study_logged')
+
 # ============================================
 # Content Management Signals
 # ============================================
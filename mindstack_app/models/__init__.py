@@ -9,11 +9,12 @@ from mindstack_app.modules.learning.models import (
     LearningGroup, 
     LearningItem, 
     LearningSession,
+    SessionAnswerReceipt,
     UserContainerState,
     ContainerContributor,
     UserItemMarker
 )
-from mindstack_app.modules.fsrs.models import ItemMemoryState
+from mindstack_app.modules.fsrs.models import ItemMemoryState, ContainerMemoryStats
 from mindstack_app.modules.learning_history.models import StudyLog
 
 # Core learning models (without collab)
@@ -21,9 +22,11 @@ from mindstack_app.modules.vocabulary.flashcard.models import (
     FlashcardSet,
     Flashcard,
 )
+from mindstack_app.modules.vocabulary.mcq.models import McqSessionState, McqSessionQuestion
 from mindstack_app.modules.quiz.models import (
     QuizSet, 
     QuizMCQ,
+    QuizSessionState,
 )
 
 # Collab models (centralized in collab module)
@@ -43,7 +46,7 @@ from mindstack_app.modules.collab.models import (
 
 from mindstack_app.modules.AI.models import ApiKey, AiTokenLog, AiCache, AiContent
 from mindstack_app.modules.goals.models import Goal, UserGoal, GoalProgress
-from mindstack_app.modules.gamification.models import Badge, UserBadge, ScoreLog, Streak
+from mindstack_app.modules.gamification.models import Badge, UserBadge, ScoreLog, Streak, LeaderboardScore
 from mindstack_app.modules.translator.models import TranslationHistory
 from mindstack_app.modules.stats.models import UserMetric, DailyStat, Achievement
 from mindstack_app.modules.notification.models import Notification, PushSubscription, NotificationPreference
@@ -54,6 +57,7 @@ from mindstack_app.modules.content_generator.models import GenerationLog
 # Module-based models (formerly in models/)
 from mindstack_app.modules.course.models import Course, Lesson
 from mindstack_app.modules.ops.models import BackgroundTask, BackgroundTaskLog
+from mindstack_app.modules.audio.models import AudioJob
 from .app_settings import AppSettings
 
 __all__ = [
@@ -64,13 +68,17 @@ __all__ = [
     'LearningGroup',
     'LearningItem',
     'ItemMemoryState',
+    'ContainerMemoryStats',
     'LearningSession',
+    'SessionAnswerReceipt',
     'UserContainerState',
     'ContainerContributor',
     'StudyLog',
     'UserItemMarker',
     'FlashcardSet',
     'Flashcard',
+    'McqSessionState',
+    'McqSessionQuestion',
     'FlashcardCollabAnswer',
     'FlashcardCollabMessage',
     'FlashcardCollabParticipant',
@@ -79,6 +87,7 @@ __all__ = [
     'FlashcardRoomProgress',
     'QuizSet',
     'QuizMCQ',
+    'QuizSessionState',
     'QuizBattleAnswer',
     'QuizBattleMessage',
     'QuizBattleParticipant',
@@ -96,6 +105,7 @@ __all__ = [
     'UserBadge',
     'ScoreLog',
     'Streak',
+    'LeaderboardScore',
     'TranslationHistory',
     'UserMetric',
     'DailyStat',
@@ -110,5 +120,6 @@ __all__ = [
     'Lesson',
     'BackgroundTask',
     'BackgroundTaskLog',
+    'AudioJob',
     'AppSettings',
 ]
\ No newline at end of file
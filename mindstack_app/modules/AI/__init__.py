@@ -18,3 +18,7 @@ def setup_module(app):
     
     # Register routes and events
     from . import routes, events
+
+    # Periodic eviction of the prompt-response cache
+    from .services.prompt_cache import AiPromptCache
+    AiPromptCache.init_scheduler(app)
@@ -2,3 +2,12 @@ class AIModuleDefaultConfig:
     PROVIDER_TIMEOUT = 30
     DEFAULT_MODEL = "gemini-1.5-flash"
     DEFAULT_TEMPERATURE = 0.7
+
+    # Prompt-response cache (AiPromptCache): in-process LRU in front of AiCache rows
+    AI_CACHE_ENABLED = True
+    AI_CACHE_TTL_SECONDS = 30 * 24 * 3600
+    AI_CACHE_MEMORY_ENTRIES = 512
+    AI_CACHE_MAX_ROWS = 20000
+    AI_CACHE_EVICT_INTERVAL_MINUTES = 60
+    # Conversational features depend on more than the prompt text: never cached
+    AI_CACHE_EXCLUDED_FEATURES = ('chat', 'test_chat')
@@ -1,5 +1,6 @@
 import logging
 from typing import Tuple, Optional
+from flask import has_app_context
 from .gemini_client import GeminiClient
 from .huggingface_client import HuggingFaceClient
 
@@ -27,16 +28,39 @@ class HybridAIClient:
                 ('huggingface', self.hf_client)
             ]
 
-    def generate_content(self, prompt: str, feature: str = 'default', context_ref: str = 'N/A', user_id: Optional[int] = None) -> Tuple[bool, str]:
+    @property
+    def cache_identity(self) -> Tuple[str, str]:
+        """(provider, model) the prompt cache is keyed by: the primary provider."""
+        provider_name, client = self.execution_order[0]
+        return provider_name, client.model_name
+
+    def generate_content(self, prompt: str, feature: str = 'default', context_ref: str = 'N/A', user_id: Optional[int] = None,
+                         use_cache: bool = True) -> Tuple[bool, str]:
         """
         Try primary provider, fallback to others on failure.
+        Responses are served from / stored in the prompt cache when running in an app context
+        (only answers of the primary provider are stored); `use_cache=False` skips the lookup
+        but still refreshes the entry.
         """
+        cache = None
+        if has_app_context():
+            from ..services.prompt_cache import AiPromptCache
+            if AiPromptCache.is_cacheable(feature):
+                cache = AiPromptCache
+        if cache is not None and use_cache:
+            cached = cache.get(*self.cache_identity, prompt)
+            if cached is not None:
+                return True, cached
+
         errors = []
         
         for provider_name, client in self.execution_order:
             try:
                 success, result = client.generate_content(prompt, feature, context_ref, user_id)
                 if success:
+                    # Lookups are keyed by the primary provider: a fallback answer is not cached under it
+                    if cache is not None and provider_name == self.execution_order[0][0]:
+                        cache.put(*self.cache_identity, prompt, result)
                     return True, result
                 errors.append(f"{provider_name}: {result}")
             except Exception as e:
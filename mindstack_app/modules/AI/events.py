@@ -1,7 +1,32 @@
 from mindstack_app.core.signals import content_changed
+from mindstack_app.core.job_queue import JobQueue, JobQueueError, PRIORITY_LOW
+from mindstack_app.modules.content_management.signals import container_content_changed
 from flask import current_app
 from mindstack_app.models import LearningItem, db
-import threading
+
+
+def explain_item(item_id, force=False):
+    """Job: generate the primary AI explanation of a flashcard if it has none (or if forced)."""
+    from .interface import AIInterface
+
+    item = db.session.get(LearningItem, item_id)
+    if not item or item.item_type != 'FLASHCARD':
+        return
+    if item.ai_explanation and not force:
+        return
+    AIInterface.generate_item_explanation(item_id, use_cache=not force)
+    current_app.logger.info(f"[AIEvent] Updated explanation for item {item_id}")
+
+
+def explain_items(item_ids):
+    """Job: explain imported items one after another (one job per import, not per item)."""
+    for item_id in item_ids:
+        try:
+            explain_item(item_id)
+        except Exception as e:
+            db.session.rollback()
+            current_app.logger.error(f"[AIEvent] Error for item {item_id}: {e}")
+
 
 @content_changed.connect
 def handle_ai_content_change(sender, **kwargs):
@@ -11,34 +36,35 @@ def handle_ai_content_change(sender, **kwargs):
     content_type = kwargs.get('content_type')
     content_id = kwargs.get('content_id')
     payload = kwargs.get('payload', {})
-    
+
     if content_type != 'item' or not payload.get('ai_process'):
         return
 
-    item = LearningItem.query.get(content_id)
-    if not item:
+    current_app.logger.info(f"[AIEvent] Queueing AI processing for item {content_id}")
+    try:
+        JobQueue.submit(
+            'ai', explain_item, args=(content_id, bool(payload.get('force_ai'))),
+            key=f'ai_explain:{content_id}', priority=PRIORITY_LOW
+        )
+    except JobQueueError as e:
+        current_app.logger.warning(f"[AIEvent] AI processing for item {content_id} not queued: {e}")
+
+
+@container_content_changed.connect
+def handle_ai_bulk_content_change(sender, **kwargs):
+    """
+    Bulk imports: one queued job walks the imported flashcards sequentially.
+    """
+    payload = kwargs.get('payload') or {}
+    if not payload.get('ai_process') or kwargs.get('item_type') != 'FLASHCARD':
+        return
+
+    item_ids = list(kwargs.get('created') or []) + list(kwargs.get('updated') or [])
+    if not item_ids:
         return
 
-    current_app.logger.info(f"[AIEvent] Triggering AI processing for item {content_id}")
-    
-    def run_ai_task(app_context):
-        with app_context:
-            try:
-                from mindstack_app.modules.AI.services.gemini_service import GeminiService
-                
-                # Example: Auto-explain if it's a flashcard and has no explanation
-                if item.item_type == 'FLASHCARD' and (not item.ai_explanation or payload.get('force_ai')):
-                    front = item.content.get('front', '')
-                    back = item.content.get('back', '')
-                    prompt = f"Explain this vocabulary: {front} ({back}). Keep it concise."
-                    
-                    result = GeminiService.generate_content(prompt)
-                    if result and result.get('text'):
-                        item.ai_explanation = result['text']
-                        db.session.commit()
-                        current_app.logger.info(f"[AIEvent] Updated explanation for item {content_id}")
-            except Exception as e:
-                current_app.logger.error(f"[AIEvent] Error: {e}")
-
-    thread = threading.Thread(target=run_ai_task, args=(current_app.app_context(),))
-    thread.start()
+    current_app.logger.info(f"[AIEvent] Queueing AI processing for {len(item_ids)} imported items")
+    try:
+        JobQueue.submit('ai', explain_items, args=(item_ids,), priority=PRIORITY_LOW)
+    except JobQueueError as e:
+        current_app.logger.warning(f"[AIEvent] AI processing of {len(item_ids)} imported items not queued: {e}")
@@ -1,14 +1,16 @@
-from typing import Optional, Union
+from typing import Dict, List, Optional, Union
 from .schemas import AIRequestDTO, AIResponseDTO
 from .services.ai_manager import get_ai_service
 
 def generate_content(
     prompt: str, 
     feature: str = "general", 
-    context_ref: Optional[str] = None
+    context_ref: Optional[str] = None,
+    use_cache: bool = True
 ) -> AIResponseDTO:
     """
     Core function to generate content.
+    `use_cache=False` bypasses the prompt-response cache (explicit regeneration).
     """
     try:
         service = get_ai_service()
@@ -18,7 +20,7 @@ def generate_content(
                 error="AI Service not configured or available."
             )
             
-        success, result = service.generate_content(prompt, feature=feature, context_ref=context_ref)
+        success, result = service.generate_content(prompt, feature=feature, context_ref=context_ref, use_cache=use_cache)
         
         if success:
             return AIResponseDTO(success=True, content=result)
@@ -30,15 +32,17 @@ def generate_content(
 
 class AIInterface:
     @staticmethod
-    def generate_content(prompt: str, feature: str = "general", context_ref: Optional[str] = None) -> AIResponseDTO:
+    def generate_content(prompt: str, feature: str = "general", context_ref: Optional[str] = None,
+                         use_cache: bool = True) -> AIResponseDTO:
         """Core AI generation call."""
-        return generate_content(prompt, feature, context_ref)
+        return generate_content(prompt, feature, context_ref, use_cache)
 
     @staticmethod
     def generate_item_explanation(
         item_id: int, 
         user_id: Optional[int] = None, 
-        custom_question: Optional[str] = None
+        custom_question: Optional[str] = None,
+        use_cache: bool = True
     ) -> str:
         """High-level helper to generate explanation for a specific learning item."""
         from mindstack_app.models import LearningItem, db
@@ -58,7 +62,7 @@ class AIInterface:
         if not prompt:
             raise ValueError("Could not format prompt for item.")
             
-        result = AIInterface.generate_content(prompt, feature="explanation", context_ref=f"ITEM_{item_id}")
+        result = AIInterface.generate_content(prompt, feature="explanation", context_ref=f"ITEM_{item_id}", use_cache=use_cache)
         if not result.success:
             raise RuntimeError(f"AI Generation Failed: {result.error}")
             
@@ -141,6 +145,22 @@ class AIInterface:
         ).first()
         return primary.content_text if primary else None
 
+    @staticmethod
+    def get_primary_explanations(item_ids: List[int]) -> Dict[int, str]:
+        """Batch get_primary_explanation: {item_id: content_text} for items that have one."""
+        from .models import AiContent
+        if not item_ids:
+            return {}
+        rows = AiContent.query.with_entities(AiContent.item_id, AiContent.content_text).filter(
+            AiContent.item_id.in_(item_ids),
+            AiContent.content_type == 'explanation',
+            AiContent.is_primary == True
+        ).order_by(AiContent.content_id).all()
+        explanations = {}
+        for item_id, content_text in rows:
+            explanations.setdefault(item_id, content_text)
+        return explanations
+
     @staticmethod
     def set_primary_explanation(item_id: int, content_text: str):
         """Set or update the primary AI explanation for an item."""
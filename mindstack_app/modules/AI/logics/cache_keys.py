@@ -0,0 +1,28 @@
+"""
+Cache Keys - Pure functions to key AI prompt-response cache entries.
+"""
+import hashlib
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Collapse whitespace so prompts that differ only in formatting share an entry.
+
+    >>> normalize_prompt('  Explain   "apple"\\n\\n in Vietnamese ')
+    'Explain "apple" in Vietnamese'
+    """
+    return ' '.join((prompt or '').split())
+
+
+def prompt_cache_key(provider: str, model: str, prompt: str) -> str:
+    """
+    sha256 of provider, model and normalized prompt (fits AiCache.prompt_hash).
+
+    >>> k = prompt_cache_key('gemini', 'gemini-2.0-flash-lite-001', 'Explain  apple')
+    >>> len(k), k == prompt_cache_key('gemini', 'gemini-2.0-flash-lite-001', 'Explain apple')
+    (64, True)
+    >>> k == prompt_cache_key('huggingface', 'gemini-2.0-flash-lite-001', 'Explain apple')
+    False
+    """
+    raw = f"{provider}|{model}|{normalize_prompt(prompt)}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
@@ -1,5 +1,5 @@
 # File: mindstack_app/modules/AI/routes/api.py
-import threading
+from mindstack_app.core.job_queue import JobQueue
 from flask import request, jsonify, current_app, flash, redirect, url_for
 from flask_login import login_required, current_user
 import mistune
@@ -45,7 +45,8 @@ def get_ai_response():
             explanation = AIInterface.generate_item_explanation(
                 item_id, 
                 user_id=current_user.user_id,
-                custom_question=custom_question
+                custom_question=custom_question,
+                use_cache=not force_regenerate
             )
             html_content = sanitize_rich_text(mistune.html(explanation))
             return jsonify({'success': True, 'response': html_content})
@@ -59,7 +60,8 @@ def get_ai_response():
         if not final_prompt:
              return jsonify({'success': False, 'message': 'Không thể tạo prompt.'}), 400
 
-        success, ai_response = ai_client.generate_content(final_prompt, feature=prompt_type, context_ref=f"ITEM_{item_id}")
+        success, ai_response = ai_client.generate_content(final_prompt, feature=prompt_type, context_ref=f"ITEM_{item_id}",
+                                                          use_cache=not force_regenerate)
         if not success:
             return jsonify({'success': False, 'message': ai_response}), 503
 
@@ -209,13 +211,13 @@ def start_autogen():
         db.session.commit()
 
         app = current_app._get_current_object()
-        thread = threading.Thread(
-            target=run_autogen_background,
+        job_id = JobQueue.submit(
+            'ai_autogen', run_autogen_background,
             args=(app, content_type, set_id, api_delay, max_items, task.task_id),
-            name='autogen_content_thread'
+            key='autogen_content'
         )
-        thread.daemon = True
-        thread.start()
+        if job_id is None:
+            return error_response('A task is already running', 'CONFLICT', 409)
         return success_response(message='Task started', data={'task_id': task.task_id})
     except Exception as e:
         return error_response(str(e), 'SERVER_ERROR', 500)
@@ -0,0 +1,197 @@
+"""
+AI Prompt Cache - two-level cache of AI responses.
+
+Level 1 is a process-local LRU, level 2 the shared ``AiCache`` table; both are
+keyed by ``prompt_cache_key(provider, model, prompt)``. Entries expire after
+``AI_CACHE_TTL_SECONDS``. Hits served from memory are counted in-process and
+written to ``hit_count`` / ``last_hit_at`` by the periodic eviction job, which
+also drops expired rows and trims the table to ``AI_CACHE_MAX_ROWS`` (least
+recently hit first).
+"""
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import func
+
+from mindstack_app.core.extensions import db, scheduler
+from mindstack_app.utils.db_session import safe_commit, safe_rollback
+from ..config import AIModuleDefaultConfig
+from ..logics.cache_keys import prompt_cache_key
+from ..models import AiCache
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite returns naive datetimes
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class AiPromptCache:
+    """Process-local LRU in front of AiCache rows."""
+
+    _entries: "OrderedDict[str, Tuple[str, Optional[datetime]]]" = OrderedDict()
+    _pending_hits: Dict[str, Tuple[int, datetime]] = {}
+    _lock = threading.RLock()
+
+    @staticmethod
+    def _config(key: str):
+        return current_app.config.get(key, getattr(AIModuleDefaultConfig, key))
+
+    @classmethod
+    def is_cacheable(cls, feature: Optional[str]) -> bool:
+        return bool(cls._config('AI_CACHE_ENABLED')) and feature not in cls._config('AI_CACHE_EXCLUDED_FEATURES')
+
+    @classmethod
+    def _remember(cls, key: str, response: str, expires_at: Optional[datetime]) -> None:
+        max_entries = int(cls._config('AI_CACHE_MEMORY_ENTRIES'))
+        with cls._lock:
+            cls._entries[key] = (response, expires_at)
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > max_entries:
+                cls._entries.popitem(last=False)
+
+    @classmethod
+    def get(cls, provider: str, model: str, prompt: str) -> Optional[str]:
+        """Cached response for the prompt, or None."""
+        key = prompt_cache_key(provider, model, prompt)
+        now = _utcnow()
+
+        with cls._lock:
+            cached = cls._entries.get(key)
+            if cached is not None:
+                response, expires_at = cached
+                if expires_at is None or expires_at > now:
+                    cls._entries.move_to_end(key)
+                    count, _ = cls._pending_hits.get(key, (0, now))
+                    cls._pending_hits[key] = (count + 1, now)
+                    return response
+                del cls._entries[key]
+
+        try:
+            row = AiCache.query.filter(
+                AiCache.prompt_hash == key,
+                db.or_(AiCache.expires_at.is_(None), AiCache.expires_at > now)
+            ).order_by(AiCache.cache_id.desc()).first()
+            if row is None:
+                return None
+            row.hit_count = (row.hit_count or 0) + 1
+            row.last_hit_at = now
+            response, expires_at = row.response_text, _aware(row.expires_at)
+            safe_commit(db.session)
+        except Exception as e:
+            safe_rollback(db.session)
+            logger.warning(f"AiPromptCache: lookup failed: {e}")
+            return None
+
+        cls._remember(key, response, expires_at)
+        return response
+
+    @classmethod
+    def put(cls, provider: str, model: str, prompt: str, response: str) -> None:
+        """Store a successful response in both levels."""
+        if not response:
+            return
+        key = prompt_cache_key(provider, model, prompt)
+        expires_at = _utcnow() + timedelta(seconds=int(cls._config('AI_CACHE_TTL_SECONDS')))
+        try:
+            row = AiCache.query.filter_by(prompt_hash=key).first()
+            if row is None:
+                row = AiCache(provider=provider, model_name=model, prompt_hash=key, hit_count=0)
+                db.session.add(row)
+            row.response_text = response
+            row.expires_at = expires_at
+            safe_commit(db.session)
+        except Exception as e:
+            safe_rollback(db.session)
+            logger.warning(f"AiPromptCache: store failed: {e}")
+        cls._remember(key, response, expires_at)
+
+    @classmethod
+    def flush_hits(cls) -> int:
+        """Write in-memory hit counters to AiCache rows. Returns the number of rows touched."""
+        with cls._lock:
+            pending, cls._pending_hits = cls._pending_hits, {}
+        if not pending:
+            return 0
+        try:
+            for key, (count, last_hit_at) in pending.items():
+                AiCache.query.filter_by(prompt_hash=key).update({
+                    AiCache.hit_count: func.coalesce(AiCache.hit_count, 0) + count,
+                    AiCache.last_hit_at: last_hit_at,
+                }, synchronize_session=False)
+            safe_commit(db.session)
+        except Exception as e:
+            safe_rollback(db.session)
+            logger.warning(f"AiPromptCache: flushing hit counters failed: {e}")
+            return 0
+        return len(pending)
+
+    @classmethod
+    def evict(cls) -> Dict[str, int]:
+        """Drop expired rows, then trim to AI_CACHE_MAX_ROWS by last use (least recent first)."""
+        cls.flush_hits()
+        now = _utcnow()
+        expired = AiCache.query.filter(AiCache.expires_at <= now).delete(synchronize_session=False)
+
+        trimmed = 0
+        excess = AiCache.query.count() - int(cls._config('AI_CACHE_MAX_ROWS'))
+        if excess > 0:
+            oldest = db.session.query(AiCache.cache_id).order_by(
+                func.coalesce(AiCache.last_hit_at, AiCache.created_at).asc(),
+                AiCache.cache_id.asc()
+            ).limit(excess).subquery()
+            trimmed = AiCache.query.filter(AiCache.cache_id.in_(db.select(oldest.c.cache_id))).delete(synchronize_session=False)
+        safe_commit(db.session)
+
+        with cls._lock:
+            cls._entries = OrderedDict(
+                (key, value) for key, value in cls._entries.items()
+                if value[1] is None or value[1] > now
+            )
+        return {'expired': expired, 'trimmed': trimmed}
+
+    @classmethod
+    def clear_memory(cls) -> None:
+        with cls._lock:
+            cls._entries.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            return {'memory_entries': len(cls._entries), 'pending_hits': sum(c for c, _ in cls._pending_hits.values())}
+
+    @staticmethod
+    def run_eviction():
+        """Scheduler job: periodic AiCache eviction."""
+        with scheduler.app.app_context():
+            try:
+                result = AiPromptCache.evict()
+                logger.info(f"AiPromptCache eviction: {result}")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"AiPromptCache eviction failed: {e}")
+
+    @staticmethod
+    def init_scheduler(app):
+        """Register the periodic eviction job with APScheduler."""
+        job_id = 'ai_cache_eviction'
+        if not scheduler.get_job(job_id):
+            scheduler.add_job(
+                id=job_id,
+                func=AiPromptCache.run_eviction,
+                trigger='interval',
+                minutes=int(app.config.get('AI_CACHE_EVICT_INTERVAL_MINUTES', AIModuleDefaultConfig.AI_CACHE_EVICT_INTERVAL_MINUTES)),
+                replace_existing=True
+            )
+            logger.info("AI cache eviction job registered.")
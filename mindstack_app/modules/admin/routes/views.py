@@ -31,7 +31,7 @@ from ..services.settings_service import (
     CORE_SETTING_KEYS, CORE_SETTING_FIELDS, SETTING_CATEGORY_LABELS,
     is_sensitive_setting, get_core_settings, get_grouped_core_settings,
     categorize_settings, refresh_runtime_settings, log_setting_change,
-    parse_setting_value, validate_setting_value
+    parse_setting_value, validate_setting_value, invalidate_category_caches
 )
 from ..services.media_service import (
     ADMIN_ALLOWED_MEDIA_EXTENSIONS, normalize_subpath,
@@ -647,6 +647,7 @@ def update_system_setting(setting_key):
         "update", key=setting.key, old_value=old_value, new_value=parsed_value
     )
     refresh_runtime_settings()
+    invalidate_category_caches(setting.category)
     flash('Đã cập nhật cấu hình thành công.', 'success')
     return redirect(url_for('admin.manage_system_settings'))
 
@@ -666,6 +667,7 @@ def delete_system_setting(setting_key):
     current_app.config.pop(setting.key, None)
     log_setting_change("delete", key=setting.key, old_value=old_value, new_value=None)
     refresh_runtime_settings()
+    invalidate_category_caches(setting.category)
 
     flash('Đã xóa cấu hình.', 'info')
     return redirect(url_for('admin.manage_system_settings'))
@@ -709,10 +711,15 @@ def reset_learning_progress():
         # REFAC: Use LearningHistoryInterface
         from mindstack_app.modules.learning_history.interface import LearningHistoryInterface
         LearningHistoryInterface.delete_user_history(user.user_id)
+        from mindstack_app.modules.stats.interface import StatsInterface
+        StatsInterface.delete_user_daily_stats(user.user_id)
         
         Note.query.filter_by(user_id=user.user_id).delete(synchronize_session=False)
         UserFeedback.query.filter_by(user_id=user.user_id).delete(synchronize_session=False)
-        ScoreLog.query.filter_by(user_id=user.user_id).delete(synchronize_session=False)
+
+        # ScoreLog together with the streak and leaderboard rows derived from it
+        from mindstack_app.modules.gamification.interface import delete_user_gamification_data
+        delete_user_gamification_data(user.user_id)
 
         user.total_score = 0
         db.session.commit()
@@ -754,15 +761,32 @@ def reset_learning_progress():
         
         # REFAC: Use LearningHistoryInterface
         from mindstack_app.modules.learning_history.interface import LearningHistoryInterface
+        StudyLog = LearningHistoryInterface.get_model_class()
+        studied_user_ids = [
+            r.user_id for r in db.session.query(StudyLog.user_id)
+            .filter(StudyLog.item_id.in_(item_subquery)).distinct()
+        ]
         LearningHistoryInterface.delete_items_history(item_ids)
+        # Daily stats are rolled up from the deleted StudyLog rows
+        from mindstack_app.modules.stats.interface import StatsInterface
+        for studied_user_id in studied_user_ids:
+            StatsInterface.rebuild_daily_rollups(user_id=studied_user_id)
         Note.query.filter(
             (Note.reference_type == 'item') & Note.reference_id.in_(item_subquery) |
             (Note.reference_type == 'container') & (Note.reference_id == container.container_id)
         ).delete(synchronize_session=False)
         UserFeedback.query.filter(UserFeedback.item_id.in_(item_subquery)).delete(synchronize_session=False)
+        scored_user_ids = [
+            r.user_id for r in db.session.query(ScoreLog.user_id)
+            .filter(ScoreLog.item_id.in_(item_subquery)).distinct()
+        ]
         ScoreLog.query.filter(ScoreLog.item_id.in_(item_subquery)).delete(synchronize_session=False)
         UserContainerState.query.filter_by(container_id=container.container_id).delete(synchronize_session=False)
 
+        # Streaks and leaderboard buckets are derived from the deleted ScoreLog rows
+        from mindstack_app.modules.gamification.interface import rebuild_users_gamification_data
+        rebuild_users_gamification_data(scored_user_ids)
+
         db.session.commit()
         flash(f"Đã đặt lại tiến độ cho bộ '{container.title}'.", 'success')
         return redirect(url_for('admin.manage_system_settings'))
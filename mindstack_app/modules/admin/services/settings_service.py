@@ -176,6 +176,12 @@ def refresh_runtime_settings(force: bool = True) -> None:
     if service:
         service.load_settings(force=force)
 
+def invalidate_category_caches(category: str | None) -> None:
+    """Báo cho module sở hữu danh mục cấu hình xóa cache nội bộ sau khi admin chỉnh sửa."""
+    if category == "srs":
+        from mindstack_app.modules.fsrs.interface import FSRSInterface
+        FSRSInterface.invalidate_config_cache()
+
 def log_setting_change(action: str, *, key: str, old_value: object, new_value: object) -> None:
     """Ghi nhận log audit cho thay đổi cấu hình."""
     user_label = "anonymous"
@@ -15,3 +15,17 @@ class AudioModuleDefaultConfig:
         'ja-f': 'edge:ja-JP-NanamiNeural',
         'ja-m': 'edge:ja-JP-KeitaNeural',
     }
+
+    # Pre-generation pipeline (AudioPregenerationService)
+    AUDIO_PREGEN_ENGINE = "edge"
+    AUDIO_PREGEN_AUTOSTART = True  # start the worker thread on the first enqueue
+    AUDIO_PREGEN_CONCURRENCY = 4
+    AUDIO_PREGEN_BATCH_SIZE = 32
+    AUDIO_PREGEN_MAX_ATTEMPTS = 4
+    AUDIO_PREGEN_RETRY_BASE_SECONDS = 10
+    AUDIO_PREGEN_RETRY_MAX_SECONDS = 600
+
+    # Multi-voice (concatenated) audio
+    AUDIO_SEGMENT_CONCURRENCY = 4
+    AUDIO_SEGMENT_CACHE_DIR = "uploads/audio/segments"
+    AUDIO_SEGMENT_DECODED_CACHE_SIZE = 64
@@ -1,3 +1,4 @@
 from .base import AudioEngine
 from .edge import EdgeEngine
 from .gtts_engine import GTTSEngine
+from .fake import FakeEngine
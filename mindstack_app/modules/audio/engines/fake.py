@@ -0,0 +1,21 @@
+import asyncio
+import os
+from .base import AudioEngine
+
+class FakeEngine(AudioEngine):
+    """
+    Local engine for tests and offline setups: writes a small placeholder file
+    instead of calling a TTS service. `delay` simulates network latency.
+    """
+
+    delay: float = 0.0
+
+    async def generate(self, text: str, voice: str, full_path: str) -> bool:
+        directory = os.path.dirname(full_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        with open(full_path, 'wb') as f:
+            f.write(f"FAKE-MP3|{voice or ''}|{text}".encode('utf-8'))
+        return True
@@ -1,13 +1,14 @@
 from mindstack_app.core.signals import content_changed
+from mindstack_app.modules.content_management.signals import container_content_changed
 from flask import current_app
-import asyncio
-from .services.audio_service import AudioService
-from mindstack_app.models import LearningItem, db
+from .services.pregeneration_service import AudioPregenerationService
+from mindstack_app.models import LearningContainer, LearningItem, db
+from mindstack_app.utils.db_session import safe_commit
 
 @content_changed.connect
 def handle_audio_content_change(sender, **kwargs):
     """
-    Listen for content changes and trigger audio regeneration if needed.
+    Listen for content changes and queue audio regeneration if needed.
     """
     content_type = kwargs.get('content_type')
     content_id = kwargs.get('content_id')
@@ -15,40 +16,43 @@ def handle_audio_content_change(sender, **kwargs):
     if content_type != 'item':
         return
 
-    # Trigger async task if in app context or use current_app for background check
-    # Note: Flask's blinker signals are synchronous. For long tasks, use a thread or task queue.
-    # For now, we'll just check if audio regeneration is requested in payload.
-    
     payload = kwargs.get('payload', {})
     if payload.get('regenerate_audio'):
-        # In a real production app, this would be an Celery task.
-        # For MindStack simple setup, we might use a thread or just a safe async call if possible.
-        
         # We need the item to know what to speak
-        item = LearningItem.query.get(content_id)
+        item = db.session.get(LearningItem, content_id)
         if not item or item.item_type != 'FLASHCARD':
             return
             
-        current_app.logger.info(f"[AudioEvent] Triggering audio regeneration for item {content_id}")
-        
-        # Simple thread-based fire and forget for MindStack
-        import threading
-        def run_regen(app_context):
-            with app_context:
-                # We need to run the async AudioService.get_audio in a loop
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                front_text = item.content.get('front', '')
-                back_text = item.content.get('back', '')
-                
-                # We use the generic logic to determine paths or just rely on AudioService
-                # to hash based on the new content.
-                from .schemas import AudioRequestDTO
-                if front_text:
-                    loop.run_until_complete(AudioService.get_audio(AudioRequestDTO(text=front_text, is_manual=True, auto_voice_parsing=True)))
-                if back_text:
-                    loop.run_until_complete(AudioService.get_audio(AudioRequestDTO(text=back_text, is_manual=True, auto_voice_parsing=True)))
-                    
-        thread = threading.Thread(target=run_regen, args=(current_app.app_context(),))
-        thread.start()
+        current_app.logger.info(f"[AudioEvent] Queueing audio regeneration for item {content_id}")
+
+        # Jobs go to the pre-generation queue (background worker, concurrency-capped),
+        # hashed by the new content like before.
+        for field in ('front', 'back'):
+            text = (item.content or {}).get(field, '')
+            if text:
+                AudioPregenerationService.enqueue(text, item_id=item.item_id, field=field, force=True)
+        # Sent after the content was saved: the jobs are this listener's own work
+        safe_commit(db.session)
+
+
+@container_content_changed.connect
+def handle_audio_bulk_content_change(sender, **kwargs):
+    """
+    Bulk imports send one event for the whole container: queue the audio of
+    every created/updated flashcard in one go.
+    """
+    payload = kwargs.get('payload') or {}
+    if not payload.get('regenerate_audio') or kwargs.get('item_type') != 'FLASHCARD':
+        return
+
+    item_ids = list(kwargs.get('created') or []) + list(kwargs.get('updated') or [])
+    if not item_ids:
+        return
+
+    container = db.session.get(LearningContainer, kwargs.get('container_id'))
+    queued = 0
+    for start in range(0, len(item_ids), 500):
+        items = LearningItem.query.filter(LearningItem.item_id.in_(item_ids[start:start + 500])).all()
+        queued += AudioPregenerationService.enqueue_items(items, container, force=True)
+    safe_commit(db.session)
+    current_app.logger.info(f"[AudioEvent] Queued {queued} audio files for {len(item_ids)} imported items")
@@ -1,6 +1,7 @@
 # File: mindstack_app/modules/audio/interface.py
-from typing import Optional
+from typing import Iterable, Optional
 from .services.audio_service import AudioService
+from .services.pregeneration_service import AudioPregenerationService
 from .schemas import AudioRequestDTO, AudioResponseDTO
 
 class AudioInterface:
@@ -34,6 +35,30 @@ class AudioInterface:
             error=result.get('error')
         )
 
+    @staticmethod
+    def get_or_queue_audio_url(
+        text: str,
+        filename: Optional[str] = None,
+        target_dir: Optional[str] = None,
+        item_id: Optional[int] = None,
+        field: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Non-blocking lookup for request handlers: URL of the existing audio
+        file, or None after queueing its generation in the background.
+        The job is flushed, not committed: it is saved by the caller's commit.
+        """
+        return AudioPregenerationService.resolve_or_enqueue(
+            text, filename, target_dir, item_id=item_id, field=field
+        )
+
+    @staticmethod
+    def queue_container_audio(container_id: int, keys: Iterable[str] = (), force: bool = False) -> int:
+        """
+        Queue bulk pre-generation of a container's item audio. Returns the number of jobs queued.
+        """
+        return AudioPregenerationService.enqueue_container(container_id, keys, force=force)
+
     @staticmethod
     def speech_to_text(audio_source, lang: str = "vi-VN") -> str:
         """
@@ -65,3 +65,31 @@ def get_storage_path(target_dir: str, filename: str) -> dict:
         'physical_path': str(physical_path.resolve() if physical_path.exists() else physical_path), # resolve only if exists validation needed? No, just str.
         'url': url_path
     }
+
+def resolve_segment_voice(lang: str, gender: str, mapping: dict, default_voice: str) -> tuple:
+    """
+    (engine, voice) of a parsed voice segment: `lang-gender` first, then `lang`,
+    values formatted 'engine:voice' (a bare value is an Edge voice).
+
+    >>> m = {'en': 'gtts:en', 'ja-m': 'edge:ja-JP-KeitaNeural', 'ko': 'ko-KR-SunHiNeural'}
+    >>> resolve_segment_voice('ja', 'm', m, 'vi-VN-HoaiMyNeural')
+    ('edge', 'ja-JP-KeitaNeural')
+    >>> resolve_segment_voice('en', 'f', m, 'vi-VN-HoaiMyNeural')
+    ('gtts', 'en')
+    >>> resolve_segment_voice('ko', None, m, 'vi-VN-HoaiMyNeural')
+    ('edge', 'ko-KR-SunHiNeural')
+    >>> resolve_segment_voice(None, None, m, 'vi-VN-HoaiMyNeural')
+    ('edge', 'vi-VN-HoaiMyNeural')
+    """
+    engine, voice = 'edge', default_voice
+    if lang:
+        key_gender = f"{lang}-{gender}" if gender else lang
+        found_val = mapping.get(key_gender) or mapping.get(lang)
+        if found_val:
+            # Format is 'engine:voice' (e.g. 'edge:vi-VN-Na', 'gtts:vi')
+            if ':' in found_val:
+                engine, voice = found_val.split(':', 1)
+            else:
+                # Legacy or edge-only format
+                voice = found_val
+    return engine, voice
@@ -0,0 +1,55 @@
+# File: mindstack_app/modules/audio/logics/pregen_logic.py
+"""
+Pure helpers of the audio pre-generation pipeline (no DB, no Flask).
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def job_key(text: str, engine: str, voice: Optional[str], target_dir: Optional[str], filename: Optional[str]) -> str:
+    """
+    Dedupe key of a TTS job: same text, voice and destination -> same job.
+
+    >>> job_key('xin chào', 'edge', None, 'uploads/audio', 'front_1.mp3') == job_key(' xin chào ', 'edge', None, 'uploads/audio', 'front_1.mp3')
+    True
+    >>> job_key('a', 'edge', None, None, None) == job_key('a', 'gtts', None, None, None)
+    False
+    """
+    raw = '|'.join([text.strip(), engine or '', voice or 'auto', target_dir or '', filename or ''])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def retry_delay(attempts: int, base_seconds: float, max_seconds: float) -> float:
+    """
+    Exponential backoff before the next attempt (after `attempts` failures).
+
+    >>> [retry_delay(n, 10, 60) for n in (1, 2, 3, 4, 5)]
+    [10, 20, 40, 60, 60]
+    """
+    return min(max_seconds, base_seconds * (2 ** max(0, attempts - 1)))
+
+
+def item_audio_specs(item_id: Optional[int], content: Dict, keys: Iterable[str] = ()) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    (field, text, filename) of the audio files a vocabulary item uses, with the
+    naming convention of the MCQ / Typing `ensure_audio_urls`:
+    custom keys -> `<key>_<id>.mp3`, front/back -> `front_<id>.mp3` / `back_<id>.mp3`
+    (reading `*_audio_content` first). Fields that already have a URL are skipped.
+
+    >>> item_audio_specs(7, {'front': 'cat', 'back': 'con mèo', 'back_audio': 'b.mp3', 'ipa': 'kæt'}, ['ipa', 'front'])
+    [('ipa', 'kæt', 'ipa_7.mp3'), ('front', 'cat', 'front_7.mp3')]
+    """
+    specs: List[Tuple[str, str, Optional[str]]] = []
+    for key in keys:
+        if key and key not in ('front', 'back'):
+            text = content.get(key)
+            if text and not content.get(f"{key}_audio") and str(text).strip():
+                specs.append((key, str(text), f"{key}_{item_id}.mp3" if item_id else None))
+
+    for side in ('front', 'back'):
+        text = content.get(f"{side}_audio_content") or content.get(side, '')
+        has_url = content.get(f"{side}_audio") or content.get(f"{side}_audio_url")
+        if text and not has_url and str(text).strip():
+            specs.append((side, str(text), f"{side}_{item_id}.mp3" if item_id else None))
+    return specs
@@ -1,2 +1,34 @@
 # File: mindstack_app/modules/audio/models.py
-# No models for this module yet.
+from datetime import datetime, timezone
+from mindstack_app.core.extensions import db
+
+
+class AudioJob(db.Model):
+    """
+    One queued TTS generation (item field -> mp3 file) of the pre-generation pipeline.
+    `job_key` is a hash of text/engine/voice/target, so the same audio is queued once.
+    """
+    __tablename__ = 'audio_jobs'
+
+    job_id = db.Column(db.Integer, primary_key=True)
+    job_key = db.Column(db.String(40), unique=True, nullable=False)
+
+    item_id = db.Column(db.Integer, nullable=True, index=True)
+    field = db.Column(db.String(100), nullable=True)
+    text = db.Column(db.Text, nullable=False)
+    engine = db.Column(db.String(20), nullable=False)
+    voice = db.Column(db.String(100), nullable=True)
+    target_dir = db.Column(db.String(255), nullable=True)
+    filename = db.Column(db.String(255), nullable=True)
+    force = db.Column(db.Boolean, default=False, nullable=False)
+
+    status = db.Column(db.String(20), default='pending', nullable=False, index=True)  # pending | running | done | failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    last_error = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<AudioJob {self.job_id}: {self.status} item={self.item_id} field={self.field}>"
@@ -5,6 +5,7 @@ from flask import request, jsonify, current_app
 from flask_login import login_required, current_user
 from .. import audio_bp as blueprint
 from ..services.audio_service import AudioService
+from ..services.pregeneration_service import AudioPregenerationService
 from mindstack_app.models import AppSettings, db, BackgroundTask
 
 @blueprint.route('/settings', methods=['POST'])
@@ -90,6 +91,18 @@ def start_audio_task():
                 audio_service.generate_cache_for_all_cards(task)
             elif task_name == 'transcribe_quiz_audio':
                 transcribe_quiz_audio(task)
+            elif task_name == AudioPregenerationService.TASK_NAME:
+                # Bulk TTS for a container: queue jobs, the background worker reports progress on this task
+                task.progress = 0
+                task.stop_requested = False
+                db.session.commit()
+                queued = AudioPregenerationService.enqueue_container(
+                    int(data.get('container_id')), data.get('keys') or [], force=bool(data.get('force'))
+                )
+                task.message = f'Queued {queued} audio files.'
+                db.session.commit()
+                AudioPregenerationService.start()
+                return jsonify({'success': True, 'message': task.message, 'queued': queued})
             else:
                  return jsonify({'success': False, 'message': 'Unknown task name.'})
                  
@@ -1,12 +1,16 @@
 import os
 import asyncio
+import threading
+import uuid
+from collections import OrderedDict
 from flask import current_app
 
 from mindstack_app.models import AppSettings
 from ..config import AudioModuleDefaultConfig
 from ..engines.edge import EdgeEngine
 from ..engines.gtts_engine import GTTSEngine
-from ..logics.audio_logic import generate_hash_name, get_storage_path
+from ..engines.fake import FakeEngine
+from ..logics.audio_logic import generate_hash_name, get_storage_path, resolve_segment_voice
 from ..schemas import AudioRequestDTO
 
 class AudioService:
@@ -18,8 +22,13 @@ class AudioService:
     # Engine Registry
     _ENGINES = {
         'edge': EdgeEngine,
-        'gtts': GTTSEngine
+        'gtts': GTTSEngine,
+        'fake': FakeEngine,
     }
+
+    # Decoded segments reused across concatenations (see _decoded_segment)
+    _decoded_segments: "OrderedDict[str, object]" = OrderedDict()
+    _decoded_lock = threading.Lock()
     
     @classmethod
     async def get_audio(cls, request_dto: AudioRequestDTO) -> dict:
@@ -109,27 +118,70 @@ class AudioService:
             current_app.logger.error(f"[AudioService] Exception: {e}")
             return {'error': str(e), 'status': 'error'}
 
+    @classmethod
+    def _segment_config(cls, key: str):
+        return current_app.config.get(key, getattr(AudioModuleDefaultConfig, key))
+
+    @classmethod
+    async def _synthesize_segment(cls, semaphore: asyncio.Semaphore, seg_text: str, engine: str, voice: str) -> str:
+        """
+        Path of the cached mp3 of one segment, synthesizing it on a miss.
+        Segments are cached by (text, engine, voice) hash and shared by all cards.
+        """
+        paths = get_storage_path(cls._segment_config('AUDIO_SEGMENT_CACHE_DIR'), generate_hash_name(seg_text, engine, voice))
+        segment_path = paths['physical_path']
+        if os.path.exists(segment_path):
+            return segment_path
+
+        engine_cls = cls._ENGINES.get(engine)
+        if not engine_cls:
+            # Fallback to Edge if unknown
+            engine_cls = cls._ENGINES['edge']
+
+        # Write next to the cache entry and rename, so a half-written file is never reused
+        tmp_path = f"{segment_path}.{uuid.uuid4().hex}.tmp"
+        async with semaphore:
+            success = await engine_cls().generate(seg_text, voice, tmp_path)
+        if not success or not os.path.exists(tmp_path):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise Exception(f"Failed to generate segment: {seg_text} with {engine}")
+        os.replace(tmp_path, segment_path)
+        return segment_path
+
+    @classmethod
+    def _decoded_segment(cls, path: str, max_entries: int):
+        """pydub AudioSegment of a cached segment file (process-local LRU of decoded audio)."""
+        from pydub import AudioSegment
+        with cls._decoded_lock:
+            decoded = cls._decoded_segments.get(path)
+            if decoded is not None:
+                cls._decoded_segments.move_to_end(path)
+                return decoded
+        decoded = AudioSegment.from_file(path)
+        with cls._decoded_lock:
+            cls._decoded_segments[path] = decoded
+            while len(cls._decoded_segments) > max_entries:
+                cls._decoded_segments.popitem(last=False)
+        return decoded
+
     @classmethod
     async def _generate_concatenated_audio(cls, text: str, output_path: str) -> bool:
         """
-        Parses text, generates segments using Edge TTS, and concatenates them.
+        Parses text, synthesizes the segments concurrently (cached per segment) and concatenates them.
         """
-        import os
-        import tempfile
-        import asyncio
+        import json
+        import shutil
         from ..logics.voice_parser import VoiceParser
-        from mindstack_app.modules.audio.logics.voice_engine import VoiceEngine # Reuse for pydub logic
-        
-        segments = VoiceParser.parse_segments(text)
+
+        segments = [seg for seg in VoiceParser.parse_segments(text) if seg['text'].strip()]
         if not segments:
             return False
-            
-        temp_files = []
+
         mapping = AppSettings.get('AUDIO_VOICE_MAPPING_GLOBAL', 
                                   current_app.config.get('AUDIO_VOICE_MAPPING_GLOBAL', 
                                                         AudioModuleDefaultConfig.AUDIO_VOICE_MAPPING_GLOBAL))
         if isinstance(mapping, str):
-            import json
             try:
                 mapping = json.loads(mapping)
             except:
@@ -140,99 +192,47 @@ class AudioService:
                                                                   AudioModuleDefaultConfig.AUDIO_DEFAULT_VOICE_EDGE))
         
         try:
-            # 1. Generate Parts
-            
-            for i, seg in enumerate(segments):
-                seg_text = seg['text']
-                if not seg_text.strip():
-                    continue
-                    
-                lang = seg['lang']
-                gender = seg['gender']
-                
-                # Resolve Identity (Engine + Voice)
-                # Default identity
-                resolved_engine = 'edge'
-                resolved_voice = default_voice_edge
-                
-                if lang:
-                    key_gender = f"{lang}-{gender}" if gender else lang
-                    key_generic = lang
-                    
-                    found_val = None
-                    if key_gender in mapping:
-                        found_val = mapping[key_gender]
-                    elif key_generic in mapping:
-                        found_val = mapping[key_generic]
-                    
-                    if found_val:
-                        # Format is 'engine:voice' (e.g. 'edge:vi-VN-Na', 'gtts:vi')
-                        if ':' in found_val:
-                            resolved_engine, resolved_voice = found_val.split(':', 1)
-                        else:
-                            # Legacy or edge-only format
-                            resolved_voice = found_val
-                            
-                current_app.logger.info(f"[AudioConcatenation] Segment '{seg_text[:10]}...': Key={lang}-{gender} -> {resolved_engine}:{resolved_voice}")
+            # 1. Resolve Identity (Engine + Voice) per segment; repeated segments are synthesized once
+            identities = []
+            for seg in segments:
+                resolved_engine, resolved_voice = resolve_segment_voice(seg['lang'], seg['gender'], mapping or {}, default_voice_edge)
+                current_app.logger.info(f"[AudioConcatenation] Segment '{seg['text'][:10]}...': Key={seg['lang']}-{seg['gender']} -> {resolved_engine}:{resolved_voice}")
+                identities.append((seg['text'], resolved_engine, resolved_voice))
+            unique = list(dict.fromkeys(identities))
+
+            # 2. Generate Parts (bounded concurrency, segment cache)
+            semaphore = asyncio.Semaphore(max(1, int(cls._segment_config('AUDIO_SEGMENT_CONCURRENCY'))))
+            paths = await asyncio.gather(*(cls._synthesize_segment(semaphore, *identity) for identity in unique))
+            path_by_identity = dict(zip(unique, paths))
+            segment_paths = [path_by_identity[identity] for identity in identities]
+
+            out_dir = os.path.dirname(output_path)
+            if out_dir and not os.path.exists(out_dir):
+                os.makedirs(out_dir, exist_ok=True)
+
+            if len(segment_paths) == 1:
+                # Nothing to join: the cached segment is the result
+                shutil.copyfile(segment_paths[0], output_path)
+                return True
+
+            # 3. Concatenate (pydub is synchronous, run in executor to avoid blocking async loop)
+            max_decoded = int(cls._segment_config('AUDIO_SEGMENT_DECODED_CACHE_SIZE'))
 
-                # Instantiate Engine for this segment
-                engine_cls = cls._ENGINES.get(resolved_engine)
-                if not engine_cls:
-                     # Fallback to Edge if unknown
-                     engine_cls = cls._ENGINES['edge']
-                
-                gen_instance = engine_cls()
-                
-                # Create Temp File
-                fd, temp_path = tempfile.mkstemp(suffix=f"_{i}.mp3")
-                os.close(fd)
-                
-                # Generate Sync (Using the instance method, awaiting if it's async compatible wrapper, 
-                # but our .generate is async def)
-                success = await gen_instance.generate(seg_text, resolved_voice, temp_path)
-                
-                if success:
-                    temp_files.append(temp_path)
-                else:
-                    raise Exception(f"Failed to generate segment: {seg_text} with {resolved_engine}")
-            
-            if not temp_files:
-                return False
-                
-            # 2. Concatenate
-            # Use VoiceEngine's logic which uses Pydub
-            # It's synchronous, so run in executor to avoid blocking async loop
-            loop = asyncio.get_running_loop()
-            
-            # VoiceEngine.concatenate_audio_files(file_paths, output_format, pause_ms)
-            # We need to construct it or make the method static. It's an instance method currently.
-            ve = VoiceEngine()
-            
-            # We only want to save to 'output_path', but 'concatenate_audio_files' generates its own temp path.
-            # We can use it and then move/copy, or use pydub directly here. 
-            # Reusing is cleaner code-wise but slightly inefficient (double write).
-            # Let's use pydub directly here for full control over destination 'output_path'.
-            
             def concat_task():
                 from pydub import AudioSegment
-                
-                # Ensure output directory exists before exporting
-                out_dir = os.path.dirname(output_path)
-                if out_dir and not os.path.exists(out_dir):
-                    os.makedirs(out_dir, exist_ok=True)
-                    
                 combined = AudioSegment.empty()
                 pause = AudioSegment.silent(duration=300) # 300ms pause between segments
                 
                 first = True
-                for tf in temp_files:
+                for path in segment_paths:
                     if not first:
                         combined += pause
-                    combined += AudioSegment.from_file(tf)
+                    combined += cls._decoded_segment(path, max_decoded)
                     first = False
                     
                 combined.export(output_path, format="mp3")
                 
+            loop = asyncio.get_running_loop()
             await loop.run_in_executor(None, concat_task)
             return True
             
@@ -243,14 +243,6 @@ class AudioService:
             # We can't easily return the error through the boolean return, 
             # but the log will have it. 
             return False
-        finally:
-            # Cleanup
-            for tf in temp_files:
-                if os.path.exists(tf):
-                    try:
-                        os.remove(tf)
-                    except:
-                        pass
 
     @classmethod
     def speech_to_text(cls, audio_source, lang: str = "vi-VN") -> str:
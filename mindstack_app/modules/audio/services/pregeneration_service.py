@@ -0,0 +1,360 @@
+# File: mindstack_app/modules/audio/services/pregeneration_service.py
+"""
+Audio Pre-generation Service - persistent TTS job queue.
+
+Learner requests never wait on TTS: they either get the URL of an existing
+file or queue an ``AudioJob`` and move on. One background thread per process
+drains the queue on its own asyncio loop, at most
+``AUDIO_PREGEN_CONCURRENCY`` generations at a time, retrying failures with
+exponential backoff. Jobs are rows, so a restart resumes where it stopped;
+overall progress is reported on the ``audio_pregeneration`` BackgroundTask.
+"""
+
+import asyncio
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from flask import current_app
+from sqlalchemy import event
+
+from mindstack_app.models import AudioJob, BackgroundTask, LearningItem, db
+from mindstack_app.utils.db_session import safe_commit, safe_rollback
+from ..config import AudioModuleDefaultConfig
+from ..logics.audio_logic import generate_hash_name, get_storage_path
+from ..logics.pregen_logic import item_audio_specs, job_key, retry_delay
+from ..schemas import AudioRequestDTO
+from .audio_service import AudioService
+
+DEFAULT_TARGET_DIR = 'uploads/audio/cache'
+ITEM_TYPES = ('FLASHCARD', 'VOCABULARY')
+
+# Jobs left 'running' longer than this (crashed worker) are picked up again
+STALE_RUNNING_AFTER = timedelta(minutes=10)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    # SQLite returns naive datetimes
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class AudioPregenerationService:
+    """Queue TTS jobs and drain them in a background asyncio worker."""
+
+    TASK_NAME = 'audio_pregeneration'
+    START_AFTER_COMMIT_KEY = 'audio_pregen_start_after_commit'
+
+    _app = None
+    _thread: Optional[threading.Thread] = None
+    _wake = threading.Event()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _config(key: str, app=None):
+        return (app or current_app).config.get(key, getattr(AudioModuleDefaultConfig, key))
+
+    # ── Paths ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def container_audio_folder(container) -> str:
+        """Audio folder of a container (same rule as the MCQ/Typing `ensure_audio_urls`)."""
+        if container:
+            from mindstack_app.utils.media_paths import normalize_media_folder
+            container_audio = (container.settings or {}).get('media_folders', {}).get('audio') or container.media_audio_folder
+            if container_audio:
+                return f"uploads/{normalize_media_folder(container_audio)}"
+        return DEFAULT_TARGET_DIR
+
+    @classmethod
+    def _paths(cls, text: str, engine: str, target_dir: Optional[str], filename: Optional[str],
+               voice: Optional[str] = None) -> dict:
+        if not filename:
+            filename = generate_hash_name(text, engine, voice or 'auto')
+        elif not filename.endswith('.mp3'):
+            filename += '.mp3'
+        return get_storage_path(target_dir or DEFAULT_TARGET_DIR, filename)
+
+    # ── Enqueue ───────────────────────────────────────────────────────
+
+    @classmethod
+    def _add(cls, text: str, filename: Optional[str], target_dir: Optional[str], *, item_id=None, field=None,
+             voice=None, engine=None, force=False) -> bool:
+        """Stage one job in the session (no commit). Returns True if something was queued."""
+        engine = engine or cls._config('AUDIO_PREGEN_ENGINE')
+        if not force and os.path.exists(cls._paths(text, engine, target_dir, filename, voice)['physical_path']):
+            return False
+
+        key = job_key(text, engine, voice, target_dir, filename)
+        job = AudioJob.query.filter_by(job_key=key).first()
+        if job is None:
+            return cls._insert_job(dict(
+                job_key=key, item_id=item_id, field=field, text=text, engine=engine, voice=voice,
+                target_dir=target_dir, filename=filename, force=force, status='pending',
+            ))
+        if job.status in ('pending', 'running'):
+            job.force = job.force or force
+            return False
+        if job.status == 'failed' and not force:
+            # Retries exhausted: only an explicit request queues it again
+            return False
+        job.status = 'pending'
+        job.force = force
+        job.attempts = 0
+        job.last_error = None
+        job.next_attempt_at = _utcnow()
+        return True
+
+    @staticmethod
+    def _insert_job(values: dict) -> bool:
+        """
+        Insert a job unless another request queued the same key meanwhile.
+        ON CONFLICT DO NOTHING on SQLite / PostgreSQL, so a race never leaves
+        the caller's transaction in a failed state.
+        """
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            stmt = dialect_insert(AudioJob).values(**values).on_conflict_do_nothing(index_elements=['job_key'])
+            return db.session.execute(stmt).rowcount > 0
+        db.session.add(AudioJob(**values))
+        return True
+
+    @classmethod
+    def _flush_and_start(cls, queued: int) -> int:
+        """
+        Flush the staged jobs. The caller owns the transaction: its commit
+        saves them, and the worker is woken up after that commit (it could not
+        see the jobs before).
+        """
+        if not queued:
+            return 0
+        db.session.flush()
+        if cls._config('AUDIO_PREGEN_AUTOSTART'):
+            cls._start_after_commit()
+        return queued
+
+    @classmethod
+    def _start_after_commit(cls) -> None:
+        session = db.session()
+        if session.info.get(cls.START_AFTER_COMMIT_KEY):
+            return
+        session.info[cls.START_AFTER_COMMIT_KEY] = True
+        app = current_app._get_current_object()
+
+        def on_commit(committed_session):
+            committed_session.info.pop(cls.START_AFTER_COMMIT_KEY, None)
+            cls.start(app)
+
+        event.listen(session, 'after_commit', on_commit, once=True)
+
+    @classmethod
+    def enqueue(cls, text: str, filename: Optional[str] = None, target_dir: Optional[str] = None, *,
+                item_id: Optional[int] = None, field: Optional[str] = None, voice: Optional[str] = None,
+                engine: Optional[str] = None, force: bool = False) -> bool:
+        """Queue one (item, field, voice) generation (flushed, not committed). Returns True if a job was queued."""
+        if not text or not str(text).strip():
+            return False
+        queued = cls._add(str(text), filename, target_dir, item_id=item_id, field=field,
+                          voice=voice, engine=engine, force=force)
+        return bool(cls._flush_and_start(int(queued)))
+
+    @classmethod
+    def enqueue_items(cls, items: Iterable, container=None, keys: Iterable[str] = (), force: bool = False) -> int:
+        """Queue the front/back (and custom key) audio of vocabulary items (not committed). Returns the number queued."""
+        target_dir = cls.container_audio_folder(container)
+        keys = list(keys or [])
+        queued = 0
+        for item in items:
+            for field, text, filename in item_audio_specs(item.item_id, dict(item.content or {}), keys):
+                queued += cls._add(text, filename, target_dir, item_id=item.item_id, field=field, force=force)
+        return cls._flush_and_start(queued)
+
+    @classmethod
+    def enqueue_container(cls, container_id: int, keys: Iterable[str] = (), force: bool = False) -> int:
+        """Bulk pre-generation for a whole container."""
+        from mindstack_app.models import LearningContainer
+        container = db.session.get(LearningContainer, container_id)
+        if not container:
+            return 0
+        items = LearningItem.query.filter(
+            LearningItem.container_id == container_id,
+            LearningItem.item_type.in_(ITEM_TYPES)
+        ).all()
+        return cls.enqueue_items(items, container, keys, force=force)
+
+    @classmethod
+    def resolve_or_enqueue(cls, text: str, filename: Optional[str], target_dir: Optional[str], *,
+                           item_id: Optional[int] = None, field: Optional[str] = None) -> Optional[str]:
+        """
+        URL of the audio file if it already exists; otherwise queue its
+        generation and return None (the client plays no audio this time).
+        """
+        if not text or not str(text).strip():
+            return None
+        text = str(text)
+        paths = cls._paths(text, cls._config('AUDIO_PREGEN_ENGINE'), target_dir, filename)
+        if os.path.exists(paths['physical_path']):
+            return paths['url']
+        try:
+            cls.enqueue(text, filename, target_dir, item_id=item_id, field=field)
+        except Exception as e:
+            current_app.logger.warning(f"[AudioPregeneration] Failed to queue audio for item {item_id}/{field}: {e}")
+        return None
+
+    # ── Worker ────────────────────────────────────────────────────────
+
+    @classmethod
+    def start(cls, app=None) -> None:
+        """Start the background worker of this process (no-op if running) and wake it up."""
+        app = app or current_app._get_current_object()
+        with cls._lock:
+            if cls._thread is None or not cls._thread.is_alive():
+                cls._app = app
+                cls._thread = threading.Thread(target=cls._run, name='audio-pregeneration', daemon=True)
+                cls._thread.start()
+        cls._wake.set()
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._thread is not None and cls._thread.is_alive()
+
+    @classmethod
+    def _run(cls) -> None:
+        app = cls._app
+        while True:
+            cls._wake.clear()
+            wait = None
+            with app.app_context():
+                try:
+                    wait = cls.run_pending()
+                except Exception as e:
+                    safe_rollback(db.session)
+                    app.logger.error(f"[AudioPregeneration] Worker error: {e}", exc_info=True)
+                    wait = float(cls._config('AUDIO_PREGEN_RETRY_BASE_SECONDS', app))
+                finally:
+                    db.session.remove()
+            cls._wake.wait(timeout=wait if wait is not None else 300)
+
+    @classmethod
+    def _task(cls) -> BackgroundTask:
+        task = BackgroundTask.query.filter_by(task_name=cls.TASK_NAME).first()
+        if task is None:
+            task = BackgroundTask(task_name=cls.TASK_NAME, status='idle', progress=0, total=0)
+            db.session.add(task)
+            safe_commit(db.session)
+        return task
+
+    @classmethod
+    def run_pending(cls) -> Optional[float]:
+        """
+        Drain every due job (blocking; used by the worker thread, tests and CLI).
+        Returns seconds until the next scheduled retry, or None if nothing is left.
+        """
+        return asyncio.run(cls._drain())
+
+    @classmethod
+    async def _drain(cls) -> Optional[float]:
+        semaphore = asyncio.Semaphore(max(1, int(cls._config('AUDIO_PREGEN_CONCURRENCY'))))
+        batch_size = max(1, int(cls._config('AUDIO_PREGEN_BATCH_SIZE')))
+        max_attempts = max(1, int(cls._config('AUDIO_PREGEN_MAX_ATTEMPTS')))
+        base = float(cls._config('AUDIO_PREGEN_RETRY_BASE_SECONDS'))
+        cap = float(cls._config('AUDIO_PREGEN_RETRY_MAX_SECONDS'))
+
+        task = cls._task()
+        AudioJob.query.filter(
+            AudioJob.status == 'running',
+            AudioJob.updated_at < _utcnow() - STALE_RUNNING_AFTER
+        ).update({'status': 'pending'}, synchronize_session=False)
+        safe_commit(db.session)
+
+        while True:
+            db.session.refresh(task)
+            if task.stop_requested:
+                task.status = 'stopped'
+                task.message = 'Stopped; queued jobs are kept.'
+                safe_commit(db.session)
+                return None
+
+            jobs = AudioJob.query.filter(
+                AudioJob.status == 'pending',
+                AudioJob.next_attempt_at <= _utcnow()
+            ).order_by(AudioJob.job_id).limit(batch_size).all()
+            if not jobs:
+                break
+
+            if task.status != 'running':
+                task.status = 'running'
+                task.progress = 0
+            for job in jobs:
+                job.status = 'running'
+            remaining = AudioJob.query.filter(AudioJob.status.in_(('pending', 'running'))).count()
+            task.total = (task.progress or 0) + remaining
+            task.message = f"Generating {len(jobs)} audio files..."
+            safe_commit(db.session)
+
+            results = await asyncio.gather(*(cls._generate(semaphore, job) for job in jobs))
+
+            for job, (ok, error) in zip(jobs, results):
+                job.attempts = (job.attempts or 0) + 1
+                if ok:
+                    job.status = 'done'
+                    job.last_error = None
+                    task.progress = (task.progress or 0) + 1
+                elif job.attempts >= max_attempts:
+                    job.status = 'failed'
+                    job.last_error = error
+                    task.progress = (task.progress or 0) + 1
+                else:
+                    job.status = 'pending'
+                    job.last_error = error
+                    job.next_attempt_at = _utcnow() + timedelta(seconds=retry_delay(job.attempts, base, cap))
+            safe_commit(db.session)
+
+        next_at = db.session.query(db.func.min(AudioJob.next_attempt_at)).filter(AudioJob.status == 'pending').scalar()
+        if next_at is not None:
+            task.message = 'Waiting to retry failed generations.'
+            safe_commit(db.session)
+            return max(1.0, (_aware(next_at) - _utcnow()).total_seconds())
+
+        if task.status == 'running':
+            failed = AudioJob.query.filter_by(status='failed').count()
+            task.status = 'completed'
+            task.message = f"Done ({task.progress} processed, {failed} failed in total)."
+            safe_commit(db.session)
+        return None
+
+    @staticmethod
+    async def _generate(semaphore: asyncio.Semaphore, job: AudioJob):
+        """Run one job through AudioService. Returns (ok, error)."""
+        request_dto = AudioRequestDTO(
+            text=job.text,
+            engine=job.engine,
+            voice=job.voice,
+            target_dir=job.target_dir,
+            custom_filename=job.filename,
+            is_manual=bool(job.force),
+            auto_voice_parsing=not job.voice,
+        )
+        async with semaphore:
+            try:
+                result = await AudioService.get_audio(request_dto)
+            except Exception as e:
+                return False, str(e)
+        if result.get('status') in ('generated', 'exists'):
+            return True, None
+        return False, result.get('error') or 'Generation failed'
+
+    @staticmethod
+    def stats() -> dict:
+        rows = db.session.query(AudioJob.status, db.func.count()).group_by(AudioJob.status).all()
+        return {status: count for status, count in rows}
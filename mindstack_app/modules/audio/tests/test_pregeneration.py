@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from flask import Flask
+
+from mindstack_app.models import AudioJob, BackgroundTask, db
+from mindstack_app.modules.audio.engines.base import AudioEngine
+from mindstack_app.modules.audio.engines.fake import FakeEngine
+from mindstack_app.modules.audio.services.audio_service import AudioService
+from mindstack_app.modules.audio.services.pregeneration_service import AudioPregenerationService
+
+
+class FlakyEngine(AudioEngine):
+    """Fails the first `failures` calls, then behaves like FakeEngine."""
+    failures = 1
+    calls = 0
+
+    async def generate(self, text, voice, full_path):
+        FlakyEngine.calls += 1
+        if FlakyEngine.calls <= FlakyEngine.failures:
+            return False
+        return await FakeEngine().generate(text, voice, full_path)
+
+
+class CountingEngine(FakeEngine):
+    """FakeEngine that records the peak number of concurrent generations."""
+    delay = 0.01
+    active = 0
+    peak = 0
+
+    async def generate(self, text, voice, full_path):
+        CountingEngine.active += 1
+        CountingEngine.peak = max(CountingEngine.peak, CountingEngine.active)
+        try:
+            return await super().generate(text, voice, full_path)
+        finally:
+            CountingEngine.active -= 1
+
+
+class TestAudioPregeneration(unittest.TestCase):
+
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config.update(
+            SQLALCHEMY_DATABASE_URI='sqlite://',
+            UPLOAD_FOLDER=self.upload_dir,
+            AUDIO_PREGEN_ENGINE='fake',
+            AUDIO_PREGEN_AUTOSTART=False,
+        )
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def test_enqueue_dedupes_and_worker_generates(self):
+        self.assertTrue(AudioPregenerationService.enqueue('xin chào', 'front_1.mp3', 'uploads/audio', item_id=1, field='front'))
+        self.assertFalse(AudioPregenerationService.enqueue('xin chào', 'front_1.mp3', 'uploads/audio', item_id=1, field='front'))
+        self.assertIsNone(AudioPregenerationService.resolve_or_enqueue('xin chào', 'front_1.mp3', 'uploads/audio', item_id=1, field='front'))
+        self.assertEqual(AudioJob.query.count(), 1)
+
+        self.assertIsNone(AudioPregenerationService.run_pending())
+
+        self.assertTrue(os.path.exists(os.path.join(self.upload_dir, 'audio', 'front_1.mp3')))
+        self.assertEqual(
+            AudioPregenerationService.resolve_or_enqueue('xin chào', 'front_1.mp3', 'uploads/audio'),
+            '/media/audio/front_1.mp3'
+        )
+        task = BackgroundTask.query.filter_by(task_name=AudioPregenerationService.TASK_NAME).one()
+        self.assertEqual((task.status, task.progress, task.total), ('completed', 1, 1))
+
+    def test_failed_generation_is_retried(self):
+        self.app.config['AUDIO_PREGEN_RETRY_BASE_SECONDS'] = 60
+        FlakyEngine.calls = 0
+        with patch.dict(AudioService._ENGINES, {'flaky': FlakyEngine}):
+            AudioPregenerationService.enqueue('hello', 'back_2.mp3', 'uploads/audio', engine='flaky')
+            wait = AudioPregenerationService.run_pending()
+            job = AudioJob.query.one()
+            self.assertEqual((job.status, job.attempts), ('pending', 1))
+            self.assertGreater(wait, 50)
+
+            # Backoff elapsed
+            job.next_attempt_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+            db.session.commit()
+            AudioPregenerationService.run_pending()
+            db.session.refresh(job)
+            self.assertEqual((job.status, job.attempts), ('done', 2))
+
+    def test_concurrency_cap(self):
+        self.app.config['AUDIO_PREGEN_CONCURRENCY'] = 2
+        CountingEngine.peak = 0
+        with patch.dict(AudioService._ENGINES, {'counting': CountingEngine}):
+            for i in range(6):
+                AudioPregenerationService.enqueue(f'word {i}', f'front_{i}.mp3', 'uploads/audio', engine='counting')
+            AudioPregenerationService.run_pending()
+        self.assertEqual(AudioJob.query.filter_by(status='done').count(), 6)
+        self.assertEqual(CountingEngine.peak, 2)
+
+    def test_enqueue_leaves_the_transaction_to_the_caller(self):
+        self.app.config['AUDIO_PREGEN_AUTOSTART'] = True
+        with patch.object(AudioPregenerationService, 'start') as start:
+            self.assertTrue(AudioPregenerationService.enqueue('tạm', 'front_1.mp3', 'uploads/audio'))
+            start.assert_not_called()
+            db.session.rollback()
+            self.assertEqual(AudioJob.query.count(), 0)
+
+            AudioPregenerationService.enqueue('xin chào', 'front_2.mp3', 'uploads/audio')
+            AudioPregenerationService.enqueue('tạm biệt', 'front_3.mp3', 'uploads/audio')
+            db.session.commit()
+        start.assert_called_once_with(self.app)
+        self.assertEqual(AudioJob.query.count(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+from pydub import AudioSegment
+
+from mindstack_app.models import AppSettings, db
+from mindstack_app.modules.audio.engines.fake import FakeEngine
+from mindstack_app.modules.audio.services.audio_service import AudioService
+
+
+class RecordingEngine(FakeEngine):
+    """FakeEngine that records every synthesized text and the peak concurrency."""
+    delay = 0.01
+    texts = []
+    active = 0
+    peak = 0
+
+    async def generate(self, text, voice, full_path):
+        RecordingEngine.texts.append(text)
+        RecordingEngine.active += 1
+        RecordingEngine.peak = max(RecordingEngine.peak, RecordingEngine.active)
+        try:
+            return await super().generate(text, voice, full_path)
+        finally:
+            RecordingEngine.active -= 1
+
+
+def silent_segment(path, max_entries):
+    # Stands in for mp3 decoding (no ffmpeg needed)
+    return AudioSegment.silent(duration=10)
+
+
+def fake_export(segment, path, format=None):
+    with open(path, 'wb') as f:
+        f.write(b'JOINED')
+
+
+class TestConcatenatedAudio(unittest.TestCase):
+
+    def setUp(self):
+        self.upload_dir = tempfile.mkdtemp()
+        self.app = Flask(__name__)
+        self.app.config.update(
+            SQLALCHEMY_DATABASE_URI='sqlite://',
+            UPLOAD_FOLDER=self.upload_dir,
+            AUDIO_SEGMENT_CONCURRENCY=2,
+        )
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        AppSettings.set('AUDIO_VOICE_MAPPING_GLOBAL', {'vi': 'fake:vi', 'en': 'fake:en'}, data_type='json')
+        db.session.commit()
+        RecordingEngine.texts = []
+        RecordingEngine.peak = 0
+        self.engines = patch.dict(AudioService._ENGINES, {'fake': RecordingEngine})
+        self.engines.start()
+
+    def tearDown(self):
+        self.engines.stop()
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+    def _generate(self, text, name):
+        output = os.path.join(self.upload_dir, name)
+        with patch.object(AudioService, '_decoded_segment', silent_segment), \
+                patch('pydub.AudioSegment.export', fake_export):
+            ok = asyncio.run(AudioService._generate_concatenated_audio(text, output))
+        return ok, output
+
+    def test_segments_are_cached_and_synthesized_concurrently(self):
+        ok, output = self._generate('[en: apple][vi: quả táo][en: red][en: apple][vi: màu đỏ]', 'a.mp3')
+        self.assertTrue(ok)
+        self.assertTrue(os.path.exists(output))
+        # Repeated segment inside one text is synthesized once
+        self.assertEqual(sorted(RecordingEngine.texts), ['apple', 'màu đỏ', 'quả táo', 'red'])
+        self.assertEqual(RecordingEngine.peak, 2)
+
+        # Shared phrases of another card come from the segment cache
+        ok, _ = self._generate('[en: apple][vi: táo xanh]', 'b.mp3')
+        self.assertTrue(ok)
+        self.assertEqual(RecordingEngine.texts[4:], ['táo xanh'])
+
+    def test_single_segment_is_copied_from_cache(self):
+        ok, output = self._generate('[vi: xin chào]', 'c.mp3')
+        self.assertTrue(ok)
+        with open(output, 'rb') as f:
+            self.assertEqual(f.read(), 'FAKE-MP3|vi|xin chào'.encode('utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+# File: mindstack_app/modules/backup/config.py
+
+class BackupModuleDefaultConfig:
+    # Online snapshot of the SQLite database (sqlite3 backup API)
+    BACKUP_SNAPSHOT_PAGES = 1024  # pages copied per step; writers can commit between steps
+    BACKUP_SNAPSHOT_SLEEP_SECONDS = 0.005
+    # Writes during the copy restart it; after this many restarts finish in one step
+    BACKUP_SNAPSHOT_MAX_RESTARTS = 20
+
+    # Dataset export: rows read per query (keyset pagination on the primary key)
+    BACKUP_EXPORT_CHUNK_SIZE = 1000
+
+    # Incremental media backup (MediaBackupService): content-addressed store of the uploads folder
+    BACKUP_MEDIA_STORE_FOLDER = None  # default: <BACKUP_FOLDER>/media_store
+    # Already-compressed formats: kept as-is in the store, ZIP_STORED in full backup archives
+    BACKUP_MEDIA_PRECOMPRESSED_EXTENSIONS = {
+        '.mp3', '.m4a', '.aac', '.ogg', '.opus', '.flac',
+        '.jpg', '.jpeg', '.png', '.gif', '.webp',
+        '.mp4', '.webm', '.mov', '.mkv', '.avi',
+        '.zip', '.rar', '.7z', '.gz', '.pdf', '.docx', '.pptx', '.xlsx',
+    }
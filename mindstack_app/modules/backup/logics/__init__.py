@@ -0,0 +1 @@
+"""Backup Logic - Pure functions."""
@@ -0,0 +1,94 @@
+# File: mindstack_app/modules/backup/logics/media_manifest.py
+"""
+Pure helpers of the incremental media backup (no DB, no Flask).
+
+A media snapshot is a list of entries ``{'path', 'size', 'mtime_ns', 'sha256'}``;
+file contents live once in a content-addressed store, keyed by sha256.
+"""
+
+import posixpath
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def is_precompressed(path: str, extensions: Iterable[str]) -> bool:
+    """
+    True for formats that are already compressed (stored as-is, not deflated again).
+
+    >>> exts = {'.mp3', '.jpg', '.png'}
+    >>> [is_precompressed(p, exts) for p in ('audio/a.MP3', 'img/b.jpg', 'notes/c.txt', 'no_ext')]
+    [True, True, False, False]
+    """
+    return posixpath.splitext(path)[1].lower() in extensions
+
+
+def normalize_media_path(path: str) -> Optional[str]:
+    """
+    POSIX relative path of a file inside the uploads folder, or None if it
+    would escape it (restoring never writes outside the target folder).
+
+    >>> normalize_media_path('audio\\\\flashcard\\\\1.mp3')
+    'audio/flashcard/1.mp3'
+    >>> [normalize_media_path(p) for p in ('../etc/passwd', '/abs/x.png', 'a/../../x', '')]
+    [None, None, None, None]
+    """
+    if not path:
+        return None
+    path = path.replace('\\', '/')
+    if path.startswith('/'):
+        return None
+    normalized = posixpath.normpath(path)
+    if normalized in ('.', '..') or normalized.startswith('../'):
+        return None
+    return normalized
+
+
+def blob_relpath(digest: str, compressed: bool) -> str:
+    """
+    Location of a blob inside the store (fanned out by the first two hex digits).
+
+    >>> blob_relpath('ab12cd', False), blob_relpath('ab12cd', True)
+    ('objects/ab/ab12cd', 'objects/ab/ab12cd.gz')
+    """
+    return f"objects/{digest[:2]}/{digest}" + ('.gz' if compressed else '')
+
+
+def reusable_digest(previous: Optional[Dict], size: int, mtime_ns: int) -> Optional[str]:
+    """
+    Digest of the previous snapshot if the file looks unchanged (same size and
+    mtime), so only new or modified files are read and hashed.
+
+    >>> prev = {'path': 'a.mp3', 'size': 10, 'mtime_ns': 5, 'sha256': 'ff'}
+    >>> reusable_digest(prev, 10, 5), reusable_digest(prev, 11, 5), reusable_digest(prev, 10, 6), reusable_digest(None, 10, 5)
+    ('ff', None, None, None)
+    """
+    if previous and previous.get('size') == size and previous.get('mtime_ns') == mtime_ns:
+        return previous.get('sha256')
+    return None
+
+
+def diff_snapshots(old_entries: Iterable[Dict], new_entries: Iterable[Dict]) -> Dict[str, List[str]]:
+    """
+    Paths added, changed (different content) and removed between two snapshots.
+
+    >>> old = [{'path': 'a', 'sha256': '1'}, {'path': 'b', 'sha256': '2'}, {'path': 'c', 'sha256': '3'}]
+    >>> new = [{'path': 'a', 'sha256': '1'}, {'path': 'b', 'sha256': '9'}, {'path': 'd', 'sha256': '4'}]
+    >>> diff_snapshots(old, new)
+    {'added': ['d'], 'changed': ['b'], 'removed': ['c']}
+    """
+    old = {entry['path']: entry['sha256'] for entry in old_entries}
+    new = {entry['path']: entry['sha256'] for entry in new_entries}
+    return {
+        'added': sorted(path for path in new if path not in old),
+        'changed': sorted(path for path, digest in new.items() if path in old and old[path] != digest),
+        'removed': sorted(path for path in old if path not in new),
+    }
+
+
+def referenced_digests(snapshots: Iterable[Iterable[Dict]]) -> Set[str]:
+    """
+    Every digest still needed by the kept snapshots (the rest can be garbage-collected).
+
+    >>> sorted(referenced_digests([[{'sha256': 'a'}, {'sha256': 'b'}], [{'sha256': 'b'}, {'sha256': 'c'}]]))
+    ['a', 'b', 'c']
+    """
+    return {entry['sha256'] for entries in snapshots for entry in entries}
@@ -1,6 +1,5 @@
 import os
 import zipfile
-import json
 from datetime import datetime
 from flask import render_template, redirect, url_for, flash, request, send_file, current_app
 from werkzeug.utils import safe_join
@@ -8,9 +7,10 @@ from .. import blueprint
 from ..services.backup_service import (
     DATASET_CATALOG,
     get_backup_folder,
-    resolve_database_path,
-    collect_dataset_payload,
-    write_dataset_to_zip,
+    create_database_backup_archive,
+    create_full_backup_archive,
+    stream_dataset_to_zip,
+    read_backup_manifest,
     restore_from_uploaded_bytes
 )
 
@@ -52,6 +52,10 @@ def sys_backup_view():
                     try:
                         with zipfile.ZipFile(file_path, 'r') as zf:
                             has_uploads = any(info.filename.startswith('uploads/') for info in zf.infolist())
+                            if not has_uploads:
+                                # Incremental backups keep uploads in the media store
+                                manifest, _ = read_backup_manifest(zf)
+                                has_uploads = isinstance(manifest, dict) and bool(manifest.get('media_snapshot'))
                     except Exception:
                         pass
 
@@ -92,18 +96,7 @@ def create_database_backup():
         backup_filename = f'mindstack_database_backup_{timestamp}.zip'
         backup_path = os.path.join(backup_folder, backup_filename)
 
-        db_path = resolve_database_path()
-        if not os.path.exists(db_path):
-            raise FileNotFoundError('Không tìm thấy file cơ sở dữ liệu để sao lưu.')
-
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            zipf.write(db_path, os.path.basename(db_path))
-            manifest = {
-                'type': 'database',
-                'generated_at': datetime.utcnow().isoformat() + 'Z',
-                'database_file': os.path.basename(db_path),
-            }
-            zipf.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+        create_database_backup_archive(backup_path)
 
         flash('Đã sao lưu cơ sở dữ liệu thành công!', 'success')
     except Exception as exc:
@@ -121,37 +114,7 @@ def download_full_backup():
         backup_filename = f'mindstack_full_backup_{timestamp}.zip'
         backup_path = os.path.join(backup_folder, backup_filename)
 
-        db_path = resolve_database_path()
-        if not os.path.exists(db_path):
-            raise FileNotFoundError('Không tìm thấy file cơ sở dữ liệu.')
-
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            zipf.write(db_path, os.path.basename(db_path))
-            
-            uploads_folder = os.path.join(current_app.root_path, 'static', 'uploads')
-            if os.path.exists(uploads_folder):
-                for root, dirs, files in os.walk(uploads_folder):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.join('uploads', os.path.relpath(file_path, uploads_folder))
-                        zipf.write(file_path, arcname)
-
-            # Add datasets for selective restore (Universal Format)
-            for dataset_key in DATASET_CATALOG.keys():
-                try:
-                    payload = collect_dataset_payload(dataset_key)
-                    write_dataset_to_zip(zipf, dataset_key, payload, folder_prefix='datasets')
-                except Exception as e:
-                    current_app.logger.error(f"Failed to include dataset {dataset_key} in full backup: {e}")
-
-            manifest = {
-                'type': 'full',
-                'generated_at': datetime.utcnow().isoformat() + 'Z',
-                'database_file': os.path.basename(db_path),
-                'includes_uploads': True,
-                'is_universal': True
-            }
-            zipf.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+        create_full_backup_archive(backup_path)
 
         return send_file(backup_path, as_attachment=True, download_name=backup_filename)
 
@@ -199,14 +162,13 @@ def _build_dataset_export_response(dataset_key):
     config = DATASET_CATALOG[dataset_key]
 
     try:
-        payload = collect_dataset_payload(dataset_key)
         backup_folder = get_backup_folder()
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f'mindstack_{dataset_key}_dataset_{timestamp}.zip'
         file_path = os.path.join(backup_folder, filename)
 
         with zipfile.ZipFile(file_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            write_dataset_to_zip(zipf, dataset_key, payload)
+            stream_dataset_to_zip(zipf, dataset_key)
 
         flash(
             f"Đã xuất dữ liệu '{config['label']}' và lưu thành công dưới tên file {filename}.",
@@ -1,20 +1,16 @@
 # File: mindstack_app/modules/backup/services/auto_backup_service.py
 import os
-import json
 import zipfile
 import logging
-import shutil
 from datetime import datetime, timedelta
-from flask import current_app
 from mindstack_app.core.extensions import scheduler, db
 from mindstack_app.services.config_service import get_runtime_config
 from .backup_service import (
     get_backup_folder,
-    resolve_database_path,
-    DATASET_CATALOG,
-    collect_dataset_payload,
-    write_dataset_to_zip
+    create_full_backup_archive,
+    read_backup_manifest
 )
+from .media_backup_service import MediaBackupService
 
 logger = logging.getLogger(__name__)
 
@@ -50,41 +46,13 @@ class AutoBackupService:
         backup_filename = f'mindstack_auto_backup_{timestamp}.zip'
         backup_path = os.path.join(backup_folder, backup_filename)
 
-        db_path = resolve_database_path()
-        if not os.path.exists(db_path):
-            raise FileNotFoundError('Database file not found.')
+        # Uploads go to the incremental media store; the archive only references the snapshot
+        media = MediaBackupService.create_snapshot()
 
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # 1. Database
-            zipf.write(db_path, os.path.basename(db_path))
-            
-            # 2. Uploads
-            uploads_folder = os.path.join(current_app.root_path, 'static', 'uploads')
-            if os.path.exists(uploads_folder):
-                for root, dirs, files in os.walk(uploads_folder):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.join('uploads', os.path.relpath(file_path, uploads_folder))
-                        zipf.write(file_path, arcname)
-
-            # 3. Datasets (Universal Format)
-            for dataset_key in DATASET_CATALOG.keys():
-                try:
-                    payload = collect_dataset_payload(dataset_key)
-                    write_dataset_to_zip(zipf, dataset_key, payload, folder_prefix='datasets')
-                except Exception as e:
-                    logger.error(f"Failed to include dataset {dataset_key} in auto backup: {e}")
-
-            # 4. Manifest
-            manifest = {
-                'type': 'full',
-                'is_auto': True,
-                'is_universal': True,
-                'generated_at': datetime.utcnow().isoformat() + 'Z',
-                'database_file': os.path.basename(db_path),
-                'includes_uploads': True
-            }
-            zipf.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+        # DB snapshot through the SQLite backup API (consistent while the app keeps writing)
+        create_full_backup_archive(
+            backup_path, include_uploads=False, is_auto=True, media_snapshot=media['snapshot']
+        )
 
     @staticmethod
     def _cleanup_old_backups():
@@ -108,6 +76,20 @@ class AutoBackupService:
                 except Exception as e:
                     logger.error(f"Failed to delete old backup {filename}: {e}")
 
+        # Media snapshots still referenced by a kept archive stay restorable
+        referenced = []
+        for filename in os.listdir(backup_folder):
+            if not filename.endswith('.zip'):
+                continue
+            try:
+                with zipfile.ZipFile(os.path.join(backup_folder, filename)) as zipf:
+                    manifest, _ = read_backup_manifest(zipf)
+            except (OSError, zipfile.BadZipFile):
+                continue
+            if isinstance(manifest, dict) and manifest.get('media_snapshot'):
+                referenced.append(manifest['media_snapshot'])
+        MediaBackupService.prune(retention_days, keep_snapshots=referenced)
+
     @staticmethod
     def init_scheduler(app):
         """
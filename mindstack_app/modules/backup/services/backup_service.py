@@ -4,13 +4,16 @@ import io
 import csv
 import json
 import shutil
+import sqlite3
 import zipfile
 import tempfile
 from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime, date, time
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterator
 
 from flask import current_app
+from sqlalchemy import select, tuple_
 from sqlalchemy.sql.sqltypes import DateTime, Date, Time
 
 from mindstack_app.models import (
@@ -34,6 +37,9 @@ from mindstack_app.modules.fsrs.interface import FSRSInterface
 ItemMemoryStateModel = FSRSInterface.get_all_memory_states_query().column_descriptions[0]['entity']
 from mindstack_app.core.config import Config
 from mindstack_app.services.config_service import get_runtime_config
+from ..config import BackupModuleDefaultConfig
+from ..logics.media_manifest import is_precompressed
+from .media_backup_service import MediaBackupService, get_uploads_folder
 
 DATASET_CATALOG: "OrderedDict[str, dict[str, object]]" = OrderedDict(
     {
@@ -137,18 +143,18 @@ def get_backup_folder():
     os.makedirs(backup_folder, exist_ok=True)
     return backup_folder
 
+def _backup_setting(key):
+    return current_app.config.get(key, getattr(BackupModuleDefaultConfig, key))
+
+def _serialize_value(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
 def serialize_instance(instance):
     data: dict[str, object] = {}
     for column in instance.__table__.columns:
-        value = getattr(instance, column.name)
-        if isinstance(value, datetime):
-            data[column.name] = value.isoformat()
-        elif isinstance(value, date):
-            data[column.name] = value.isoformat()
-        elif isinstance(value, time):
-            data[column.name] = value.isoformat()
-        else:
-            data[column.name] = value
+        data[column.name] = _serialize_value(getattr(instance, column.name))
     return data
 
 def coerce_column_value(column, value):
@@ -169,16 +175,203 @@ def coerce_column_value(column, value):
         return value
     return value
 
-def collect_dataset_payload(dataset_key):
+class _SnapshotRestartLimit(Exception):
+    pass
+
+def snapshot_database(dest_path, pages=None, sleep=None):
+    """
+    Chụp bản sao nhất quán của DB SQLite đang chạy vào `dest_path` bằng
+    sqlite3 backup API, `pages` trang mỗi bước: giữa các bước app vẫn ghi được.
+    Nếu DB bị ghi trong lúc chép, SQLite chép lại từ đầu; quá
+    BACKUP_SNAPSHOT_MAX_RESTARTS lần thì chép nốt trong một bước.
+    """
+    db_path = resolve_database_path()
+    if not os.path.exists(db_path):
+        raise FileNotFoundError('Không tìm thấy file cơ sở dữ liệu để sao lưu.')
+    pages = pages or int(_backup_setting('BACKUP_SNAPSHOT_PAGES'))
+    sleep = _backup_setting('BACKUP_SNAPSHOT_SLEEP_SECONDS') if sleep is None else sleep
+    max_restarts = int(_backup_setting('BACKUP_SNAPSHOT_MAX_RESTARTS'))
+    state = {'remaining': None, 'restarts': 0}
+
+    def progress(status, remaining, total):
+        if state['remaining'] is not None and remaining > state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > max_restarts:
+                raise _SnapshotRestartLimit()
+        state['remaining'] = remaining
+
+    source = sqlite3.connect(db_path, timeout=30)
+    target = sqlite3.connect(dest_path)
+    try:
+        try:
+            source.backup(target, pages=pages, progress=progress, sleep=sleep)
+        except _SnapshotRestartLimit:
+            current_app.logger.warning(
+                f"[Backup] Snapshot restarted {state['restarts']} times, copying the rest in one step"
+            )
+            source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+@contextmanager
+def database_snapshot() -> Iterator[str]:
+    """Snapshot tạm (trong BACKUP_FOLDER, không phải /tmp) - xóa khi ra khỏi khối with."""
+    fd, snapshot_path = tempfile.mkstemp(prefix='.mindstack_', suffix='.snapshot', dir=get_backup_folder())
+    os.close(fd)
+    try:
+        snapshot_database(snapshot_path)
+        yield snapshot_path
+    finally:
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+
+def write_database_snapshot_to_zip(zipf):
+    """Ghi snapshot DB vào zip dưới tên file DB gốc (restore vẫn tìm theo basename). Trả về tên đó."""
+    database_file = os.path.basename(resolve_database_path())
+    with database_snapshot() as snapshot_path:
+        zipf.write(snapshot_path, database_file)
+    return database_file
+
+def write_uploads_to_zip(zipf, uploads_folder):
+    if not os.path.exists(uploads_folder):
+        return
+    # mp3/jpg/... are already compressed: deflating them again only costs CPU
+    extensions = set(_backup_setting('BACKUP_MEDIA_PRECOMPRESSED_EXTENSIONS'))
+    for root, dirs, files in os.walk(uploads_folder):
+        for file in files:
+            file_path = os.path.join(root, file)
+            arcname = os.path.join('uploads', os.path.relpath(file_path, uploads_folder))
+            compress_type = zipfile.ZIP_STORED if is_precompressed(file, extensions) else None
+            zipf.write(file_path, arcname, compress_type=compress_type)
+
+def iter_table_records(model, chunk_size=None):
+    """
+    Các dòng (đã serialize) của bảng theo thứ tự khóa chính. Đọc từng trang
+    `chunk_size` dòng (keyset pagination), mỗi trang một truy vấn ngắn, nên
+    không giữ cả bảng trong bộ nhớ cũng như không giữ khóa đọc suốt quá trình xuất.
+    """
+    table = model.__table__
+    primary_key = list(table.primary_key.columns)
+    columns = list(table.columns)
+    chunk_size = chunk_size or int(_backup_setting('BACKUP_EXPORT_CHUNK_SIZE'))
+    last_key = None
+    while True:
+        stmt = select(table).order_by(*primary_key).limit(chunk_size)
+        if last_key is not None:
+            if len(primary_key) == 1:
+                stmt = stmt.where(primary_key[0] > last_key[0])
+            else:
+                stmt = stmt.where(tuple_(*primary_key) > tuple_(*last_key))
+        with db.engine.connect() as conn:
+            rows = conn.execute(stmt).all()
+        for row in rows:
+            mapping = row._mapping
+            yield {column.name: _serialize_value(mapping[column]) for column in columns}
+        if len(rows) < chunk_size:
+            return
+        last_key = [rows[-1]._mapping[column] for column in primary_key]
+
+def _dataset_models(dataset_key):
     config = DATASET_CATALOG.get(dataset_key)
     if not config:
         raise KeyError('Dataset không tồn tại.')
-    payload: dict[str, list[dict[str, object]]] = {}
+    models = OrderedDict()
     for model in config['models']:
-        rows = model.query.order_by(*model.__table__.primary_key.columns).all()
-        payload[model.__tablename__] = [serialize_instance(row) for row in rows]
+        models.setdefault(model.__tablename__, model)
+    return list(models.values())
+
+def collect_dataset_payload(dataset_key):
+    payload: dict[str, list[dict[str, object]]] = {}
+    for model in _dataset_models(dataset_key):
+        payload[model.__tablename__] = list(iter_table_records(model))
     return payload
 
+def _indented_json(record):
+    # Same layout as json.dumps(records, indent=2) for a record inside the list
+    return '  ' + json.dumps(record, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+
+def _stream_table_to_zip(zipf, member_base, model, chunk_size=None):
+    fieldnames = [column.name for column in model.__table__.columns]
+    count = 0
+    with tempfile.TemporaryFile(mode='w+', encoding='utf-8', newline='', dir=get_backup_folder()) as csv_buffer:
+        writer = csv.DictWriter(csv_buffer, fieldnames=fieldnames)
+        with io.TextIOWrapper(zipf.open(f'{member_base}.json', 'w', force_zip64=True), encoding='utf-8') as out:
+            out.write('[')
+            for record in iter_table_records(model, chunk_size):
+                if count == 0:
+                    writer.writeheader()
+                out.write('\n' if count == 0 else ',\n')
+                out.write(_indented_json(record))
+                writer.writerow(record)
+                count += 1
+            out.write('\n]' if count else ']')
+        # Only one zip member can be open for writing: the CSV is spooled to disk meanwhile
+        if count:
+            csv_buffer.seek(0)
+            with io.TextIOWrapper(zipf.open(f'{member_base}.csv', 'w', force_zip64=True),
+                                  encoding='utf-8', newline='') as out:
+                shutil.copyfileobj(csv_buffer, out)
+    return count
+
+def stream_dataset_to_zip(zipf, dataset_key, folder_prefix=None, chunk_size=None):
+    """
+    Như `write_dataset_to_zip(zipf, dataset_key, collect_dataset_payload(dataset_key))`
+    (cùng tên file, cùng định dạng JSON/CSV) nhưng ghi thẳng vào zip từng bảng,
+    từng trang dòng, bộ nhớ không phụ thuộc kích thước bảng. Trả về số dòng mỗi bảng.
+    """
+    models = _dataset_models(dataset_key)
+    base_path = f"{folder_prefix}/" if folder_prefix else ""
+    manifest = {
+        'type': 'dataset',
+        'dataset': dataset_key,
+        'generated_at': datetime.utcnow().isoformat() + 'Z',
+        'tables': [model.__tablename__ for model in models],
+    }
+    zipf.writestr(f'{base_path}{dataset_key}/manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+    counts: dict[str, int] = {}
+    for model in models:
+        table_name = model.__tablename__
+        counts[table_name] = _stream_table_to_zip(zipf, f'{base_path}{dataset_key}/{table_name}', model, chunk_size)
+    return counts
+
+def create_database_backup_archive(backup_path):
+    with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        database_file = write_database_snapshot_to_zip(zipf)
+        manifest = {
+            'type': 'database',
+            'generated_at': datetime.utcnow().isoformat() + 'Z',
+            'database_file': database_file,
+        }
+        zipf.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+
+def create_full_backup_archive(backup_path, include_uploads=True, **manifest_extra):
+    """
+    Gói sao lưu toàn bộ: snapshot DB, thư mục uploads và mọi dataset (Universal
+    Format, để khôi phục chọn lọc). `manifest_extra` được thêm vào manifest.
+    Không có uploads (`include_uploads=False`) khi media nằm trong media store
+    (manifest ghi `media_snapshot`).
+    """
+    with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        database_file = write_database_snapshot_to_zip(zipf)
+        if include_uploads:
+            write_uploads_to_zip(zipf, get_uploads_folder())
+        for dataset_key in DATASET_CATALOG.keys():
+            try:
+                stream_dataset_to_zip(zipf, dataset_key, folder_prefix='datasets')
+            except Exception as e:
+                current_app.logger.error(f"Failed to include dataset {dataset_key} in full backup: {e}")
+
+        manifest = {
+            'type': 'full',
+            'generated_at': datetime.utcnow().isoformat() + 'Z',
+            'database_file': database_file,
+            'includes_uploads': include_uploads,
+            'is_universal': True,
+        }
+        manifest.update(manifest_extra)
+        zipf.writestr('manifest.json', json.dumps(manifest, ensure_ascii=False, indent=2))
+
 def write_dataset_to_zip(zipf, dataset_key, payload, folder_prefix=None):
     base_path = f"{folder_prefix}/" if folder_prefix else ""
     manifest = {
@@ -288,7 +481,7 @@ def restore_backup_from_zip(zipf, restore_database=True, restore_uploads=True):
             os.makedirs(os.path.dirname(db_path), exist_ok=True)
             shutil.copy2(extracted_db_path, db_path)
         if restore_uploads:
-            uploads_folder = Config.UPLOAD_FOLDER
+            uploads_folder = get_uploads_folder()
             if uploads_folder and any(member.startswith('uploads/') for member in members):
                 zipf.extractall(temp_dir)
                 source_uploads = os.path.join(temp_dir, 'uploads')
@@ -339,6 +532,14 @@ def restore_from_uploaded_bytes(raw_bytes, dataset_hint=None) -> Dict[str, objec
                 if manifest_type == 'full' and not explicit_dataset_key:
                     includes_uploads = bool(manifest_data.get('includes_uploads', False))
                     restore_backup_from_zip(zipf, restore_database=True, restore_uploads=includes_uploads)
+                    media_snapshot = manifest_data.get('media_snapshot')
+                    if media_snapshot and not includes_uploads:
+                        # Incremental backup: uploads are rebuilt from the media store
+                        if media_snapshot not in MediaBackupService.list_snapshots():
+                            return {'success': True, 'message': f'Đã khôi phục cơ sở dữ liệu. Không tìm thấy snapshot media {media_snapshot} trên máy chủ nên uploads được giữ nguyên.'}
+                        result = MediaBackupService.restore_snapshot(media_snapshot)
+                        if result['missing']:
+                            return {'success': True, 'message': f"Đã khôi phục toàn bộ hệ thống, thiếu {len(result['missing'])} file media trong media store."}
                     return {'success': True, 'message': 'Đã khôi phục toàn bộ hệ thống (Full Backup).'}
                 
                 # Case 2: Database only restore
@@ -0,0 +1,309 @@
+# File: mindstack_app/modules/backup/services/media_backup_service.py
+"""
+Incremental, content-addressed backup of the uploads folder (audio and images
+generated by AudioService / ImageService, user uploads).
+
+Store layout (``BACKUP_MEDIA_STORE_FOLDER``, default ``<BACKUP_FOLDER>/media_store``)::
+
+    objects/ab/ab12...        blob of an already-compressed file (mp3, jpg...), as-is
+    objects/cd/cd34....gz     blob of any other file, gzip-compressed
+    snapshots/media_<ts>.json one manifest per backup: path, size, mtime_ns, sha256
+
+A snapshot only reads and hashes the files whose size or mtime differ from the
+previous snapshot and only writes blobs that are not in the store yet, so its
+cost follows what changed, not the size of the library. Any snapshot can be
+restored on its own (manifest + blobs).
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from flask import current_app
+
+from mindstack_app.core.config import Config
+from mindstack_app.services.config_service import get_runtime_config
+from ..config import BackupModuleDefaultConfig
+from ..logics.media_manifest import (
+    blob_relpath,
+    diff_snapshots,
+    is_precompressed,
+    normalize_media_path,
+    referenced_digests,
+    reusable_digest,
+)
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = 'media_'
+_COPY_BUFFER = 1024 * 1024
+
+
+def get_uploads_folder():
+    return get_runtime_config('UPLOAD_FOLDER', Config.UPLOAD_FOLDER)
+
+
+class MediaBackupService:
+    """Snapshots, restore and garbage collection of the media store."""
+
+    _lock = threading.Lock()  # one snapshot / restore / prune at a time
+
+    @staticmethod
+    def _setting(key):
+        return current_app.config.get(key, getattr(BackupModuleDefaultConfig, key))
+
+    @classmethod
+    def get_store_folder(cls):
+        store = cls._setting('BACKUP_MEDIA_STORE_FOLDER') or os.path.join(Config.BACKUP_FOLDER, 'media_store')
+        os.makedirs(os.path.join(store, 'objects'), exist_ok=True)
+        os.makedirs(os.path.join(store, 'snapshots'), exist_ok=True)
+        return store
+
+    # ------------------------------------------------------------------ #
+    # Snapshots
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def list_snapshots(cls) -> List[str]:
+        """Snapshot names, oldest first."""
+        folder = os.path.join(cls.get_store_folder(), 'snapshots')
+        names = [
+            filename[:-len('.json')] for filename in os.listdir(folder)
+            if filename.startswith(SNAPSHOT_PREFIX) and filename.endswith('.json')
+        ]
+        return sorted(names)
+
+    @classmethod
+    def load_snapshot(cls, name: str) -> Dict:
+        if not name or os.path.basename(name) != name:
+            raise ValueError('Tên snapshot không hợp lệ.')
+        path = os.path.join(cls.get_store_folder(), 'snapshots', f'{name}.json')
+        if not os.path.exists(path):
+            raise FileNotFoundError(f'Không tìm thấy snapshot media {name}.')
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    @classmethod
+    def _find_blob(cls, store: str, digest: str) -> Optional[str]:
+        for compressed in (False, True):
+            path = os.path.join(store, blob_relpath(digest, compressed))
+            if os.path.exists(path):
+                return path
+        return None
+
+    @classmethod
+    def _ingest(cls, store: str, file_path: str, compress: bool):
+        """Hash a file while copying it into the store (one read). Returns (digest, size, new_blob_bytes)."""
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(prefix='.ingest_', dir=os.path.join(store, 'objects'))
+        try:
+            with open(file_path, 'rb') as src, os.fdopen(fd, 'wb') as raw:
+                out = gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) if compress else raw
+                for chunk in iter(lambda: src.read(_COPY_BUFFER), b''):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+                if compress:
+                    out.close()
+            digest = digest.hexdigest()
+            if cls._find_blob(store, digest):
+                return digest, size, 0
+            blob_path = os.path.join(store, blob_relpath(digest, compress))
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            os.replace(tmp_path, blob_path)
+            return digest, size, os.path.getsize(blob_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def create_snapshot(cls, uploads_folder: Optional[str] = None, rehash: bool = False) -> Dict:
+        """
+        Record the current uploads folder as a new snapshot.
+
+        Files with the same size and mtime as in the latest snapshot reuse its
+        digest (`rehash=True` reads everything again). Returns a summary:
+        snapshot name, file count, added/changed/removed counts, new blobs.
+        """
+        uploads_folder = uploads_folder or get_uploads_folder()
+        extensions = set(cls._setting('BACKUP_MEDIA_PRECOMPRESSED_EXTENSIONS'))
+
+        with cls._lock:
+            store = cls.get_store_folder()
+            previous_name = next(reversed(cls.list_snapshots()), None)
+            previous_entries = cls.load_snapshot(previous_name)['files'] if previous_name else []
+            previous = {entry['path']: entry for entry in previous_entries}
+
+            entries = []
+            new_blobs = 0
+            new_bytes = 0
+            hashed = 0
+            if os.path.isdir(uploads_folder):
+                for root, dirs, files in os.walk(uploads_folder):
+                    dirs.sort()
+                    for filename in sorted(files):
+                        file_path = os.path.join(root, filename)
+                        rel_path = os.path.relpath(file_path, uploads_folder).replace(os.sep, '/')
+                        try:
+                            stat = os.stat(file_path)
+                            digest = None if rehash else reusable_digest(previous.get(rel_path), stat.st_size, stat.st_mtime_ns)
+                            size = stat.st_size
+                            if digest is None or not cls._find_blob(store, digest):
+                                digest, size, written = cls._ingest(
+                                    store, file_path, compress=not is_precompressed(rel_path, extensions)
+                                )
+                                hashed += 1
+                                if written:
+                                    new_blobs += 1
+                                    new_bytes += written
+                        except OSError as e:
+                            # Deleted or unreadable while walking: not part of this snapshot
+                            logger.warning(f"[MediaBackup] Skipped {rel_path}: {e}")
+                            continue
+                        entries.append({'path': rel_path, 'size': size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest})
+
+            changes = diff_snapshots(previous_entries, entries)
+            name = cls._new_snapshot_name(previous_name)
+            snapshot = {
+                'snapshot': name,
+                'parent': previous_name,
+                'generated_at': datetime.utcnow().isoformat() + 'Z',
+                'files': entries,
+            }
+            fd, tmp_path = tempfile.mkstemp(prefix='.snapshot_', dir=os.path.join(store, 'snapshots'))
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp_path, os.path.join(store, 'snapshots', f'{name}.json'))
+
+        summary = {
+            'snapshot': name,
+            'files': len(entries),
+            'added': len(changes['added']),
+            'changed': len(changes['changed']),
+            'removed': len(changes['removed']),
+            'hashed': hashed,
+            'new_blobs': new_blobs,
+            'new_bytes': new_bytes,
+        }
+        logger.info(f"[MediaBackup] Snapshot {summary}")
+        return summary
+
+    @staticmethod
+    def _new_snapshot_name(previous_name: Optional[str]) -> str:
+        name = f"{SNAPSHOT_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        # Names sort chronologically; never go behind the previous one (clock changes)
+        if previous_name and name <= previous_name:
+            name = f"{previous_name}_1"
+        return name
+
+    # ------------------------------------------------------------------ #
+    # Restore
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def restore_snapshot(cls, name: str, target_folder: Optional[str] = None, clean: bool = True) -> Dict:
+        """
+        Rebuild the uploads folder as it was at snapshot `name`. Files that
+        already match (size + mtime) are left alone; with `clean`, files that
+        are not in the snapshot are removed.
+        """
+        target_folder = target_folder or get_uploads_folder()
+        with cls._lock:
+            store = cls.get_store_folder()
+            entries = cls.load_snapshot(name)['files']
+            wanted = set()
+            restored = 0
+            missing = []
+            for entry in entries:
+                rel_path = normalize_media_path(entry['path'])
+                if rel_path is None:
+                    missing.append(entry['path'])
+                    continue
+                wanted.add(rel_path)
+                dest = os.path.join(target_folder, *rel_path.split('/'))
+                try:
+                    stat = os.stat(dest)
+                    if stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+                        continue
+                except OSError:
+                    pass
+                blob = cls._find_blob(store, entry['sha256'])
+                if not blob:
+                    missing.append(rel_path)
+                    continue
+                cls._extract_blob(blob, dest)
+                os.utime(dest, ns=(entry['mtime_ns'], entry['mtime_ns']))
+                restored += 1
+
+            removed = 0
+            if clean and os.path.isdir(target_folder):
+                for root, dirs, files in os.walk(target_folder):
+                    for filename in files:
+                        file_path = os.path.join(root, filename)
+                        rel_path = os.path.relpath(file_path, target_folder).replace(os.sep, '/')
+                        if rel_path not in wanted:
+                            os.remove(file_path)
+                            removed += 1
+
+        if missing:
+            logger.error(f"[MediaBackup] {len(missing)} files of {name} could not be restored (missing blobs)")
+        return {'snapshot': name, 'files': len(entries), 'restored': restored, 'removed': removed, 'missing': missing}
+
+    @staticmethod
+    def _extract_blob(blob_path: str, dest: str) -> None:
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.restore_', dir=os.path.dirname(dest))
+        try:
+            opener = gzip.open if blob_path.endswith('.gz') else open
+            with opener(blob_path, 'rb') as src, os.fdopen(fd, 'wb') as out:
+                shutil.copyfileobj(src, out, _COPY_BUFFER)
+            os.replace(tmp_path, dest)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    # ------------------------------------------------------------------ #
+    # Retention
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def prune(cls, retention_days: int, keep_snapshots: Optional[List[str]] = None) -> Dict:
+        """
+        Delete snapshots older than `retention_days` (the latest one and
+        `keep_snapshots` are always kept), then blobs no kept snapshot uses.
+        """
+        threshold = datetime.now() - timedelta(days=retention_days)
+        keep = set(keep_snapshots or [])
+        with cls._lock:
+            store = cls.get_store_folder()
+            names = cls.list_snapshots()
+            deleted = 0
+            for name in names[:-1]:
+                path = os.path.join(store, 'snapshots', f'{name}.json')
+                if name in keep or datetime.fromtimestamp(os.path.getmtime(path)) >= threshold:
+                    continue
+                os.remove(path)
+                deleted += 1
+
+            needed = referenced_digests(cls.load_snapshot(name)['files'] for name in cls.list_snapshots())
+            freed = 0
+            objects = os.path.join(store, 'objects')
+            for root, dirs, files in os.walk(objects):
+                for filename in files:
+                    digest = filename[:-len('.gz')] if filename.endswith('.gz') else filename
+                    if digest in needed or filename.startswith('.'):
+                        continue
+                    file_path = os.path.join(root, filename)
+                    freed += os.path.getsize(file_path)
+                    os.remove(file_path)
+
+        logger.info(f"[MediaBackup] Pruned {deleted} snapshots, freed {freed} bytes")
+        return {'deleted_snapshots': deleted, 'freed_bytes': freed}
@@ -0,0 +1,89 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from flask import Flask
+
+from mindstack_app.modules.backup.services.media_backup_service import MediaBackupService
+
+
+class TestIncrementalMediaBackup(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.uploads = os.path.join(self.root, 'uploads')
+        self.store = os.path.join(self.root, 'store')
+        self.app = Flask(__name__)
+        self.app.config.update(UPLOAD_FOLDER=self.uploads, BACKUP_MEDIA_STORE_FOLDER=self.store)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.write('audio/1.mp3', b'ID3' + b'\x00' * 100)
+        self.write('audio/2.mp3', b'ID3' + b'\x01' * 100)
+        self.write('notes/readme.txt', b'hello ' * 50)
+
+    def tearDown(self):
+        self.ctx.pop()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def write(self, rel_path, data):
+        path = os.path.join(self.uploads, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def read(self, rel_path):
+        with open(os.path.join(self.uploads, rel_path), 'rb') as f:
+            return f.read()
+
+    def blobs(self):
+        return sorted(
+            filename for _, _, files in os.walk(os.path.join(self.store, 'objects')) for filename in files
+        )
+
+    def test_second_snapshot_only_stores_changes(self):
+        first = MediaBackupService.create_snapshot()
+        self.assertEqual((first['files'], first['added'], first['new_blobs']), (3, 3, 3))
+        # mp3 kept as-is, text gzip-compressed
+        self.assertEqual(sum(name.endswith('.gz') for name in self.blobs()), 1)
+
+        second = MediaBackupService.create_snapshot()
+        self.assertEqual((second['hashed'], second['new_blobs']), (0, 0))
+
+        self.write('audio/2.mp3', b'ID3' + b'\x02' * 100)
+        self.write('audio/3.mp3', b'ID3' + b'\x00' * 100)  # same content as 1.mp3
+        os.remove(os.path.join(self.uploads, 'notes/readme.txt'))
+        third = MediaBackupService.create_snapshot()
+        self.assertEqual((third['added'], third['changed'], third['removed']), (1, 1, 1))
+        self.assertEqual((third['hashed'], third['new_blobs']), (2, 1))
+
+    def test_restore_any_point_in_time(self):
+        first = MediaBackupService.create_snapshot()['snapshot']
+        self.write('audio/2.mp3', b'changed')
+        self.write('images/new.png', b'PNG')
+        MediaBackupService.create_snapshot()
+
+        result = MediaBackupService.restore_snapshot(first)
+        self.assertEqual((result['restored'], result['removed'], result['missing']), (1, 1, []))
+        self.assertEqual(self.read('audio/2.mp3'), b'ID3' + b'\x01' * 100)
+        self.assertEqual(self.read('notes/readme.txt'), b'hello ' * 50)
+        self.assertFalse(os.path.exists(os.path.join(self.uploads, 'images/new.png')))
+
+        # Everything restored is already in the store
+        self.assertEqual(MediaBackupService.create_snapshot()['new_blobs'], 0)
+
+    def test_prune_removes_unreferenced_blobs(self):
+        first = MediaBackupService.create_snapshot()['snapshot']
+        self.write('audio/2.mp3', b'changed')
+        latest = MediaBackupService.create_snapshot()['snapshot']
+
+        MediaBackupService.prune(retention_days=0)
+        self.assertEqual(MediaBackupService.list_snapshots(), [latest])
+        self.assertEqual(len(self.blobs()), 3)
+
+        with self.assertRaises(FileNotFoundError):
+            MediaBackupService.restore_snapshot(first)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,10 @@
 import json
 import logging
-import time
 from datetime import datetime
-from threading import Thread
 from flask import current_app
 from sqlalchemy.orm.attributes import flag_modified
 from mindstack_app.core.extensions import db
+from mindstack_app.core.job_queue import JobQueue
 from mindstack_app.models import LearningItem, LearningContainer
 from .models import GenerationLog
 from .engine.core import ContentEngine
@@ -14,68 +13,51 @@ from . import signals
 logger = logging.getLogger(__name__)
 
 def run_in_background(app, log_id, delay_seconds=0):
-    """(Deprecated for Bulk) Keep for single tasks."""
-    def task_wrapper():
-        with app.app_context():
-            if delay_seconds > 0:
-                time.sleep(delay_seconds)
-            process_generation_task(log_id)
-    thread = Thread(target=task_wrapper)
-    thread.start()
-    return thread
+    """(Deprecated for Bulk) Keep for single tasks. Queued on the shared job queue."""
+    JobQueue.init_app(app)
+    return JobQueue.submit(
+        'content_generation', process_generation_task, args=(log_id,),
+        key=f"generation:{log_id}", delay=delay_seconds or 0
+    )
+
+def _next_pending_log_id(session_id):
+    row = db.session.query(GenerationLog.id).filter_by(
+        session_id=session_id, status='pending'
+    ).order_by(GenerationLog.id).first()
+    return row.id if row else None
+
+def _run_session_step(session_id, log_id, delay_per_item):
+    """
+    One step of a session: process `log_id`, then queue the next pending task
+    of the session `delay_per_item` seconds later. Stopping a session fails its
+    pending tasks, so the chain simply ends (no polling).
+    """
+    process_generation_task(log_id)
+
+    next_log_id = _next_pending_log_id(session_id)
+    if next_log_id is None:
+        logger.info(f"Session Runner: Finished session {session_id}")
+        return
+    JobQueue.submit(
+        'content_generation', _run_session_step, args=(session_id, next_log_id, delay_per_item),
+        key=f"generation:{next_log_id}", delay=delay_per_item or 0
+    )
 
 def start_session_runner(app, session_id, delay_per_item):
     """
     Master Worker: Runs tasks sequentially with delay AFTER each completion.
+    Each task is a job on the shared queue that queues its successor.
     """
-    def runner():
-        with app.app_context():
-            logger.info(f"Session Runner: Started for {session_id}")
-            
-            # Get all pending tasks for this session, ordered by creation (or ID)
-            # We fetch IDs only to keep memory low, then fetch objects one by one
-            task_ids = [r.id for r in db.session.query(GenerationLog.id).filter_by(
-                session_id=session_id, status='pending'
-            ).order_by(GenerationLog.id).all()]
-            
-            total = len(task_ids)
-            logger.info(f"Session Runner: Found {total} tasks to process.")
-            
-            for idx, log_id in enumerate(task_ids):
-                # 0. Ensure fresh data (crucial for detecting Stop signal from API thread)
-                db.session.commit()
-
-                # 1. Check Global Stop Signal (Check specific task or generic session flag)
-                # Since we don't have a session-level table, we check the first remaining task's stop flag
-                # or rely on process_generation_task to handle it.
-                
-                # Check if this specific task was cancelled before we start
-                current_log = GenerationLog.query.get(log_id)
-                if not current_log or current_log.stop_requested:
-                    logger.info("Session Runner: Stop signal detected.")
-                    break
-                
-                # 2. Process the task (Synchronously wait for it to finish)
-                process_generation_task(log_id)
-                
-                # 3. Wait BEFORE the next task (if not the last one)
-                if idx < total - 1 and delay_per_item > 0:
-                    next_log_id = task_ids[idx + 1]
-                    # Check stop signal again during sleep
-                    for _ in range(delay_per_item):
-                        db.session.commit() # End previous transaction to see external updates
-                        
-                        # We MUST check the NEXT task because the current one is likely COMPLETED
-                        # and the Stop API only flags 'pending'/'processing' tasks.
-                        next_task = GenerationLog.query.get(next_log_id)
-                        if next_task and (next_task.stop_requested or next_task.status == 'failed'):
-                            logger.info(f"Session Runner: Stop detected on next task {next_log_id}")
-                            break 
-                        time.sleep(1)
-                        
-    thread = Thread(target=runner)
-    thread.start()
-    return thread
+    JobQueue.init_app(app)
+    with app.app_context():
+        first_log_id = _next_pending_log_id(session_id)
+    if first_log_id is None:
+        return None
+    logger.info(f"Session Runner: Started for {session_id}")
+    return JobQueue.submit(
+        'content_generation', _run_session_step, args=(session_id, first_log_id, delay_per_item),
+        key=f"generation:{first_log_id}"
+    )
 
 def _ensure_container_media_folder(container, media_type):
     """
@@ -14,3 +14,11 @@ module_metadata = {
 
 def setup_module(app):
     from . import routes
+
+    # Container searches via utils.search.apply_search_filter use the FTS5 index
+    from mindstack_app.utils.search import register_full_text_resolver
+    from .services.search_index import SearchIndex
+    register_full_text_resolver('learning_containers', SearchIndex.resolve_search_filter)
+
+    from .commands import register_commands
+    register_commands(app)
@@ -0,0 +1,23 @@
+# File: mindstack_app/modules/content_management/commands.py
+"""
+CLI commands for the content management module.
+
+Usage:
+    flask --app start_mindstack_app rebuild-search-index
+"""
+import click
+
+
+def register_commands(app):
+    """Attach content maintenance commands to `app.cli`."""
+
+    @app.cli.command('rebuild-search-index')
+    def rebuild_search_index_command():
+        """Build / repair the FTS5 search index (run at deploy, before the first search)."""
+        from mindstack_app.core.extensions import db
+        from .services.search_index import SearchIndex
+        if db.engine.dialect.name != 'sqlite':
+            click.echo("Chỉ hỗ trợ SQLite: tìm kiếm dùng LIKE.")
+            return
+        SearchIndex.rebuild()
+        click.echo("Đã dựng lại chỉ mục tìm kiếm.")
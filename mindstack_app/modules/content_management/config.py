@@ -10,3 +10,6 @@ class ContentManagementModuleDefaultConfig:
         'FLASHCARD_SET': 'flashcards',
         'QUIZ_SET': 'quizzes'
     }
+
+    # Bulk Excel import: rows validated and written per transaction
+    CONTENT_IMPORT_CHUNK_SIZE = 500
@@ -215,3 +215,17 @@ class ContentInterface:
     def delete_container(container_id: int):
         """Wrapper for ContentKernelService.delete_container."""
         return ContentKernelService.delete_container(container_id)
+
+    @staticmethod
+    def filter_containers_by_search(query, search_text: str, fields: Optional[List[str]] = None,
+                                    ranked: bool = False):
+        """Full-text filter of a LearningContainer query (FTS5; LIKE on other databases)."""
+        from .services.search_index import SearchIndex
+        return SearchIndex.filter_containers(query, search_text, fields, ranked=ranked)
+
+    @staticmethod
+    def search_item_ids(search_text: str, container_ids: Optional[List[int]] = None,
+                        item_types: Optional[List[str]] = None, limit: int = 50) -> List[int]:
+        """Ids of the items whose search_text best matches (most relevant first)."""
+        from .services.search_index import SearchIndex
+        return SearchIndex.search_item_ids(search_text, container_ids, item_types, limit)
@@ -0,0 +1,60 @@
+"""
+FTS Query - Pure helpers that turn a search box string into an SQLite FTS5
+MATCH expression (prefix search on every word).
+
+NO database, NO Flask dependencies allowed.
+"""
+import re
+from typing import Iterable, List, Optional
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+# Han, kana, hangul: written without spaces, so one unicode61 token is a whole phrase
+_CJK_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]')
+
+
+def tokenize_query(text: Optional[str]) -> List[str]:
+    """
+    Words of a search string (FTS5 operators and punctuation are dropped).
+
+    >>> tokenize_query('  Từ vựng: "N3" OR kanji* ')
+    ['từ', 'vựng', 'n3', 'or', 'kanji']
+    >>> tokenize_query(None)
+    []
+    """
+    if not text:
+        return []
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+def has_cjk(text: Optional[str]) -> bool:
+    """
+    True if the search string has CJK characters. Word-prefix MATCH can't
+    find a substring of such a token, so these queries use LIKE instead.
+
+    >>> has_cjk('単語'), has_cjk('勉強する'), has_cjk('한국어'), has_cjk('từ vựng'), has_cjk(None)
+    (True, True, True, False, False)
+    """
+    return bool(text and _CJK_RE.search(text))
+
+
+def match_expression(text: Optional[str], columns: Optional[Iterable[str]] = None,
+                     operator: str = 'AND') -> Optional[str]:
+    """
+    FTS5 MATCH expression: each word as a quoted prefix term, joined by
+    `operator`, optionally limited to some columns. None if there is no word.
+
+    >>> match_expression('tu vung')
+    '"tu"* AND "vung"*'
+    >>> match_expression('cat dog', columns=['title', 'description'], operator='OR')
+    '{title description} : ("cat"* OR "dog"*)'
+    >>> match_expression(' !? ') is None
+    True
+    """
+    tokens = tokenize_query(text)
+    if not tokens:
+        return None
+    expression = f' {operator} '.join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+    columns = list(columns or [])
+    if columns:
+        expression = '{%s} : (%s)' % (' '.join(columns), expression)
+    return expression
@@ -0,0 +1,111 @@
+"""
+Import Plan - Pure functions that turn a chunk of spreadsheet rows into
+create / update / delete operations for the bulk importer.
+
+NO database, NO Flask dependencies allowed.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from mindstack_app.utils.excel import get_cell_value, normalize_action
+
+
+@dataclass
+class ImportPlan:
+    """Operations of one chunk. `create`/`update` carry (content, custom_data)."""
+    create: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = field(default_factory=list)
+    update: List[Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]] = field(default_factory=list)
+    delete: List[int] = field(default_factory=list)
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def parse_item_id(raw: Any) -> Optional[int]:
+    """
+    Item id of an `item_id` cell ('12', 12.0, '12.0'); None if blank or invalid.
+
+    >>> [parse_item_id(v) for v in ('12', 12.0, ' 7.0 ', '', None, 'abc')]
+    [12, 12, 7, None, None, None]
+    """
+    if raw is None:
+        return None
+    try:
+        return int(float(str(raw).strip()))
+    except (TypeError, ValueError):
+        return None
+
+
+def referenced_item_ids(rows: Iterable[Dict[str, Any]]) -> Set[int]:
+    """
+    All item ids a chunk refers to (to check them against the container in one query).
+
+    >>> sorted(referenced_item_ids([{'item_id': 3}, {'item_id': None}, {'front': 'x'}, {'item_id': '5.0'}]))
+    [3, 5]
+    """
+    ids = set()
+    for row in rows:
+        item_id = parse_item_id(row.get('item_id'))
+        if item_id:
+            ids.add(item_id)
+    return ids
+
+
+def plan_import_rows(rows: List[Dict[str, Any]], column_mapper: Callable,
+                     existing_ids: Set[int], use_row_actions: bool = True,
+                     first_row_number: int = 2) -> ImportPlan:
+    """
+    Validate a chunk of rows and group them by operation.
+
+    column_mapper: function(row_data, columns) -> (content_dict, custom_data_dict).
+    With `use_row_actions` the `item_id` / `action` columns decide the operation;
+    ids that are not in `existing_ids` (unknown or belonging to another
+    container) are skipped. Without it every non-empty row is created.
+
+    >>> mapper = lambda row, columns: ({k: v for k, v in row.items() if k in ('front', 'back') and v}, None)
+    >>> rows = [
+    ...     {'item_id': None, 'action': None, 'front': 'cat', 'back': 'mèo'},
+    ...     {'item_id': 4, 'action': 'update', 'front': 'dog', 'back': 'chó'},
+    ...     {'item_id': 5, 'action': 'delete', 'front': None, 'back': None},
+    ...     {'item_id': 9, 'action': None, 'front': 'x', 'back': 'y'},
+    ...     {'item_id': 4, 'action': 'skip', 'front': 'dog', 'back': 'chó'},
+    ...     {'item_id': None, 'action': None, 'front': None, 'back': None},
+    ... ]
+    >>> plan = plan_import_rows(rows, mapper, existing_ids={4, 5})
+    >>> plan.create, plan.update, plan.delete, plan.skipped
+    ([({'front': 'cat', 'back': 'mèo'}, None)], [(4, {'front': 'dog', 'back': 'chó'}, None)], [5], 3)
+    >>> plan.errors
+    ['Dòng 5: item_id 9 không thuộc bộ này.']
+    """
+    plan = ImportPlan()
+    for offset, row in enumerate(rows):
+        columns = list(row.keys())
+        item_id = None
+        action = 'create'
+
+        if use_row_actions:
+            item_id = parse_item_id(get_cell_value(row, 'item_id', columns))
+            action = normalize_action(get_cell_value(row, 'action', columns), bool(item_id))
+            if action == 'skip':
+                plan.skipped += 1
+                continue
+            if item_id and item_id not in existing_ids:
+                plan.skipped += 1
+                plan.errors.append(f"Dòng {first_row_number + offset}: item_id {item_id} không thuộc bộ này.")
+                continue
+            if action == 'delete':
+                if item_id:
+                    plan.delete.append(item_id)
+                else:
+                    plan.skipped += 1
+                continue
+
+        content, custom_data = column_mapper(row, columns)
+        if not content:
+            plan.skipped += 1
+            continue
+
+        if item_id:
+            plan.update.append((item_id, content, custom_data))
+        else:
+            plan.create.append((content, custom_data))
+    return plan
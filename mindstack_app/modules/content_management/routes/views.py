@@ -640,59 +640,43 @@ def export_container_excel(container_id):
 def _import_excel_items(container_id, excel_file, container_type):
     """
     Helper to parse Excel and create items in bulk.
+    Rows are streamed from the sheet and inserted per chunk (see ManagementService.bulk_import_rows).
     """
     try:
-        import pandas as pd
+        from mindstack_app.utils.excel import iter_excel_rows
         from ..logics.parsers import normalize_column_headers
         
-        # Read Excel
-        xls = pd.ExcelFile(excel_file)
-        # Check sheet
-        data_sheet = 'Data' if 'Data' in xls.sheet_names else xls.sheet_names[0]
-        df = pd.read_excel(xls, sheet_name=data_sheet)
-        
-        # Normalize columns
-        mapping = normalize_column_headers([str(c) for c in df.columns])
-        df.rename(columns=mapping, inplace=True)
-        
         # Determine Item Type
         item_type = 'FLASHCARD'
         if container_type == 'QUIZ_SET': 
             item_type = 'QUIZ_MCQ'
         elif container_type == 'COURSE': 
             item_type = 'LESSON'
-            
-        # Determine start order
-        last_item = LearningItem.query.filter_by(container_id=container_id).order_by(LearningItem.order_in_container.desc()).first()
-        start_order = (last_item.order_in_container if last_item else 0) + 1
-        
-        count = 0
-        for idx, row in df.iterrows():
+
+        # Normalize columns once (headers are the same for every row)
+        mapping = {}
+
+        def column_mapper(row, columns):
+            if not mapping:
+                mapping.update(normalize_column_headers(columns) or {col: col for col in columns})
             content = {}
             # Extract all columns to content dict
-            for col in df.columns:
-                val = row[col]
-                if pd.notna(val):
-                     content[str(col)] = str(val).strip()
-                     
-            # Special Handling for Quiz
-            if container_type == 'QUIZ_SET':
-                # Map standardized keys if needed or rely on interface
-                pass
-            
-            # Skip empty rows (basic check)
-            if not content:
-                continue
-                
-            ContentKernelService.create_item(
-                container_id=container_id,
-                item_type=item_type,
-                content=content,
-                order=start_order + count
-            )
-            count += 1
-            
-        return count
+            for col, val in row.items():
+                if val is not None and str(val).strip():
+                    content[str(mapping.get(col, col))] = str(val).strip()
+            return content, None
+
+        chunk_size = current_app.config.get(
+            'CONTENT_IMPORT_CHUNK_SIZE', ContentManagementModuleDefaultConfig.CONTENT_IMPORT_CHUNK_SIZE
+        )
+        # 'Data' sheet, or the first sheet
+        stats = ManagementService.bulk_import_rows(
+            container_id, item_type,
+            iter_excel_rows(excel_file, sheet_name=None, chunk_size=chunk_size),
+            column_mapper,
+            use_row_actions=False
+        )
+        return stats['created']
 
     except Exception as e:
         current_app.logger.error(f"Excel Import Error: {e}", exc_info=True)
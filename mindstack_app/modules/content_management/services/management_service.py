@@ -1,18 +1,22 @@
 """Management Service for orchestrating content operations."""
 from __future__ import annotations
+import json
 import os
 import tempfile
-from typing import Any, Dict, List, Optional
-import pandas as pd
+from typing import Any, Dict, Iterable, List, Optional
 from flask import current_app
+from sqlalchemy import bindparam, func, insert, update
 from .kernel_service import ContentKernelService
+from mindstack_app.core.extensions import db
 from mindstack_app.core.signals import content_changed
+from mindstack_app.models import LearningContainer, LearningItem
+from mindstack_app.utils.db_session import safe_commit, safe_rollback
 from mindstack_app.utils.excel import (
-    read_excel_with_formulas, 
+    iter_excel_rows,
     extract_info_sheet_mapping,
-    normalize_action,
-    get_cell_value
 )
+from ..config import ContentManagementModuleDefaultConfig
+from ..logics.import_plan import plan_import_rows, referenced_item_ids
 from ..logics.validators import has_container_access
 
 class ManagementService:
@@ -122,23 +126,20 @@ class ManagementService:
     def process_excel_import(cls, container_id: int, item_type: str, 
                              excel_file, column_mapper: callable) -> Dict[str, int]:
         """
-        Generic Excel import logic.
+        Generic Excel import logic: Info sheet, then the Data sheet through
+        `bulk_import_rows`.
         column_mapper: function(row_data, columns) -> (content_dict, custom_data_dict)
         """
         if not has_container_access(container_id, 'editor'):
             raise PermissionError("User does not have editor access to this container.")
 
         temp_filepath = None
-        stats = {'created': 0, 'updated': 0, 'deleted': 0, 'skipped': 0}
 
         try:
             with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp:
                 excel_file.save(tmp.name)
                 temp_filepath = tmp.name
 
-            df = read_excel_with_formulas(temp_filepath, sheet_name='Data')
-            columns = list(df.columns)
-            
             # 1. Process Info sheet if exists
             info_mapping, _ = extract_info_sheet_mapping(temp_filepath)
             if info_mapping:
@@ -170,40 +171,16 @@ class ManagementService:
                 if update_payload:
                     ContentKernelService.update_container(container_id, **update_payload)
 
-            # 2. Process Data rows
-            for index, row in df.iterrows():
-                raw_item_id = get_cell_value(row, 'item_id', columns)
-                item_id = int(float(raw_item_id)) if raw_item_id else None
-                
-                action = normalize_action(get_cell_value(row, 'action', columns), bool(item_id))
-                
-                if action == 'skip':
-                    stats['skipped'] += 1
-                    continue
-                
-                if action == 'delete' and item_id:
-                    ContentKernelService.delete_item(item_id)
-                    cls.notify_content_change(item_id, 'deleted', container_id)
-                    stats['deleted'] += 1
-                    continue
-
-                # Map columns to content structure
-                content, custom_data = column_mapper(row, columns)
-                
-                if not content:
-                    stats['skipped'] += 1
-                    continue
-
-                if item_id:
-                    ContentKernelService.update_item(item_id, content=content, custom_data=custom_data)
-                    cls.notify_content_change(item_id, 'updated', container_id)
-                    stats['updated'] += 1
-                else:
-                    item = ContentKernelService.create_item(container_id, item_type, content, custom_data=custom_data)
-                    cls.notify_content_change(item.item_id, 'created', container_id)
-                    stats['created'] += 1
-
-            return stats
+            # 2. Process Data rows (streamed, one transaction per chunk)
+            chunk_size = current_app.config.get(
+                'CONTENT_IMPORT_CHUNK_SIZE', ContentManagementModuleDefaultConfig.CONTENT_IMPORT_CHUNK_SIZE
+            )
+            return cls.bulk_import_rows(
+                container_id, item_type,
+                iter_excel_rows(temp_filepath, sheet_name='Data', chunk_size=chunk_size),
+                column_mapper,
+                regenerate_audio=True, ai_process=True
+            )
 
         finally:
             if temp_filepath and os.path.exists(temp_filepath):
@@ -212,6 +189,143 @@ class ManagementService:
                 except:
                     pass
 
+    @classmethod
+    def bulk_import_rows(cls, container_id: int, item_type: str,
+                         chunks: Iterable[List[Dict[str, Any]]], column_mapper: callable,
+                         use_row_actions: bool = True, regenerate_audio: bool = False,
+                         ai_process: bool = False) -> Dict[str, Any]:
+        """
+        Bulk create/update/delete of items from chunks of row dicts
+        (see `iter_excel_rows`).
+
+        Each chunk is validated up front, then written with executemany
+        statements and committed as one transaction; a failing chunk is rolled
+        back and counted as `failed`. No per-item signals are sent: one
+        `container_content_changed` lists every affected item at the end.
+        """
+        stats = {'created': 0, 'updated': 0, 'deleted': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+        created_ids: List[int] = []
+        updated_ids: List[int] = []
+        deleted_ids: List[int] = []
+
+        table = LearningItem.__table__
+        next_order = (db.session.query(func.max(LearningItem.order_in_container))
+                      .filter(LearningItem.container_id == container_id).scalar() or 0) + 1
+        row_number = 2  # row 1 is the header
+
+        for chunk in chunks:
+            existing_ids = set()
+            wanted = referenced_item_ids(chunk) if use_row_actions else set()
+            if wanted:
+                existing_ids = {item_id for (item_id,) in db.session.query(LearningItem.item_id).filter(
+                    LearningItem.container_id == container_id,
+                    LearningItem.item_id.in_(wanted)
+                )}
+            plan = plan_import_rows(chunk, column_mapper, existing_ids, use_row_actions, first_row_number=row_number)
+            row_number += len(chunk)
+            stats['skipped'] += plan.skipped
+            stats['errors'].extend(plan.errors)
+
+            try:
+                new_ids: List[int] = []
+                if plan.create:
+                    rows = [{
+                        'container_id': container_id,
+                        'item_type': item_type,
+                        'content': content,
+                        'custom_data': custom_data,
+                        'order_in_container': next_order + offset,
+                        'search_text': LearningItem.build_search_text(item_type, content),
+                    } for offset, (content, custom_data) in enumerate(plan.create)]
+                    new_ids = cls._insert_items(rows)
+
+                # custom_data=None keeps the stored value (as update_item does)
+                for with_custom in (True, False):
+                    params = [{
+                        'b_item_id': item_id,
+                        'content': content,
+                        'search_text': LearningItem.build_search_text(item_type, content),
+                        **({'custom_data': custom_data} if with_custom else {}),
+                    } for item_id, content, custom_data in plan.update if (custom_data is not None) == with_custom]
+                    if params:
+                        values = {'content': bindparam('content'), 'search_text': bindparam('search_text')}
+                        if with_custom:
+                            values['custom_data'] = bindparam('custom_data')
+                        db.session.execute(
+                            update(table).where(table.c.item_id == bindparam('b_item_id')).values(**values),
+                            params
+                        )
+
+                if plan.delete:
+                    # ORM delete keeps relationship cascades (progress, notes, ...)
+                    for item in LearningItem.query.filter(LearningItem.item_id.in_(plan.delete)).all():
+                        db.session.delete(item)
+
+                safe_commit(db.session)
+            except Exception as e:
+                safe_rollback(db.session)
+                failed = len(plan.create) + len(plan.update) + len(plan.delete)
+                stats['failed'] += failed
+                stats['errors'].append(f"Lỗi ghi {failed} dòng: {e}")
+                current_app.logger.error(f"[Import] Chunk failed for container {container_id}: {e}", exc_info=True)
+                continue
+
+            next_order += len(plan.create)
+            created_ids.extend(new_ids)
+            updated_ids.extend(item_id for item_id, _, _ in plan.update)
+            deleted_ids.extend(plan.delete)
+
+        stats['created'] = len(created_ids)
+        stats['updated'] = len(updated_ids)
+        stats['deleted'] = len(deleted_ids)
+
+        if created_ids or updated_ids or deleted_ids:
+            cls.notify_container_content_change(
+                container_id, item_type, created_ids, updated_ids, deleted_ids,
+                payload={'regenerate_audio': regenerate_audio, 'ai_process': ai_process}
+            )
+        return stats
+
+    @staticmethod
+    def _insert_items(rows: List[Dict[str, Any]]) -> List[int]:
+        """executemany INSERT of learning_items rows; returns the new ids in row order."""
+        table = LearningItem.__table__
+        if db.session.get_bind().dialect.insert_executemany_returning_sort_by_parameter_order:
+            result = db.session.execute(
+                insert(table).returning(table.c.item_id, sort_by_parameter_order=True), rows
+            )
+            return [item_id for (item_id,) in result]
+
+        db.session.execute(insert(table), rows)
+        # Orders of this batch are new in the container: map them back to ids
+        orders = [row['order_in_container'] for row in rows]
+        by_order = dict(db.session.query(LearningItem.order_in_container, LearningItem.item_id).filter(
+            LearningItem.container_id == rows[0]['container_id'],
+            LearningItem.order_in_container.between(min(orders), max(orders))
+        ).all())
+        return [by_order[order] for order in orders if order in by_order]
+
+    @staticmethod
+    def notify_container_content_change(container_id: int, item_type: str, created: List[int],
+                                        updated: List[int], deleted: List[int], payload: Dict = None):
+        """Emit one coalesced signal for a bulk change of a container."""
+        from ..signals import container_content_changed
+        container = db.session.get(LearningContainer, container_id)
+        try:
+            container_content_changed.send(
+                'cms',
+                container_id=container_id,
+                item_type=item_type,
+                created=list(created),
+                updated=list(updated),
+                deleted=list(deleted),
+                user_id=container.creator_user_id if container else None,
+                payload=payload or {}
+            )
+        except Exception as e:
+            # Don't fail the import if a listener fails
+            current_app.logger.warning(f"[Import] container_content_changed listener failed: {e}")
+
     @staticmethod
     def get_container_content_keys(container_id: int, limit: int = 100) -> List[str]:
          """
@@ -0,0 +1,218 @@
+"""
+Search Index - SQLite FTS5 full-text index of learning items and containers.
+
+Two external-content FTS5 tables mirror the searchable columns:
+
+- ``learning_items_fts(search_text)`` over ``learning_items``;
+- ``learning_containers_fts(title, description, tags)`` over ``learning_containers``.
+
+Triggers on the base tables keep them in sync, so every write path is
+covered: ``LearningItem.update_search_text``, bulk imports and container
+edits. The index is built by ``flask rebuild-search-index`` (or lazily on the
+first search if that was not run) from the base tables. Queries are prefix
+matches on every word, ranked by bm25.
+Other databases, SQLite builds without FTS5 and queries with CJK characters
+(unicode61 keeps a run of them as one token, so a word inside it is not a
+prefix match) fall back to ``LIKE``.
+"""
+import logging
+import threading
+import weakref
+from typing import Iterable, List, Optional
+
+from sqlalchemy import and_, bindparam, column, literal_column, or_, select, table, text
+from sqlalchemy.exc import OperationalError
+
+from mindstack_app.core.extensions import db
+from mindstack_app.models import LearningContainer, LearningItem
+from ..logics.fts_query import has_cjk, match_expression, tokenize_query
+
+logger = logging.getLogger(__name__)
+
+ITEMS_FTS = 'learning_items_fts'
+CONTAINERS_FTS = 'learning_containers_fts'
+CONTAINER_COLUMNS = ('title', 'description', 'tags')
+TOKENIZER = 'unicode61 remove_diacritics 2'
+
+_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {ITEMS_FTS} USING fts5("
+    f"search_text, content='learning_items', content_rowid='item_id', tokenize='{TOKENIZER}')",
+    f"CREATE TRIGGER IF NOT EXISTS {ITEMS_FTS}_ai AFTER INSERT ON learning_items BEGIN "
+    f"INSERT INTO {ITEMS_FTS}(rowid, search_text) VALUES (new.item_id, new.search_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {ITEMS_FTS}_ad AFTER DELETE ON learning_items BEGIN "
+    f"INSERT INTO {ITEMS_FTS}({ITEMS_FTS}, rowid, search_text) VALUES ('delete', old.item_id, old.search_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {ITEMS_FTS}_au AFTER UPDATE OF search_text ON learning_items BEGIN "
+    f"INSERT INTO {ITEMS_FTS}({ITEMS_FTS}, rowid, search_text) VALUES ('delete', old.item_id, old.search_text); "
+    f"INSERT INTO {ITEMS_FTS}(rowid, search_text) VALUES (new.item_id, new.search_text); END",
+
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {CONTAINERS_FTS} USING fts5("
+    f"title, description, tags, content='learning_containers', content_rowid='container_id', tokenize='{TOKENIZER}')",
+    f"CREATE TRIGGER IF NOT EXISTS {CONTAINERS_FTS}_ai AFTER INSERT ON learning_containers BEGIN "
+    f"INSERT INTO {CONTAINERS_FTS}(rowid, title, description, tags) "
+    f"VALUES (new.container_id, new.title, new.description, new.tags); END",
+    f"CREATE TRIGGER IF NOT EXISTS {CONTAINERS_FTS}_ad AFTER DELETE ON learning_containers BEGIN "
+    f"INSERT INTO {CONTAINERS_FTS}({CONTAINERS_FTS}, rowid, title, description, tags) "
+    f"VALUES ('delete', old.container_id, old.title, old.description, old.tags); END",
+    f"CREATE TRIGGER IF NOT EXISTS {CONTAINERS_FTS}_au AFTER UPDATE OF title, description, tags ON learning_containers BEGIN "
+    f"INSERT INTO {CONTAINERS_FTS}({CONTAINERS_FTS}, rowid, title, description, tags) "
+    f"VALUES ('delete', old.container_id, old.title, old.description, old.tags); "
+    f"INSERT INTO {CONTAINERS_FTS}(rowid, title, description, tags) "
+    f"VALUES (new.container_id, new.title, new.description, new.tags); END",
+]
+_SCHEMA_OBJECTS = {ITEMS_FTS, f'{ITEMS_FTS}_ai', f'{ITEMS_FTS}_ad', f'{ITEMS_FTS}_au',
+                   CONTAINERS_FTS, f'{CONTAINERS_FTS}_ai', f'{CONTAINERS_FTS}_ad', f'{CONTAINERS_FTS}_au'}
+
+_items_fts = table(ITEMS_FTS, column('rowid'), column('rank'))
+_containers_fts = table(CONTAINERS_FTS, column('rowid'), column('rank'))
+
+
+class SearchIndex:
+    """Full-text search over LearningItem.search_text and container title/description/tags."""
+
+    _ready = weakref.WeakKeyDictionary()  # engine -> bool (FTS usable)
+    _lock = threading.Lock()
+
+    @classmethod
+    def ensure(cls) -> bool:
+        """
+        Create the index if needed (once per engine). Returns False if FTS5 can't
+        be used; a transient failure (database locked) is retried on the next call.
+        """
+        engine = db.engine
+        ready = cls._ready.get(engine)
+        if ready is not None:
+            return ready
+        with cls._lock:
+            ready = cls._ready.get(engine)
+            if ready is None:
+                ready = cls._setup(engine)
+                if ready is None:
+                    return False
+                cls._ready[engine] = ready
+        return ready
+
+    @classmethod
+    def _setup(cls, engine) -> Optional[bool]:
+        """True if the index is usable, False if it never will be, None to retry later."""
+        if engine.dialect.name != 'sqlite':
+            return False
+        try:
+            with engine.begin() as conn:
+                existing = {row[0] for row in conn.execute(text(
+                    "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')"
+                ))}
+                if 'learning_items' not in existing or 'learning_containers' not in existing:
+                    return False
+                if _SCHEMA_OBJECTS <= existing:
+                    return True
+            # First use (or triggers lost with a re-created table): build from scratch
+            cls.rebuild(engine)
+            return True
+        except Exception as e:
+            if isinstance(e, OperationalError) and 'no such module' in str(e).lower():
+                logger.warning(f"[SearchIndex] FTS5 unavailable, falling back to LIKE: {e}")
+                return False
+            # Locked / busy database: LIKE for this search, build on the next one
+            logger.warning(f"[SearchIndex] Index not built yet, retrying on next search: {e}")
+            return None
+
+    @classmethod
+    def rebuild(cls, engine=None) -> None:
+        """Fill missing LearningItem.search_text, (re)create the FTS schema and re-index everything."""
+        engine = engine or db.engine
+        items = LearningItem.__table__
+        with engine.begin() as conn:
+            rows = conn.execute(
+                select(items.c.item_id, items.c.item_type, items.c.content).where(items.c.search_text.is_(None))
+            ).all()
+            params = [
+                {'b_item_id': item_id, 'search_text': LearningItem.build_search_text(item_type, content)}
+                for item_id, item_type, content in rows
+            ]
+            params = [p for p in params if p['search_text'] is not None]
+            if params:
+                conn.execute(
+                    items.update().where(items.c.item_id == bindparam('b_item_id'))
+                    .values(search_text=bindparam('search_text')),
+                    params
+                )
+            for statement in _DDL:
+                conn.execute(text(statement))
+            conn.execute(text(f"INSERT INTO {ITEMS_FTS}({ITEMS_FTS}) VALUES ('rebuild')"))
+            conn.execute(text(f"INSERT INTO {CONTAINERS_FTS}({CONTAINERS_FTS}) VALUES ('rebuild')"))
+        cls._ready[engine] = True
+        logger.info(f"[SearchIndex] Rebuilt full-text index ({len(params)} items backfilled)")
+
+    @staticmethod
+    def _like_conditions(columns, search_text: str, operator: str):
+        tokens = tokenize_query(search_text)
+        if not tokens:
+            return None
+        per_token = [or_(*[col.ilike(f'%{token}%') for col in columns]) for token in tokens]
+        return and_(*per_token) if operator == 'AND' else or_(*per_token)
+
+    @classmethod
+    def filter_containers(cls, query, search_text: str, fields: Optional[Iterable[str]] = None,
+                          operator: str = 'AND', ranked: bool = False, fallback: bool = True):
+        """
+        Restrict a LearningContainer query to containers matching `search_text`
+        in `fields` (default: title, description, tags). `ranked` orders by
+        relevance first. Without FTS (or for a CJK query): LIKE if `fallback`,
+        else None.
+        """
+        fields = [f for f in (fields or CONTAINER_COLUMNS) if f in CONTAINER_COLUMNS]
+        if not fields or not tokenize_query(search_text):
+            return query
+
+        if has_cjk(search_text) or not cls.ensure():
+            if not fallback:
+                return None
+            condition = cls._like_conditions([getattr(LearningContainer, f) for f in fields], search_text, operator)
+            return query.filter(condition)
+
+        columns = fields if len(fields) < len(CONTAINER_COLUMNS) else None
+        match = literal_column(CONTAINERS_FTS).op('MATCH')(match_expression(search_text, columns, operator))
+        if ranked:
+            hits = select(_containers_fts.c.rowid.label('rowid'), _containers_fts.c.rank.label('rank')) \
+                .where(match).subquery()
+            return query.join(hits, hits.c.rowid == LearningContainer.container_id).order_by(hits.c.rank)
+        return query.filter(LearningContainer.container_id.in_(select(_containers_fts.c.rowid).where(match)))
+
+    @classmethod
+    def filter_items(cls, query, search_text: str, operator: str = 'AND', ranked: bool = False,
+                     fallback: bool = True):
+        """Same as `filter_containers` for a LearningItem query (matches search_text)."""
+        if not tokenize_query(search_text):
+            return query
+
+        if has_cjk(search_text) or not cls.ensure():
+            if not fallback:
+                return None
+            return query.filter(cls._like_conditions([LearningItem.search_text], search_text, operator))
+
+        match = literal_column(ITEMS_FTS).op('MATCH')(match_expression(search_text, None, operator))
+        if ranked:
+            hits = select(_items_fts.c.rowid.label('rowid'), _items_fts.c.rank.label('rank')).where(match).subquery()
+            return query.join(hits, hits.c.rowid == LearningItem.item_id).order_by(hits.c.rank)
+        return query.filter(LearningItem.item_id.in_(select(_items_fts.c.rowid).where(match)))
+
+    @classmethod
+    def search_item_ids(cls, search_text: str, container_ids: Optional[List[int]] = None,
+                        item_types: Optional[List[str]] = None, limit: int = 50) -> List[int]:
+        """Ids of the best matching items (most relevant first)."""
+        if not tokenize_query(search_text):
+            return []
+        query = db.session.query(LearningItem.item_id)
+        if container_ids:
+            query = query.filter(LearningItem.container_id.in_(container_ids))
+        if item_types:
+            query = query.filter(LearningItem.item_type.in_(item_types))
+        query = cls.filter_items(query, search_text, ranked=True)
+        return [item_id for (item_id,) in query.limit(limit).all()]
+
+    @classmethod
+    def resolve_search_filter(cls, query, search_query: str, field_names: List[str], operator: str):
+        """`utils.search.apply_search_filter` backend for learning_containers (None -> LIKE)."""
+        if not set(field_names) <= set(CONTAINER_COLUMNS):
+            return None
+        return cls.filter_containers(query, search_query, field_names, operator, fallback=False)
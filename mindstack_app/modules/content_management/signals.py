@@ -27,3 +27,9 @@ content_deleted = _signals.signal('content-deleted')
 # Emitted when a container structure changes (reordered items, etc.)
 # Kwargs: container_id (int), user_id (int)
 container_structure_changed = _signals.signal('container-structure-changed')
+
+# Emitted once per bulk operation (e.g. Excel import) instead of one
+# content_created/updated/deleted per item.
+# Kwargs: container_id (int), item_type (str), created (list[int]), updated (list[int]),
+#         deleted (list[int]), user_id (int), payload (dict: regenerate_audio, ai_process)
+container_content_changed = _signals.signal('container-content-changed')
@@ -0,0 +1,82 @@
+import sqlite3
+import unittest
+from unittest.mock import patch
+
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+
+from mindstack_app.models import LearningContainer, LearningItem, User, db
+from mindstack_app.modules.content_management.services.search_index import SearchIndex
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://')
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        user = User(username='u', email='u@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        self.container = self.add_container(user, '日本語の単語', 'JLPT N3')
+        self.other = self.add_container(user, 'Từ vựng tiếng Anh', 'Chủ đề gia đình')
+        self.items = {}
+        for front, back in (('勉強する', 'học'), ('family', 'gia đình')):
+            item = LearningItem(container_id=self.container.container_id, item_type='FLASHCARD',
+                                content={'front': front, 'back': back})
+            item.update_search_text()
+            db.session.add(item)
+            db.session.flush()
+            self.items[front] = item.item_id
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def add_container(self, user, title, description):
+        container = LearningContainer(creator_user_id=user.user_id, container_type='FLASHCARD_SET',
+                                      title=title, description=description)
+        db.session.add(container)
+        db.session.flush()
+        return container
+
+    def container_titles(self, search_text):
+        query = SearchIndex.filter_containers(LearningContainer.query, search_text)
+        return [container.title for container in query.all()]
+
+    def test_word_prefix_search(self):
+        self.assertTrue(SearchIndex.ensure())
+        self.assertEqual(self.container_titles('từ vựng'), ['Từ vựng tiếng Anh'])
+        self.assertEqual(self.container_titles('gia'), ['Từ vựng tiếng Anh'])
+        self.assertEqual(SearchIndex.search_item_ids('fam'), [self.items['family']])
+
+    def test_cjk_substring_search(self):
+        self.assertEqual(self.container_titles('単語'), ['日本語の単語'])
+        self.assertEqual(self.container_titles('日本'), ['日本語の単語'])
+        self.assertEqual(SearchIndex.search_item_ids('強'), [self.items['勉強する']])
+        self.assertEqual(SearchIndex.search_item_ids('勉強 học'), [self.items['勉強する']])
+
+    def test_locked_database_is_retried(self):
+        locked = OperationalError('BEGIN', {}, sqlite3.OperationalError('database is locked'))
+        with patch.object(SearchIndex, 'rebuild', side_effect=locked):
+            self.assertFalse(SearchIndex.ensure())
+        # Still searchable meanwhile (LIKE), and FTS comes up once the lock is gone
+        self.assertEqual(self.container_titles('gia'), ['Từ vựng tiếng Anh'])
+        self.assertTrue(SearchIndex.ensure())
+
+    def test_missing_fts5_is_permanent(self):
+        missing = OperationalError('CREATE', {}, sqlite3.OperationalError('no such module: fts5'))
+        with patch.object(SearchIndex, 'rebuild', side_effect=missing) as rebuild:
+            self.assertFalse(SearchIndex.ensure())
+            self.assertFalse(SearchIndex.ensure())
+        self.assertEqual(rebuild.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,3 +13,4 @@ module_metadata = {
 def setup_module(app):
     # Chỉ cần import routes là đủ để decorator @blueprint.route thực thi
     from . import routes
+    from . import events  # Snapshot invalidation on learning events
@@ -1,2 +1,22 @@
 class DashboardModuleDefaultConfig:
-    pass
+    # Per-user dashboard snapshot (process-local, see services/snapshot_cache.py)
+    DASHBOARD_SNAPSHOT_ENABLED = True
+    DASHBOARD_SNAPSHOT_MAX_USERS = 2000
+
+    # Serve an expired/invalidated section immediately and refresh it in the background
+    DASHBOARD_STALE_WHILE_REVALIDATE = False
+
+    # Max age (seconds) per section; events (card_reviewed, score_awarded,
+    # session_completed) invalidate the affected sections earlier.
+    DASHBOARD_SECTION_TTLS = {
+        'activity': 300,
+        'due_counts': 60,
+        'gamification': 300,
+        'active_sessions': 60,
+        'new_items_today': 300,
+        'goals': 300,
+        'heatmap': 900,
+        'mastery': 900,
+        'leaderboard': 300,
+        'difficult_items': 900,
+    }
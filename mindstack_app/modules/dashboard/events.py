@@ -0,0 +1,48 @@
+"""
+Event Handlers for Dashboard Module.
+
+Learning events mark the affected sections of the user's dashboard snapshot
+dirty, so the next load recomputes only those sections.
+"""
+from flask import current_app
+from mindstack_app.core.signals import card_reviewed, score_awarded, session_completed, study_logged
+from .services.snapshot_cache import DashboardSnapshotCache
+
+# Sections affected by each event
+REVIEW_SECTIONS = (
+    'activity', 'due_counts', 'active_sessions', 'new_items_today',
+    'goals', 'heatmap', 'mastery', 'difficult_items',
+)
+SCORE_SECTIONS = ('activity', 'gamification', 'goals')
+SESSION_SECTIONS = ('activity', 'active_sessions', 'goals')
+
+
+def _invalidate(kwargs, sections):
+    user_id = kwargs.get('user_id')
+    if not user_id:
+        return
+    try:
+        DashboardSnapshotCache.invalidate(user_id, sections)
+    except Exception as e:
+        current_app.logger.warning(f"[Dashboard] Snapshot invalidation failed: {e}")
+
+
+@card_reviewed.connect
+def on_card_reviewed(sender, **kwargs):
+    _invalidate(kwargs, REVIEW_SECTIONS)
+
+
+@study_logged.connect
+def on_study_logged(sender, **kwargs):
+    # Every StudyLog is a review, including paths that do not emit card_reviewed
+    _invalidate(kwargs, REVIEW_SECTIONS)
+
+
+@score_awarded.connect
+def on_score_awarded(sender, **kwargs):
+    _invalidate(kwargs, SCORE_SECTIONS)
+
+
+@session_completed.connect
+def on_session_completed(sender, **kwargs):
+    _invalidate(kwargs, SESSION_SECTIONS)
@@ -3,3 +3,7 @@ from .services.dashboard_service import DashboardService
 def get_dashboard_data(user_id: int):
     """Public API to get dashboard data."""
     return DashboardService.get_dashboard_data(user_id)
+
+def invalidate_dashboard(user_id: int, sections=None):
+    """Mark cached dashboard sections of a user stale (all sections if None)."""
+    return DashboardService.invalidate_snapshot(user_id, sections)
@@ -1,3 +1,5 @@
+import copy
+from datetime import datetime, timezone
 from typing import Dict, Any, List
 from flask import url_for
 from mindstack_app.modules.gamification import interface as gamification_interface
@@ -6,15 +8,31 @@ from mindstack_app.modules.stats import interface as stats_interface
 from mindstack_app.modules.goals import interface as goals_interface
 from mindstack_app.modules.session.interface import SessionInterface
 from mindstack_app.modules.learning.interface import LearningInterface
+from .snapshot_cache import DashboardSnapshotCache, SHARED_USER_ID
 import math
 
+MODE_META = {
+    'flashcard': {'label': 'Flashcard', 'icon': 'bolt'},
+    'mcq': {'label': 'Trắc nghiệm', 'icon': 'list-check'},
+    'typing': {'label': 'Luyện viết', 'icon': 'keyboard'},
+    'listening': {'label': 'Luyện nghe', 'icon': 'headphones'},
+    'matching': {'label': 'Nối từ', 'icon': 'puzzle-piece'},
+    'speed': {'label': 'Ôn nhanh', 'icon': 'gauge-high'}
+}
+
+
 class DashboardService:
     @staticmethod
     def get_dashboard_data(user_id: int) -> Dict[str, Any]:
-        """Fetch and aggregate all data for the user dashboard."""
-        
+        """
+        Fetch and aggregate all data for the user dashboard.
+        Sections come from the per-user snapshot (DashboardSnapshotCache); only
+        missing, expired or event-invalidated sections hit the other modules.
+        """
+        section = lambda name, loader: DashboardSnapshotCache.get_section(user_id, name, loader)
+
         # 1. Fetch Stats (Summaries, Activity Counts, Score Logs)
-        stats_data = stats_interface.get_dashboard_activity(user_id)
+        stats_data = copy.deepcopy(section('activity', lambda: stats_interface.get_dashboard_activity(user_id)))
         
         # Extract from aggregated stats
         summaries = stats_data.get('summaries', {})
@@ -23,7 +41,7 @@ class DashboardService:
         course_summary = summaries.get('course', {})
         
         # 2. Fetch Due Counts from FSRS (Source of Truth for Scheduling)
-        due_counts = fsrs_interface.get_due_counts(user_id)
+        due_counts = section('due_counts', lambda: fsrs_interface.get_due_counts(user_id))
         
         # Override due counts in summaries with FSRS real-time data
         flashcard_summary['due'] = due_counts.get('flashcard', 0)
@@ -31,60 +49,16 @@ class DashboardService:
         # quiz_summary['due'] = due_counts.get('quiz', 0) 
         
         # 3. Fetch Gamification Status
-        user_progress = gamification_interface.get_user_progress(user_id)
+        user_progress = dict(section('gamification', lambda: gamification_interface.get_user_progress(user_id)))
         # Standardize User Level (sqrt(XP/100))
         user_xp = user_progress.get('total_xp', 0)
         user_progress['level'] = int(math.sqrt(user_xp / 100)) if user_xp > 0 else 1
         
         # 3b. [NEW] Fetch Active Sessions for "Phiên học đang diễn ra"
-        active_sessions_raw = SessionInterface.get_active_sessions(user_id)
-        active_sessions = []
-        for sess in active_sessions_raw:
-            # Resolve container title
-            container_id = sess.set_id_data
-            title = "Khối kiến thức"
-            if isinstance(container_id, int):
-                container = LearningInterface.get_container_by_id(container_id)
-                if container:
-                    title = container.title
-            
-            # Mode and Icon mapping
-            mode = sess.learning_mode
-            mode_meta = {
-                'flashcard': {'label': 'Flashcard', 'icon': 'bolt'},
-                'mcq': {'label': 'Trắc nghiệm', 'icon': 'list-check'},
-                'typing': {'label': 'Luyện viết', 'icon': 'keyboard'},
-                'listening': {'label': 'Luyện nghe', 'icon': 'headphones'},
-                'matching': {'label': 'Nối từ', 'icon': 'puzzle-piece'},
-                'speed': {'label': 'Ôn nhanh', 'icon': 'gauge-high'}
-            }
-            meta = mode_meta.get(mode, {'label': mode.capitalize(), 'icon': 'layer-group'})
-            
-            # Correct URL generation based on mode
-            if mode == 'flashcard':
-                resume_url = url_for('vocab_flashcard.flashcard_session', session_id=sess.session_id)
-            elif mode == 'mcq':
-                resume_url = url_for('vocab_mcq.mcq_session', set_id=sess.set_id_data)
-            elif mode == 'typing':
-                resume_url = url_for('vocab_typing.typing_session', set_id=sess.set_id_data)
-            elif mode == 'listening':
-                resume_url = url_for('vocab_listening.listening_session_page', set_id=sess.set_id_data)
-            elif mode == 'matching':
-                resume_url = url_for('vocab_matching.matching_session_page', set_id=sess.set_id_data)
-            elif mode == 'speed':
-                resume_url = url_for('vocab_speed.speed_session_page', set_id=sess.set_id_data)
-            else:
-                resume_url = "#"
-
-            active_sessions.append({
-                'session_id': sess.session_id,
-                'title': title,
-                'mode_display': meta['label'],
-                'icon': meta['icon'],
-                'processed_count': len(sess.processed_item_ids or []),
-                'total_items': sess.total_items,
-                'resume_url': resume_url
-            })
+        active_sessions = [
+            DashboardService._present_active_session(sess)
+            for sess in section('active_sessions', lambda: DashboardService._load_active_sessions(user_id))
+        ]
         
         # 4. Score Overview
         score_data = stats_data.get('score_data', {})
@@ -94,10 +68,7 @@ class DashboardService:
         total_reps_today = todays_counts.get('flashcard', 0) + todays_counts.get('quiz', 0)
         
         # [NEW] Calculate additional metrics for header
-        from datetime import datetime, time, timezone
-        now = datetime.now(timezone.utc)
-        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        new_items_today = fsrs_interface.get_daily_new_items_count(user_id, today_start, now)
+        new_items_today = section('new_items_today', lambda: DashboardService._load_new_items_today(user_id))
         
         score_overview = {
             'today': score_data.get('today', 0),
@@ -109,7 +80,6 @@ class DashboardService:
         }
 
         # 5. Motivation message
-        todays_counts = stats_data.get('todays_counts', {})
         flashcard_reviews_today = todays_counts.get('flashcard', 0)
         quiz_attempts_today = todays_counts.get('quiz', 0)
         
@@ -127,24 +97,21 @@ class DashboardService:
         )
 
         # 7. Goals
-        goal_progress = goals_interface.get_goal_progress(user_id)
+        goal_progress = section('goals', lambda: goals_interface.get_goal_progress(user_id))
         
         # 8. [NEW] Activity Heatmap (Last 12 weeks)
-        activity_heatmap = stats_interface.get_user_activity_heatmap(user_id, weeks=12)
+        activity_heatmap = section('heatmap', lambda: stats_interface.get_user_activity_heatmap(user_id, weeks=12))
         
         # 9. [NEW] Mastery Distribution
-        mastery_distribution = stats_interface.get_mastery_distribution(user_id)
+        mastery_distribution = section('mastery', lambda: stats_interface.get_mastery_distribution(user_id))
         
-        # 10. [NEW] Leaderboard Snippet
-        leaderboard_raw = gamification_interface.get_leaderboard(limit=5)
-        leaderboard = []
-        for entry in leaderboard_raw:
-            xp = entry.get('score', 0)
-            entry['level'] = int(math.sqrt(xp / 100)) if xp > 0 else 1
-            leaderboard.append(entry)
+        # 10. [NEW] Leaderboard Snippet (same for every user)
+        leaderboard = DashboardSnapshotCache.get_section(
+            SHARED_USER_ID, 'leaderboard', DashboardService._load_leaderboard
+        )
         
         # 11. [NEW] Difficult Items Carousel
-        difficult_items = stats_interface.get_difficult_items_overview(user_id, limit=10)
+        difficult_items = section('difficult_items', lambda: stats_interface.get_difficult_items_overview(user_id, limit=10))
 
         return {
             'flashcard_summary': flashcard_summary,
@@ -162,6 +129,83 @@ class DashboardService:
             'active_sessions': active_sessions
         }
 
+    @staticmethod
+    def invalidate_snapshot(user_id: int, sections=None) -> None:
+        """Drop (mark dirty) cached dashboard sections for a user."""
+        DashboardSnapshotCache.invalidate(user_id, sections)
+
+    # === Section loaders (return plain data: they may run on a refresh thread) ===
+
+    @staticmethod
+    def _load_active_sessions(user_id: int) -> List[Dict[str, Any]]:
+        sessions = []
+        for sess in SessionInterface.get_active_sessions(user_id):
+            # Resolve container title
+            container_id = sess.set_id_data
+            title = "Khối kiến thức"
+            if isinstance(container_id, int):
+                container = LearningInterface.get_container_by_id(container_id)
+                if container:
+                    title = container.title
+
+            sessions.append({
+                'session_id': sess.session_id,
+                'title': title,
+                'learning_mode': sess.learning_mode,
+                'set_id_data': sess.set_id_data,
+                'processed_count': len(sess.processed_item_ids or []),
+                'total_items': sess.total_items,
+            })
+        return sessions
+
+    @staticmethod
+    def _present_active_session(sess: Dict[str, Any]) -> Dict[str, Any]:
+        """Add display label, icon and resume URL (needs a request context)."""
+        mode = sess['learning_mode'] or ''
+        set_id = sess['set_id_data']
+        meta = MODE_META.get(mode, {'label': mode.capitalize(), 'icon': 'layer-group'})
+        
+        # Correct URL generation based on mode
+        if mode == 'flashcard':
+            resume_url = url_for('vocab_flashcard.flashcard_session', session_id=sess['session_id'])
+        elif mode == 'mcq':
+            resume_url = url_for('vocab_mcq.mcq_session', set_id=set_id)
+        elif mode == 'typing':
+            resume_url = url_for('vocab_typing.typing_session', set_id=set_id)
+        elif mode == 'listening':
+            resume_url = url_for('vocab_listening.listening_session_page', set_id=set_id)
+        elif mode == 'matching':
+            resume_url = url_for('vocab_matching.matching_session_page', set_id=set_id)
+        elif mode == 'speed':
+            resume_url = url_for('vocab_speed.speed_session_page', set_id=set_id)
+        else:
+            resume_url = "#"
+
+        return {
+            'session_id': sess['session_id'],
+            'title': sess['title'],
+            'mode_display': meta['label'],
+            'icon': meta['icon'],
+            'processed_count': sess['processed_count'],
+            'total_items': sess['total_items'],
+            'resume_url': resume_url
+        }
+
+    @staticmethod
+    def _load_new_items_today(user_id: int) -> int:
+        now = datetime.now(timezone.utc)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return fsrs_interface.get_daily_new_items_count(user_id, today_start, now)
+
+    @staticmethod
+    def _load_leaderboard() -> List[Dict[str, Any]]:
+        leaderboard = []
+        for entry in gamification_interface.get_leaderboard(limit=5):
+            xp = entry.get('score', 0)
+            entry['level'] = int(math.sqrt(xp / 100)) if xp > 0 else 1
+            leaderboard.append(entry)
+        return leaderboard
+
     @staticmethod
     def _generate_motivation_message(flashcard_count, quiz_count, score_today) -> str:
         activity_parts = []
@@ -0,0 +1,152 @@
+# File: mindstack_app/modules/dashboard/services/snapshot_cache.py
+from __future__ import annotations
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from flask import copy_current_request_context, current_app, has_request_context
+
+from ..config import DashboardModuleDefaultConfig
+
+logger = logging.getLogger(__name__)
+
+# Sections shared by every user (not keyed per user, only expire by TTL)
+SHARED_USER_ID = 0
+
+
+class _Section:
+    __slots__ = ('value', 'computed_at', 'dirty')
+
+    def __init__(self, value: Any):
+        self.value = value
+        self.computed_at = time.monotonic()
+        self.dirty = False
+
+
+class DashboardSnapshotCache:
+    """
+    Process-wide per-user snapshot of dashboard sections.
+
+    Each section (due counts, heatmap, leaderboard, ...) has its own TTL and is
+    marked dirty by learning events, so a warm dashboard load is a handful of
+    dict lookups instead of a dozen interface calls. With stale-while-revalidate
+    enabled, an expired or dirty section is served as-is and recomputed on a
+    background thread.
+    """
+
+    _users: "OrderedDict[int, Dict[str, _Section]]" = OrderedDict()
+    _refreshing: Set[Tuple[int, str]] = set()
+    _lock = threading.RLock()
+
+    @staticmethod
+    def _config(key: str):
+        return current_app.config.get(key, getattr(DashboardModuleDefaultConfig, key))
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return bool(cls._config('DASHBOARD_SNAPSHOT_ENABLED'))
+
+    @classmethod
+    def _ttl(cls, section: str) -> float:
+        ttls = cls._config('DASHBOARD_SECTION_TTLS') or {}
+        return float(ttls.get(section, DashboardModuleDefaultConfig.DASHBOARD_SECTION_TTLS.get(section, 60)))
+
+    @classmethod
+    def _lookup(cls, user_id: int, section: str) -> Optional[_Section]:
+        with cls._lock:
+            sections = cls._users.get(user_id)
+            if sections is None:
+                return None
+            cls._users.move_to_end(user_id)
+            return sections.get(section)
+
+    @classmethod
+    def _store(cls, user_id: int, section: str, value: Any) -> None:
+        max_users = int(cls._config('DASHBOARD_SNAPSHOT_MAX_USERS'))
+        with cls._lock:
+            sections = cls._users.setdefault(user_id, {})
+            sections[section] = _Section(value)
+            cls._users.move_to_end(user_id)
+            while len(cls._users) > max_users:
+                cls._users.popitem(last=False)
+
+    @classmethod
+    def get_section(cls, user_id: int, section: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached section, computing it with `loader` when missing or stale."""
+        if not cls.enabled():
+            return loader()
+
+        entry = cls._lookup(user_id, section)
+        if entry is not None:
+            fresh = not entry.dirty and (time.monotonic() - entry.computed_at) < cls._ttl(section)
+            if fresh:
+                return entry.value
+            if cls._config('DASHBOARD_STALE_WHILE_REVALIDATE') and cls._refresh_async(user_id, section, loader):
+                return entry.value
+
+        value = loader()
+        cls._store(user_id, section, value)
+        return value
+
+    @classmethod
+    def _refresh_async(cls, user_id: int, section: str, loader: Callable[[], Any]) -> bool:
+        """Recompute a section on a background thread (at most one refresh per section)."""
+        key = (user_id, section)
+        with cls._lock:
+            if key in cls._refreshing:
+                return True
+            cls._refreshing.add(key)
+
+        def refresh():
+            cls._store(user_id, section, loader())
+
+        if has_request_context():
+            # Loaders may build URLs: run them under a copy of the request context
+            target = copy_current_request_context(refresh)
+        else:
+            app = current_app._get_current_object()
+
+            def target():
+                with app.app_context():
+                    refresh()
+
+        def run():
+            try:
+                target()
+            except Exception as e:
+                logger.warning(f"[DashboardSnapshot] Background refresh of '{section}' failed for user {user_id}: {e}")
+            finally:
+                with cls._lock:
+                    cls._refreshing.discard(key)
+
+        try:
+            threading.Thread(target=run, name=f'dashboard-refresh-{section}', daemon=True).start()
+        except RuntimeError:
+            with cls._lock:
+                cls._refreshing.discard(key)
+            return False
+        return True
+
+    @classmethod
+    def invalidate(cls, user_id: int, sections: Optional[Iterable[str]] = None) -> None:
+        """Mark sections of one user's snapshot dirty (all sections if None)."""
+        with cls._lock:
+            cached = cls._users.get(user_id)
+            if not cached:
+                return
+            for name in (cached.keys() if sections is None else sections):
+                entry = cached.get(name)
+                if entry is not None:
+                    entry.dirty = True
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._users.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            return {'users': len(cls._users), 'refreshing': len(cls._refreshing)}
@@ -14,12 +14,20 @@ module_metadata = {
 def setup_module(app):
     """Initialize the FSRS module."""
     from . import models
+    from . import events
     from .routes.api import api_bp
     # Import admin_views to ensure routes are registered to fsrs_bp
     from .routes import admin_views
 
     # Register API routes
     app.register_blueprint(api_bp)
+
+    from .commands import register_commands
+    register_commands(app)
+
+    # Nightly re-bucketing of the container aggregates' due histograms
+    from .services.container_stats_service import ContainerStatsService
+    ContainerStatsService.init_scheduler(app)
     
     # Register Admin/View routes
     # specific handling: bootstrap.py handles fsrs_bp registration via module_metadata
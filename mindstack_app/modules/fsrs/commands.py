@@ -0,0 +1,22 @@
+# File: mindstack_app/modules/fsrs/commands.py
+"""
+CLI commands for the FSRS module.
+
+Usage:
+    flask --app start_mindstack_app rebuild-container-stats
+    flask --app start_mindstack_app rebuild-container-stats --user-id 5 --container-id 12
+"""
+import click
+
+
+def register_commands(app):
+    """Attach FSRS maintenance commands to `app.cli`."""
+
+    @app.cli.command('rebuild-container-stats')
+    @click.option('--user-id', type=int, default=None, help='Only rebuild this user.')
+    @click.option('--container-id', type=int, multiple=True, help='Only rebuild these containers.')
+    def rebuild_container_stats_command(user_id, container_id):
+        """Backfill / repair the per-container memory aggregates from ItemMemoryState."""
+        from .services.container_stats_service import ContainerStatsService
+        result = ContainerStatsService.rebuild(user_id=user_id, container_ids=list(container_id) or None)
+        click.echo(f"Đã dựng lại {result.get('row_count', 0)} dòng thống kê bộ thẻ.")
@@ -9,6 +9,7 @@ class DefaultConfig:
     FSRS_ENABLE_FUZZING = True
     FSRS_ENABLE_FUZZ = True # Legacy alias
     FSRS_GLOBAL_WEIGHTS = list(DEFAULT_PARAMETERS)
+    FSRS_ENGINE_CACHE_SIZE = 256  # Max cached per-user engines (LRU)
 
 # Backward compatibility alias
 FSRSDefaultConfig = DefaultConfig
\ No newline at end of file
@@ -0,0 +1,111 @@
+# File: mindstack_app/modules/fsrs/engine/batch.py
+from __future__ import annotations
+import datetime
+from typing import Iterable, Optional, Sequence, Dict, Any
+import numpy as np
+from ..schemas import CardStateEnum
+
+SECONDS_PER_DAY = 86400.0
+
+
+class BatchRetrievabilityEngine:
+    """
+    Vectorized retrievability calculator for many memory states at once.
+    Pure Logic Layer: No Database, No Flask Context.
+
+    Mirrors FSRSEngine.get_realtime_retention (R = 0.9 ** (elapsed / S)) but
+    works on columnar arrays so a whole deck is computed in one NumPy pass
+    instead of one engine instance per item.
+    """
+
+    DECAY_BASE = 0.9
+
+    @staticmethod
+    def to_epoch_seconds(values: Iterable[Optional[datetime.datetime]]) -> np.ndarray:
+        """Convert datetimes to UTC epoch seconds (NaN for missing). Naive values are treated as UTC."""
+        out = []
+        for dt in values:
+            if dt is None:
+                out.append(np.nan)
+                continue
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=datetime.timezone.utc)
+            out.append(dt.timestamp())
+        return np.asarray(out, dtype=np.float64)
+
+    @staticmethod
+    def columns_from_states(states: Sequence[Any]) -> Dict[str, np.ndarray]:
+        """Build (stability, last_review, state, reps) columns from ItemMemoryState-like records."""
+        return {
+            'stability': np.asarray([s.stability or 0.0 for s in states], dtype=np.float64),
+            'last_review': BatchRetrievabilityEngine.to_epoch_seconds(s.last_review for s in states),
+            'state': np.asarray([s.state or CardStateEnum.NEW for s in states], dtype=np.int8),
+            'reps': np.asarray([s.repetitions or 0 for s in states], dtype=np.int32),
+        }
+
+    @classmethod
+    def compute(
+        cls,
+        stability: np.ndarray,
+        last_review: np.ndarray,
+        state: np.ndarray,
+        reps: np.ndarray,
+        now: Optional[datetime.datetime] = None,
+        unreviewed_value: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Calculate current retrievability for every row.
+
+        `last_review` is epoch seconds with NaN for "never reviewed".
+        By default rows without last_review follow the engine (1.0 if they have
+        stability); pass `unreviewed_value` to force a value for all of them,
+        e.g. 0.0 to match FSRSInterface.get_retrievability.
+        """
+        stability = np.asarray(stability, dtype=np.float64)
+        last_review = np.asarray(last_review, dtype=np.float64)
+        state = np.asarray(state)
+        reps = np.asarray(reps)
+
+        if now is None:
+            now = datetime.datetime.utcnow()
+        if now.tzinfo is None:
+            now = now.replace(tzinfo=datetime.timezone.utc)
+        now_ts = now.timestamp()
+
+        result = np.ones(stability.shape, dtype=np.float64)
+        if result.size == 0:
+            return result
+
+        elapsed = (now_ts - last_review) / SECONDS_PER_DAY
+        decaying = (stability > 0) & ~np.isnan(last_review) & (elapsed > 0)
+        with np.errstate(over='ignore', under='ignore', divide='ignore', invalid='ignore'):
+            result[decaying] = np.power(cls.DECAY_BASE, elapsed[decaying] / stability[decaying])
+
+        result[(stability <= 0) & (reps > 0)] = 1.0
+        result[(stability <= 0) & (reps <= 0)] = 0.0
+        if unreviewed_value is not None:
+            result[np.isnan(last_review)] = unreviewed_value
+        result[state == CardStateEnum.NEW] = 0.0
+        return result
+
+    @classmethod
+    def compute_for_states(
+        cls,
+        states: Sequence[Any],
+        now: Optional[datetime.datetime] = None,
+        unreviewed_value: Optional[float] = None
+    ) -> np.ndarray:
+        """Convenience wrapper: records -> columns -> retrievability array (same order as input)."""
+        cols = cls.columns_from_states(states)
+        return cls.compute(
+            cols['stability'], cols['last_review'], cols['state'], cols['reps'],
+            now=now, unreviewed_value=unreviewed_value
+        )
+
+    @staticmethod
+    def bucket_counts(retrievability: np.ndarray, weak_below: float = 0.7, strong_from: float = 0.9) -> Dict[str, int]:
+        """Count rows in weak / medium / strong retention buckets."""
+        r = np.asarray(retrievability, dtype=np.float64)
+        weak = int(np.count_nonzero(r < weak_below))
+        strong = int(np.count_nonzero(r >= strong_from))
+        return {'weak': weak, 'medium': int(r.size) - weak - strong, 'strong': strong}
@@ -8,7 +8,9 @@ from sqlalchemy import func
 from mindstack_app.models import db
 from mindstack_app.modules.fsrs.models import ItemMemoryState
 from ..schemas import SrsResultDTO, CardStateDTO, Rating, CardStateEnum
+from ..logics.container_stats_logic import snapshot
 from ..logics.fsrs_engine import FSRSEngine
+from ..services.container_stats_service import ContainerStatsService
 from ..services.settings_service import FSRSSettingsService
 from mindstack_app.modules.fsrs.services.optimizer_service import FSRSOptimizerService
 
@@ -71,6 +73,7 @@ class FSRSProcessor:
         state_record = ItemMemoryState.query.filter_by(
             user_id=user_id, item_id=item_id
         ).first()
+        before = snapshot(state_record) if state_record else None
         
         if not state_record:
             state_record = ItemMemoryState(
@@ -160,6 +163,8 @@ class FSRSProcessor:
         else:
             state_record.times_incorrect = (state_record.times_incorrect or 0) + 1
         
+        ContainerStatsService.record_change(user_id, item_id, before, snapshot(state_record), now=now)
+
         # 8. Log Review - DELEGATED to HistoryRecorder (via caller)
         
         # 9. Return Result
@@ -1,2 +1,30 @@
 # Event listeners for FSRS module
-# This file is currently a placeholder for future integrations.
+"""
+Keeps the per-container memory aggregates consistent with content changes:
+deleting an item drops the aggregates of its container (rebuilt on next read).
+"""
+from flask import current_app
+from mindstack_app.core.extensions import db
+from mindstack_app.utils.db_session import safe_commit
+from mindstack_app.modules.content_management.signals import container_content_changed, content_deleted
+from .services.container_stats_service import ContainerStatsService
+
+
+@content_deleted.connect
+def on_content_deleted(sender, **kwargs):
+    container_id = kwargs.get('container_id')
+    if not container_id:
+        return
+    try:
+        ContainerStatsService.invalidate(container_ids=[container_id])
+        safe_commit(db.session)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.warning(f"[FSRS] Container stats invalidation failed for container {container_id}: {e}")
+
+
+@container_content_changed.connect
+def on_container_content_changed(sender, **kwargs):
+    # Bulk imports: only deletions change the aggregates
+    if kwargs.get('deleted'):
+        on_content_deleted(sender, container_id=kwargs.get('container_id'))
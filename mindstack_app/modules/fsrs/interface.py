@@ -1,9 +1,11 @@
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, Tuple, List, Dict, Any, Sequence
 import datetime
 from mindstack_app.modules.fsrs.models import ItemMemoryState
 from mindstack_app.modules.fsrs.services.scheduler_service import SchedulerService
 from mindstack_app.modules.fsrs.services.optimizer_service import FSRSOptimizerService
 from mindstack_app.modules.fsrs.services.settings_service import FSRSSettingsService
+from mindstack_app.modules.fsrs.services.container_stats_service import ContainerStatsService
+from mindstack_app.modules.fsrs.logics.container_stats_logic import snapshot
 from mindstack_app.modules.fsrs.schemas import SrsResultDTO
 
 def get_due_counts(user_id: int) -> Dict[str, int]:
@@ -86,20 +88,90 @@ class FSRSInterface:
     @staticmethod
     def get_retrievability(state: ItemMemoryState) -> float:
         """Calculate current retrievability (memory power)."""
-        from mindstack_app.modules.fsrs.engine.core import FSRSEngine
-        from datetime import datetime, timezone
-        
         if not state.last_review:
             return 0.0
-            
-        dto = SchedulerService._model_to_dto(state)
-        engine = FSRSEngine() 
-        return engine.get_realtime_retention(dto, datetime.utcnow())
+        return float(FSRSInterface.get_retrievability_batch([state])[0])
+
+    @staticmethod
+    def get_retrievability_batch(states: Sequence[ItemMemoryState], now: Optional[datetime.datetime] = None):
+        """
+        Vectorized get_retrievability for many states in one NumPy pass.
+        Returns a float ndarray aligned with `states`.
+        """
+        from .engine.batch import BatchRetrievabilityEngine
+        return BatchRetrievabilityEngine.compute_for_states(list(states), now=now, unreviewed_value=0.0)
+
+    @staticmethod
+    def get_retrievability_distribution(states: Sequence[ItemMemoryState]) -> Dict[str, int]:
+        """Count states in weak (<70%), medium and strong (>=90%) retention buckets."""
+        from .engine.batch import BatchRetrievabilityEngine
+        return BatchRetrievabilityEngine.bucket_counts(FSRSInterface.get_retrievability_batch(states))
+
+    @staticmethod
+    def get_retrievability_columns(
+        user_id: int,
+        item_ids: Optional[List[int]] = None,
+        learned_only: bool = False,
+        now: Optional[datetime.datetime] = None
+    ) -> Tuple[List[int], Any]:
+        """
+        Compute retrievability for a user's memory states straight from column data
+        (no ORM objects). Returns (item_ids, ndarray) in matching order.
+        """
+        from mindstack_app.core.extensions import db
+        from .engine.batch import BatchRetrievabilityEngine
+
+        columns = (
+            ItemMemoryState.item_id,
+            ItemMemoryState.stability,
+            ItemMemoryState.last_review,
+            ItemMemoryState.state,
+            ItemMemoryState.repetitions,
+        )
+        base_query = db.session.query(*columns).filter(ItemMemoryState.user_id == user_id)
+        if learned_only:
+            base_query = base_query.filter(ItemMemoryState.state != 0)
+
+        if item_ids is None:
+            rows = base_query.all()
+        else:
+            # SQLite has limit on variables (999 usually). Break into chunks.
+            rows = []
+            chunk_size = 500
+            for i in range(0, len(item_ids), chunk_size):
+                chunk = item_ids[i:i + chunk_size]
+                rows.extend(base_query.filter(ItemMemoryState.item_id.in_(chunk)).all())
+
+        if not rows:
+            return [], BatchRetrievabilityEngine.compute([], [], [], [], now=now)
+
+        ids, stability, last_review, state, reps = zip(*rows)
+        values = BatchRetrievabilityEngine.compute(
+            [s or 0.0 for s in stability],
+            BatchRetrievabilityEngine.to_epoch_seconds(last_review),
+            [s or 0 for s in state],
+            [r or 0 for r in reps],
+            now=now,
+            unreviewed_value=0.0
+        )
+        return list(ids), values
 
     @staticmethod
     def predict_next_intervals(user_id: int, item_id: int) -> Dict[int, str]:
         """Predict next intervals for an item."""
         previews = SchedulerService.get_preview_intervals(user_id, item_id)
+        return FSRSInterface._interval_labels(previews)
+
+    @staticmethod
+    def predict_next_intervals_for_states(user_id: int, states: Dict[int, Optional[ItemMemoryState]]) -> Dict[int, Dict[int, str]]:
+        """Batch predict_next_intervals for already loaded states ({item_id: state or None})."""
+        return {
+            item_id: FSRSInterface._interval_labels(SchedulerService.get_preview_intervals_for_state(user_id, state))
+            for item_id, state in states.items()
+        }
+
+    @staticmethod
+    def _interval_labels(previews: Dict[str, Dict[str, Any]]) -> Dict[int, str]:
         result = {}
         for k, v in previews.items():
             try:
@@ -118,6 +190,17 @@ class FSRSInterface:
         """Get FSRS configuration."""
         return FSRSSettingsService.get(key, default)
 
+    @staticmethod
+    def invalidate_config_cache() -> None:
+        """Reload `srs` settings and drop cached engines (call after editing that category)."""
+        FSRSSettingsService.invalidate_cache()
+
+    @staticmethod
+    def invalidate_user_engine(user_id: int) -> None:
+        """Drop the cached engine/parameters of one user (call after changing their weights)."""
+        from .services.engine_cache import FSRSEngineCache
+        FSRSEngineCache.invalidate_user(user_id)
+
     @staticmethod
     def get_due_counts(user_id: int) -> Dict[str, int]:
         """Get count of due items per type for a user."""
@@ -226,43 +309,55 @@ class FSRSInterface:
 
     @staticmethod
     def get_container_stats(user_id: int, container_id: int) -> Dict[str, Any]:
-        """Get FSRS statistics for a specific container."""
-        from datetime import datetime, timezone
-        from sqlalchemy import func, select
+        """Get FSRS statistics for a specific container (reads the container aggregate)."""
+        stats = ContainerStatsService.get_stats(user_id, container_id)
+        return {
+            'total': stats['total'],
+            'learned': stats['total'],
+            'due': stats['due'],
+            'mastered': stats['mastered'],
+            'avg_stability': stats['avg_stability']
+        }
+
+    @staticmethod
+    def get_container_stats_map(user_id: int, container_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Memory stats for many containers at once (deck lists): one indexed read.
+        Each value: total, learned (state != 0), new, learning, review, relearning,
+        due, mastered, hard, avg_stability, times_correct, times_incorrect, last_review.
+        """
+        return ContainerStatsService.get_stats_map(user_id, container_ids)
+
+    @staticmethod
+    def get_learned_item_states_for_container(user_id: int, container_id: int) -> List[Any]:
+        """
+        Light rows (stability, last_review, state, repetitions) of a user's memory
+        states in a container, for `get_retrievability_batch`.
+        """
         from mindstack_app.core.extensions import db
         from mindstack_app.models import LearningItem
-        
-        now = datetime.utcnow()
-        
-        # Use explicit select for IN clause to avoid SAWarning
-        item_ids_select = select(LearningItem.item_id).filter(
-            LearningItem.container_id == container_id
-        )
-        
-        base_query = ItemMemoryState.query.filter(
-            ItemMemoryState.user_id == user_id,
-            ItemMemoryState.item_id.in_(item_ids_select)
-        )
-        
-        total = base_query.count()
-        due = base_query.filter(ItemMemoryState.due_date <= now).count()
-        mastered = base_query.filter(ItemMemoryState.stability >= 21.0).count()
-        
-        avg_stability = db.session.query(
-            func.avg(ItemMemoryState.stability)
+        return db.session.query(
+            ItemMemoryState.stability, ItemMemoryState.last_review,
+            ItemMemoryState.state, ItemMemoryState.repetitions
+        ).join(
+            LearningItem, LearningItem.item_id == ItemMemoryState.item_id
         ).filter(
             ItemMemoryState.user_id == user_id,
-            ItemMemoryState.item_id.in_(item_ids_select),
-            ItemMemoryState.state != 0
-        ).scalar() or 0.0
-        
-        return {
-            'total': total,
-            'learned': total,
-            'due': due,
-            'mastered': mastered,
-            'avg_stability': round(avg_stability, 2)
-        }
+            LearningItem.container_id == container_id
+        ).all()
+
+    @staticmethod
+    def rebuild_container_stats(user_id: Optional[int] = None, container_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Recompute the container aggregates from ItemMemoryState."""
+        return ContainerStatsService.rebuild(user_id=user_id, container_ids=container_ids)
+
+    @staticmethod
+    def invalidate_container_stats(user_id: Optional[int] = None, container_ids: Optional[List[int]] = None) -> None:
+        """
+        Drop container aggregates after bulk changes to memory states (resets,
+        deleted items). They are rebuilt on next read. Does not commit.
+        """
+        ContainerStatsService.invalidate(user_id=user_id, container_ids=container_ids)
 
     @staticmethod
     def get_learned_item_ids_for_container(container_id: int, user_id: int) -> List[int]:
@@ -333,6 +428,8 @@ class FSRSInterface:
                 created_at=datetime.now(timezone.utc)
             )
             db.session.add(state_record)
+            # A new (state 0) row counts in the container aggregate
+            ContainerStatsService.record_change(user_id, item_id, None, snapshot(state_record))
             
         data = dict(state_record.data) if state_record.data else {}
         markers = data.get('markers', [])
@@ -600,12 +697,13 @@ class FSRSInterface:
             ItemMemoryState.difficulty >= 7.5
         ).limit(limit).all()
         
+        retrievability = FSRSInterface.get_retrievability_batch([state for _, state in items_with_state])
         results = []
-        for item, state in items_with_state:
+        for (item, state), r in zip(items_with_state, retrievability):
             results.append({
                 'item_id': item.item_id,
                 'difficulty': state.difficulty,
-                'retrievability': FSRSInterface.get_retrievability(state)
+                'retrievability': float(r)
             })
         return results
 
@@ -783,18 +881,8 @@ class FSRSInterface:
         return query
     @staticmethod
     def get_hard_count(user_id: int, container_id: int) -> int:
-        """Get count of hard items in a container."""
-        from sqlalchemy import func
-        from mindstack_app.modules.fsrs.models import ItemMemoryState
-        from mindstack_app.models import LearningItem, db
-        
-        return db.session.query(func.count(ItemMemoryState.item_id)).join(
-            LearningItem, LearningItem.item_id == ItemMemoryState.item_id
-        ).filter(
-            ItemMemoryState.user_id == user_id,
-            LearningItem.container_id == container_id,
-            ItemMemoryState.difficulty >= 7.5
-        ).scalar() or 0
+        """Get count of hard items (difficulty >= 7.5) in a container."""
+        return ContainerStatsService.get_stats(user_id, container_id)['hard']
 
     @staticmethod
     def get_leaderboard_mastery(user_ids: List[int], item_ids_subquery) -> Dict[int, int]:
@@ -882,19 +970,9 @@ class FSRSInterface:
     def get_learned_count(user_id: int, container_id: int) -> int:
         """
         Get count of learned items (state != 0) in a container.
-        Optimized SQL query.
+        Reads the container aggregate.
         """
-        from sqlalchemy import func
-        from mindstack_app.modules.fsrs.models import ItemMemoryState
-        from mindstack_app.models import LearningItem, db
-        
-        return db.session.query(func.count(ItemMemoryState.state_id)).join(
-            LearningItem, LearningItem.item_id == ItemMemoryState.item_id
-        ).filter(
-            LearningItem.container_id == container_id,
-            ItemMemoryState.user_id == user_id,
-            ItemMemoryState.state != 0
-        ).scalar() or 0
+        return ContainerStatsService.get_stats(user_id, container_id)['learned']
 
     @staticmethod
     def get_initial_state(user_id: int, item_id: int):
@@ -993,131 +1071,44 @@ class FSRSInterface:
         return result
 
     @staticmethod
-    def get_daily_reviews_map(user_id: int, start_date, end_date) -> Dict[str, int]:
-        """
-        Get a map of date string -> review count for a date range.
-        Used for charts.
-        """
-        from mindstack_app.modules.fsrs.models import ItemMemoryState
-        from sqlalchemy import func
-        from mindstack_app.core.extensions import db
-        
-        # Note: ItemMemoryState only stores LAST review. 
-        # For accurate review history counts, we should query StudyLog or ScoreLog.
-        # But User requested to rely on FSRS logic where possible? 
-        # Wait, `get_daily_reviewed_items_count` uses ItemMemoryState.last_review.
-        # This is inaccurate for historical charts because it only shows the LAST review date.
-        # If I review an item today, its last review date moves to today.
-        
-        # HOWEVER, the `LearningMetricsService` implementation plan relies on this method.
-        # If we want accurate "Reviews per day" chart, we MUST use ScoreLog or StudyLog.
-        # `ScoreLog` is available and used for Points.
-        # Does ScoreLog track every review? Yes, usually.
-        # Let's check `ScoreLog` usage. 
-        # ScoreLog tracks score changes.
-        
-        # Alternative: Use `StudyLog` (if available in this context).
-        # The checklist said "REFAC: StudyLog removed (Isolation)".
-        # So we shouldn't rely on StudyLog if it's being removed/isolated?
-        # But `LearningHistoryInterface` exists.
-        
-        # The prompt said "REFAC: ItemMemoryState removed... REFAC: StudyLog removed (Isolation)".
-        # It seems I should access logs via `LearningHistoryInterface`?
-        # But `LearningMetricsService` already queries `ScoreLog` directly.
-        # So I will query `ScoreLog` here as a proxy for activity/reviews.
-        # Or, I can check if `StudyLog` is still accessible.
-        # `mindstack_app/modules/learning/services/learning_metrics_service.py` imports `StudyLog`.
-        
-        # Let's use `ScoreLog` or `StudyLog` here? 
-        # Actually `FSRSInterface` should be about FSRS state.
-        # Historical review counts are NOT FSRS state (which is snapshots).
-        # But the method `get_daily_reviews_map` was requested to be in `FsrsInterface`?
-        # Or maybe I should put it in `LearningMetricsService` directly?
-        # `LearningMetricsService` called `FsrsInterface.get_daily_reviews_map`.
-        # So I must implement it here.
-        
-        # I will implement it using `item_memory_state` last_review as a fallback 
-        # OR better, if valid, query `LearningHistoryInterface`.
-        # But `FsrsInterface` depending on `LearningHistoryInterface` might be a circular dep?
-        # `Fsrs` -> `LearningHistory`?
-        # `LearningHistory` -> `Fsrs`?
-        
-        # To avoid circular dep, I will query the `StudyLog` model directly if it's in `mindstack_app.models`.
-        # Or `ScoreLog`.
-        
-        # Re-reading `learning_metrics_service.py` imports:
-        # `from mindstack_app.models import ..., StudyLog`
-        # So `StudyLog` is in core models.
-        
-        # I'll use `StudyLog` to get accurate review counts.
-        from mindstack_app.models import StudyLog
-    @staticmethod
     def get_daily_reviews_map(user_id: int, start_date, end_date, item_types: Optional[List[str]] = None, user_timezone: Optional[str] = None) -> Dict[str, int]:
         """
         Get a map of date string -> review count for a date range in user's local timezone.
+        Reads the stats daily rollups (local day of the user's profile timezone).
         """
-        from mindstack_app.core.extensions import db
-        from mindstack_app.models import ScoreLog
-        from datetime import datetime, time, timezone
-        import pytz
-        
-        user_tz = pytz.timezone(user_timezone) if user_timezone else pytz.UTC
-        
-        # Date filtering (UTC boundary for query)
-        start_dt = datetime.combine(start_date, time.min).replace(tzinfo=timezone.utc)
-        
-        query = db.session.query(ScoreLog.timestamp).filter(
-            ScoreLog.user_id == user_id,
-            ScoreLog.timestamp >= start_dt
-        )
-        
-        if item_types:
-            query = query.filter(ScoreLog.item_type.in_(item_types))
-        else:
-            query = query.filter(ScoreLog.item_type.in_(['FLASHCARD', 'QUIZ_MCQ', 'LESSON']))
-            
-        logs = query.all()
-        
-        # Grouping in Python for accurate local day boundaries
-        counts = {}
-        for (ts,) in logs:
-            if ts:
-                if ts.tzinfo is None:
-                    ts = pytz.UTC.localize(ts)
-                local_date = ts.astimezone(user_tz).date().isoformat()
-                counts[local_date] = counts.get(local_date, 0) + 1
-                
-        return counts
+        from mindstack_app.modules.stats.interface import StatsInterface
+        return StatsInterface.get_daily_rollup_map(user_id, 'reviews', start_date, end_date, item_types=item_types)
 
     @staticmethod
     def get_daily_new_items_map(user_id: int, start_date, end_date, item_types: Optional[List[str]] = None, user_timezone: Optional[str] = None) -> Dict[str, int]:
         """
-        Get a map of date string -> new items count (created_at) for a date range in local timezone.
+        Get a map of date string -> new items count (first review) for a date range in local timezone.
+        Reads the stats daily rollups.
         """
-        from mindstack_app.modules.fsrs.models import ItemMemoryState
-        from mindstack_app.models import LearningItem
-        from sqlalchemy import func
-        from mindstack_app.core.extensions import db
-        from datetime import datetime, time, timezone
-        
-        start_dt = datetime.combine(start_date, time.min).replace(tzinfo=timezone.utc)
-        
-        query = db.session.query(
-            func.date(ItemMemoryState.created_at).label('date'),
-            func.count(ItemMemoryState.item_id).label('count')
-        ).filter(
-            ItemMemoryState.user_id == user_id,
-            ItemMemoryState.created_at >= start_dt
-        )
-
-        if item_types:
-            # Need to join with LearningItem to filter by type
-            query = query.join(LearningItem, LearningItem.item_id == ItemMemoryState.item_id)\
-                         .filter(LearningItem.item_type.in_(item_types))
+        from mindstack_app.modules.stats.interface import StatsInterface
+        return StatsInterface.get_daily_rollup_map(user_id, 'new_items', start_date, end_date, item_types=item_types)
 
-        rows = query.group_by(func.date(ItemMemoryState.created_at)).all()
-        
-        return {str(row.date): int(row.count) for row in rows}
+    @staticmethod
+    def get_user_states_subquery(user_id: int):
+        """
+        Subquery of one user's memory states for SQL-side joins on `item_id`
+        (item listings with status filters, ORDER BY and keyset pagination).
+        Columns: item_id, state, stability, difficulty, due_date, last_review,
+        created_at, times_correct, times_incorrect, data.
+        """
+        from mindstack_app.core.extensions import db
+        return db.session.query(
+            ItemMemoryState.item_id,
+            ItemMemoryState.state,
+            ItemMemoryState.stability,
+            ItemMemoryState.difficulty,
+            ItemMemoryState.due_date,
+            ItemMemoryState.last_review,
+            ItemMemoryState.created_at,
+            ItemMemoryState.times_correct,
+            ItemMemoryState.times_incorrect,
+            ItemMemoryState.data,
+        ).filter(ItemMemoryState.user_id == user_id).subquery('user_states')
 
     @staticmethod
     def get_all_memory_states_query():
@@ -1139,13 +1130,13 @@ class FSRSInterface:
         """
         from .models import ItemMemoryState
         from mindstack_app.models import db
-        from sqlalchemy import func
         from sqlalchemy.orm.attributes import flag_modified
         
         progress = ItemMemoryState.query.filter_by(
             user_id=user_id,
             item_id=item_id
         ).first()
+        before = snapshot(progress) if progress else None
 
         if progress:
             if not progress.data:
@@ -1161,7 +1152,8 @@ class FSRSInterface:
             )
             db.session.add(progress)
 
-        progress.last_review = func.now()
+        progress.last_review = datetime.datetime.utcnow()
+        ContainerStatsService.record_change(user_id, item_id, before, snapshot(progress))
         # Note: DB commit is NOT handled here to allow transaction grouping in routes.
         return progress
 
@@ -1262,10 +1254,7 @@ class FSRSInterface:
         """
         Calculates retrievability for a given ItemMemoryState record.
         """
-        from .engine.core import FSRSEngine
-        from .services.scheduler_service import SchedulerService
-        from .services.optimizer_service import FSRSOptimizerService
-        from .services.settings_service import FSRSSettingsService
+        from .engine.batch import BatchRetrievabilityEngine
         
         if not record:
             return 0.0
@@ -1273,16 +1262,32 @@ class FSRSInterface:
         if now is None:
             now = datetime.datetime.utcnow()
 
-        # 1. Convert to DTO
-        dto = SchedulerService._model_to_dto(record)
-        
-        # 2. Get Engine
-        effective_weights = FSRSOptimizerService.get_user_parameters(record.user_id)
-        desired_retention = float(FSRSSettingsService.get('FSRS_DESIRED_RETENTION', 0.9))
-        engine = FSRSEngine(custom_weights=effective_weights, desired_retention=desired_retention)
-        
-        # 3. Calculate
-        return engine.get_realtime_retention(dto, now)
+        # Retention decay only depends on stability/elapsed time, so no per-user engine is needed.
+        return float(BatchRetrievabilityEngine.compute_for_states([record], now=now)[0])
+
+    @staticmethod
+    def get_due_item_ids(user_id: int, container_ids: List[int], due_after, due_before,
+                         item_types: Optional[List[str]] = None) -> List[int]:
+        """
+        IDs of learned items (state != 0) whose due_date falls in (due_after, due_before],
+        i.e. items that became due in that window. Uses the (user_id, due_date) index.
+        """
+        from mindstack_app.core.extensions import db
+        from mindstack_app.models import LearningItem
+        if not container_ids:
+            return []
+        query = db.session.query(ItemMemoryState.item_id).join(
+            LearningItem, LearningItem.item_id == ItemMemoryState.item_id
+        ).filter(
+            ItemMemoryState.user_id == user_id,
+            ItemMemoryState.state != 0,
+            ItemMemoryState.due_date > due_after,
+            ItemMemoryState.due_date <= due_before,
+            LearningItem.container_id.in_(container_ids)
+        )
+        if item_types:
+            query = query.filter(LearningItem.item_type.in_(item_types))
+        return [row.item_id for row in query.order_by(ItemMemoryState.due_date.asc()).all()]
 
     @staticmethod
     def apply_due_exclusion_filter(query, user_id: int, item_ids: List[int]):
@@ -0,0 +1,182 @@
+# File: mindstack_app/modules/fsrs/logics/container_stats_logic.py
+"""
+Container Stats Logic
+Pure helpers for the per-(user, container) memory aggregate.
+Không dính tới DB hay Flask context.
+
+Every ItemMemoryState row contributes a fixed set of counters (by state,
+mastered, hard, stability sum, correct/incorrect) and one due bucket. A review
+changes the aggregate by `contribution(after) - contribution(before)`.
+
+Due histogram (JSON):
+    '2024-01-02T05' -> items due in that UTC hour
+    'past'          -> items whose due hour has already elapsed
+Elapsed hour buckets are folded into 'past' ("re-bucketing"), so the due count
+at any moment is 'past' + the current hour bucket.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+STATE_NEW = 0
+STATE_LEARNING = 1
+STATE_REVIEW = 2
+STATE_RELEARNING = 3
+
+# Same thresholds as the per-request queries they replace
+MASTERED_STABILITY = 21.0
+HARD_DIFFICULTY = 7.5
+
+PAST_BUCKET = 'past'
+
+COUNTER_COLUMNS = (
+    'item_count', 'new_count', 'learning_count', 'review_count', 'relearning_count',
+    'mastered_count', 'hard_count', 'stability_sum', 'times_correct', 'times_incorrect',
+)
+
+_STATE_COLUMNS = {
+    STATE_NEW: 'new_count',
+    STATE_LEARNING: 'learning_count',
+    STATE_REVIEW: 'review_count',
+    STATE_RELEARNING: 'relearning_count',
+}
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def hour_bucket(moment: datetime) -> str:
+    """
+    >>> hour_bucket(datetime(2024, 1, 2, 5, 59))
+    '2024-01-02T05'
+    >>> hour_bucket(datetime(2024, 1, 2, 12, 30, tzinfo=timezone.utc))
+    '2024-01-02T12'
+    """
+    return _naive_utc(moment).strftime('%Y-%m-%dT%H')
+
+
+def due_bucket(due_date: Optional[datetime], now: datetime) -> Optional[str]:
+    """
+    Histogram key of a due date as seen at `now` (None if not scheduled).
+
+    >>> now = datetime(2024, 1, 2, 5, 10)
+    >>> due_bucket(datetime(2024, 1, 2, 5, 50), now), due_bucket(datetime(2024, 1, 1), now)
+    ('2024-01-02T05', 'past')
+    >>> due_bucket(None, now) is None
+    True
+    """
+    if due_date is None:
+        return None
+    key = hour_bucket(due_date)
+    return PAST_BUCKET if key < hour_bucket(now) else key
+
+
+def contribution(state: Optional[int], stability: Optional[float], difficulty: Optional[float],
+                 times_correct: Optional[int] = 0, times_incorrect: Optional[int] = 0) -> Dict[str, float]:
+    """
+    Counters contributed by one memory state row.
+
+    >>> sorted(contribution(2, 30.0, 8.0, 4, 1).items())
+    [('hard_count', 1), ('item_count', 1), ('mastered_count', 1), ('review_count', 1), ('stability_sum', 30.0), ('times_correct', 4), ('times_incorrect', 1)]
+    >>> contribution(0, 0.0, 0.0)
+    {'item_count': 1, 'new_count': 1}
+    """
+    state = state or STATE_NEW
+    stability = float(stability or 0.0)
+    values = {
+        'item_count': 1,
+        _STATE_COLUMNS.get(state, 'learning_count'): 1,
+        'mastered_count': 1 if stability >= MASTERED_STABILITY else 0,
+        'hard_count': 1 if (difficulty or 0.0) >= HARD_DIFFICULTY else 0,
+        'stability_sum': stability if state != STATE_NEW else 0.0,
+        'times_correct': int(times_correct or 0),
+        'times_incorrect': int(times_incorrect or 0),
+    }
+    return {key: value for key, value in values.items() if value}
+
+
+def snapshot(state: Any) -> Dict[str, Any]:
+    """Capture the fields of an ItemMemoryState-like object that feed the aggregate."""
+    return {
+        'state': state.state,
+        'stability': state.stability,
+        'difficulty': state.difficulty,
+        'times_correct': state.times_correct,
+        'times_incorrect': state.times_incorrect,
+        'due_date': state.due_date,
+        'last_review': state.last_review,
+    }
+
+
+def counter_delta(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Counter changes between two snapshots (None = row did not exist / was deleted).
+
+    >>> sorted(counter_delta({'state': 1, 'stability': 2.0, 'difficulty': 5.0},
+    ...                      {'state': 2, 'stability': 25.0, 'difficulty': 5.0}).items())
+    [('learning_count', -1), ('mastered_count', 1), ('review_count', 1), ('stability_sum', 23.0)]
+    """
+    delta: Dict[str, float] = {}
+    for sign, snap in ((-1, before), (1, after)):
+        if snap is None:
+            continue
+        values = contribution(snap.get('state'), snap.get('stability'), snap.get('difficulty'),
+                              snap.get('times_correct'), snap.get('times_incorrect'))
+        for key, value in values.items():
+            delta[key] = delta.get(key, 0) + sign * value
+    return {key: value for key, value in delta.items() if value}
+
+
+def histogram_delta(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]],
+                    now: datetime) -> Dict[str, int]:
+    """
+    >>> now = datetime(2024, 1, 2, 5, 10)
+    >>> histogram_delta({'due_date': datetime(2024, 1, 1)}, {'due_date': datetime(2024, 1, 5, 9)}, now)
+    {'past': -1, '2024-01-05T09': 1}
+    """
+    delta: Dict[str, int] = {}
+    for sign, snap in ((-1, before), (1, after)):
+        key = due_bucket(snap.get('due_date'), now) if snap else None
+        if key is not None:
+            delta[key] = delta.get(key, 0) + sign
+    return {key: value for key, value in delta.items() if value}
+
+
+def rebucket(histogram: Optional[Dict[str, int]], now: datetime) -> Dict[str, int]:
+    """
+    Fold elapsed hour buckets into 'past'.
+
+    >>> rebucket({'past': 1, '2024-01-01T23': 2, '2024-01-02T05': 3, '2024-01-03T00': 4}, datetime(2024, 1, 2, 5, 10))
+    {'past': 3, '2024-01-02T05': 3, '2024-01-03T00': 4}
+    """
+    current = hour_bucket(now)
+    result: Dict[str, int] = {PAST_BUCKET: 0}
+    for key, count in (histogram or {}).items():
+        target = PAST_BUCKET if key == PAST_BUCKET or key < current else key
+        result[target] = result.get(target, 0) + int(count or 0)
+    return {key: count for key, count in result.items() if count > 0}
+
+
+def apply_histogram_delta(histogram: Optional[Dict[str, int]], delta: Dict[str, int], now: datetime) -> Dict[str, int]:
+    """
+    >>> apply_histogram_delta({'past': 1}, {'past': -1, '2024-01-05T09': 1}, datetime(2024, 1, 2))
+    {'2024-01-05T09': 1}
+    """
+    result = rebucket(histogram, now)
+    for key, value in delta.items():
+        result[key] = result.get(key, 0) + value
+    return {key: count for key, count in result.items() if count > 0}
+
+
+def due_count(histogram: Optional[Dict[str, int]], now: datetime) -> int:
+    """
+    Items due at `now`: elapsed buckets plus the current hour (hour granularity).
+
+    >>> due_count({'past': 2, '2024-01-02T05': 1, '2024-01-02T06': 7}, datetime(2024, 1, 2, 5, 10))
+    3
+    """
+    current = hour_bucket(now)
+    return sum(int(count or 0) for key, count in (histogram or {}).items()
+               if key == PAST_BUCKET or key <= current)
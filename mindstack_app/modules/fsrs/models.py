@@ -38,6 +38,10 @@ class ItemMemoryState(db.Model):
 
     __table_args__ = (
         db.UniqueConstraint('user_id', 'item_id', name='uq_user_item_memory'),
+        # Per-user listings: status filters, due checks and "recent first" ordering
+        db.Index('ix_item_memory_states_user_state', 'user_id', 'state'),
+        db.Index('ix_item_memory_states_user_due', 'user_id', 'due_date'),
+        db.Index('ix_item_memory_states_user_last_review', 'user_id', 'last_review'),
     )
 
     def to_dict(self):
@@ -53,3 +57,36 @@ class ItemMemoryState(db.Model):
             'repetitions': self.repetitions,
             'lapses': self.lapses
         }
+
+
+class ContainerMemoryStats(db.Model):
+    """
+    Per-(user, container) aggregate of ItemMemoryState, maintained on every review.
+    Deck lists read one row per container instead of running COUNT/AVG queries.
+    See `logics/container_stats_logic.py` for the counters and the due histogram.
+    """
+    __tablename__ = 'container_memory_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id', ondelete='CASCADE'), primary_key=True)
+    container_id = db.Column(db.Integer, db.ForeignKey('learning_containers.container_id', ondelete='CASCADE'), primary_key=True)
+
+    item_count = db.Column(db.Integer, default=0, nullable=False)  # Rows in item_memory_states
+    new_count = db.Column(db.Integer, default=0, nullable=False)
+    learning_count = db.Column(db.Integer, default=0, nullable=False)
+    review_count = db.Column(db.Integer, default=0, nullable=False)
+    relearning_count = db.Column(db.Integer, default=0, nullable=False)
+    mastered_count = db.Column(db.Integer, default=0, nullable=False)  # stability >= 21
+    hard_count = db.Column(db.Integer, default=0, nullable=False)  # difficulty >= 7.5
+    stability_sum = db.Column(db.Float, default=0.0, nullable=False)  # Over state != 0
+    times_correct = db.Column(db.Integer, default=0, nullable=False)
+    times_incorrect = db.Column(db.Integer, default=0, nullable=False)
+    last_review = db.Column(db.DateTime(timezone=True))
+
+    # {'YYYY-MM-DDTHH': count, 'past': count} by UTC due hour
+    due_histogram = db.Column(db.JSON, nullable=True)
+
+    updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    @property
+    def learned_count(self) -> int:
+        return (self.item_count or 0) - (self.new_count or 0)
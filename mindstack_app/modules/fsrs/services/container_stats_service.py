@@ -0,0 +1,252 @@
+# File: mindstack_app/modules/fsrs/services/container_stats_service.py
+"""
+Container Stats Service
+=======================
+Per-(user, container) memory aggregate stored in `container_memory_stats`.
+
+- Write path: `record_change` applies the before/after delta of one
+  ItemMemoryState inside the caller's transaction (no commit).
+- Read path: `get_stats_map` returns stats for many containers with one
+  primary-key read. Missing rows are built once from ItemMemoryState
+  (insert-or-ignore, so concurrent first reads don't collide).
+- Maintenance: rows are dropped on resets / content deletion (rebuilt lazily);
+  a nightly job folds elapsed due buckets; `rebuild` is exposed as a CLI command.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from mindstack_app.core.extensions import db, scheduler
+from mindstack_app.models import LearningItem
+from mindstack_app.utils.db_session import insert_ignore, safe_commit
+from ..models import ItemMemoryState, ContainerMemoryStats
+from ..logics.container_stats_logic import (
+    COUNTER_COLUMNS, apply_histogram_delta, contribution, counter_delta, due_bucket,
+    due_count, histogram_delta, rebucket
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ContainerStatsService:
+    """Dịch vụ thống kê trí nhớ theo bộ thẻ (aggregate cập nhật tăng dần)."""
+
+    # Containers per IN (...) clause (SQLite variable limit)
+    CHUNK_SIZE = 500
+
+    # ── Write path ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _resolve_container_id(item_id: int) -> Optional[int]:
+        item = db.session.get(LearningItem, item_id)
+        return item.container_id if item else None
+
+    @classmethod
+    def record_change(cls, user_id: int, item_id: int, before: Optional[Dict[str, Any]],
+                      after: Optional[Dict[str, Any]], container_id: Optional[int] = None,
+                      now: Optional[datetime] = None) -> None:
+        """
+        Apply one memory state change (snapshots from `snapshot`, None = no row).
+        Does not commit: joins the caller's transaction together with the state.
+        """
+        container_id = container_id or cls._resolve_container_id(item_id)
+        if not container_id:
+            return
+        now = now or datetime.utcnow()
+
+        row = db.session.get(ContainerMemoryStats, (user_id, container_id), with_for_update=True)
+        if row is None:
+            # First touch of this container: build it from the states (autoflush
+            # includes the pending change, so no delta is applied on top).
+            cls._build(user_id, [container_id], now)
+            return
+
+        for column, value in counter_delta(before, after).items():
+            setattr(row, column, (getattr(row, column) or 0) + value)
+        row.due_histogram = apply_histogram_delta(row.due_histogram, histogram_delta(before, after, now), now)
+        last_review = (after or {}).get('last_review')
+        if last_review is not None and (row.last_review is None or _naive(last_review) > _naive(row.last_review)):
+            row.last_review = last_review
+
+    # ── Read path ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def to_dict(row: ContainerMemoryStats, now: Optional[datetime] = None) -> Dict[str, Any]:
+        now = now or datetime.utcnow()
+        learned = row.learned_count
+        return {
+            'total': row.item_count or 0,
+            'learned': learned,
+            'new': row.new_count or 0,
+            'learning': row.learning_count or 0,
+            'review': row.review_count or 0,
+            'relearning': row.relearning_count or 0,
+            'due': due_count(row.due_histogram, now),
+            'mastered': row.mastered_count or 0,
+            'hard': row.hard_count or 0,
+            'avg_stability': round((row.stability_sum or 0.0) / learned, 2) if learned > 0 else 0.0,
+            'times_correct': row.times_correct or 0,
+            'times_incorrect': row.times_incorrect or 0,
+            'last_review': row.last_review,
+        }
+
+    @classmethod
+    def get_stats_map(cls, user_id: int, container_ids: Iterable[int],
+                      now: Optional[datetime] = None) -> Dict[int, Dict[str, Any]]:
+        """{container_id: stats} for every requested container (one indexed read when warm)."""
+        now = now or datetime.utcnow()
+        container_ids = [cid for cid in dict.fromkeys(container_ids) if cid]
+        rows: Dict[int, ContainerMemoryStats] = {}
+        for start in range(0, len(container_ids), cls.CHUNK_SIZE):
+            chunk = container_ids[start:start + cls.CHUNK_SIZE]
+            for row in ContainerMemoryStats.query.filter(
+                ContainerMemoryStats.user_id == user_id,
+                ContainerMemoryStats.container_id.in_(chunk)
+            ):
+                rows[row.container_id] = row
+
+        missing = [cid for cid in container_ids if cid not in rows]
+        if missing:
+            rows.update(cls._build(user_id, missing, now))
+            safe_commit(db.session)
+
+        return {cid: cls.to_dict(rows[cid], now) for cid in container_ids}
+
+    @classmethod
+    def get_stats(cls, user_id: int, container_id: int) -> Dict[str, Any]:
+        return cls.get_stats_map(user_id, [container_id])[container_id]
+
+    # ── Build / maintenance ───────────────────────────────────────────
+
+    @classmethod
+    def _aggregate(cls, user_id: Optional[int], container_ids: Optional[List[int]],
+                   now: datetime) -> Dict[tuple, ContainerMemoryStats]:
+        """Compute aggregates from ItemMemoryState, keyed by (user_id, container_id)."""
+        query = db.session.query(
+            ItemMemoryState.user_id, LearningItem.container_id, ItemMemoryState.state,
+            ItemMemoryState.stability, ItemMemoryState.difficulty, ItemMemoryState.times_correct,
+            ItemMemoryState.times_incorrect, ItemMemoryState.due_date, ItemMemoryState.last_review
+        ).join(LearningItem, LearningItem.item_id == ItemMemoryState.item_id)
+        if user_id is not None:
+            query = query.filter(ItemMemoryState.user_id == user_id)
+        if container_ids is not None:
+            query = query.filter(LearningItem.container_id.in_(container_ids))
+
+        aggregates: Dict[tuple, ContainerMemoryStats] = {}
+        histograms: Dict[tuple, Dict[str, int]] = defaultdict(dict)
+        for row in query.yield_per(1000):
+            key = (row.user_id, row.container_id)
+            agg = aggregates.get(key)
+            if agg is None:
+                agg = aggregates[key] = ContainerMemoryStats(
+                    user_id=row.user_id, container_id=row.container_id,
+                    **{column: 0 for column in COUNTER_COLUMNS}
+                )
+            for column, value in contribution(row.state, row.stability, row.difficulty,
+                                              row.times_correct, row.times_incorrect).items():
+                setattr(agg, column, getattr(agg, column) + value)
+            bucket = due_bucket(row.due_date, now)
+            if bucket is not None:
+                histograms[key][bucket] = histograms[key].get(bucket, 0) + 1
+            if row.last_review is not None and (agg.last_review is None or _naive(row.last_review) > _naive(agg.last_review)):
+                agg.last_review = row.last_review
+
+        for key, agg in aggregates.items():
+            agg.due_histogram = histograms.get(key) or {}
+        return aggregates
+
+    @classmethod
+    def _build(cls, user_id: int, container_ids: List[int], now: datetime) -> Dict[int, ContainerMemoryStats]:
+        """
+        Create rows for containers that have none yet (empty rows included). Does not commit.
+        Insert-or-ignore: a row created meanwhile by a concurrent first read is kept.
+        """
+        columns = [column.name for column in ContainerMemoryStats.__table__.columns if column.name != 'updated_at']
+        for start in range(0, len(container_ids), cls.CHUNK_SIZE):
+            chunk = container_ids[start:start + cls.CHUNK_SIZE]
+            aggregates = cls._aggregate(user_id, chunk, now)
+            rows = []
+            for cid in chunk:
+                row = aggregates.get((user_id, cid)) or ContainerMemoryStats(
+                    user_id=user_id, container_id=cid, due_histogram={},
+                    **{column: 0 for column in COUNTER_COLUMNS}
+                )
+                rows.append({column: getattr(row, column) for column in columns})
+            insert_ignore(db.session, ContainerMemoryStats, rows, key_columns=('user_id', 'container_id'))
+
+        built: Dict[int, ContainerMemoryStats] = {}
+        for start in range(0, len(container_ids), cls.CHUNK_SIZE):
+            chunk = container_ids[start:start + cls.CHUNK_SIZE]
+            for row in ContainerMemoryStats.query.filter(
+                ContainerMemoryStats.user_id == user_id,
+                ContainerMemoryStats.container_id.in_(chunk)
+            ).populate_existing():
+                built[row.container_id] = row
+        return built
+
+    @classmethod
+    def rebuild(cls, user_id: Optional[int] = None, container_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Recompute aggregates from ItemMemoryState and replace the stored rows."""
+        now = datetime.utcnow()
+        cls.invalidate(user_id=user_id, container_ids=container_ids)
+        aggregates = cls._aggregate(user_id, container_ids, now)
+        db.session.add_all(aggregates.values())
+        safe_commit(db.session)
+        return {'success': True, 'row_count': len(aggregates)}
+
+    @staticmethod
+    def invalidate(user_id: Optional[int] = None, container_ids: Optional[List[int]] = None) -> None:
+        """Drop stored rows (rebuilt on next read). Does not commit."""
+        query = ContainerMemoryStats.query
+        if user_id is not None:
+            query = query.filter(ContainerMemoryStats.user_id == user_id)
+        if container_ids is not None:
+            query = query.filter(ContainerMemoryStats.container_id.in_(container_ids))
+        query.delete(synchronize_session=False)
+
+    @staticmethod
+    def rebucket_all(now: Optional[datetime] = None) -> int:
+        """Fold elapsed due buckets of every row into 'past' (keeps histograms small)."""
+        now = now or datetime.utcnow()
+        updated = 0
+        for row in ContainerMemoryStats.query.yield_per(500):
+            histogram = rebucket(row.due_histogram, now)
+            if histogram != (row.due_histogram or {}):
+                row.due_histogram = histogram
+                updated += 1
+        safe_commit(db.session)
+        return updated
+
+    @staticmethod
+    def run_rebucket():
+        """Scheduler job: nightly due re-bucketing."""
+        with scheduler.app.app_context():
+            try:
+                updated = ContainerStatsService.rebucket_all()
+                logger.info(f"Container stats re-bucketing done: {updated} rows.")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Container stats re-bucketing failed: {e}")
+
+    @staticmethod
+    def init_scheduler(app):
+        """Register the nightly re-bucketing job with APScheduler (04:00)."""
+        job_id = 'container_stats_rebucket'
+        if not scheduler.get_job(job_id):
+            scheduler.add_job(
+                id=job_id,
+                func=ContainerStatsService.run_rebucket,
+                trigger='cron',
+                hour=4,
+                minute=0,
+                replace_existing=True
+            )
+            logger.info("Container stats re-bucketing job registered at 04:00.")
+
+
+def _naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,92 @@
+# File: mindstack_app/modules/fsrs/services/engine_cache.py
+from __future__ import annotations
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from mindstack_app.modules.fsrs.engine.core import FSRSEngine
+from mindstack_app.modules.fsrs.services.settings_service import FSRSSettingsService
+from mindstack_app.modules.fsrs.services.optimizer_service import FSRSOptimizerService
+from ..config import DefaultConfig
+
+
+class FSRSEngineCache:
+    """
+    Process-wide LRU cache of constructed FSRS engines.
+
+    Engines are keyed by (user_id, parameter hash, desired_retention), so a
+    review no longer pays for `User.query.get` + building an `fsrs_rs_python.FSRS`
+    object. Entries must be evicted when a user's weights are retrained
+    (`invalidate_user`) or when the `srs` settings category changes (`clear`).
+    """
+
+    MAX_ENGINES = DefaultConfig.FSRS_ENGINE_CACHE_SIZE
+
+    _engines: "OrderedDict[Tuple[int, str, float], FSRSEngine]" = OrderedDict()
+    _user_params: "OrderedDict[int, Tuple[List[float], str]]" = OrderedDict()
+    _lock = threading.RLock()
+
+    @staticmethod
+    def _hash_parameters(params: List[float]) -> str:
+        raw = json.dumps([round(float(p), 8) for p in params])
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    @classmethod
+    def _get_user_parameters(cls, user_id: int) -> Tuple[List[float], str]:
+        with cls._lock:
+            cached = cls._user_params.get(user_id)
+            if cached is not None:
+                cls._user_params.move_to_end(user_id)
+                return cached
+
+        params = FSRSOptimizerService.get_user_parameters(user_id)
+        entry = (params, cls._hash_parameters(params))
+        with cls._lock:
+            cls._user_params[user_id] = entry
+            cls._user_params.move_to_end(user_id)
+            while len(cls._user_params) > cls.MAX_ENGINES:
+                cls._user_params.popitem(last=False)
+        return entry
+
+    @classmethod
+    def get_engine(cls, user_id: int, desired_retention: Optional[float] = None) -> FSRSEngine:
+        """Return a (possibly shared) engine for the user's current weights and retention target."""
+        if desired_retention is None:
+            desired_retention = float(FSRSSettingsService.get('FSRS_DESIRED_RETENTION', 0.9))
+        params, params_hash = cls._get_user_parameters(user_id)
+        key = (user_id, params_hash, round(float(desired_retention), 6))
+
+        with cls._lock:
+            engine = cls._engines.get(key)
+            if engine is not None:
+                cls._engines.move_to_end(key)
+                return engine
+
+        engine = FSRSEngine(custom_weights=params, desired_retention=desired_retention)
+        with cls._lock:
+            cls._engines[key] = engine
+            cls._engines.move_to_end(key)
+            while len(cls._engines) > cls.MAX_ENGINES:
+                cls._engines.popitem(last=False)
+        return engine
+
+    @classmethod
+    def invalidate_user(cls, user_id: int) -> None:
+        """Drop cached parameters and engines for one user (e.g. after training)."""
+        with cls._lock:
+            cls._user_params.pop(user_id, None)
+            for key in [k for k in cls._engines if k[0] == user_id]:
+                del cls._engines[key]
+
+    @classmethod
+    def clear(cls) -> None:
+        """Drop every cached engine (e.g. after the `srs` settings category changes)."""
+        with cls._lock:
+            cls._engines.clear()
+            cls._user_params.clear()
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            return {'engines': len(cls._engines), 'users': len(cls._user_params)}
@@ -39,11 +39,20 @@ class FSRSOptimizerService:
                 if user:
                     user.fsrs_parameters = params_list
                     db.session.commit()
+                    cls._on_parameters_saved(user_id)
             except Exception as e:
                 current_app.logger.error(f"[FsrsOptimizer] Failed to save params for user {user_id}: {e}")
                 
         return params_list
     
+    @classmethod
+    def _on_parameters_saved(cls, user_id: int) -> None:
+        """Evict cached engines built from the old weights and notify listeners."""
+        from mindstack_app.modules.fsrs.services.engine_cache import FSRSEngineCache
+        from mindstack_app.modules.fsrs.signals import parameters_updated
+        FSRSEngineCache.invalidate_user(user_id)
+        parameters_updated.send(cls, user_id=user_id)
+
     @classmethod
     def get_user_parameters(cls, user_id: int) -> List[float]:
         try:
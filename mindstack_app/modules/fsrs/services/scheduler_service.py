@@ -2,11 +2,13 @@ from typing import Dict, Any, Tuple, Optional
 import datetime
 import logging
 from mindstack_app.core.extensions import db
+from mindstack_app.utils.db_session import safe_commit, safe_rollback
 from mindstack_app.modules.fsrs.models import ItemMemoryState
-from mindstack_app.modules.fsrs.engine.core import FSRSEngine
 from mindstack_app.modules.fsrs.schemas import CardStateDTO, CardStateEnum, SrsResultDTO
 from mindstack_app.modules.fsrs.services.settings_service import FSRSSettingsService
-from mindstack_app.modules.fsrs.services.optimizer_service import FSRSOptimizerService
+from mindstack_app.modules.fsrs.services.engine_cache import FSRSEngineCache
+from mindstack_app.modules.fsrs.services.container_stats_service import ContainerStatsService
+from mindstack_app.modules.fsrs.logics.container_stats_logic import snapshot
 from mindstack_app.modules.fsrs.signals import card_reviewed
 from mindstack_app.modules.fsrs.exceptions import CardNotDueError, InvalidRatingError
 
@@ -69,6 +71,7 @@ class SchedulerService:
 
         # 1. Fetch Data
         item_state = SchedulerService._get_or_create_state(user_id, item_id)
+        before = snapshot(item_state) if item_state.state_id is not None else None
         card_dto = SchedulerService._model_to_dto(item_state)
         
         now = datetime.datetime.utcnow()
@@ -82,9 +85,7 @@ class SchedulerService:
             # Prepare dummy result for DTO
             retrievability = 0.0
             try:
-                effective_weights = FSRSOptimizerService.get_user_parameters(user_id)
-                desired_retention = float(FSRSSettingsService.get('FSRS_DESIRED_RETENTION', 0.9))
-                engine = FSRSEngine(custom_weights=effective_weights, desired_retention=desired_retention)
+                engine = FSRSEngineCache.get_engine(user_id)
                 card_for_r = SchedulerService._model_to_dto(item_state)
                 # This returns CURRENT retention based on PREVIOUS last_review (correct decay)
                 retrievability = engine.get_realtime_retention(card_for_r, now)
@@ -96,12 +97,10 @@ class SchedulerService:
             srs_result_next_due = item_state.due_date or now
         else:
             # 2. Get Configuration & Parameters
-            effective_weights = FSRSOptimizerService.get_user_parameters(user_id)
-            desired_retention = float(FSRSSettingsService.get('FSRS_DESIRED_RETENTION', 0.9))
             enable_fuzz = bool(FSRSSettingsService.get('FSRS_ENABLE_FUZZING', True))
             
-            # 3. Call Engine
-            engine = FSRSEngine(custom_weights=effective_weights, desired_retention=desired_retention)
+            # 3. Call Engine (cached per user / weights / retention)
+            engine = FSRSEngineCache.get_engine(user_id)
             
             try:
                 new_card_state, next_due, log = engine.review_card(
@@ -153,12 +152,13 @@ class SchedulerService:
         from sqlalchemy.orm.attributes import flag_modified
         flag_modified(item_state, 'data')
             
-        # 5. Commit
+        # 5. Commit (deferred to the caller's unit of work, if any)
         try:
             db.session.add(item_state)
-            db.session.commit()
+            ContainerStatsService.record_change(user_id, item_id, before, snapshot(item_state), now=now)
+            safe_commit(db.session)
         except Exception as e:
-            db.session.rollback()
+            safe_rollback(db.session)
             raise e
         
         # 6. Prepare Result & Emit Signal
@@ -205,6 +205,22 @@ class SchedulerService:
         
         try:
             item_state = ItemMemoryState.query.filter_by(user_id=user_id, item_id=item_id).first()
+            return SchedulerService.get_preview_intervals_for_state(user_id, item_state)
+        except Exception as e:
+            logger.error(f"FSRS get_preview_intervals failed for user={user_id}, item={item_id}: {e}")
+            return FALLBACK
+
+    @staticmethod
+    def get_preview_intervals_for_state(user_id: int, item_state: Optional[ItemMemoryState]) -> Dict[str, Dict[str, Any]]:
+        """
+        Preview intervals for an already loaded state (None = new card), no DB read.
+        """
+        FALLBACK = {
+            str(r): {'interval': 'N/A', 'stability': 0, 'difficulty': 0, 'retrievability': 0}
+            for r in range(1, 5)
+        }
+
+        try:
             if not item_state:
                 # Treat as new card
                 card_dto = CardStateDTO(state=CardStateEnum.NEW)
@@ -216,9 +232,7 @@ class SchedulerService:
                      # Calculate gap
                      pass 
 
-            effective_weights = FSRSOptimizerService.get_user_parameters(user_id)
-            desired_retention = float(FSRSSettingsService.get('FSRS_DESIRED_RETENTION', 0.9))
-            engine = FSRSEngine(custom_weights=effective_weights, desired_retention=desired_retention)
+            engine = FSRSEngineCache.get_engine(user_id)
             
             now = datetime.datetime.utcnow()
             previews = {}
@@ -248,8 +262,9 @@ class SchedulerService:
             return previews
             
         except Exception as e:
-            logger.error(f"FSRS get_preview_intervals failed for user={user_id}, item={item_id}: {e}")
+            logger.error(f"FSRS get_preview_intervals failed for user={user_id}: {e}")
             return FALLBACK
+
     @staticmethod
     def get_due_counts(user_id: int) -> Dict[str, int]:
         """
@@ -44,6 +44,9 @@ class FSRSSettingsService:
     def invalidate_cache(cls) -> None:
         cls._cache.clear()
         cls._cache_loaded = False
+        # Engines are keyed by desired retention; drop them with the settings they were built from.
+        from .engine_cache import FSRSEngineCache
+        FSRSEngineCache.clear()
 
     @classmethod
     def get(cls, key: str, default: Any = None) -> Any:
@@ -0,0 +1,76 @@
+import datetime
+import unittest
+
+from flask import Flask
+
+from mindstack_app.models import ContainerMemoryStats, LearningContainer, LearningItem, User, db
+from mindstack_app.modules.fsrs.interface import FSRSInterface
+from mindstack_app.modules.fsrs.services.container_stats_service import ContainerStatsService
+
+
+class TestContainerStats(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://')
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        user = User(username='u', email='u@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        container = LearningContainer(creator_user_id=user.user_id, container_type='FLASHCARD_SET', title='Set')
+        db.session.add(container)
+        db.session.flush()
+        items = [
+            LearningItem(container_id=container.container_id, item_type='FLASHCARD', content={'front': str(i)})
+            for i in range(3)
+        ]
+        db.session.add_all(items)
+        db.session.commit()
+        self.user_id, self.container_id = user.user_id, container.container_id
+        self.item_ids = [item.item_id for item in items]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def stats(self):
+        return ContainerStatsService.get_stats(self.user_id, self.container_id)
+
+    def test_marker_and_lesson_progress_rows_are_counted(self):
+        self.assertEqual(self.stats()['total'], 0)
+
+        FSRSInterface.toggle_item_marker(self.user_id, self.item_ids[0], 'favorite')
+        FSRSInterface.save_lesson_progress(self.user_id, self.item_ids[1], 50)
+        db.session.commit()
+        FSRSInterface.save_lesson_progress(self.user_id, self.item_ids[1], 80)
+        db.session.commit()
+
+        stats = self.stats()
+        self.assertEqual((stats['total'], stats['new']), (2, 2))
+        self.assertIsNotNone(stats['last_review'])
+        ContainerStatsService.rebuild(self.user_id, [self.container_id])
+        self.assertEqual({k: v for k, v in self.stats().items() if k != 'last_review'},
+                         {k: v for k, v in stats.items() if k != 'last_review'})
+
+    def test_concurrent_first_reads_do_not_collide(self):
+        now = datetime.datetime.utcnow()
+        FSRSInterface.toggle_item_marker(self.user_id, self.item_ids[0], 'favorite')
+        ContainerStatsService.invalidate(self.user_id)
+        db.session.commit()
+
+        # Two first reads building the same missing row
+        ContainerStatsService._build(self.user_id, [self.container_id], now)
+        rows = ContainerStatsService._build(self.user_id, [self.container_id], now)
+        db.session.commit()
+
+        self.assertEqual(rows[self.container_id].item_count, 1)
+        self.assertEqual(ContainerMemoryStats.query.count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import datetime
+import unittest
+from types import SimpleNamespace
+from mindstack_app.modules.fsrs.engine.core import FSRSEngine
+from mindstack_app.modules.fsrs.engine.batch import BatchRetrievabilityEngine
+from mindstack_app.modules.fsrs.schemas import CardStateDTO, CardStateEnum
+
+
+class TestBatchRetrievability(unittest.TestCase):
+
+    def setUp(self):
+        self.now = datetime.datetime(2026, 1, 10, 12, 0, 0)
+        self.states = [
+            SimpleNamespace(stability=0.0, last_review=None, state=CardStateEnum.NEW, repetitions=0),
+            SimpleNamespace(stability=5.0, last_review=self.now - datetime.timedelta(days=5), state=CardStateEnum.REVIEW, repetitions=3),
+            SimpleNamespace(stability=30.0, last_review=self.now - datetime.timedelta(days=2), state=CardStateEnum.REVIEW, repetitions=6),
+            SimpleNamespace(stability=0.0, last_review=self.now - datetime.timedelta(days=1), state=CardStateEnum.LEARNING, repetitions=1),
+            SimpleNamespace(stability=2.0, last_review=None, state=CardStateEnum.LEARNING, repetitions=1),
+            SimpleNamespace(stability=1.0, last_review=self.now + datetime.timedelta(hours=1), state=CardStateEnum.LEARNING, repetitions=1),
+            SimpleNamespace(stability=0.5, last_review=(self.now - datetime.timedelta(days=400)).replace(tzinfo=datetime.timezone.utc), state=CardStateEnum.RELEARNING, repetitions=9),
+        ]
+
+    def test_matches_scalar_engine(self):
+        """Vectorized result must equal FSRSEngine.get_realtime_retention row by row."""
+        engine = FSRSEngine()
+        expected = [
+            engine.get_realtime_retention(
+                CardStateDTO(stability=s.stability, reps=s.repetitions, state=s.state, last_review=s.last_review),
+                self.now
+            )
+            for s in self.states
+        ]
+        actual = BatchRetrievabilityEngine.compute_for_states(self.states, now=self.now)
+        for e, a in zip(expected, actual):
+            self.assertAlmostEqual(e, float(a), places=9)
+
+    def test_unreviewed_override(self):
+        """unreviewed_value applies to every row without last_review (interface semantics)."""
+        actual = BatchRetrievabilityEngine.compute_for_states(self.states, now=self.now, unreviewed_value=0.0)
+        self.assertEqual(float(actual[4]), 0.0)
+        self.assertEqual(float(actual[0]), 0.0)
+
+    def test_empty_and_buckets(self):
+        self.assertEqual(BatchRetrievabilityEngine.compute_for_states([], now=self.now).size, 0)
+        buckets = BatchRetrievabilityEngine.bucket_counts([0.1, 0.75, 0.95, 1.0])
+        self.assertEqual(buckets, {'weak': 1, 'medium': 1, 'strong': 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
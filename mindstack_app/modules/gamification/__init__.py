@@ -17,3 +17,10 @@ def setup_module(app):
     from . import events  # [FIX] Ensure event handlers are registered
     from .services.reward_manager import RewardManager
     RewardManager.init_listeners()
+
+    from .commands import register_commands
+    register_commands(app)
+
+    # Nightly reconciliation of materialized leaderboards against ScoreLog
+    from .services.leaderboard_aggregate_service import LeaderboardAggregateService
+    LeaderboardAggregateService.init_scheduler(app)
@@ -0,0 +1,27 @@
+# File: mindstack_app/modules/gamification/commands.py
+"""
+CLI commands for the Gamification module.
+
+Usage:
+    flask --app start_mindstack_app backfill-streaks
+    flask --app start_mindstack_app rebuild-leaderboards
+"""
+import click
+
+
+def register_commands(app):
+    """Attach gamification maintenance commands to `app.cli`."""
+
+    @app.cli.command('backfill-streaks')
+    def backfill_streaks_command():
+        """Rebuild every user's persisted streak from ScoreLog (one-time)."""
+        from .services.streak_service import StreakService
+        result = StreakService.backfill_all()
+        click.echo(f"Đã tính lại streak cho {result.get('synced_count', 0)} người dùng.")
+
+    @app.cli.command('rebuild-leaderboards')
+    def rebuild_leaderboards_command():
+        """Rebuild all materialized leaderboard buckets from ScoreLog."""
+        from .services.leaderboard_aggregate_service import LeaderboardAggregateService
+        result = LeaderboardAggregateService.rebuild()
+        click.echo(f"Đã dựng lại {result.get('bucket_count', 0)} bucket bảng xếp hạng.")
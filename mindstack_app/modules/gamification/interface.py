@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from .schemas import BadgeDTO, StreakDTO
 from .services.scoring_service import ScoreService
 from .services.badges_service import BadgeService
@@ -20,13 +20,50 @@ def get_streak(user_id: int) -> StreakDTO:
     streak = StreakService.get_user_streak(user_id)
     if not streak:
         return StreakDTO(user_id, 0, 0, None)
+    current_streak, longest_streak = StreakService.get_streak_values(user_id)
     return StreakDTO(
         user_id, 
-        streak.current_streak, 
-        streak.longest_streak, 
+        current_streak, 
+        longest_streak, 
         streak.last_activity_date.isoformat() if streak.last_activity_date else None
     )
 
+def get_streak_values(user_id: int) -> Tuple[int, int]:
+    """Get (current_streak, longest_streak) from the persisted streak record (O(1))."""
+    return StreakService.get_streak_values(user_id)
+
+def record_streak_activity(user_id: int) -> None:
+    """Advance the user's streak for activity now. Joins the caller's transaction (no commit)."""
+    StreakService.record_activity(user_id)
+
+def backfill_streaks() -> Dict[str, Any]:
+    """One-time rebuild of all persisted streaks from ScoreLog history."""
+    return StreakService.backfill_all()
+
+def record_leaderboard_score(user_id: int, amount: int, item_id: Optional[int] = None) -> None:
+    """Add a ScoreLog's points to the materialized leaderboards. Joins the caller's transaction."""
+    from .services.leaderboard_aggregate_service import LeaderboardAggregateService
+    LeaderboardAggregateService.record_score(user_id, amount, item_id)
+
+def get_leaderboard_entries(timeframe: str = 'all_time', limit: int = 10, container_id: int = 0) -> List[Dict[str, Any]]:
+    """
+    Top-N from materialized leaderboards.
+    timeframe: 'day' | 'week' | 'month' (calendar) | '7d' | '30d' (rolling) | 'all_time'.
+    container_id=0 is the global board.
+    """
+    from .services.leaderboard_aggregate_service import LeaderboardAggregateService
+    return LeaderboardAggregateService.get_top(timeframe, limit, container_id)
+
+def get_leaderboard_rank(user_id: int, timeframe: str = 'all_time', container_id: int = 0) -> Optional[Dict[str, Any]]:
+    """"My rank" on a materialized leaderboard (None if the user has no score in that period)."""
+    from .services.leaderboard_aggregate_service import LeaderboardAggregateService
+    return LeaderboardAggregateService.get_user_rank(user_id, timeframe, container_id)
+
+def rebuild_leaderboards() -> Dict[str, Any]:
+    """Rebuild all leaderboard buckets from ScoreLog (after bulk score changes)."""
+    from .services.leaderboard_aggregate_service import LeaderboardAggregateService
+    return LeaderboardAggregateService.rebuild()
+
 def get_user_progress(user_id: int) -> Dict[str, Any]:
     """
     Get gamification progress for a user.
@@ -38,7 +75,7 @@ def get_user_progress(user_id: int) -> Dict[str, Any]:
     from mindstack_app.models import User
     
     user = User.query.get(user_id)
-    streak = StreakService.get_user_streak(user_id)
+    current_streak, longest_streak = StreakService.get_streak_values(user_id)
     
     total_xp = user.total_score if user else 0
     
@@ -47,8 +84,8 @@ def get_user_progress(user_id: int) -> Dict[str, Any]:
     level = int(math.sqrt(total_xp / 100)) if total_xp > 0 else 1
     
     return {
-        'current_streak': streak.current_streak if streak else 0,
-        'longest_streak': streak.longest_streak if streak else 0,
+        'current_streak': current_streak,
+        'longest_streak': longest_streak,
         'total_xp': total_xp or 0,
         'level': max(1, level),
     }
@@ -93,3 +130,10 @@ def delete_items_gamification_data(user_id: int, item_ids: List[int]) -> bool:
     """
     return ScoreService.delete_items_data(user_id, item_ids)
 
+def rebuild_users_gamification_data(user_ids: List[int]) -> None:
+    """
+    Rebuild streaks and leaderboard buckets of these users from ScoreLog
+    after their ScoreLog rows were deleted directly. Commits.
+    """
+    ScoreService.rebuild_derived_data(user_ids)
+
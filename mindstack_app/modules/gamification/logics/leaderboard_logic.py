@@ -0,0 +1,70 @@
+"""
+Leaderboard Logic - Pure functions for leaderboard period bucketing.
+
+This module contains ONLY pure Python logic.
+NO database, NO Flask, NO model dependencies allowed.
+"""
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+PERIOD_DAY = 'day'
+PERIOD_WEEK = 'week'
+PERIOD_MONTH = 'month'
+PERIOD_ALL = 'all'
+PERIOD_TYPES = (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH, PERIOD_ALL)
+
+# Bucket "all-time" dùng một ngày cố định làm khóa
+ALL_TIME_START = date(1970, 1, 1)
+
+# Cửa sổ trượt (rolling) được cộng từ các bucket ngày
+ROLLING_WINDOWS = {'30d': 30, '7d': 7}
+
+_TIMEFRAME_ALIASES = {
+    None: PERIOD_ALL, '': PERIOD_ALL, 'all': PERIOD_ALL, 'all_time': PERIOD_ALL, 'alltime': PERIOD_ALL,
+    'day': PERIOD_DAY, 'today': PERIOD_DAY,
+    'week': PERIOD_WEEK,
+    'month': PERIOD_MONTH,
+}
+
+
+def period_starts(activity_date: date) -> Dict[str, date]:
+    """
+    Khóa bucket (ngày bắt đầu) của từng loại kỳ chứa `activity_date`.
+
+    Examples:
+        >>> period_starts(date(2024, 5, 16))['week']
+        datetime.date(2024, 5, 13)
+        >>> period_starts(date(2024, 5, 16))['month']
+        datetime.date(2024, 5, 1)
+    """
+    if isinstance(activity_date, datetime):
+        activity_date = activity_date.date()
+    return {
+        PERIOD_DAY: activity_date,
+        PERIOD_WEEK: activity_date - timedelta(days=activity_date.weekday()),  # Monday-start
+        PERIOD_MONTH: activity_date.replace(day=1),
+        PERIOD_ALL: ALL_TIME_START,
+    }
+
+
+def resolve_timeframe(timeframe: Optional[str], today: date) -> Tuple[str, date, Optional[date]]:
+    """
+    Chuyển timeframe của UI thành truy vấn trên bucket.
+
+    Returns:
+        (period_type, start, end)
+        - Kỳ lịch (day/week/month/all): đọc đúng 1 bucket, end = None.
+        - Cửa sổ trượt ('30d', '7d'): cộng các bucket ngày trong [start, end].
+
+    Examples:
+        >>> resolve_timeframe('all_time', date(2024, 5, 16))
+        ('all', datetime.date(1970, 1, 1), None)
+        >>> resolve_timeframe('30d', date(2024, 5, 16))
+        ('day', datetime.date(2024, 4, 17), datetime.date(2024, 5, 16))
+    """
+    if timeframe in ROLLING_WINDOWS:
+        days = ROLLING_WINDOWS[timeframe]
+        return PERIOD_DAY, today - timedelta(days=days - 1), today
+
+    period_type = _TIMEFRAME_ALIASES.get(timeframe, PERIOD_ALL)
+    return period_type, period_starts(today)[period_type], None
@@ -5,7 +5,7 @@ This module contains ONLY pure Python logic.
 NO database, NO Flask, NO model dependencies allowed.
 """
 from datetime import date, datetime, timedelta
-from typing import List, Set, Union
+from typing import List, Set, Tuple, Union
 
 
 def calculate_streak_from_dates(
@@ -102,3 +102,100 @@ def _normalize_to_date(val: Union[date, datetime, str, None]) -> Union[date, Non
                 return None
     
     return None
+
+
+def calculate_longest_streak(activity_dates: List[Union[date, datetime, str]]) -> int:
+    """
+    Tính chuỗi ngày liên tục dài nhất trong toàn bộ lịch sử.
+
+    Examples:
+        >>> dates = [date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 5)]
+        >>> calculate_longest_streak(dates)
+        2
+    """
+    learned_dates = sorted({d for d in (_normalize_to_date(v) for v in activity_dates) if d})
+    if not learned_dates:
+        return 0
+
+    longest = run = 1
+    for prev, curr in zip(learned_dates, learned_dates[1:]):
+        run = run + 1 if curr == prev + timedelta(days=1) else 1
+        longest = max(longest, run)
+    return longest
+
+
+def advance_streak(
+    current_streak: int,
+    longest_streak: int,
+    last_activity_date: Union[date, None],
+    activity_date: date
+) -> Tuple[int, int, date]:
+    """
+    Cập nhật streak tăng dần khi có hoạt động mới (O(1), không quét lịch sử).
+
+    Returns:
+        (current_streak, longest_streak, last_activity_date) mới.
+
+    Examples:
+        >>> advance_streak(3, 5, date(2024, 1, 2), date(2024, 1, 3))
+        (4, 5, datetime.date(2024, 1, 3))
+        >>> advance_streak(3, 5, date(2024, 1, 1), date(2024, 1, 3))
+        (1, 5, datetime.date(2024, 1, 3))
+    """
+    current_streak = current_streak or 0
+    longest_streak = longest_streak or 0
+
+    if last_activity_date is None or current_streak <= 0:
+        current_streak = 1
+    elif activity_date == last_activity_date:
+        pass  # Đã tính hôm nay
+    elif activity_date == last_activity_date + timedelta(days=1):
+        current_streak += 1
+    elif activity_date > last_activity_date:
+        current_streak = 1
+    else:
+        # Hoạt động cũ hơn ngày cuối (ghi log trễ) không làm thay đổi streak
+        return current_streak, max(longest_streak, current_streak), last_activity_date
+
+    return current_streak, max(longest_streak, current_streak), activity_date
+
+
+def effective_current_streak(current_streak: int, last_activity_date: Union[date, None], today: date) -> int:
+    """
+    Streak hiện tại "thực" tại ngày `today`: đứt nếu không hoạt động hôm nay hoặc hôm qua.
+
+    Examples:
+        >>> effective_current_streak(4, date(2024, 1, 2), today=date(2024, 1, 3))
+        4
+        >>> effective_current_streak(4, date(2024, 1, 1), today=date(2024, 1, 3))
+        0
+    """
+    if not last_activity_date or not current_streak:
+        return 0
+    if (today - last_activity_date).days > 1:
+        return 0
+    return current_streak
+
+
+def summarize_streak(
+    activity_dates: List[Union[date, datetime, str]]
+) -> Tuple[int, int, Union[date, None]]:
+    """
+    Tính toàn bộ trạng thái streak từ lịch sử (dùng cho backfill / rebuild).
+
+    Returns:
+        (current_streak, longest_streak, last_activity_date)
+
+    Examples:
+        >>> summarize_streak([date(2024, 1, 2), date(2024, 1, 3)])
+        (2, 2, datetime.date(2024, 1, 3))
+    """
+    learned_dates = [d for d in (_normalize_to_date(v) for v in activity_dates) if d]
+    if not learned_dates:
+        return 0, 0, None
+
+    last_activity_date = max(learned_dates)
+    # Streak "đang chạy" tại ngày hoạt động cuối; effective_current_streak sẽ
+    # trả về 0 khi đọc nếu chuỗi đã đứt.
+    current = calculate_streak_from_dates(learned_dates, last_activity_date)
+    return current, calculate_longest_streak(learned_dates), last_activity_date
@@ -87,3 +87,29 @@ class Streak(db.Model):
     longest_streak = db.Column(db.Integer, default=0)
     last_activity_date = db.Column(db.Date)
     updated_at = db.Column(db.DateTime(timezone=True), onupdate=func.now())
+
+
+class LeaderboardScore(db.Model):
+    """
+    Materialized score aggregate per (period, container, user).
+
+    period_type: 'day' | 'week' | 'month' | 'all'; period_start is the bucket key
+    (1970-01-01 for 'all'). container_id = 0 means the global board.
+    Maintained incrementally on every ScoreLog insert and reconciled periodically.
+    """
+    __tablename__ = 'leaderboard_scores'
+
+    id = db.Column(db.Integer, primary_key=True)
+    period_type = db.Column(db.String(10), nullable=False)
+    period_start = db.Column(db.Date, nullable=False)
+    container_id = db.Column(db.Integer, nullable=False, default=0)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id'), nullable=False)
+    score = db.Column(db.Integer, nullable=False, default=0)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        db.UniqueConstraint('period_type', 'period_start', 'container_id', 'user_id', name='_leaderboard_bucket_user_uc'),
+        db.Index('ix_leaderboard_scores_bucket_score', 'period_type', 'period_start', 'container_id', 'score'),
+        db.Index('ix_leaderboard_scores_user', 'user_id'),
+    )
@@ -5,6 +5,7 @@ Logic kiểm tra và cấp phát huy hiệu (Achievements).
 from datetime import datetime, timezone
 from mindstack_app.models import User
 from mindstack_app.core.extensions import db
+from mindstack_app.utils.db_session import safe_commit
 from flask import current_app
 from ..models import Badge, UserBadge, ScoreLog
 
@@ -69,11 +70,14 @@ class BadgeService:
                             timestamp=datetime.now(timezone.utc)
                         )
                         db.session.add(log)
+
+                        from .leaderboard_aggregate_service import LeaderboardAggregateService
+                        LeaderboardAggregateService.record_score(user_id, badge.reward_points, None, log.timestamp)
                     
                     new_badges.append(badge)
 
             if new_badges:
-                db.session.commit()
+                safe_commit(db.session)
 
             return new_badges
 
@@ -35,6 +35,9 @@ class GamificationKernel:
             timestamp=timestamp
         )
         db.session.add(log)
+
+        from .leaderboard_aggregate_service import LeaderboardAggregateService
+        LeaderboardAggregateService.record_score(user_id, amount, item_id, timestamp)
         return log
 
     @staticmethod
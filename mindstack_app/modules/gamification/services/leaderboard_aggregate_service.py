@@ -0,0 +1,303 @@
+# File: mindstack_app/modules/gamification/services/leaderboard_aggregate_service.py
+"""
+Leaderboard Aggregate Service
+=============================
+Materialized leaderboards: per-period (day/week/month/all-time), global and
+per-container score totals kept in `leaderboard_scores`.
+
+- Write path: `record_score` upserts 4 global (+4 container) buckets for every
+  ScoreLog row, inside the caller's transaction (no commit).
+- Read path: top-N and "my rank" read only the bucket rows, so latency does not
+  grow with ScoreLog. Rolling windows ('30d', '7d') sum at most N day buckets.
+- Reconciliation: `rebuild` recomputes buckets from ScoreLog (nightly job).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_
+
+from mindstack_app.core.extensions import db, scheduler
+from mindstack_app.models import User, LearningItem
+from mindstack_app.utils.db_session import safe_commit, upsert_increment
+from ..models import LeaderboardScore, ScoreLog
+from ..logics.leaderboard_logic import (
+    PERIOD_ALL, PERIOD_DAY, PERIOD_MONTH, PERIOD_WEEK, ALL_TIME_START,
+    period_starts, resolve_timeframe
+)
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderboardAggregateService:
+    """Dịch vụ bảng xếp hạng dựng sẵn (materialized) theo kỳ."""
+
+    # Day buckets older than this are pruned by the reconciliation job
+    DAY_BUCKET_RETENTION_DAYS = 62
+
+    # ── Write path ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _to_utc_date(timestamp: Optional[datetime]) -> date:
+        if timestamp is None:
+            return datetime.now(timezone.utc).date()
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc)
+        return timestamp.date()
+
+    @staticmethod
+    def _resolve_container_id(item_id: Optional[int]) -> Optional[int]:
+        if not item_id:
+            return None
+        item = db.session.get(LearningItem, item_id)
+        return item.container_id if item else None
+
+    @classmethod
+    def record_score(cls, user_id: int, amount: int, item_id: Optional[int] = None,
+                     timestamp: Optional[datetime] = None) -> None:
+        """
+        Add one ScoreLog row's worth of score to every bucket it belongs to.
+        Does not commit: joins the caller's transaction together with the ScoreLog.
+        """
+        activity_date = cls._to_utc_date(timestamp)
+        container_ids = [0]
+        container_id = cls._resolve_container_id(item_id)
+        if container_id:
+            container_ids.append(container_id)
+
+        rows = [
+            {
+                'period_type': period_type,
+                'period_start': period_start,
+                'container_id': cid,
+                'user_id': user_id,
+                'score': int(amount or 0),
+                'review_count': 1,
+            }
+            for period_type, period_start in period_starts(activity_date).items()
+            for cid in container_ids
+        ]
+        cls._upsert_increment(rows)
+
+    @staticmethod
+    def _upsert_increment(rows: List[Dict[str, Any]]) -> None:
+        """INSERT ... ON CONFLICT DO UPDATE score = score + excluded.score (one statement)."""
+        upsert_increment(
+            db.session, LeaderboardScore, rows,
+            key_columns=('period_type', 'period_start', 'container_id', 'user_id'),
+            counter_columns=('score', 'review_count'),
+        )
+
+    # ── Read path ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def _bucket_filter(period_type: str, start: date, end: Optional[date], container_id: int):
+        conditions = [
+            LeaderboardScore.period_type == period_type,
+            LeaderboardScore.container_id == (container_id or 0),
+        ]
+        if end is None:
+            conditions.append(LeaderboardScore.period_start == start)
+        else:
+            conditions.append(LeaderboardScore.period_start >= start)
+            conditions.append(LeaderboardScore.period_start <= end)
+        return and_(*conditions)
+
+    @classmethod
+    def _score_query(cls, timeframe: Optional[str], container_id: int, today: Optional[date]):
+        """(user_id, score, review_count) per user for the requested window."""
+        today = today or datetime.now(timezone.utc).date()
+        period_type, start, end = resolve_timeframe(timeframe, today)
+        bucket = cls._bucket_filter(period_type, start, end, container_id)
+
+        if end is None:
+            return db.session.query(
+                LeaderboardScore.user_id.label('user_id'),
+                LeaderboardScore.score.label('score'),
+                LeaderboardScore.review_count.label('review_count'),
+            ).filter(bucket)
+
+        return db.session.query(
+            LeaderboardScore.user_id.label('user_id'),
+            func.sum(LeaderboardScore.score).label('score'),
+            func.sum(LeaderboardScore.review_count).label('review_count'),
+        ).filter(bucket).group_by(LeaderboardScore.user_id)
+
+    @classmethod
+    def _ranked_query(cls, timeframe: Optional[str], container_id: int, today: Optional[date]):
+        """`_score_query` plus a competition rank (RANK(): ties share a rank, 1, 1, 3)."""
+        scores = cls._score_query(timeframe, container_id, today).subquery()
+        return db.session.query(
+            scores.c.user_id, scores.c.score, scores.c.review_count,
+            func.rank().over(order_by=scores.c.score.desc()).label('rank'),
+        ).subquery()
+
+    @classmethod
+    def get_top(cls, timeframe: Optional[str] = 'all_time', limit: int = 10, container_id: int = 0,
+                today: Optional[date] = None) -> List[Dict[str, Any]]:
+        """Top-N users for a period. Each row: rank, user_id, username, avatar_url, user_role, score, review_count."""
+        ranked = cls._ranked_query(timeframe, container_id, today)
+        rows = (
+            db.session.query(
+                User.user_id, User.username, User.avatar_url, User.user_role,
+                ranked.c.score, ranked.c.review_count, ranked.c.rank
+            )
+            .join(ranked, ranked.c.user_id == User.user_id)
+            .order_by(ranked.c.rank.asc(), User.user_id.asc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                'rank': int(row.rank),
+                'user_id': row.user_id,
+                'username': row.username,
+                'avatar_url': row.avatar_url,
+                'user_role': row.user_role,
+                'score': int(row.score or 0),
+                'review_count': int(row.review_count or 0),
+            }
+            for row in rows
+        ]
+
+    @classmethod
+    def get_user_rank(cls, user_id: int, timeframe: Optional[str] = 'all_time', container_id: int = 0,
+                      today: Optional[date] = None) -> Optional[Dict[str, Any]]:
+        """"My rank", same RANK() as `get_top`. None if the user has no score."""
+        ranked = cls._ranked_query(timeframe, container_id, today)
+        mine = (
+            db.session.query(ranked.c.rank, ranked.c.score, ranked.c.review_count)
+            .filter(ranked.c.user_id == user_id)
+            .first()
+        )
+        if mine is None:
+            return None
+
+        total = db.session.query(func.count()).select_from(ranked).scalar() or 0
+        return {
+            'rank': int(mine.rank),
+            'score': int(mine.score or 0),
+            'review_count': int(mine.review_count or 0),
+            'total_participants': int(total),
+        }
+
+    # ── Reconciliation ────────────────────────────────────────────────
+
+    @classmethod
+    def rebuild(cls, since: Optional[date] = None, user_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Recompute buckets from ScoreLog and replace the stored ones.
+
+        since=None rebuilds everything. Otherwise day/week/month buckets whose
+        period contains or follows `since` are rebuilt; the all-time bucket is
+        always rebuilt (it is an aggregate over the whole history).
+        user_ids limits the rebuild to those users' buckets (after ScoreLog deletes).
+        """
+        container_col = func.coalesce(LearningItem.container_id, 0)
+        day_col = func.date(ScoreLog.timestamp)
+
+        def grouped(*group_cols, lower_bound: Optional[date] = None):
+            query = (
+                db.session.query(
+                    ScoreLog.user_id, container_col, *group_cols,
+                    func.sum(ScoreLog.score_change), func.count(ScoreLog.log_id)
+                )
+                .outerjoin(LearningItem, LearningItem.item_id == ScoreLog.item_id)
+            )
+            if lower_bound is not None:
+                query = query.filter(ScoreLog.timestamp >= datetime.combine(lower_bound, datetime.min.time()))
+            if user_ids is not None:
+                query = query.filter(ScoreLog.user_id.in_(user_ids))
+            return query.group_by(ScoreLog.user_id, container_col, *group_cols).all()
+
+        buckets: Dict[tuple, List[int]] = defaultdict(lambda: [0, 0])
+
+        def add(period_type, period_start, container_id, user_id, score, count):
+            for cid in {0, container_id or 0}:
+                entry = buckets[(period_type, period_start, cid, user_id)]
+                entry[0] += int(score or 0)
+                entry[1] += int(count or 0)
+
+        # Periodic buckets
+        cutoffs = period_starts(since) if since else None
+        lower_bound = min(cutoffs[PERIOD_MONTH], cutoffs[PERIOD_WEEK]) if cutoffs else None
+        for user_id, container_id, day_value, score, count in grouped(day_col, lower_bound=lower_bound):
+            if day_value is None:
+                continue
+            activity_date = date.fromisoformat(day_value) if isinstance(day_value, str) else day_value
+            for period_type, period_start in period_starts(activity_date).items():
+                if period_type == PERIOD_ALL:
+                    continue
+                if cutoffs and period_start < cutoffs[period_type]:
+                    continue
+                add(period_type, period_start, container_id, user_id, score, count)
+
+        # All-time bucket
+        for user_id, container_id, score, count in grouped():
+            add(PERIOD_ALL, ALL_TIME_START, container_id, user_id, score, count)
+
+        # Replace stored buckets in the rebuilt range
+        stale_query = LeaderboardScore.query
+        if user_ids is not None:
+            stale_query = stale_query.filter(LeaderboardScore.user_id.in_(user_ids))
+        if cutoffs:
+            stale = or_(
+                LeaderboardScore.period_type == PERIOD_ALL,
+                *[
+                    and_(LeaderboardScore.period_type == p, LeaderboardScore.period_start >= cutoffs[p])
+                    for p in (PERIOD_DAY, PERIOD_WEEK, PERIOD_MONTH)
+                ]
+            )
+            stale_query = stale_query.filter(stale)
+        stale_query.delete(synchronize_session=False)
+
+        # Prune old day buckets (rolling windows never look that far back)
+        retention_start = datetime.now(timezone.utc).date() - timedelta(days=cls.DAY_BUCKET_RETENTION_DAYS)
+        LeaderboardScore.query.filter(
+            LeaderboardScore.period_type == PERIOD_DAY,
+            LeaderboardScore.period_start < retention_start
+        ).delete(synchronize_session=False)
+
+        new_rows = [
+            {
+                'period_type': period_type, 'period_start': period_start, 'container_id': cid,
+                'user_id': user_id, 'score': score, 'review_count': count,
+            }
+            for (period_type, period_start, cid, user_id), (score, count) in buckets.items()
+            if not (period_type == PERIOD_DAY and period_start < retention_start)
+        ]
+        if new_rows:
+            db.session.execute(LeaderboardScore.__table__.insert(), new_rows)
+        safe_commit(db.session)
+
+        return {'success': True, 'bucket_count': len(new_rows)}
+
+    @staticmethod
+    def run_reconciliation():
+        """Scheduler job: rebuild current periods (from the start of last month) against ScoreLog."""
+        with scheduler.app.app_context():
+            try:
+                today = datetime.now(timezone.utc).date()
+                last_month = (today.replace(day=1) - timedelta(days=1)).replace(day=1)
+                result = LeaderboardAggregateService.rebuild(since=last_month)
+                logger.info(f"Leaderboard reconciliation done: {result.get('bucket_count', 0)} buckets.")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Leaderboard reconciliation failed: {e}")
+
+    @staticmethod
+    def init_scheduler(app):
+        """Register the nightly reconciliation job with APScheduler (03:30)."""
+        job_id = 'leaderboard_reconciliation'
+        if not scheduler.get_job(job_id):
+            scheduler.add_job(
+                id=job_id,
+                func=LeaderboardAggregateService.run_reconciliation,
+                trigger='cron',
+                hour=3,
+                minute=30,
+                replace_existing=True
+            )
+            logger.info("Leaderboard reconciliation job registered at 03:30.")
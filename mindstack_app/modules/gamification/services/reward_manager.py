@@ -18,8 +18,7 @@ from mindstack_app.core.signals import (
 # For now, let's use what we have or generic ones.
 
 from mindstack_app.modules.gamification.services.gamification_kernel import GamificationKernel
-from ..logics.streak_logic import calculate_streak_from_dates
-from datetime import datetime, date, timezone
+from .streak_service import StreakService
 
 class RewardManager:
     """Handles event-driven rewards."""
@@ -60,8 +59,8 @@ class RewardManager:
                 )
                 GamificationKernel.update_user_total_score(user_id, points)
             
-            # 2. Update Streak
-            RewardManager._update_streak(user_id)
+            # 2. Update Streak (O(1), same path as award_points)
+            StreakService.record_activity(user_id)
             
             db.session.commit()
             
@@ -84,43 +83,8 @@ class RewardManager:
             # Often Login is enough for streak in some apps.
             # Let's say Login is enough for Streak maintenance but maybe not points.
             
-            RewardManager._update_streak(user.user_id)
+            StreakService.record_activity(user.user_id)
             db.session.commit()
         except Exception as e:
             current_app.logger.error(f"Error in reward manager (login): {e}")
             db.session.rollback()
-
-    @staticmethod
-    def _update_streak(user_id: int):
-        """Logic to calculate and update streak."""
-        # 1. Fetch activity dates from Kernel/DB
-        # We need to query ScoreLogs for dates. 
-        # Since logic is complex, good to move query to Kernel or keeping it here if specific.
-        # Let's query distinct dates from ScoreLog
-        from mindstack_app.models import ScoreLog
-        from sqlalchemy import func
-        
-        rows = (
-            db.session.query(func.date(ScoreLog.timestamp).label('d'))
-            .filter(ScoreLog.user_id == user_id)
-            .group_by(func.date(ScoreLog.timestamp))
-            .all()
-        )
-        dates = [r.d for r in rows]
-        
-        # 2. Calculate using stateless logic
-        today = datetime.now(timezone.utc).date()
-        current_streak = calculate_streak_from_dates(dates, today)
-        
-        # 3. Save to Streak model
-        # We need existing "longest" to update correctly
-        streak_record = GamificationKernel.get_or_create_streak(user_id)
-        longest = max(streak_record.longest_streak, current_streak)
-        
-        GamificationKernel.update_streak(
-            user_id=user_id,
-            current_val=current_streak,
-            longest_val=longest,
-            last_activity_date=today
-        )
-
@@ -2,15 +2,15 @@
 Score Service
 Logic quản lý điểm số và leaderboard.
 """
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from mindstack_app.core.extensions import db
+from mindstack_app.utils.db_session import safe_commit, safe_rollback
 from mindstack_app.models import User
 from ..models import ScoreLog
 from flask import current_app
 from sqlalchemy import func
 
 from mindstack_app.core.signals import score_awarded
-from ..logics.streak_logic import calculate_streak_from_dates
 
 
 class ScoreService:
@@ -45,7 +45,16 @@ class ScoreService:
             )
             
             db.session.add(log)
-            db.session.commit()
+
+            # Streak tăng dần (O(1)), cùng transaction với ScoreLog
+            from .streak_service import StreakService
+            StreakService.record_activity(user_id, log.timestamp)
+
+            # Bảng xếp hạng dựng sẵn (day/week/month/all, global + container)
+            from .leaderboard_aggregate_service import LeaderboardAggregateService
+            LeaderboardAggregateService.record_score(user_id, amount, item_id, log.timestamp)
+
+            safe_commit(db.session)
             
             # Emit signal để các module khác xử lý (badges, achievements, etc.)
             score_awarded.send(
@@ -65,7 +74,7 @@ class ScoreService:
             }
 
         except Exception as e:
-            db.session.rollback()
+            safe_rollback(db.session)
             current_app.logger.error(f"Lỗi khi cộng điểm cho user {user_id}: {e}", exc_info=True)
             return {'success': False, 'message': str(e)}
 
@@ -110,7 +119,10 @@ class ScoreService:
         """
         Lấy bảng xếp hạng top users.
         timeframe: 'day', 'week', 'month', 'all_time'
+        Đọc từ bảng xếp hạng dựng sẵn (leaderboard_scores), không quét ScoreLog.
         """
+        from .leaderboard_aggregate_service import LeaderboardAggregateService
+
         if timeframe == 'all_time':
             users = User.query.order_by(User.total_score.desc()).limit(limit).all()
             return [
@@ -120,54 +132,24 @@ class ScoreService:
                     'score': u.total_score or 0
                 } for u in users
             ]
-        
-        query = db.session.query(
-            User.username,
-            User.user_id,
-            func.sum(ScoreLog.score_change).label('period_score')
-        ).join(ScoreLog, User.user_id == ScoreLog.user_id)
-
-        now = datetime.now(timezone.utc)
-        if timeframe == 'day':
-            start_date = now - timedelta(days=1)
-            query = query.filter(ScoreLog.timestamp >= start_date)
-        elif timeframe == 'week':
-            # Monday-start week
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=now.weekday())
-            query = query.filter(ScoreLog.timestamp >= start_date)
-        elif timeframe == 'month':
-            start_date = now - timedelta(days=30)
-            query = query.filter(ScoreLog.timestamp >= start_date)
-        
-        results = query.group_by(User.user_id, User.username)\
-            .order_by(func.sum(ScoreLog.score_change).desc())\
-            .limit(limit).all()
-            
+
+        # 'month' ở đây là 30 ngày gần nhất (cửa sổ trượt)
+        window = '30d' if timeframe == 'month' else timeframe
+        results = LeaderboardAggregateService.get_top(window, limit)
         return [
             {
-                'username': r.username,
-                'user_id': r.user_id,
-                'score': int(r.period_score or 0)
+                'username': r['username'],
+                'user_id': r['user_id'],
+                'score': r['score']
             } for r in results
         ]
 
     @staticmethod
     def calculate_current_streak(user_id):
-        """Tính chuỗi ngày hoạt động liên tục (learning streak)."""
-        rows = (
-            db.session.query(func.date(ScoreLog.timestamp).label('activity_date'))
-            .filter(ScoreLog.user_id == user_id)
-            .group_by(func.date(ScoreLog.timestamp))
-            .order_by(func.date(ScoreLog.timestamp).desc())
-            .all()
-        )
-
-        if not rows:
-            return 0
-
-        # Extract dates from query results and delegate to pure logic
-        activity_dates = [row.activity_date for row in rows]
-        return calculate_streak_from_dates(activity_dates, datetime.now(timezone.utc).date())
+        """Tính chuỗi ngày hoạt động liên tục (learning streak) từ bảng user_streaks (O(1))."""
+        from .streak_service import StreakService
+        current_streak, _ = StreakService.get_streak_values(user_id)
+        return current_streak
 
     @staticmethod
     def sync_user_score(user_id: int) -> int:
@@ -208,10 +190,12 @@ class ScoreService:
     def delete_user_data(user_id: int) -> bool:
         """Delete all score logs for user (Reset Data)."""
         try:
+            from ..models import Streak, LeaderboardScore
             ScoreLog.query.filter_by(user_id=user_id).delete()
-            # Note: Badges and Streaks might need resetting too if they are stored in separate tables linked to user.
-            # Assuming ScoreLog is the main transactional data. 
-            # Streaks are calculated from logs, so deleting logs breaks streaks implicitly (or check StreakService).
+            LeaderboardScore.query.filter_by(user_id=user_id).delete()
+            # Note: Badges might need resetting too if they are stored in separate tables linked to user.
+            # The persisted streak is derived from ScoreLog, so drop it with the logs.
+            Streak.query.filter_by(user_id=user_id).delete()
             db.session.commit()
             return True
         except Exception as e:
@@ -229,9 +213,23 @@ class ScoreService:
                 ScoreLog.user_id == user_id, 
                 ScoreLog.item_id.in_(item_ids)
             ).delete(synchronize_session=False)
-            db.session.commit()
+            ScoreService.rebuild_derived_data([user_id])
             return True
         except Exception as e:
             db.session.rollback()
             current_app.logger.error(f"Error deleting item gamification data: {e}")
             return False
+
+    @staticmethod
+    def rebuild_derived_data(user_ids: list[int]) -> None:
+        """
+        Recompute the persisted streaks and leaderboard buckets of these users
+        from ScoreLog (after ScoreLog rows were deleted). Commits.
+        """
+        if not user_ids:
+            return
+        from .streak_service import StreakService
+        from .leaderboard_aggregate_service import LeaderboardAggregateService
+        for user_id in user_ids:
+            StreakService.rebuild_streak(user_id)
+        LeaderboardAggregateService.rebuild(user_ids=list(user_ids))
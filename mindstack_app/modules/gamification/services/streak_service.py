@@ -3,25 +3,31 @@
 Streak Service
 ==============
 Manages user learning streaks (consecutive days of activity).
+
+The `user_streaks` row is the source of truth and is advanced incrementally
+whenever points are awarded (O(1)). ScoreLog is only scanned to rebuild a
+missing row or during the one-time backfill.
 """
 
 from datetime import datetime, timezone
+from typing import Tuple
 from flask import current_app
 from sqlalchemy import func
 
 from mindstack_app.core.extensions import db
+from mindstack_app.utils.db_session import safe_commit, safe_rollback
 from ..models import Streak, ScoreLog
-from ..logics.streak_logic import calculate_streak_from_dates
+from ..logics.streak_logic import advance_streak, effective_current_streak, summarize_streak
 
 
 class StreakService:
     """Service for managing user activity streaks."""
-    
+
     @staticmethod
     def get_user_streak(user_id: int) -> Streak:
         """Get the streak record for a user."""
         return Streak.query.get(user_id)
-    
+
     @staticmethod
     def get_or_create_streak(user_id: int) -> Streak:
         """Get or create a streak record for a user."""
@@ -34,62 +40,116 @@ class StreakService:
             )
             db.session.add(streak)
         return streak
-    
+
+    @staticmethod
+    def _ensure_streak(user_id: int) -> Streak:
+        """Get the streak record, rebuilding it once from ScoreLog if it does not exist yet."""
+        streak = Streak.query.get(user_id)
+        if streak is None:
+            streak = StreakService.rebuild_streak(user_id)
+        return streak
+
+    @staticmethod
+    def rebuild_streak(user_id: int) -> Streak:
+        """Recompute the streak record from the full ScoreLog history (does not commit)."""
+        rows = (
+            db.session.query(func.date(ScoreLog.timestamp))
+            .filter(ScoreLog.user_id == user_id)
+            .group_by(func.date(ScoreLog.timestamp))
+            .all()
+        )
+        current, longest, last_date = summarize_streak([d for (d,) in rows])
+
+        streak = StreakService.get_or_create_streak(user_id)
+        streak.current_streak = current
+        streak.longest_streak = longest
+        streak.last_activity_date = last_date
+        return streak
+
+    @staticmethod
+    def record_activity(user_id: int, activity_at: datetime = None) -> Streak:
+        """
+        Advance the streak for an activity (UTC date of `activity_at`, default now).
+        Does not commit: the row joins the caller's transaction.
+        """
+        activity_date = (activity_at or datetime.now(timezone.utc)).date()
+        streak = StreakService._ensure_streak(user_id)
+        current, longest, last_date = advance_streak(
+            streak.current_streak, streak.longest_streak, streak.last_activity_date, activity_date
+        )
+        streak.current_streak = current
+        streak.longest_streak = longest
+        streak.last_activity_date = last_date
+        return streak
+
+    @staticmethod
+    def get_streak_values(user_id: int) -> Tuple[int, int]:
+        """
+        Return (current_streak, longest_streak) in O(1); current is 0 if the chain
+        is broken. Read-only: (0, 0) if the user has no streak record yet.
+        """
+        streak = StreakService.get_user_streak(user_id)
+        if streak is None:
+            return 0, 0
+        today_utc = datetime.now(timezone.utc).date()
+        current = effective_current_streak(streak.current_streak, streak.last_activity_date, today_utc)
+        return current, streak.longest_streak or 0
+
     @staticmethod
     def update_streak(user_id: int) -> dict:
         """
-        Update user streak based on their activity dates in UTC.
+        Record today's activity (UTC) and persist the streak.
         """
         try:
-            # 1. Query activity dates from ScoreLog (Raw UTC dates)
-            logs = (
-                db.session.query(ScoreLog.timestamp)
-                .filter(ScoreLog.user_id == user_id)
-                .order_by(ScoreLog.timestamp.desc())
-                .all()
-            )
-            
-            # Extract unique UTC dates
-            activity_dates_set = set()
-            for (ts,) in logs:
-                if ts:
-                    # In MindStack, all timestamps are stored as UTC
-                    activity_dates_set.add(ts.date())
-            
-            activity_dates = sorted(list(activity_dates_set), reverse=True)
-            
-            # 2. Calculate current streak using UTC today
-            today_utc = datetime.now(timezone.utc).date()
-            
-            current_streak = calculate_streak_from_dates(activity_dates, today_utc)
-            
-            # 3. Get or create streak record
-            streak = StreakService.get_or_create_streak(user_id)
-            
-            # 4. Update values
-            streak.current_streak = current_streak
-            streak.longest_streak = max(streak.longest_streak or 0, current_streak)
-            streak.last_activity_date = today_utc
-            
-            db.session.commit()
-            
+            streak = StreakService.record_activity(user_id)
+            safe_commit(db.session)
+
             return {
                 'current_streak': streak.current_streak,
                 'longest_streak': streak.longest_streak
             }
-            
+
         except Exception as e:
             current_app.logger.error(f"Error updating streak for user {user_id}: {e}")
-            db.session.rollback()
+            safe_rollback(db.session)
             return {'current_streak': 0, 'longest_streak': 0}
-    
+
+    @staticmethod
+    def backfill_all() -> dict:
+        """
+        One-time backfill: rebuild every user's streak record from ScoreLog
+        in a single grouped query.
+        """
+        rows = (
+            db.session.query(ScoreLog.user_id, func.date(ScoreLog.timestamp))
+            .group_by(ScoreLog.user_id, func.date(ScoreLog.timestamp))
+            .all()
+        )
+        dates_by_user = {}
+        for user_id, activity_date in rows:
+            dates_by_user.setdefault(user_id, []).append(activity_date)
+
+        existing = {s.user_id: s for s in Streak.query.all()}
+        for user_id, dates in dates_by_user.items():
+            current, longest, last_date = summarize_streak(dates)
+            streak = existing.get(user_id)
+            if streak is None:
+                streak = Streak(user_id=user_id)
+                db.session.add(streak)
+            streak.current_streak = current
+            streak.longest_streak = longest
+            streak.last_activity_date = last_date
+
+        safe_commit(db.session)
+        return {'success': True, 'synced_count': len(dates_by_user)}
+
     @staticmethod
     def get_streak_info(user_id: int) -> dict:
         """
         Get streak information strictly in UTC.
         """
         streak = StreakService.get_user_streak(user_id)
-        
+
         if not streak:
             return {
                 'current_streak': 0,
@@ -98,12 +158,12 @@ class StreakService:
                 'is_active_today': False,
                 'timezone': 'UTC'
             }
-        
+
         today_utc = datetime.now(timezone.utc).date()
         is_active_today = (streak.last_activity_date == today_utc) if streak.last_activity_date else False
-        
+
         return {
-            'current_streak': streak.current_streak or 0,
+            'current_streak': effective_current_streak(streak.current_streak, streak.last_activity_date, today_utc),
             'longest_streak': streak.longest_streak or 0,
             'last_activity_date': streak.last_activity_date.isoformat() if streak.last_activity_date else None,
             'is_active_today': is_active_today,
@@ -162,7 +162,10 @@ class LearningItem(db.Model):
 
     group = db.relationship('LearningGroup', backref=db.backref('items', lazy=True), lazy=True)
     
-    __table_args__ = (db.Index('ix_learning_items_search_text', 'search_text'),)
+    __table_args__ = (
+        db.Index('ix_learning_items_search_text', 'search_text'),
+        db.Index('ix_learning_items_container_type', 'container_id', 'item_type'),
+    )
 
     @property
     def ai_explanation(self):
@@ -183,19 +186,25 @@ class LearningItem(db.Model):
         from mindstack_app.modules.AI.interface import AIInterface
         AIInterface.set_primary_explanation(self.item_id, value)
 
-    def update_search_text(self):
-        if not self.content: return
+    @staticmethod
+    def build_search_text(item_type, content):
+        """search_text of an item (also used by bulk inserts that bypass the ORM)."""
+        if not content: return None
         text_parts = []
-        c = self.content
-        if self.item_type == 'FLASHCARD':
+        c = content
+        if item_type == 'FLASHCARD':
             if c.get('front'): text_parts.append(str(c['front']))
             if c.get('back'): text_parts.append(str(c['back']))
-        elif self.item_type == 'QUIZ_MCQ':
+        elif item_type == 'QUIZ_MCQ':
             if c.get('question'): text_parts.append(str(c['question']))
             if c.get('explanation'): text_parts.append(str(c['explanation']))
             options = c.get('options')
             if isinstance(options, dict): text_parts.extend([str(v) for v in options.values() if v])
-        self.search_text = " ".join(text_parts).lower()
+        return " ".join(text_parts).lower()
+
+    def update_search_text(self):
+        if not self.content: return
+        self.search_text = self.build_search_text(self.item_type, self.content)
 
 class UserContainerState(db.Model):
     __tablename__ = 'user_container_states'
@@ -365,6 +374,24 @@ class LearningSession(db.Model):
         processed_count = len(self.processed_item_ids) if self.processed_item_ids else 0
         return min(100, int((processed_count / self.total_items) * 100))
 
+class SessionAnswerReceipt(db.Model):
+    """
+    Result of a submission sent with an idempotency key. The unique
+    (session_id, idempotency_key) key makes a retried or concurrent duplicate
+    fail on insert instead of being applied twice.
+    """
+    __tablename__ = 'session_answer_receipts'
+
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey('learning_sessions.session_id', ondelete='CASCADE'), nullable=False)
+    idempotency_key = db.Column(db.String(100), nullable=False)
+    result = db.Column(JSON, nullable=True)
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        db.UniqueConstraint('session_id', 'idempotency_key', name='_session_answer_receipt_uc'),
+    )
+
 from sqlalchemy import event
 @event.listens_for(LearningItem, 'before_insert')
 @event.listens_for(LearningItem, 'before_update')
@@ -233,54 +233,9 @@ class LearningMetricsService:
 
     @classmethod
     def _compute_learning_streaks(cls, user_id: int) -> Tuple[int, int]:
-        rows = (
-            db.session.query(func.date(ScoreLog.timestamp).label('activity_date'))
-            .filter(ScoreLog.user_id == user_id)
-            .group_by(func.date(ScoreLog.timestamp))
-            .order_by(func.date(ScoreLog.timestamp))
-            .all()
-        )
-
-        if not rows: return 0, 0
-
-        dates = []
-        for row in rows:
-            val = row.activity_date
-            if isinstance(val, str):
-                try: val = date.fromisoformat(val)
-                except ValueError: continue
-            if isinstance(val, datetime): val = val.date()
-            if isinstance(val, date): dates.append(val)
-
-        if not dates: return 0, 0
-
-        date_set = set(dates)
-        today = date.today()
-        current_streak = 0
-        
-        sorted_dates = sorted(list(date_set))
-        last_active = sorted_dates[-1]
-        
-        if (today - last_active).days > 1:
-            current_streak = 0
-        else:
-            current_streak = 0
-            pointer = last_active
-            while pointer in date_set:
-                current_streak += 1
-                pointer -= timedelta(days=1)
-
-        longest = 1
-        run = 1
-        for i in range(len(sorted_dates) - 1):
-            if sorted_dates[i+1] == sorted_dates[i] + timedelta(days=1):
-                run += 1
-            else:
-                longest = max(longest, run)
-                run = 1
-        longest = max(longest, run)
-
-        return current_streak, longest
+        """Current and longest streak from the persisted per-user streak record (O(1))."""
+        from mindstack_app.modules.gamification.interface import get_streak_values
+        return get_streak_values(user_id)
 
     @classmethod
     def get_leaderboard(cls, timeframe: str = 'all_time', sort_by: str = 'total_score', limit: int = 50, viewer_user = None) -> List[Dict]:
@@ -393,35 +348,21 @@ class LearningMetricsService:
     def get_leaderboard(cls, timeframe: str = 'all_time', sort_by: str = 'total_score', limit: int = 50, viewer_user = None) -> List[Dict]:
         """
         Get leaderboard containing rank, user info, and score.
+        Served from the materialized leaderboards (calendar day/week/month, all-time).
         """
-        # Minimal implementation based on typical ScoreLog usage
-        # time handling
-        start_date = None
-        now = datetime.now(timezone.utc)
-        if timeframe == 'day': start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif timeframe == 'week': start_date = (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
-        elif timeframe == 'month': start_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        
-        query = db.session.query(
-            User.user_id, User.username, User.avatar_url,
-            func.sum(ScoreLog.score_change).label('total_score'),
-            func.count(ScoreLog.log_id).label('review_count')
-        ).join(ScoreLog, User.user_id == ScoreLog.user_id)
-        
-        if start_date:
-            query = query.filter(ScoreLog.timestamp >= start_date)
-            
-        results = query.group_by(User.user_id, User.username, User.avatar_url).order_by(desc('total_score')).limit(limit).all()
-        
+        from mindstack_app.modules.gamification.interface import get_leaderboard_entries
+
+        results = get_leaderboard_entries(timeframe=timeframe, limit=limit)
+
         leaderboard = []
-        for idx, row in enumerate(results, start=1):
+        for row in results:
             leaderboard.append({
-                'rank': idx,
-                'user_id': row.user_id,
-                'username': row.username,
-                'avatar_url': row.avatar_url,
-                'total_score': int(row.total_score or 0),
-                'review_count': int(row.review_count or 0)
+                'rank': row['rank'],
+                'user_id': row['user_id'],
+                'username': row['username'],
+                'avatar_url': row['avatar_url'],
+                'total_score': row['score'],
+                'review_count': row['review_count']
             })
             
         return leaderboard
@@ -430,68 +371,27 @@ class LearningMetricsService:
     def get_hourly_activity(cls, user_id: int, user_timezone: Optional[str] = None) -> Dict[str, Any]:
         """
         Get activity breakdown by hour of day (0-23) in local timezone.
+        Reads the all-time hour histogram maintained by the stats rollups.
         """
-        from sqlalchemy import func
-        from mindstack_app.models import ScoreLog
-        import pytz
-        
-        user_tz = pytz.timezone(user_timezone) if user_timezone else pytz.UTC
-        
-        # We need to fetch all relevant logs to convert timezone in Python
-        # extraction in SQL across different DBs is problematic for timezones.
-        logs = db.session.query(ScoreLog.timestamp).filter(
-            ScoreLog.user_id == user_id
-        ).all()
-        
-        hourly_counts = [0] * 24
-        for (ts,) in logs:
-            if ts:
-                if ts.tzinfo is None:
-                    ts = pytz.UTC.localize(ts)
-                local_ts = ts.astimezone(user_tz)
-                h = local_ts.hour
-                if 0 <= h < 24:
-                    hourly_counts[h] += 1
-                
+        from mindstack_app.modules.stats.interface import StatsInterface
+
         return {
             'labels': [f"{h}:00" for h in range(24)],
-            'data': hourly_counts
+            'data': StatsInterface.get_hourly_activity_histogram(user_id)
         }
 
     @classmethod
     def get_accuracy_trend(cls, user_id: int, days: int = 30, user_timezone: Optional[str] = None) -> Dict[str, Any]:
         """
-        Get daily average accuracy trend for the last N days in local timezone.
+        Get daily accuracy (correct / reviews, %) for the last N local days from the daily rollups.
         """
-        import pytz
-        user_tz = pytz.timezone(user_timezone) if user_timezone else pytz.UTC
-        now_local = datetime.now(user_tz)
-        end_date_local = now_local.date()
+        from mindstack_app.modules.stats.interface import StatsInterface
+
+        end_date_local = StatsInterface.get_rollup_today(user_id)
         start_date_local = end_date_local - timedelta(days=days-1)
-        
-        from sqlalchemy import func, case
-        from mindstack_app.models import ScoreLog
-        
-        # Calculate daily "Success" rate
-        # Need to query with UTC buffer
-        start_dt_utc = user_tz.localize(datetime.combine(start_date_local, time.min)).astimezone(pytz.UTC)
-        
-        logs = db.session.query(ScoreLog.timestamp, ScoreLog.score_change).filter(
-            ScoreLog.user_id == user_id,
-            ScoreLog.timestamp >= start_dt_utc
-        ).all()
-        
-        daily_stats = defaultdict(lambda: {'total': 0, 'success': 0})
-        for ts, sc in logs:
-            if ts:
-                if ts.tzinfo is None:
-                    ts = pytz.UTC.localize(ts)
-                local_date = ts.astimezone(user_tz).date()
-                if start_date_local <= local_date <= end_date_local:
-                    d_str = local_date.isoformat()
-                    daily_stats[d_str]['total'] += 1
-                    if sc > 0:
-                        daily_stats[d_str]['success'] += 1
+
+        reviews_map = StatsInterface.get_daily_rollup_map(user_id, 'reviews', start_date_local, end_date_local)
+        correct_map = StatsInterface.get_daily_rollup_map(user_id, 'correct', start_date_local, end_date_local)
         
         labels = []
         accuracy_data = []
@@ -499,9 +399,9 @@ class LearningMetricsService:
         current = start_date_local
         while current <= end_date_local:
             d_str = current.isoformat()
-            stats = daily_stats.get(d_str, {'total': 0, 'success': 0})
-            if stats['total'] > 0:
-                acc = round((stats['success'] / stats['total']) * 100, 1)
+            total = reviews_map.get(d_str, 0)
+            if total > 0:
+                acc = round((correct_map.get(d_str, 0) / total) * 100, 1)
             else:
                 acc = 0
             accuracy_data.append(acc)
@@ -547,11 +447,19 @@ class LearningMetricsService:
     def get_extended_dashboard_stats(cls, user_id: int, user_timezone: Optional[str] = None) -> Dict[str, Any]:
         """
         Get extended statistics for dashboard including averages and chart data in local timezone.
+        All series come from the daily rollups (DailyStat), keyed by the user's profile timezone.
         """
         import pytz
-        user_tz = pytz.timezone(user_timezone) if user_timezone else pytz.UTC
+        from mindstack_app.modules.stats.interface import StatsInterface
+
+        user = db.session.get(User, user_id)
+        user_timezone = user_timezone or (user.timezone if user else None)
+        try:
+            user_tz = pytz.timezone(user_timezone) if user_timezone else pytz.UTC
+        except pytz.UnknownTimeZoneError:
+            user_tz = pytz.UTC
         now_local = datetime.now(user_tz)
-        end_date_local = now_local.date()
+        end_date_local = StatsInterface.get_rollup_today(user_id)
         start_date_local = end_date_local - timedelta(days=29) 
         
         labels = []
@@ -564,39 +472,17 @@ class LearningMetricsService:
         
         # Date range for labels and maps
         date_range = [start_date_local + timedelta(days=x) for x in range(30)]
+
+        def rollup(metric, item_types=None):
+            return StatsInterface.get_daily_rollup_map(
+                user_id, metric, start_date_local, end_date_local, item_types=item_types
+            )
         
-        # A. Daily Scores (from ScoreLog)
-        start_dt_utc = user_tz.localize(datetime.combine(start_date_local, time.min)).astimezone(pytz.UTC)
-        score_logs = db.session.query(ScoreLog.timestamp, ScoreLog.score_change).filter(
-            ScoreLog.user_id == user_id,
-            ScoreLog.timestamp >= start_dt_utc
-        ).all()
-        
-        score_map = defaultdict(int)
-        for ts, sc in score_logs:
-            if ts:
-                if ts.tzinfo is None:
-                    ts = pytz.UTC.localize(ts)
-                local_date = ts.astimezone(user_tz).date().isoformat()
-                score_map[local_date] += int(sc or 0)
-
-        # NEW: Daily Use Time (from StudyLog)
-        study_logs = db.session.query(StudyLog.timestamp, StudyLog.review_duration).filter(
-            StudyLog.user_id == user_id,
-            StudyLog.timestamp >= start_dt_utc
-        ).all()
-        
-        use_time_map = defaultdict(int)
-        for ts, dur in study_logs:
-            if ts:
-                if ts.tzinfo is None:
-                    ts = pytz.UTC.localize(ts)
-                local_date = ts.astimezone(user_tz).date().isoformat()
-                use_time_map[local_date] += int(dur or 0)
-        
-        # B. Daily Reviews & New Items (FSRS)
-        reviews_map = FsrsInterface.get_daily_reviews_map(user_id, start_date_local, end_date_local, user_timezone=user_timezone)
-        new_items_map = FsrsInterface.get_daily_new_items_map(user_id, start_date_local, end_date_local, user_timezone=user_timezone)
+        # A. Daily Scores, Use Time, Reviews & New Items
+        score_map = rollup('points')
+        use_time_map = rollup('duration_ms')
+        reviews_map = rollup('reviews')
+        new_items_map = rollup('new_items')
         
         use_time_data = [] # in milliseconds
         for d in date_range:
@@ -626,8 +512,8 @@ class LearningMetricsService:
         avg_use_time_per_day_ms = round(total_use_time_30d_ms / 30, 1)
 
         # Averages (Split by Type)
-        reviews_map_fc = FsrsInterface.get_daily_reviews_map(user_id, start_date_local, end_date_local, item_types=['FLASHCARD'], user_timezone=user_timezone)
-        new_items_map_fc = FsrsInterface.get_daily_new_items_map(user_id, start_date_local, end_date_local, item_types=['FLASHCARD'], user_timezone=user_timezone)
+        reviews_map_fc = rollup('reviews', item_types=['FLASHCARD'])
+        new_items_map_fc = rollup('new_items', item_types=['FLASHCARD'])
         
         total_fc_reviews_corr = sum(max(0, reviews_map_fc.get(dt.isoformat(), 0) - new_items_map_fc.get(dt.isoformat(), 0)) for dt in date_range)
         total_fc_new = sum(new_items_map_fc.values())
@@ -635,8 +521,8 @@ class LearningMetricsService:
         avg_reviews_fc = round(total_fc_reviews_corr / 30, 1)
         avg_new_fc = round(total_fc_new / 30, 1)
 
-        reviews_map_quiz = FsrsInterface.get_daily_reviews_map(user_id, start_date_local, end_date_local, item_types=['QUIZ_MCQ'], user_timezone=user_timezone)
-        new_items_map_quiz = FsrsInterface.get_daily_new_items_map(user_id, start_date_local, end_date_local, item_types=['QUIZ_MCQ'], user_timezone=user_timezone)
+        reviews_map_quiz = rollup('reviews', item_types=['QUIZ_MCQ'])
+        new_items_map_quiz = rollup('new_items', item_types=['QUIZ_MCQ'])
         
         total_quiz_reviews_corr = sum(max(0, reviews_map_quiz.get(dt.isoformat(), 0) - new_items_map_quiz.get(dt.isoformat(), 0)) for dt in date_range)
         total_quiz_new = sum(new_items_map_quiz.values())
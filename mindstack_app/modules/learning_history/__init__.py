@@ -15,3 +15,6 @@ def setup_module(app):
     """Register module."""
     # Register models immediately to ensure they are picked up by migrations
     from . import models
+
+    from .services.log_writer import StudyLogWriter
+    StudyLogWriter.init_app(app)
@@ -0,0 +1,7 @@
+class DefaultConfig:
+    """Default configuration for Learning History module."""
+    # Write-behind StudyLog writer (off by default: every log is committed inline)
+    STUDY_LOG_WRITE_BEHIND = False
+    STUDY_LOG_QUEUE_SIZE = 5000         # Bounded queue; when full, writes fall back to sync
+    STUDY_LOG_BATCH_SIZE = 200          # Max rows per executemany batch
+    STUDY_LOG_FLUSH_INTERVAL_MS = 500   # Max time a row waits before being flushed
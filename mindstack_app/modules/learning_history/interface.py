@@ -56,6 +56,11 @@ class LearningHistoryInterface:
         """Count all study interactions for a user/item."""
         return HistoryQueryService.count_mode_reps(user_id, item_id, None)
 
+    @staticmethod
+    def get_total_counts(user_id: int, item_ids: List[int]) -> Dict[int, int]:
+        """Batch get_total_count: {item_id: count}."""
+        return HistoryQueryService.count_mode_reps_for_items(user_id, item_ids, None)
+
     @staticmethod
     def get_mode_count(user_id: int, item_id: int, mode: str) -> int:
         """Count study interactions for a user/item in a specific mode."""
@@ -66,6 +71,11 @@ class LearningHistoryInterface:
         """Get history for a specific item, optionally filtered by user."""
         return HistoryQueryService.get_item_history(item_id, limit, learning_mode, user_id=user_id)
     @staticmethod
+    def get_items_history(user_id: int, item_ids: List[int], limit: int = 50) -> Dict[int, List[Dict[str, Any]]]:
+        """Latest `limit` logs per item for one user ({item_id: [log, ...]}, newest first)."""
+        return HistoryQueryService.get_items_history(user_id, item_ids, limit)
+
+    @staticmethod
     def get_model_class():
         """
         [SYSTEM USE ONLY] Returns the StudyLog model class.
@@ -116,6 +126,12 @@ class LearningHistoryInterface:
         """Get community-wide metrics from learning history for an item."""
         return HistoryQueryService.get_item_community_metrics(item_id)
     @staticmethod
+    def iter_rollup_source(user_id: Optional[int] = None, since: Optional[datetime] = None,
+                           batch_size: int = 1000):
+        """Stream StudyLog rows (as dicts) for rebuilding the daily rollups."""
+        return HistoryQueryService.iter_rollup_source(user_id, since, batch_size)
+
+    @staticmethod
     def get_daily_activity_counts(user_id: int, start_date: datetime) -> List[Dict[str, Any]]:
         """Get daily activity counts for a user since start_date."""
         return HistoryQueryService.get_daily_activity_counts(user_id, start_date)
@@ -35,4 +35,5 @@ class StudyLog(db.Model):
     
     __table_args__ = (
         db.Index('ix_study_logs_user_timestamp', 'user_id', 'timestamp'),
+        db.Index('ix_study_logs_user_item', 'user_id', 'item_id'),
     )
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional, Type
+from typing import List, Dict, Any, Iterator, Optional, Type
 from datetime import datetime
 from sqlalchemy import func
 from mindstack_app.core.extensions import db
@@ -40,6 +40,20 @@ class HistoryQueryService:
             learning_mode=learning_mode
         ).count()
 
+    @staticmethod
+    def count_mode_reps_for_items(user_id: int, item_ids: List[int], learning_mode: Optional[str]) -> Dict[int, int]:
+        """Batch count_mode_reps: {item_id: count} (same filter, one GROUP BY query)."""
+        if not item_ids:
+            return {}
+        rows = db.session.query(StudyLog.item_id, func.count(StudyLog.log_id)).filter(
+            StudyLog.user_id == user_id,
+            StudyLog.item_id.in_(item_ids),
+            StudyLog.learning_mode == learning_mode if learning_mode is not None else StudyLog.learning_mode.is_(None)
+        ).group_by(StudyLog.item_id).all()
+        counts = {item_id: 0 for item_id in item_ids}
+        counts.update({item_id: count for item_id, count in rows})
+        return counts
+
     @staticmethod
     def get_logs_by_user(
         user_id: int, 
@@ -101,6 +115,43 @@ class HistoryQueryService:
             for log in logs
         ]
 
+    @staticmethod
+    def get_items_history(user_id: int, item_ids: List[int], limit: int = 50) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Batch get_item_history for one user: the latest `limit` logs of every item,
+        newest first, in one query (ROW_NUMBER() per item).
+        """
+        if not item_ids:
+            return {}
+        ranked = db.session.query(
+            StudyLog.log_id.label('log_id'),
+            func.row_number().over(
+                partition_by=StudyLog.item_id,
+                order_by=(StudyLog.timestamp.desc(), StudyLog.log_id.desc())
+            ).label('rn')
+        ).filter(
+            StudyLog.user_id == user_id,
+            StudyLog.item_id.in_(item_ids)
+        ).subquery()
+        logs = StudyLog.query.join(ranked, ranked.c.log_id == StudyLog.log_id).filter(
+            ranked.c.rn <= limit
+        ).order_by(StudyLog.item_id, StudyLog.timestamp.desc(), StudyLog.log_id.desc()).all()
+
+        history = {item_id: [] for item_id in item_ids}
+        for log in logs:
+            history[log.item_id].append({
+                'timestamp': log.timestamp,
+                'rating': log.rating,
+                'is_correct': log.is_correct,
+                'learning_mode': log.learning_mode,
+                'review_duration': log.review_duration,
+                'user_answer': log.user_answer,
+                'gamification_snapshot': log.gamification_snapshot,
+                'fsrs_snapshot': log.fsrs_snapshot,
+                'context_snapshot': log.context_snapshot
+            })
+        return history
+
     @staticmethod
     def get_study_log_timeline(user_id: int, item_ids: List[int], start_date: datetime) -> List[Dict[str, Any]]:
         """Get timeline data for specific items."""
@@ -250,6 +301,44 @@ class HistoryQueryService:
         
         return [{'date': r.date, 'count': r.count} for r in results]
 
+    @staticmethod
+    def iter_rollup_source(user_id: Optional[int] = None, since: Optional[datetime] = None,
+                           batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the StudyLog columns needed to rebuild daily rollups, in log_id order.
+        `is_first_review` marks the user's first ever log of the item.
+        """
+        from .history_recorder import HistoryRecorder
+
+        first_logs = db.session.query(
+            func.min(StudyLog.log_id).label('log_id')
+        ).group_by(StudyLog.user_id, StudyLog.item_id)
+        if user_id is not None:
+            first_logs = first_logs.filter(StudyLog.user_id == user_id)
+        first_logs = first_logs.subquery()
+
+        query = db.session.query(
+            StudyLog.log_id, StudyLog.user_id, StudyLog.item_id, StudyLog.timestamp,
+            StudyLog.learning_mode, StudyLog.is_correct, StudyLog.review_duration,
+            StudyLog.gamification_snapshot, first_logs.c.log_id.label('first_log_id')
+        ).outerjoin(first_logs, first_logs.c.log_id == StudyLog.log_id)
+        if user_id is not None:
+            query = query.filter(StudyLog.user_id == user_id)
+        if since is not None:
+            query = query.filter(StudyLog.timestamp >= since)
+
+        for row in query.order_by(StudyLog.log_id).yield_per(batch_size):
+            yield {
+                'user_id': row.user_id,
+                'item_id': row.item_id,
+                'timestamp': row.timestamp,
+                'learning_mode': row.learning_mode,
+                'is_correct': bool(row.is_correct),
+                'review_duration': row.review_duration or 0,
+                'points': HistoryRecorder.points_from_snapshot(row.gamification_snapshot),
+                'is_first_review': row.first_log_id is not None,
+            }
+
     @staticmethod
     def delete_items_history(item_ids: List[int]) -> int:
         """Delete history for specific items (Admin/Reset)."""
@@ -1,7 +1,11 @@
 # File: mindstack_app/modules/learning_history/services/history_recorder.py
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional
 from mindstack_app.core.extensions import db
+from mindstack_app.core.signals import study_logged
+from mindstack_app.utils.db_session import unit_of_work
 from ..models import StudyLog
+from .log_writer import StudyLogWriter
 
 class HistoryRecorder:
     """
@@ -29,6 +33,9 @@ class HistoryRecorder:
             fsrs_snapshot: State of FSRS parameters after review
             game_snapshot: Points earned, streak info, breakdown
             context_snapshot: Detailed context (Reps, Device, Pre-values)
+
+        In write-behind mode (STUDY_LOG_WRITE_BEHIND) the row is queued for the
+        background batch writer and a transient, unsaved StudyLog is returned.
         """
         from flask import request, has_request_context
         
@@ -51,6 +58,7 @@ class HistoryRecorder:
                         device_name = platform.capitalize()
             context_snapshot['input_device'] = device_name
         log = StudyLog(
+            timestamp=datetime.now(timezone.utc),
             user_id=user_id,
             item_id=item_id,
             
@@ -71,7 +79,54 @@ class HistoryRecorder:
             context_snapshot=context_snapshot
         )
         
-        db.session.add(log)
-        db.session.commit()
+        # Checked before the row is added (autoflush would otherwise find it)
+        is_first_review = not HistoryRecorder._has_previous_log(user_id, item_id)
+
+        # The rollups written by study_logged subscribers share the StudyLog's
+        # commit (or the caller's unit of work, which then commits both)
+        with unit_of_work(db.session):
+            if not StudyLogWriter.enqueue(HistoryRecorder._to_row(log)):
+                db.session.add(log)
+
+            study_logged.send(
+                HistoryRecorder,
+                user_id=user_id,
+                item_id=item_id,
+                timestamp=log.timestamp,
+                learning_mode=log.learning_mode,
+                is_correct=bool(log.is_correct),
+                review_duration=log.review_duration or 0,
+                points=HistoryRecorder.points_from_snapshot(game_snapshot),
+                is_first_review=is_first_review
+            )
         
         return log
+
+    @staticmethod
+    def _has_previous_log(user_id: int, item_id: int) -> bool:
+        # Write-behind: a log still in the writer's queue is not in the table yet
+        if StudyLogWriter.has_pending(user_id, item_id):
+            return True
+        return db.session.query(
+            StudyLog.query.filter_by(user_id=user_id, item_id=item_id).exists()
+        ).scalar()
+
+    @staticmethod
+    def points_from_snapshot(game_snapshot: Optional[Dict[str, Any]]) -> int:
+        """Points earned by one interaction ('score_earned' or the driver's 'total_score')."""
+        if not game_snapshot:
+            return 0
+        value = game_snapshot.get('score_earned', game_snapshot.get('total_score', 0))
+        try:
+            return int(value or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    @staticmethod
+    def _to_row(log: StudyLog) -> Dict[str, Any]:
+        """Column dict for bulk insert (everything except the autoincrement id)."""
+        return {
+            column.name: getattr(log, column.name)
+            for column in StudyLog.__table__.columns
+            if column.name != 'log_id'
+        }
@@ -0,0 +1,195 @@
+# File: mindstack_app/modules/learning_history/services/log_writer.py
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import insert
+from mindstack_app.core.extensions import db
+from mindstack_app.utils.db_session import safe_commit
+from ..config import DefaultConfig
+from ..models import StudyLog
+
+logger = logging.getLogger(__name__)
+
+
+class StudyLogWriter:
+    """
+    Optional write-behind writer for StudyLog rows.
+
+    Rows are pushed onto a bounded in-process queue and a single background
+    thread bulk-inserts them (one `executemany` + one commit per batch), so the
+    answer endpoint no longer waits on the SQLite write lock for audit rows.
+    Enabled with `STUDY_LOG_WRITE_BEHIND`; when disabled, not started, or the
+    queue is full, `enqueue` returns False and the caller writes synchronously.
+    """
+
+    _queue: Optional["queue.Queue[Dict[str, Any]]"] = None
+    _thread: Optional[threading.Thread] = None
+    _stop_event = threading.Event()
+    _app = None
+    _batch_size = DefaultConfig.STUDY_LOG_BATCH_SIZE
+    _flush_interval = DefaultConfig.STUDY_LOG_FLUSH_INTERVAL_MS / 1000.0
+    _atexit_registered = False
+    # (user_id, item_id) -> rows queued or being written (not committed yet)
+    _pending: "Counter[Tuple[int, int]]" = Counter()
+    _pending_lock = threading.Lock()
+
+    # A failed batch is retried, then written row by row (only failing rows are dropped)
+    BATCH_RETRIES = 3
+    RETRY_DELAY = 0.2
+
+    @classmethod
+    def init_app(cls, app) -> None:
+        """Start the background writer if write-behind is enabled in config."""
+        if not app.config.get('STUDY_LOG_WRITE_BEHIND', DefaultConfig.STUDY_LOG_WRITE_BEHIND):
+            return
+        if cls.is_running():
+            return
+
+        cls._app = app
+        cls._batch_size = max(1, int(app.config.get('STUDY_LOG_BATCH_SIZE', DefaultConfig.STUDY_LOG_BATCH_SIZE)))
+        cls._flush_interval = max(0.01, int(app.config.get(
+            'STUDY_LOG_FLUSH_INTERVAL_MS', DefaultConfig.STUDY_LOG_FLUSH_INTERVAL_MS
+        )) / 1000.0)
+        cls._queue = queue.Queue(maxsize=int(app.config.get('STUDY_LOG_QUEUE_SIZE', DefaultConfig.STUDY_LOG_QUEUE_SIZE)))
+        cls._stop_event.clear()
+        cls._thread = threading.Thread(target=cls._run, name='study-log-writer', daemon=True)
+        cls._thread.start()
+
+        if not cls._atexit_registered:
+            atexit.register(cls.shutdown)
+            cls._atexit_registered = True
+        app.logger.info("[StudyLogWriter] Write-behind mode enabled")
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls._thread is not None and cls._thread.is_alive()
+
+    @classmethod
+    def enqueue(cls, row: Dict[str, Any]) -> bool:
+        """Queue a StudyLog column dict. Returns False if the caller must write it itself."""
+        if not cls.is_running() or cls._stop_event.is_set():
+            return False
+        key = (row.get('user_id'), row.get('item_id'))
+        with cls._pending_lock:
+            cls._pending[key] += 1
+        try:
+            cls._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            cls._release([row])
+            logger.warning("[StudyLogWriter] Queue full, falling back to synchronous write")
+            return False
+
+    @classmethod
+    def has_pending(cls, user_id: int, item_id: int) -> bool:
+        """True if a log of this (user, item) is queued or being written."""
+        with cls._pending_lock:
+            return cls._pending.get((user_id, item_id), 0) > 0
+
+    @classmethod
+    def _release(cls, rows: List[Dict[str, Any]]) -> None:
+        with cls._pending_lock:
+            for row in rows:
+                key = (row.get('user_id'), row.get('item_id'))
+                cls._pending[key] -= 1
+                if cls._pending[key] <= 0:
+                    del cls._pending[key]
+
+    @classmethod
+    def _drain(cls, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Top up `batch` from the queue without blocking, up to the batch size."""
+        while len(batch) < cls._batch_size:
+            try:
+                batch.append(cls._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    @classmethod
+    def _run(cls) -> None:
+        while not cls._stop_event.is_set():
+            try:
+                first = cls._queue.get(timeout=cls._flush_interval)
+            except queue.Empty:
+                continue
+
+            # Give the batch a chance to fill up before taking the write lock
+            deadline = time.monotonic() + cls._flush_interval
+            batch = cls._drain([first])
+            while len(batch) < cls._batch_size and time.monotonic() < deadline and not cls._stop_event.is_set():
+                time.sleep(min(0.05, cls._flush_interval))
+                cls._drain(batch)
+
+            cls._write_batch(batch)
+
+    @classmethod
+    def _insert(cls, rows: List[Dict[str, Any]]) -> None:
+        try:
+            db.session.execute(insert(StudyLog), rows)
+            safe_commit(db.session)
+        except Exception:
+            db.session.rollback()
+            raise
+
+    @classmethod
+    def _write_batch(cls, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert a batch. study_logged has already fired for these rows, so a
+        failed batch is retried, then written row by row: only rows that fail
+        on their own are dropped.
+        """
+        if not rows:
+            return
+        with cls._app.app_context():
+            try:
+                for attempt in range(cls.BATCH_RETRIES):
+                    try:
+                        cls._insert(rows)
+                        return
+                    except Exception as e:
+                        logger.warning(f"[StudyLogWriter] Batch of {len(rows)} logs failed "
+                                       f"(attempt {attempt + 1}/{cls.BATCH_RETRIES}): {e}")
+                        time.sleep(cls.RETRY_DELAY * (2 ** attempt))
+
+                dropped = 0
+                for row in rows:
+                    try:
+                        cls._insert([row])
+                    except Exception as e:
+                        dropped += 1
+                        logger.error(f"[StudyLogWriter] Dropped log of user {row.get('user_id')} "
+                                     f"item {row.get('item_id')}: {e}", exc_info=True)
+                if dropped:
+                    logger.error(f"[StudyLogWriter] {dropped} of {len(rows)} logs could not be written")
+            finally:
+                cls._release(rows)
+                db.session.remove()
+
+    @classmethod
+    def flush(cls) -> int:
+        """Synchronously write everything still queued. Returns the number of rows flushed."""
+        if cls._queue is None or cls._app is None:
+            return 0
+        total = 0
+        while True:
+            batch = cls._drain([])
+            if not batch:
+                return total
+            cls._write_batch(batch)
+            total += len(batch)
+
+    @classmethod
+    def shutdown(cls, timeout: float = 5.0) -> None:
+        """Stop the background thread and flush remaining rows (registered with atexit)."""
+        if cls._thread is None:
+            return
+        cls._stop_event.set()
+        cls._thread.join(timeout=timeout)
+        flushed = cls.flush()
+        if flushed:
+            logger.info(f"[StudyLogWriter] Flushed {flushed} pending logs on shutdown")
+        cls._thread = None
@@ -0,0 +1,108 @@
+import queue
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from flask import Flask
+
+from mindstack_app.core.signals import study_logged
+from mindstack_app.models import DailyStat, LearningContainer, LearningItem, StudyLog, User, db
+from mindstack_app.modules.learning_history.services.history_recorder import HistoryRecorder
+from mindstack_app.modules.learning_history.services.log_writer import StudyLogWriter
+from mindstack_app.modules.stats.services.analytics_listener import init_analytics_listener
+
+
+class TestHistoryRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://')
+        db.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        init_analytics_listener()
+
+        user = User(username='u', email='u@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        container = LearningContainer(creator_user_id=user.user_id, container_type='FLASHCARD_SET', title='Set')
+        db.session.add(container)
+        db.session.flush()
+        item = LearningItem(container_id=container.container_id, item_type='FLASHCARD',
+                            content={'front': 'a', 'back': 'b'})
+        db.session.add(item)
+        db.session.commit()
+        self.user_id, self.item_id, self.container_id = user.user_id, item.item_id, container.container_id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_review_and_daily_rollup_are_committed_together(self):
+        HistoryRecorder.record_interaction(
+            self.user_id, self.item_id,
+            result_data={'rating': 3, 'is_correct': True, 'review_duration': 4000},
+            context_data={'container_id': self.container_id, 'learning_mode': 'mcq'},
+            game_snapshot={'score_earned': 10},
+        )
+        # Like the MCQ / typing answer routes: no further commit before the request ends
+        db.session.remove()
+
+        self.assertEqual(StudyLog.query.count(), 1)
+        stats = {row.metric_key: row.metric_value for row in DailyStat.query.filter_by(user_id=self.user_id)}
+        self.assertEqual(stats.get('reviews'), 1)
+        self.assertEqual(stats.get('points'), 10)
+
+    def test_failing_subscriber_only_undoes_its_own_writes(self):
+        def broken_subscriber(sender, **kwargs):
+            db.session.add(User(username='u', email='dup@example.com', password_hash='x'))
+            db.session.flush()  # IntegrityError: duplicate username
+
+        study_logged.connect(broken_subscriber)
+        try:
+            HistoryRecorder.record_interaction(
+                self.user_id, self.item_id,
+                result_data={'rating': 1, 'is_correct': False},
+                context_data={'container_id': self.container_id, 'learning_mode': 'typing'},
+            )
+        finally:
+            study_logged.disconnect(broken_subscriber)
+        db.session.remove()
+
+        self.assertEqual(StudyLog.query.count(), 1)
+        self.assertEqual(User.query.count(), 1)
+        self.assertEqual(DailyStat.query.filter_by(user_id=self.user_id, metric_key='reviews').one().metric_value, 1)
+
+    def _row(self, **overrides):
+        row = {'user_id': self.user_id, 'item_id': self.item_id, 'rating': 3,
+               'timestamp': datetime.now(timezone.utc), 'learning_mode': 'flashcard'}
+        row.update(overrides)
+        return row
+
+    def test_failed_batch_only_drops_the_bad_rows(self):
+        good, bad = self._row(), self._row(rating=None)  # NOT NULL violation
+        with patch.object(StudyLogWriter, '_app', self.app), patch.object(StudyLogWriter, 'RETRY_DELAY', 0):
+            for row in (good, bad):
+                StudyLogWriter._pending[(row['user_id'], row['item_id'])] += 1
+            StudyLogWriter._write_batch([good, bad])
+
+        self.assertEqual(StudyLog.query.count(), 1)
+        self.assertFalse(StudyLogWriter.has_pending(self.user_id, self.item_id))
+
+    def test_queued_log_counts_as_previous_review(self):
+        self.assertFalse(HistoryRecorder._has_previous_log(self.user_id, self.item_id))
+        pending = queue.Queue()
+        with patch.object(StudyLogWriter, 'is_running', return_value=True), \
+                patch.object(StudyLogWriter, '_queue', pending):
+            self.assertTrue(StudyLogWriter.enqueue(self._row()))
+        try:
+            self.assertTrue(HistoryRecorder._has_previous_log(self.user_id, self.item_id))
+        finally:
+            StudyLogWriter._release([pending.get_nowait()])
+        self.assertFalse(HistoryRecorder._has_previous_log(self.user_id, self.item_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ except ImportError:
     webpush = None
 
 from mindstack_app.core.extensions import db
+from mindstack_app.utils.db_session import safe_commit
 from ..models import Notification, PushSubscription
 
 class NotificationService:
@@ -21,7 +22,7 @@ class NotificationService:
             meta_data=meta_data
         )
         db.session.add(notif)
-        db.session.commit()
+        safe_commit(db.session)
         
         # Trigger Web Push
         NotificationService.send_web_push(user_id, {
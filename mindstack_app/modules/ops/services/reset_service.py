@@ -3,6 +3,8 @@ from mindstack_app.models import (
     LearningSession, UserItemMarker, UserContainerState, ContainerContributor, LearningGroup
 )
 from mindstack_app.modules.learning_history.interface import LearningHistoryInterface
+from mindstack_app.modules.fsrs.interface import FSRSInterface
+from mindstack_app.modules.stats.interface import StatsInterface
 from sqlalchemy import text, distinct, or_
 
 class ResetService:
@@ -15,7 +17,9 @@ class ResetService:
             if user_id:
                 # Dữ liệu phụ thuộc vào User
                 LearningHistoryInterface.delete_user_history(user_id)
+                StatsInterface.delete_user_daily_stats(user_id)
                 ItemMemoryState.query.filter_by(user_id=user_id).delete()
+                FSRSInterface.invalidate_container_stats(user_id=user_id)
                 LearningSession.query.filter_by(user_id=user_id).delete()
                 UserItemMarker.query.filter_by(user_id=user_id).delete()
                 UserContainerState.query.filter_by(user_id=user_id).delete()
@@ -24,8 +28,10 @@ class ResetService:
                 # REFAC: Direct model access via interface special method for admin/ops
                 StudyLog = LearningHistoryInterface.get_model_class()
                 db.session.query(StudyLog).delete()
+                StatsInterface.delete_user_daily_stats()
                 
                 db.session.query(ItemMemoryState).delete()
+                FSRSInterface.invalidate_container_stats()
                 db.session.query(LearningSession).delete()
                 db.session.query(UserItemMarker).delete()
                 db.session.query(UserContainerState).delete()
@@ -47,8 +53,10 @@ class ResetService:
             # Cần xóa trước vì chúng có Foreign Key trỏ tới Item/Container
             StudyLog = LearningHistoryInterface.get_model_class()
             db.session.query(StudyLog).delete()
+            StatsInterface.delete_user_daily_stats()
             
             db.session.query(ItemMemoryState).delete()
+            FSRSInterface.invalidate_container_stats()
             db.session.query(UserItemMarker).delete()
             
             # LearningSession không có FK cứng tới Item nhưng chứa ID item trong JSON
@@ -108,6 +116,7 @@ class ResetService:
                 # Currently creating granular methods in interface for every edge case is overkill, so allowing restricted Model access
                 StudyLog = LearningHistoryInterface.get_model_class()
                 db.session.query(StudyLog).filter(StudyLog.user_id == user_id, StudyLog.item_id.in_(item_ids)).delete(synchronize_session=False)
+                StatsInterface.rebuild_daily_rollups(user_id=user_id)
                 
                 ItemMemoryState.query.filter(ItemMemoryState.user_id == user_id, ItemMemoryState.item_id.in_(item_ids)).delete(synchronize_session=False)
                 UserItemMarker.query.filter(UserItemMarker.user_id == user_id, UserItemMarker.item_id.in_(item_ids)).delete(synchronize_session=False)
@@ -129,8 +138,9 @@ class ResetService:
                 if should_delete:
                     db.session.delete(sess)
 
-            # 4. Xóa UserContainerState
+            # 4. Xóa UserContainerState & thống kê bộ thẻ (FSRS)
             UserContainerState.query.filter_by(user_id=user_id, container_id=container_id).delete()
+            FSRSInterface.invalidate_container_stats(user_id=user_id, container_ids=[container_id])
 
             db.session.commit()
             return True
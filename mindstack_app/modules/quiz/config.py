@@ -6,6 +6,8 @@ class QuizLearningConfig:
     """
     DEFAULT_ITEMS_PER_PAGE = 3
     QUIZ_DEFAULT_BATCH_SIZE = 1 
+    # Số phiên quiz giữ danh sách ID ứng viên trong bộ nhớ (QuizCandidatePool)
+    QUIZ_CANDIDATE_POOL_MAX_SESSIONS = 256
 
     QUIZ_MODES = [
         {'id': 'new_only', 'name': 'Chỉ làm mới', 'algorithm_func_name': 'get_new_only_items'},
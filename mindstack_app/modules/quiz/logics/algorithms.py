@@ -70,9 +70,8 @@ def get_quiz_mode_counts(user_id, set_id):
         learned = 0
         due = 0
         container_ids = set_id if isinstance(set_id, list) else []
-        for cid in container_ids:
-            s = FSRSInterface.get_container_stats(user_id, cid)
-            learned += s.get('learned', 0)
+        for s in FSRSInterface.get_container_stats_map(user_id, container_ids).values():
+            learned += s.get('total', 0)  # Same as get_container_stats()['learned']
             due += s.get('due', 0)
         new_count = total - learned
     
@@ -100,7 +99,8 @@ def get_filtered_quiz_sets(user_id, search_query, search_field, current_filter,
         
     # Search
     if search_query:
-        query = query.filter(LearningContainer.title.ilike(f'%{search_query}%'))
+        from mindstack_app.modules.content_management.interface import ContentInterface
+        query = ContentInterface.filter_containers_by_search(query, search_query, ['title'], ranked=True)
         
     # Paginate
     from mindstack_app.utils.pagination import get_pagination_data
@@ -26,8 +26,8 @@ from .algorithms import (
 from .stats_logic import get_quiz_item_statistics
 from ..engine.core import QuizEngine
 from ..config import QuizLearningConfig
-from sqlalchemy.sql import func
 import random
+from mindstack_app.utils.sampling import reservoir_sample, sample_where
 import datetime
 from mindstack_app.utils.content_renderer import render_content_dict, render_text_field
 import os
@@ -37,7 +37,7 @@ from mindstack_app.utils.media_paths import build_relative_media_path
 class QuizSessionManager:
     """
     Quản lý phiên học Quiz cho một người dùng.
-    Sử dụng Flask session để lưu trữ trạng thái.
+    Trạng thái được lưu phía server (QuizSessionStore); Flask session chỉ giữ handle.
     """
     SESSION_KEY = 'quiz_session'
 
@@ -71,6 +71,7 @@ class QuizSessionManager:
         self.batch_correct_answers = batch_correct_answers or {}
         self.current_batch_cache = current_batch_cache
         self.db_session_id = db_session_id
+        self.handle: Optional[str] = None  # QuizSessionStore handle (kept in the Flask session)
         self._media_folders_cache: Optional[dict[str, str]] = None
         current_app.logger.debug(f"QuizSessionManager: Instance được khởi tạo/tải. User: {self.user_id}, Set: {self.set_id}, Mode: {self.mode}")
 
@@ -130,6 +131,58 @@ class QuizSessionManager:
             'db_session_id': self.db_session_id
         }
 
+    # ── Server-side state ────────────────────────────────────────────
+
+    @classmethod
+    def load(cls):
+        """
+        Tải phiên Quiz hiện tại của người dùng từ QuizSessionStore (None nếu không có).
+        """
+        from ..services.session_store import QuizSessionStore
+
+        raw = session.get(cls.SESSION_KEY)
+        if isinstance(raw, dict):
+            # Cookie written by older versions: move the state server-side
+            manager = cls.from_dict(raw)
+            manager.save()
+            return manager
+
+        handle, state = QuizSessionStore.load(current_user.user_id, raw)
+        if state is None:
+            session.pop(cls.SESSION_KEY, None)
+            return None
+
+        manager = cls.from_dict(state)
+        manager.handle = handle
+        if raw != handle:
+            session[cls.SESSION_KEY] = handle
+            session.modified = True
+        return manager
+
+    def save(self):
+        """Lưu trạng thái vào QuizSessionStore; cookie chỉ giữ handle."""
+        from ..services.session_store import QuizSessionStore
+
+        handle = QuizSessionStore.save(self.user_id, self.to_dict(), self.handle)
+        if handle:
+            self.handle = handle
+            session[self.SESSION_KEY] = handle
+            session.modified = True
+
+    @classmethod
+    def get_state(cls):
+        """Trạng thái (dict) của phiên Quiz hiện tại, hoặc None."""
+        manager = cls.load()
+        return manager.to_dict() if manager else None
+
+    @classmethod
+    def clear(cls):
+        """Xóa trạng thái phiên Quiz (server-side + handle trong cookie)."""
+        from ..services.session_store import QuizSessionStore
+
+        QuizSessionStore.delete(current_user.user_id)
+        session.pop(cls.SESSION_KEY, None)
+
     @classmethod
     def start_new_quiz_session(cls, set_id, mode, session_size, batch_size=1, custom_pairs=None):
         """
@@ -142,8 +195,8 @@ class QuizSessionManager:
         # [UPDATED] Smart Session Cleanup (Session Isolation)
         # If switching to a DIFFERENT set, just clear Flask session (keep DB session active for resume).
         # If restarting SAME set, complete the old session.
-        if cls.SESSION_KEY in session:
-            current_session_data = session.get(cls.SESSION_KEY)
+        current_session_data = cls.get_state()
+        if current_session_data:
             current_set_id = current_session_data.get('set_id')
             
             # Helper to normalize for comparison
@@ -153,7 +206,7 @@ class QuizSessionManager:
             if is_same_set:
                 cls.end_quiz_session() # Restarting same set -> Complete old one
             else:
-                session.pop(cls.SESSION_KEY, None) # Switching sets -> Detach, keep active in DB
+                cls.clear() # Switching sets -> Detach, keep active in DB
         
         # OLD: cls.end_quiz_session()
 
@@ -220,21 +273,14 @@ class QuizSessionManager:
 
             normalized_set_id = set_id_int
 
-        total_items_in_session_query = algorithm_func(user_id, normalized_set_id, None)
-        total_items_in_session = min(total_items_in_session_query.count(), session_size)
+        from ..services.candidate_pool import QuizCandidatePool
 
-        group_counts = (
-            total_items_in_session_query
-            .with_entities(LearningItem.group_id, func.count())
-            .group_by(LearningItem.group_id)
-            .all()
-        )
-        total_question_groups_in_session = 0
-        for gid, count in group_counts:
-            if gid is None:
-                total_question_groups_in_session += count
-            else:
-                total_question_groups_in_session += 1
+        # Một truy vấn nhẹ (item_id, group_id) thay cho count + group_by + ORDER BY random()
+        total_items_in_session_query = algorithm_func(user_id, normalized_set_id, None)
+        candidate_groups = QuizCandidatePool.load_groups(total_items_in_session_query)
+        candidate_ids = [item_id for group in candidate_groups for item_id in group]
+        total_items_in_session = min(len(candidate_ids), session_size)
+        total_question_groups_in_session = len(candidate_groups)
 
         if total_items_in_session == 0:
             cls.end_quiz_session()
@@ -242,16 +288,17 @@ class QuizSessionManager:
             return False, 'Không có câu hỏi nào cho chế độ này.', None
 
         sample_size = min(total_items_in_session, 50)
-        
-        if total_items_in_session > 0:
-            sample_items = total_items_in_session_query.order_by(func.random()).limit(sample_size).all()
-            global_pre_texts = [item.content.get('pre_question_text') for item in sample_items if item.content.get('pre_question_text')]
-            common_pre_question_text_global = None
-            if global_pre_texts and all(p == global_pre_texts[0] for p in global_pre_texts):
-                common_pre_question_text_global = global_pre_texts[0]
-                current_app.logger.debug(f"SessionManager: Phát hiện common_pre_question_text_global: '{common_pre_question_text_global}'")
-        else:
-            common_pre_question_text_global = None
+        sample_ids = reservoir_sample(candidate_ids, sample_size)
+        sample_contents = (
+            db.session.query(LearningItem.content)
+            .filter(LearningItem.item_id.in_(sample_ids))
+            .all()
+        )
+        global_pre_texts = [content.get('pre_question_text') for (content,) in sample_contents if content and content.get('pre_question_text')]
+        common_pre_question_text_global = None
+        if global_pre_texts and all(p == global_pre_texts[0] for p in global_pre_texts):
+            common_pre_question_text_global = global_pre_texts[0]
+            current_app.logger.debug(f"SessionManager: Phát hiện common_pre_question_text_global: '{common_pre_question_text_global}'")
 
         new_session_manager = cls(
             user_id=user_id,
@@ -287,8 +334,11 @@ class QuizSessionManager:
         if db_session:
             new_session_manager.db_session_id = db_session.session_id
 
-        session[cls.SESSION_KEY] = new_session_manager.to_dict()
-        session.modified = True
+        new_session_manager.save()
+        QuizCandidatePool.put(
+            QuizCandidatePool.key(user_id, normalized_set_id, mode, new_session_manager.start_time),
+            candidate_groups,
+        )
 
         current_app.logger.debug(f"SessionManager: Phiên học mới đã được khởi tạo với {total_items_in_session} câu hỏi. Batch size: {batch_size}")
         return True, 'Khởi tạo thành công.', new_session_manager.db_session_id
@@ -351,7 +401,7 @@ class QuizSessionManager:
 
         if len(self.processed_item_ids) >= self.total_items_in_session:
             self.current_batch_cache = None # Clear cache provided end
-            session[self.SESSION_KEY] = self.to_dict()
+            self.save()
             current_app.logger.debug("SessionManager: Hết câu hỏi trong phiên. Đã hiển thị đủ số lượng.")
             return None
 
@@ -375,42 +425,44 @@ class QuizSessionManager:
             current_app.logger.error(f"Không tìm thấy hàm thuật toán cho chế độ: {self.mode}")
             return None
 
-        unprocessed_items_query = algorithm_func(self.user_id, self.set_id, None).filter(
-            LearningItem.item_id.notin_(self.processed_item_ids)
+        # Lấy mẫu nhóm từ danh sách ID ứng viên đã cache thay vì ORDER BY random() trên cả bộ
+        from ..services.candidate_pool import QuizCandidatePool
+        candidate_groups = QuizCandidatePool.get(
+            QuizCandidatePool.key(self.user_id, self.set_id, self.mode, self.start_time),
+            lambda: algorithm_func(self.user_id, self.set_id, None),
         )
-        
+
         # [NEW] Exclude items marked as 'ignored' by this user
-        ignored_subquery = db.session.query(UserItemMarker.item_id).filter(
-            UserItemMarker.user_id == self.user_id,
-            UserItemMarker.marker_type == 'ignored'
+        excluded_ids = set(self.processed_item_ids)
+        excluded_ids.update(
+            item_id for (item_id,) in db.session.query(UserItemMarker.item_id).filter(
+                UserItemMarker.user_id == self.user_id,
+                UserItemMarker.marker_type == 'ignored'
+            )
         )
-        unprocessed_items_query = unprocessed_items_query.filter(LearningItem.item_id.notin_(ignored_subquery))
-        
-        unprocessed_items = unprocessed_items_query.order_by(func.random()).all()
 
-        if not unprocessed_items:
+        selected_groups = sample_where(
+            candidate_groups,
+            requested_batch_size,
+            lambda group: any(item_id not in excluded_ids for item_id in group),
+        )
+        selected_ids: list[int] = []
+        for group in selected_groups:
+            members = [item_id for item_id in group if item_id not in excluded_ids]
+            random.shuffle(members)
+            selected_ids.extend(members)
+
+        if not selected_ids:
             current_app.logger.debug("Không còn câu hỏi mới nào để lấy.")
             return None
 
-        grouped_candidates: dict[str, list[LearningItem]] = {}
-        for item in unprocessed_items:
-            if item.group_id:
-                key = f"group-{item.group_id}"
-            else:
-                key = f"single-{item.item_id}"
-            grouped_candidates.setdefault(key, []).append(item)
-
-        group_keys = list(grouped_candidates.keys())
-        random.shuffle(group_keys)
-
-        new_items_to_add_to_session: list[LearningItem] = []
-        selected_group_count = 0
-
-        for key in group_keys:
-            if selected_group_count >= requested_batch_size:
-                break
-            new_items_to_add_to_session.extend(grouped_candidates[key])
-            selected_group_count += 1
+        items_by_id = {
+            item.item_id: item
+            for item in LearningItem.query.filter(LearningItem.item_id.in_(selected_ids)).all()
+        }
+        new_items_to_add_to_session: list[LearningItem] = [
+            items_by_id[item_id] for item_id in selected_ids if item_id in items_by_id
+        ]
 
         if not new_items_to_add_to_session:
             current_app.logger.debug("Không chọn được nhóm câu hỏi nào để thêm.")
@@ -667,8 +719,7 @@ class QuizSessionManager:
         }
         
         self.current_batch_cache = result_batch
-        session[self.SESSION_KEY] = self.to_dict()
-        session.modified = True
+        self.save()
         return result_batch
 
     def process_answer_batch(self, answers):
@@ -779,9 +830,6 @@ class QuizSessionManager:
                     
             results.append(res_dict)
         
-        session[self.SESSION_KEY] = self.to_dict()
-        session.modified = True 
-        
         # [NEW] Update database session progress
         if getattr(self, 'db_session_id', None):
             try:
@@ -843,9 +891,8 @@ class QuizSessionManager:
 
         if self.current_batch_cache:
             self.current_batch_cache['submitted_results'] = results
-            # Update session with new cache state
-            session[self.SESSION_KEY] = self.to_dict()
-            session.modified = True
+        # Persist counters, processed ids and the cache state (one write per answer batch)
+        self.save()
             
         return results
 
@@ -856,8 +903,8 @@ class QuizSessionManager:
         """
         result = {'message': 'Phiên học đã kết thúc.', 'stats': {}}
         
-        if cls.SESSION_KEY in session:
-            session_data = session.get(cls.SESSION_KEY)
+        session_data = cls.get_state()
+        if session_data:
             db_session_id = session_data.get('db_session_id')
             
             # Gather stats
@@ -875,7 +922,7 @@ class QuizSessionManager:
                 # or just use complete_session which sets status='completed'
                 SessionInterface.complete_session(db_session_id)
 
-            session.pop(cls.SESSION_KEY, None)
+            cls.clear()
             
         return result
 
@@ -884,7 +931,7 @@ class QuizSessionManager:
         """
         Lấy trạng thái hiện tại của phiên học.
         """
-        status = session.get(cls.SESSION_KEY)
+        status = cls.get_state()
         print(f">>> SESSION_MANAGER: Lấy trạng thái session: {status} <<<")
         current_app.logger.debug(f"SessionManager: Lấy trạng thái session: {status}")
         return status
@@ -1,6 +1,7 @@
 """Quiz database models."""
 
 from __future__ import annotations
+from datetime import datetime, timezone
 from mindstack_app.core.extensions import db
 from mindstack_app.models import LearningContainer, LearningItem
 
@@ -24,3 +25,21 @@ class QuizMCQ(LearningItem):
     def __repr__(self):
         return f"<QuizMCQ {self.item_id}>"
 
+
+
+class QuizSessionState(db.Model):
+    """
+    Server-side state of a user's current individual quiz session
+    (QuizSessionManager.to_dict()). The Flask session cookie only keeps `handle`.
+    One row per user, so the state also follows the user across devices.
+    """
+    __tablename__ = 'quiz_session_states'
+
+    handle = db.Column(db.String(32), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False, unique=True)
+    db_session_id = db.Column(db.Integer, nullable=True)  # LearningSession.session_id
+    data = db.Column(db.JSON, nullable=False)
+    updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f"<QuizSessionState {self.handle}: user={self.user_id}>"
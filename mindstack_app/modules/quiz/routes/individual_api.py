@@ -3,7 +3,7 @@ import os
 import copy
 from typing import Optional
 
-from flask import request, jsonify, abort, current_app, session, url_for
+from flask import request, jsonify, abort, current_app, url_for
 from flask_login import login_required, current_user
 from sqlalchemy.sql import func
 from sqlalchemy.orm.attributes import flag_modified
@@ -145,22 +145,19 @@ def get_quiz_item_api(item_id):
 @login_required
 def get_question_batch():
     """Trả về dữ liệu nhóm câu hỏi tiếp theo trong phiên học hiện tại."""
-    if 'quiz_session' not in session:
+    session_manager = QuizSessionManager.load()
+    if not session_manager:
         return jsonify({'message': 'Phiên học không hợp lệ hoặc đã kết thúc.'}), 404
 
-    session_manager = QuizSessionManager.from_dict(session['quiz_session'])
     batch_size = session_manager.batch_size
     
     force_next = request.args.get('force_next', 'false').lower() == 'true'
     
     try:
         question_batch = session_manager.get_next_batch(batch_size, force_next=force_next)
-        session['quiz_session'] = session_manager.to_dict()
 
         if question_batch is None:
-            db_session_id = None
-            if 'quiz_session' in session:
-                db_session_id = session['quiz_session'].get('db_session_id')
+            db_session_id = session_manager.db_session_id
 
             session_manager.end_quiz_session()
             
@@ -368,10 +365,7 @@ def submit_answer_batch():
     if not answers or not isinstance(answers, list):
         return jsonify({'error': 'Dữ liệu đáp án không hợp lệ.'}), 400
 
-    if 'quiz_session' not in session:
-        return jsonify({'message': 'Phiên học không hợp lệ hoặc đã kết thúc.'}), 404
-
-    session_manager = QuizSessionManager.from_dict(session['quiz_session'])
+    session_manager = QuizSessionManager.load()
     if not session_manager:
         return jsonify({'message': 'Phiên học không hợp lệ hoặc đã kết thúc.'}), 404
 
@@ -408,8 +402,6 @@ def submit_answer_batch():
         if 'error' in results:
             return jsonify(results), 400
 
-        session['quiz_session'] = session_manager.to_dict()
-
         response_data = {
             'results': results,
             'session_correct_answers': session_manager.correct_answers,
@@ -428,9 +420,8 @@ def submit_answer_batch():
 @login_required
 def end_session():
     """Kết thúc phiên học Quiz hiện tại."""
-    db_session_id = None
-    if 'quiz_session' in session:
-        db_session_id = session['quiz_session'].get('db_session_id')
+    state = QuizSessionManager.get_state()
+    db_session_id = state.get('db_session_id') if state else None
     
     result = QuizSessionManager.end_quiz_session()
     
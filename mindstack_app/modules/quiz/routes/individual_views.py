@@ -1,5 +1,5 @@
 # File: mindstack_app/modules/quiz/routes/individual_views.py
-from flask import render_template, request, redirect, url_for, flash, session, current_app
+from flask import render_template, request, redirect, url_for, flash, current_app
 from mindstack_app.utils.template_helpers import render_dynamic_template
 from flask_login import login_required, current_user
 from mindstack_app.models import LearningContainer, db, UserGoal
@@ -260,7 +260,7 @@ def quiz_active_session_redirect():
 @login_required
 def quiz_session(session_id):
     """Hiển thị giao diện làm bài Quiz."""
-    current_session_data = session.get('quiz_session')
+    current_session_data = QuizSessionManager.get_state()
     should_reload = False
     
     if not current_session_data:
@@ -272,7 +272,7 @@ def quiz_session(session_id):
         
     if should_reload:
         # Force clear old session data to ensure clean state
-        session.pop('quiz_session', None)
+        QuizSessionManager.clear()
         
         from mindstack_app.modules.session.interface import SessionInterface
         db_session = SessionInterface.get_session_by_id(session_id)
@@ -303,8 +303,7 @@ def quiz_session(session_id):
         if current_user.session_state and current_user.session_state.current_quiz_batch_size:
             session_manager.batch_size = current_user.session_state.current_quiz_batch_size
         
-        session['quiz_session'] = session_manager.to_dict()
-        session.modified = True
+        session_manager.save()
         current_app.logger.debug(f"[QUIZ_VIEW] Session initialized for ID={session_id}. SetID={db_session.set_id_data}")
 
     try:
@@ -348,7 +347,7 @@ def quiz_start():
         return redirect(url_for('.dashboard'))
 
     try:
-        session_manager = QuizSessionManager.from_dict(session['quiz_session'])
+        session_manager = QuizSessionManager.load()
         
         from mindstack_app.services.template_service import TemplateService
         if TemplateService.get_active_version() == 'aura_mobile':
@@ -1,3 +1,5 @@
 from .audio_service import QuizAudioService
 from .battle_service import *
+from .candidate_pool import QuizCandidatePool
 from .quiz_config_service import QuizConfigService
+from .session_store import QuizSessionStore
@@ -0,0 +1,62 @@
+# File: mindstack_app/modules/quiz/services/candidate_pool.py
+"""
+Candidate pool for individual quiz sessions.
+
+The mode query of a session (new / reviewed / hard items of the chosen sets)
+is run once as a light ``(item_id, group_id)`` query; its groups are kept in a
+process-local LRU keyed by the session, so each batch samples groups in Python
+instead of running ``ORDER BY random()`` over the whole set. A miss (another
+worker, eviction) simply rebuilds the pool from the mode query.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from mindstack_app.models import LearningItem
+from mindstack_app.utils.sampling import group_ids
+from ..config import QuizLearningConfig
+
+PoolKey = Tuple[Hashable, ...]
+
+
+class QuizCandidatePool:
+    """Process-wide cache of candidate item-id groups per quiz session."""
+
+    _pools: "OrderedDict[PoolKey, List[List[int]]]" = OrderedDict()
+    _lock = threading.RLock()
+
+    @staticmethod
+    def key(user_id: int, set_id, mode: str, start_time: Optional[str]) -> PoolKey:
+        return (user_id, str(set_id), mode, start_time)
+
+    @staticmethod
+    def load_groups(query) -> List[List[int]]:
+        """Item-id groups of a mode query (one light query, no ORDER BY)."""
+        rows = query.order_by(None).with_entities(LearningItem.item_id, LearningItem.group_id).all()
+        return group_ids(rows)
+
+    @classmethod
+    def put(cls, key: PoolKey, groups: List[List[int]]) -> None:
+        with cls._lock:
+            cls._pools[key] = groups
+            cls._pools.move_to_end(key)
+            while len(cls._pools) > QuizLearningConfig.QUIZ_CANDIDATE_POOL_MAX_SESSIONS:
+                cls._pools.popitem(last=False)
+
+    @classmethod
+    def get(cls, key: PoolKey, build_query: Callable[[], object]) -> List[List[int]]:
+        """Cached groups of a session; `build_query()` gives the mode query on a miss."""
+        with cls._lock:
+            groups = cls._pools.get(key)
+            if groups is not None:
+                cls._pools.move_to_end(key)
+                return groups
+        groups = cls.load_groups(build_query())
+        cls.put(key, groups)
+        return groups
+
+    @classmethod
+    def discard(cls, key: PoolKey) -> None:
+        with cls._lock:
+            cls._pools.pop(key, None)
@@ -0,0 +1,70 @@
+# File: mindstack_app/modules/quiz/services/session_store.py
+"""
+Server-side store for individual quiz session state.
+
+The Flask session cookie only carries an opaque handle; the state itself
+(processed ids, rendered batch cache, counters, ...) lives in the
+`quiz_session_states` table, one row per user.
+"""
+
+import uuid
+from typing import Optional, Tuple
+
+from flask import current_app
+
+from mindstack_app.models import QuizSessionState, db
+from mindstack_app.utils.db_session import safe_commit, safe_rollback
+
+
+class QuizSessionStore:
+    """Load / save / delete quiz session state by handle (falls back to the user's row)."""
+
+    @staticmethod
+    def load(user_id: int, handle: Optional[str] = None) -> Tuple[Optional[str], Optional[dict]]:
+        """
+        Returns (handle, state). A missing or foreign handle falls back to the
+        user's current state (e.g. the same quiz opened on another device).
+        """
+        row = None
+        if handle:
+            row = db.session.get(QuizSessionState, handle)
+            if row is not None and row.user_id != user_id:
+                row = None
+        if row is None:
+            row = QuizSessionState.query.filter_by(user_id=user_id).first()
+        if row is None:
+            return None, None
+        return row.handle, dict(row.data or {})
+
+    @staticmethod
+    def save(user_id: int, state: dict, handle: Optional[str] = None) -> Optional[str]:
+        """Stores `state` as the user's current quiz session. Returns the handle."""
+        try:
+            row = QuizSessionState.query.filter_by(user_id=user_id).first()
+            if row is None or (handle and row.handle != handle):
+                # New session (or a stale handle): replace the user's row
+                if row is not None:
+                    db.session.delete(row)
+                    db.session.flush()
+                row = QuizSessionState(handle=handle or uuid.uuid4().hex, user_id=user_id)
+                db.session.add(row)
+            row.data = state
+            row.db_session_id = state.get('db_session_id')
+            safe_commit(db.session)
+            return row.handle
+        except Exception as e:
+            safe_rollback(db.session)
+            current_app.logger.error(f"[QuizSessionStore] Failed to save state for user {user_id}: {e}", exc_info=True)
+            return None
+
+    @staticmethod
+    def delete(user_id: int) -> bool:
+        """Drops the user's quiz session state."""
+        try:
+            deleted = QuizSessionState.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+            safe_commit(db.session)
+            return bool(deleted)
+        except Exception as e:
+            safe_rollback(db.session)
+            current_app.logger.error(f"[QuizSessionStore] Failed to delete state for user {user_id}: {e}", exc_info=True)
+            return False
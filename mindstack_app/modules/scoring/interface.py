@@ -55,6 +55,11 @@ class ScoringInterface:
                 item_type=item_type
             )
             db.session.add(log)
+
+            # Cập nhật streak tăng dần trong cùng transaction
+            from mindstack_app.modules.gamification.interface import record_streak_activity, record_leaderboard_score
+            record_streak_activity(user_id)
+            record_leaderboard_score(user_id, amount, item_id)
             
             # 4. Phát tín hiệu cho các module khác (ví dụ: Gamification để kiểm tra Badge)
             score_awarded.send(None, 
@@ -68,7 +73,8 @@ class ScoringInterface:
             safe_commit(db.session)
             return True
         except Exception as e:
-            db.session.rollback()
+            from mindstack_app.utils.db_session import safe_rollback
+            safe_rollback(db.session)
             from flask import current_app
             current_app.logger.error(f"Error awarding points to user {user_id}: {e}")
             return False
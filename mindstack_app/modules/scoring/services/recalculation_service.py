@@ -165,9 +165,10 @@ class RecalculationService:
         
         # ── Step 3: Sync User total_scores from SUM(score_logs) ──
         try:
-            from mindstack_app.modules.gamification.interface import sync_all_users_scores
+            from mindstack_app.modules.gamification.interface import sync_all_users_scores, rebuild_leaderboards
             sync_all_users_scores()
-            print("[Recalculation] Step 3 done. User totals synced.")
+            rebuild_leaderboards()
+            print("[Recalculation] Step 3 done. User totals and leaderboards synced.")
         except Exception as e:
             print(f"[Recalculation] Step 3 error: {e}")
 
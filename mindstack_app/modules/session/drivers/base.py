@@ -19,7 +19,7 @@ Design principles
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
@@ -110,6 +110,9 @@ class BaseSessionDriver(ABC):
             payload = driver.get_next_interaction(state)
             result  = driver.process_submission(state, payload.item_id, user_input)
         summary = driver.finalize_session(state)
+
+    ``get_lookahead(state, k)`` is optional: it previews the next *k*
+    interactions without consuming them (client-side prefetch).
     """
 
     # ── lifecycle methods ────────────────────────────────────────────
@@ -142,6 +145,38 @@ class BaseSessionDriver(ABC):
         """
         ...
 
+    def get_lookahead(
+        self,
+        state: SessionState,
+        count: int,
+    ) -> List[InteractionPayload]:
+        """
+        Return up to *count* upcoming interactions (current one first) so the
+        client can prefetch and answer without waiting on a fetch per item.
+
+        Must not mutate ``state`` or mark anything as processed. The default
+        walks ``get_next_interaction`` on a copy of the state; drivers that
+        can fetch and render items in bulk should override it.
+        """
+        preview = replace(
+            state,
+            item_queue=list(state.item_queue),
+            processed_ids=list(state.processed_ids),
+            settings=dict(state.settings),
+            extra=dict(state.extra),
+        )
+        payloads: List[InteractionPayload] = []
+        while len(payloads) < count:
+            payload = self.get_next_interaction(preview)
+            if payload is None or payload.item_id in preview.processed_ids:
+                break
+            payloads.append(payload)
+            preview.processed_ids.append(payload.item_id)
+            preview.active_item_id = None
+            if payload.is_last:
+                break
+        return payloads
+
     @abstractmethod
     def process_submission(
         self,
@@ -142,6 +142,11 @@ class SessionInterface:
         """Get completed/cancelled sessions for a user."""
         return LearningSessionService.get_session_history(user_id, limit)
 
+    @staticmethod
+    def update_session_data(session_id: int, updates: dict) -> bool:
+        """Merge keys into an active session's session_data."""
+        return LearningSessionService.update_session_data(session_id, updates)
+
     @staticmethod
     def set_current_item(session_id: int, item_id: int) -> bool:
         """Update the active item for a session."""
@@ -182,6 +182,8 @@ def api_submit_answer(session_id):
     """
     try:
         user_input = request.get_json(silent=True) or {}
+        if request.headers.get('Idempotency-Key') and not user_input.get('idempotency_key'):
+            user_input['idempotency_key'] = request.headers['Idempotency-Key']
 
         # Security: ensure session belongs to current user
         session = LearningSessionService.get_session_by_id(session_id)
@@ -260,6 +262,67 @@ def api_start_driven_session():
         return jsonify({'error': 'Internal server error'}), 500
 
 
+def _rebuild_driver_state(session):
+    """Rebuild the driver SessionState of an active session from its DB record."""
+    from mindstack_app.modules.session.drivers.base import SessionState
+
+    # [FIX] Ensure we get fresh data (stats) from DB
+    from mindstack_app.core.extensions import db
+    db.session.expire_all()
+
+    # Rebuild state from DB
+    container_id = session.set_id_data if isinstance(session.set_id_data, int) else 0
+    from mindstack_app.models import LearningItem
+
+    # [FIX] Restore settings from session_data (persisted at session start)
+    persisted_settings = {}
+    if session.session_data and isinstance(session.session_data, dict):
+        persisted_settings = session.session_data.get('settings', {})
+
+    # [FIX] Handle dynamic SRS modes:
+    # For dynamic modes (srs, mixed, due, new, etc.), keep queue EMPTY.
+    # VocabularyDriver.get_next_interaction() will do a fresh FSRS query.
+    DYNAMIC_FILTERS = {'srs', 'mixed', 'mixed_srs', 'due', 'new', 'review', 'available'}
+    current_filter = persisted_settings.get('filter', '')
+
+    if current_filter in DYNAMIC_FILTERS:
+        # Dynamic mode: empty queue, let VocabularyDriver fetch on-demand
+        all_item_ids = []
+        current_app.logger.info(f"[SESSION_API] Dynamic SRS mode (filter={current_filter}). Queue kept empty for fresh FSRS query.")
+    else:
+        # Static mode: load persisted queue or fallback to all items
+        stored_queue = None
+        if session.session_data and isinstance(session.session_data, dict):
+            stored_queue = session.session_data.get('item_queue')
+
+        if stored_queue:
+            current_app.logger.info(f"[SESSION_API] Using persisted queue of length {len(stored_queue)}")
+            all_item_ids = stored_queue
+        else:
+            current_app.logger.warning(f"[SESSION_API] No persisted queue found. Loading ALL items (legacy).")
+            all_item_ids = [
+                i.item_id for i in
+                LearningItem.query.filter_by(container_id=container_id)
+                .order_by(LearningItem.order_in_container.asc()).all()
+            ]
+
+    state = SessionState(
+        user_id=session.user_id,
+        container_id=container_id,
+        mode=session.learning_mode,
+        session_id=session.session_id,
+        item_queue=all_item_ids,
+        processed_ids=list(session.processed_item_ids or []),
+        correct_count=session.correct_count or 0,
+        incorrect_count=session.incorrect_count or 0,
+        total_items=session.total_items or 0,
+        started_at=session.start_time.isoformat() if session.start_time else '',
+        active_item_id=session.current_item_id,
+        settings=persisted_settings,
+    )
+    return state
+
+
 @blueprint.route('/api/<int:session_id>/next')
 @login_required
 def api_get_next_interaction(session_id):
@@ -272,7 +335,6 @@ def api_get_next_interaction(session_id):
     """
     try:
         from mindstack_app.modules.session.drivers.registry import DriverRegistry
-        from mindstack_app.modules.session.drivers.base import SessionState
 
         session = LearningSessionService.get_session_by_id(session_id)
         if not session or session.user_id != current_user.user_id:
@@ -282,61 +344,7 @@ def api_get_next_interaction(session_id):
 
         # Resolve driver
         driver = DriverRegistry.resolve(session.learning_mode)
-
-        # [FIX] Ensure we get fresh data (stats) from DB
-        from mindstack_app.core.extensions import db
-        db.session.expire_all()
-
-        # Rebuild state from DB
-        container_id = session.set_id_data if isinstance(session.set_id_data, int) else 0
-        from mindstack_app.models import LearningItem
-        
-        # [FIX] Restore settings from session_data (persisted at session start)
-        persisted_settings = {}
-        if session.session_data and isinstance(session.session_data, dict):
-            persisted_settings = session.session_data.get('settings', {})
-        
-        # [FIX] Handle dynamic SRS modes:
-        # For dynamic modes (srs, mixed, due, new, etc.), keep queue EMPTY.
-        # VocabularyDriver.get_next_interaction() will do a fresh FSRS query.
-        DYNAMIC_FILTERS = {'srs', 'mixed', 'mixed_srs', 'due', 'new', 'review', 'available'}
-        current_filter = persisted_settings.get('filter', '')
-        
-        if current_filter in DYNAMIC_FILTERS:
-            # Dynamic mode: empty queue, let VocabularyDriver fetch on-demand
-            all_item_ids = []
-            current_app.logger.info(f"[SESSION_API] Dynamic SRS mode (filter={current_filter}). Queue kept empty for fresh FSRS query.")
-        else:
-            # Static mode: load persisted queue or fallback to all items
-            stored_queue = None
-            if session.session_data and isinstance(session.session_data, dict):
-                stored_queue = session.session_data.get('item_queue')
-                
-            if stored_queue:
-                current_app.logger.info(f"[SESSION_API] Using persisted queue of length {len(stored_queue)}")
-                all_item_ids = stored_queue
-            else:
-                current_app.logger.warning(f"[SESSION_API] No persisted queue found. Loading ALL items (legacy).")
-                all_item_ids = [
-                    i.item_id for i in
-                    LearningItem.query.filter_by(container_id=container_id)
-                    .order_by(LearningItem.order_in_container.asc()).all()
-                ]
-
-        state = SessionState(
-            user_id=session.user_id,
-            container_id=container_id,
-            mode=session.learning_mode,
-            session_id=session_id,
-            item_queue=all_item_ids,
-            processed_ids=list(session.processed_item_ids or []),
-            correct_count=session.correct_count or 0,
-            incorrect_count=session.incorrect_count or 0,
-            total_items=session.total_items or 0,
-            started_at=session.start_time.isoformat() if session.start_time else '',
-            active_item_id=session.current_item_id,
-            settings=persisted_settings,
-        )
+        state = _rebuild_driver_state(session)
 
         payload = driver.get_next_interaction(state)
 
@@ -370,6 +378,110 @@ def api_get_next_interaction(session_id):
         return jsonify({'error': 'Internal server error'}), 500
 
 
+# Prefetch: at most this many interactions per lookahead / answers per batch
+MAX_LOOKAHEAD = 10
+MAX_BATCH_ANSWERS = 50
+
+
+@blueprint.route('/api/<int:session_id>/lookahead')
+@login_required
+def api_get_lookahead(session_id):
+    """
+    Get the next K rendered interactions (current one first) for prefetching.
+    Nothing is consumed: items only leave the queue once they are answered.
+
+    GET /session/api/<session_id>/lookahead?count=5
+
+    Returns: { "items": [InteractionPayload, ...], "finished": bool }
+    """
+    try:
+        from mindstack_app.modules.session.drivers.registry import DriverRegistry
+        import dataclasses
+
+        session = LearningSessionService.get_session_by_id(session_id)
+        if not session or session.user_id != current_user.user_id:
+            return jsonify({'error': 'Session not found'}), 404
+        if session.status != 'active':
+            return jsonify({'error': 'Session is not active'}), 400
+
+        count = max(1, min(request.args.get('count', default=5, type=int) or 1, MAX_LOOKAHEAD))
+        driver = DriverRegistry.resolve(session.learning_mode)
+        state = _rebuild_driver_state(session)
+
+        payloads = driver.get_lookahead(state, count)
+        if payloads and session.current_item_id != payloads[0].item_id:
+            LearningSessionService.set_current_item(session_id, payloads[0].item_id)
+
+        return jsonify({
+            'items': [dataclasses.asdict(p) for p in payloads],
+            'finished': not payloads,
+        })
+
+    except KeyError as e:
+        return jsonify({'error': f'Driver not available: {e}'}), 422
+    except Exception as e:
+        current_app.logger.error(f"Error getting lookahead: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@blueprint.route('/api/<int:session_id>/submit_batch', methods=['POST'])
+@login_required
+def api_submit_answers_batch(session_id):
+    """
+    Submit queued answers in one request (processed in order).
+
+    POST /session/api/<session_id>/submit_batch
+    Payload: { "answers": [ { "item_id": 123, "idempotency_key": "...", ... }, ... ] }
+
+    Retrying a batch is safe: answers whose idempotency_key was already
+    processed come back with status "duplicate" and are not applied again.
+
+    Returns: { "results": [ { "idempotency_key", "item_id", "status", "result" | "error" } ],
+               "session_processed_count", ... }
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        answers = data.get('answers')
+        if not isinstance(answers, list) or not answers:
+            return jsonify({'error': 'answers must be a non-empty list'}), 400
+        if len(answers) > MAX_BATCH_ANSWERS:
+            return jsonify({'error': f'At most {MAX_BATCH_ANSWERS} answers per batch'}), 400
+        if not all(isinstance(a, dict) for a in answers):
+            return jsonify({'error': 'Each answer must be an object'}), 400
+
+        session = LearningSessionService.get_session_by_id(session_id)
+        if not session or session.user_id != current_user.user_id:
+            return jsonify({'error': 'Session not found'}), 404
+
+        results = LearningSessionService.submit_answers(session_id, answers)
+
+        session = LearningSessionService.get_session_by_id(session_id)
+        response = {
+            'results': results,
+            'session_processed_count': len(session.processed_item_ids or []),
+            'session_correct_answers': session.correct_count,
+            'session_incorrect_answers': session.incorrect_count,
+            'session_points': session.points_earned,
+        }
+
+        # Same SRS HUD counts as /submit, computed once for the batch
+        if session.learning_mode == 'flashcard':
+            from mindstack_app.modules.vocabulary.flashcard.engine.algorithms import get_session_srs_counts
+            srs_counts = get_session_srs_counts(
+                current_user.user_id,
+                session.set_id_data,
+                processed_ids=list(session.processed_item_ids or [])
+            )
+            response['new_learned'] = srs_counts['new_learned']
+            response['due_remaining'] = srs_counts['due_remaining']
+
+        return jsonify(response)
+
+    except Exception as e:
+        current_app.logger.error(f"Error in submit_batch API: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
+
 @blueprint.route('/api/<int:session_id>/cancel', methods=['POST'])
 @login_required
 def api_cancel_session(session_id):
@@ -1,9 +1,15 @@
+import json
 from datetime import datetime, timezone
 from flask import current_app
-from mindstack_app.models import db, LearningSession, User
-from mindstack_app.utils.db_session import safe_commit
+from mindstack_app.models import db, LearningSession, SessionAnswerReceipt, User
+from mindstack_app.utils.db_session import safe_commit, safe_rollback, savepoint, unit_of_work
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm.attributes import flag_modified
 
+
+class _DuplicateSubmission(Exception):
+    """Another request already holds the receipt of this idempotency key."""
+
 class LearningSessionService:
     """
     Service layer for managing database-backed learning sessions.
@@ -207,7 +213,7 @@ class LearningSessionService:
             safe_commit(db.session)
             return effective_duration_ms
         except Exception as e:
-            db.session.rollback()
+            safe_rollback(db.session)
             current_app.logger.error(f"Error updating session progress: {e}", exc_info=True)
             return 0
 
@@ -297,6 +303,24 @@ class LearningSessionService:
             LearningSession.status.in_(['completed', 'cancelled'])
         ).order_by(LearningSession.end_time.desc()).limit(limit).all()
 
+    @staticmethod
+    def update_session_data(session_id, updates):
+        """Merge keys into session_data (e.g. a precomputed card queue). Returns False if not active."""
+        try:
+            session = db.session.get(LearningSession, session_id)
+            if not session or session.status != 'active':
+                return False
+            data = dict(session.session_data or {})
+            data.update(updates)
+            session.session_data = data
+            flag_modified(session, 'session_data')
+            safe_commit(db.session)
+            return True
+        except Exception as e:
+            safe_rollback(db.session)
+            current_app.logger.error(f"Error updating session data {session_id}: {e}", exc_info=True)
+            return False
+
     @staticmethod
     def set_current_item(session_id, item_id):
         """Update the active item for a session (for persistence)."""
@@ -389,6 +413,16 @@ class LearningSessionService:
         session = db.session.get(LearningSession, session_id)
         if not session:
             raise ValueError(f"Session {session_id} not found")
+
+        # Idempotency: a retried submission returns the stored result, nothing is re-applied
+        idempotency_key = str(user_input['idempotency_key']) if user_input.get('idempotency_key') else None
+        if idempotency_key and len(idempotency_key) > 100:
+            raise ValueError("'idempotency_key' must be at most 100 characters")
+        if idempotency_key:
+            receipt = LearningSessionService._get_answer_receipt(session_id, idempotency_key)
+            if receipt is not None:
+                return receipt
+
         if session.status != 'active':
             raise ValueError(f"Session {session_id} is not active (status={session.status})")
 
@@ -414,19 +448,83 @@ class LearningSessionService:
             started_at=session.start_time.isoformat() if session.start_time else '',
         )
 
-        # 4. Process via driver
-        result = driver.process_submission(state, item_id, user_input)
-
-        # 5. Sync state back to DB
+        # 4-5. Process via driver and sync state back to DB in ONE transaction:
+        # FSRS state, StudyLog, ScoreLog, badges and session counters are
+        # flushed by their services and committed once at the end.
         try:
-            LearningSessionService.update_progress(
-                session_id=session_id,
-                item_id=item_id,
-                result_type='correct' if result.is_correct else 'incorrect',
-                points=result.score_change,
-            )
-        except Exception as e:
-            current_app.logger.error(f"Error syncing session progress: {e}", exc_info=True)
+            with unit_of_work(db.session):
+                receipt = None
+                if idempotency_key:
+                    # Claim the key first: a concurrent duplicate blocks on the
+                    # unique key and fails once this transaction commits.
+                    receipt = SessionAnswerReceipt(session_id=session_id, idempotency_key=idempotency_key)
+                    db.session.add(receipt)
+                    try:
+                        db.session.flush()
+                    except IntegrityError:
+                        raise _DuplicateSubmission()
+
+                result = driver.process_submission(state, item_id, user_input)
+
+                try:
+                    # A failed counter sync must not undo the answer
+                    with savepoint(db.session):
+                        LearningSessionService.update_progress(
+                            session_id=session_id,
+                            item_id=item_id,
+                            result_type='correct' if result.is_correct else 'incorrect',
+                            points=result.score_change,
+                        )
+                except Exception as e:
+                    current_app.logger.error(f"Error syncing session progress: {e}", exc_info=True)
+
+                result_dict = dataclasses.asdict(result)
+                if receipt is not None:
+                    receipt.result = json.loads(json.dumps(result_dict, default=str))
+        except _DuplicateSubmission:
+            receipt = LearningSessionService._get_answer_receipt(session_id, idempotency_key)
+            if receipt is None:
+                raise ValueError(f"Submission {idempotency_key} is already being processed")
+            return receipt
 
         # 6. Return as dict
-        return dataclasses.asdict(result)
+        return result_dict
+
+    @staticmethod
+    def _get_answer_receipt(session_id, key):
+        """Stored result of a keyed submission (marked 'duplicate'), or None."""
+        receipt = SessionAnswerReceipt.query.filter_by(session_id=session_id, idempotency_key=key).first()
+        if receipt is None or receipt.result is None:
+            return None
+        return {**receipt.result, 'duplicate': True}
+
+    @staticmethod
+    def submit_answers(session_id, answers):
+        """
+        Process a batch of submissions in order (async client queue).
+
+        Each answer is its own unit of work, so one failure does not undo the
+        others. Answers should carry an 'idempotency_key' so that a batch
+        retried after a network error is not applied twice.
+
+        Returns:
+            List of { "idempotency_key", "item_id", "status": "ok" | "duplicate" | "error",
+                      "result" | "error" } in the order of *answers*.
+        """
+        outcomes = []
+        for user_input in answers:
+            outcome = {
+                'idempotency_key': user_input.get('idempotency_key'),
+                'item_id': user_input.get('item_id'),
+            }
+            try:
+                result = LearningSessionService.submit_answer(session_id, user_input)
+                outcome['status'] = 'duplicate' if result.pop('duplicate', False) else 'ok'
+                outcome['result'] = result
+            except (ValueError, KeyError) as e:
+                outcome.update(status='error', error=str(e))
+            except Exception as e:
+                current_app.logger.error(f"Error in batched submission for session {session_id}: {e}", exc_info=True)
+                outcome.update(status='error', error='Internal server error')
+            outcomes.append(outcome)
+        return outcomes
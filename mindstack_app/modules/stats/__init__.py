@@ -17,3 +17,10 @@ def setup_module(app):
     
     from .services.analytics_listener import init_analytics_listener
     init_analytics_listener()
+
+    from .commands import register_commands
+    register_commands(app)
+
+    # Nightly repair of the daily rollups against StudyLog
+    from .services.daily_rollup_service import DailyRollupService
+    DailyRollupService.init_scheduler(app)
@@ -0,0 +1,28 @@
+# File: mindstack_app/modules/stats/commands.py
+"""
+CLI commands for the Stats module.
+
+Usage:
+    flask --app start_mindstack_app rebuild-daily-stats
+    flask --app start_mindstack_app rebuild-daily-stats --user-id 5 --since 2024-01-01
+"""
+from datetime import date
+
+import click
+
+
+def register_commands(app):
+    """Attach stats maintenance commands to `app.cli`."""
+
+    @app.cli.command('rebuild-daily-stats')
+    @click.option('--user-id', type=int, default=None, help='Only rebuild this user.')
+    @click.option('--since', default=None, help='Only rebuild days >= YYYY-MM-DD.')
+    def rebuild_daily_stats_command(user_id, since):
+        """Backfill / repair the daily rollups (DailyStat) from StudyLog."""
+        from .services.daily_rollup_service import DailyRollupService
+        since_date = date.fromisoformat(since) if since else None
+        result = DailyRollupService.rebuild(user_id=user_id, since=since_date)
+        click.echo(
+            f"Đã dựng lại {result.get('row_count', 0)} dòng thống kê ngày "
+            f"từ {result.get('log_count', 0)} lượt học."
+        )
@@ -168,3 +168,36 @@ class StatsInterface:
     def get_retention_trend(user_id: int, days: int = 7) -> list:
         """Get daily average retention trend."""
         return get_retention_trend(user_id, days)
+
+    # === DAILY ROLLUPS (DailyStat built from StudyLog) ===
+
+    @staticmethod
+    def get_rollup_today(user_id: int) -> date:
+        """Today's date in the user's profile timezone (the day rollups are keyed by)."""
+        from .services.daily_rollup_service import DailyRollupService
+        return DailyRollupService.local_today(user_id)
+
+    @staticmethod
+    def get_daily_rollup_map(user_id: int, metric: str, start_date: date, end_date: date,
+                             item_types: Optional[List[str]] = None) -> Dict[str, int]:
+        """{'YYYY-MM-DD': value} for a rollup metric (reviews, new_items, correct, duration_ms, points)."""
+        from .services.daily_rollup_service import DailyRollupService
+        return DailyRollupService.get_daily_map(user_id, metric, start_date, end_date, item_types=item_types)
+
+    @staticmethod
+    def get_hourly_activity_histogram(user_id: int) -> List[int]:
+        """All-time activity count per local hour of day (24 values)."""
+        from .services.daily_rollup_service import DailyRollupService
+        return DailyRollupService.get_hourly_histogram(user_id)
+
+    @staticmethod
+    def rebuild_daily_rollups(user_id: Optional[int] = None, since: Optional[date] = None) -> Dict[str, Any]:
+        """Backfill / repair the daily rollups from StudyLog."""
+        from .services.daily_rollup_service import DailyRollupService
+        return DailyRollupService.rebuild(user_id=user_id, since=since)
+
+    @staticmethod
+    def delete_user_daily_stats(user_id: Optional[int] = None) -> None:
+        """Delete a user's daily stats (everyone's if None) on a progress reset. Joins the caller's transaction."""
+        from .services.daily_rollup_service import DailyRollupService
+        DailyRollupService.delete_user_data(user_id)
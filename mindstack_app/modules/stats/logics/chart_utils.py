@@ -139,6 +139,39 @@ def sanitize_pagination(
     return page, per_page
 
 
+def encode_keyset_cursor(sort_value: Optional[datetime], item_id: int) -> str:
+    """
+    Opaque "next page" cursor: the (sort_value, item_id) of the last row of a page.
+
+    >>> encode_keyset_cursor(datetime(2024, 1, 2, 3, 4, 5), 42)
+    '2024-01-02T03:04:05|42'
+    """
+    if isinstance(sort_value, str):
+        sort_value = datetime.fromisoformat(sort_value)
+    if sort_value is not None and sort_value.tzinfo is not None:
+        sort_value = sort_value.astimezone(timezone.utc).replace(tzinfo=None)
+    stamp = sort_value.isoformat() if sort_value else ''
+    return f"{stamp}|{int(item_id)}"
+
+
+def decode_keyset_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Parse a cursor from `encode_keyset_cursor`; malformed input yields None (first page).
+
+    >>> decode_keyset_cursor('2024-01-02T03:04:05|42')
+    (datetime.datetime(2024, 1, 2, 3, 4, 5), 42)
+    >>> decode_keyset_cursor('garbage') is None
+    True
+    """
+    if not cursor or '|' not in cursor:
+        return None
+    stamp, _, raw_id = cursor.rpartition('|')
+    try:
+        return datetime.fromisoformat(stamp), int(raw_id)
+    except ValueError:
+        return None
+
+
 def fill_series_gaps(
     data_map: dict,
     start_date: date,
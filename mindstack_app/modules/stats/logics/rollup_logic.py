@@ -0,0 +1,135 @@
+"""
+Rollup Logic
+Pure helpers for the per-day StudyLog rollups stored in `DailyStat`.
+Không dính tới DB hay Flask context.
+
+Key layout (metric_key, max 50 chars):
+    'reviews'                 -> total for the day
+    'reviews:type:FLASHCARD'  -> per item type (FLASHCARD, QUIZ_MCQ, ...)
+    'reviews:mode:mcq'        -> per learning mode (flashcard, mcq, typing, ...)
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+import pytz
+
+METRIC_REVIEWS = 'reviews'
+METRIC_NEW_ITEMS = 'new_items'
+METRIC_CORRECT = 'correct'
+METRIC_DURATION_MS = 'duration_ms'
+METRIC_POINTS = 'points'
+
+ROLLUP_METRICS = (METRIC_REVIEWS, METRIC_NEW_ITEMS, METRIC_CORRECT, METRIC_DURATION_MS, METRIC_POINTS)
+
+# UserMetric keys for the all-time hour-of-day histogram ('activity_hour:00'..'activity_hour:23')
+HOUR_METRIC_PREFIX = 'activity_hour:'
+
+MAX_KEY_LENGTH = 50
+
+
+def metric_key(metric: str, item_type: Optional[str] = None, learning_mode: Optional[str] = None) -> str:
+    """
+    Build the DailyStat key for a metric, optionally scoped to an item type or mode.
+
+    >>> metric_key('reviews')
+    'reviews'
+    >>> metric_key('reviews', item_type='FLASHCARD')
+    'reviews:type:FLASHCARD'
+    >>> metric_key('points', learning_mode='mcq')
+    'points:mode:mcq'
+    """
+    if item_type:
+        key = f"{metric}:type:{item_type}"
+    elif learning_mode:
+        key = f"{metric}:mode:{learning_mode}"
+    else:
+        key = metric
+    return key[:MAX_KEY_LENGTH]
+
+
+def hour_key(hour: int) -> str:
+    """
+    >>> hour_key(7)
+    'activity_hour:07'
+    """
+    return f"{HOUR_METRIC_PREFIX}{hour:02d}"
+
+
+def is_rollup_key(key: str) -> bool:
+    """
+    Whether a DailyStat key is owned by the rollup (cleared and rebuilt by the repair job).
+
+    >>> is_rollup_key('reviews:mode:typing'), is_rollup_key('new_items'), is_rollup_key('score_earned')
+    (True, True, False)
+    """
+    return key.split(':', 1)[0] in ROLLUP_METRICS
+
+
+def to_local(timestamp: Optional[datetime], tz_name: Optional[str]) -> datetime:
+    """
+    Convert a stored timestamp (naive = UTC) into the user's timezone.
+    Unknown timezone names fall back to UTC.
+
+    >>> to_local(datetime(2024, 1, 1, 20, 0), 'Asia/Ho_Chi_Minh').isoformat()
+    '2024-01-02T03:00:00+07:00'
+    >>> to_local(datetime(2024, 1, 1, 20, 0), 'Not/AZone').isoformat()
+    '2024-01-01T20:00:00+00:00'
+    """
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    try:
+        user_tz = pytz.timezone(tz_name) if tz_name else pytz.UTC
+    except pytz.UnknownTimeZoneError:
+        user_tz = pytz.UTC
+    return timestamp.astimezone(user_tz)
+
+
+def review_increments(is_correct: bool, is_new: bool, duration_ms: int = 0, points: int = 0) -> Dict[str, float]:
+    """
+    Counters contributed by one StudyLog row (zero values are dropped).
+
+    >>> review_increments(True, False, 1500, 10)
+    {'reviews': 1, 'correct': 1, 'duration_ms': 1500, 'points': 10}
+    >>> review_increments(False, True)
+    {'reviews': 1, 'new_items': 1}
+    """
+    values = {
+        METRIC_REVIEWS: 1,
+        METRIC_NEW_ITEMS: 1 if is_new else 0,
+        METRIC_CORRECT: 1 if is_correct else 0,
+        METRIC_DURATION_MS: int(duration_ms or 0),
+        METRIC_POINTS: int(points or 0),
+    }
+    return {metric: value for metric, value in values.items() if value}
+
+
+def expand_keys(increments: Dict[str, float], item_type: Optional[str] = None,
+                learning_mode: Optional[str] = None) -> Dict[str, float]:
+    """
+    Fan metric increments out to the total, per-type and per-mode keys.
+
+    >>> sorted(expand_keys({'reviews': 1}, 'FLASHCARD', 'flashcard').items())
+    [('reviews', 1), ('reviews:mode:flashcard', 1), ('reviews:type:FLASHCARD', 1)]
+    """
+    expanded: Dict[str, float] = {}
+    for metric, value in increments.items():
+        expanded[metric_key(metric)] = value
+        if item_type:
+            expanded[metric_key(metric, item_type=item_type)] = value
+        if learning_mode:
+            expanded[metric_key(metric, learning_mode=learning_mode)] = value
+    return expanded
+
+
+def fill_daily_series(values: Dict[date, float], start: date, days: int) -> Iterable[Tuple[date, float]]:
+    """
+    Dense (date, value) series over `days` days starting at `start` (missing days = 0).
+
+    >>> list(fill_daily_series({date(2024, 1, 2): 3}, date(2024, 1, 1), 3))
+    [(datetime.date(2024, 1, 1), 0), (datetime.date(2024, 1, 2), 3), (datetime.date(2024, 1, 3), 0)]
+    """
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        yield day, values.get(day, 0)
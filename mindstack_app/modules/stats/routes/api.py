@@ -11,7 +11,8 @@ def get_leaderboard_api():
     data = LeaderboardService.get_leaderboard(timeframe=timeframe, viewer_user=current_user)
     return jsonify({
         'success': True,
-        'data': data
+        'data': data,
+        'my_rank': LeaderboardService.get_viewer_rank(current_user, timeframe)
     })
 
 @stats_bp.route('/api/leaderboard/container/<int:container_id>')
@@ -71,3 +72,37 @@ def api_get_container_summary(container_id):
             'error': str(e)
         }), 500
 
+
+@stats_bp.route('/api/metrics/<string:item_kind>')
+@login_required
+def api_get_set_metrics(item_kind):
+    """
+    Per-set metrics with a page of items (flashcard | quiz | course).
+
+    Query: container_id, status, page, per_page, cursor. The first page of a
+    set returns `items.next_cursor`; sending it back as `cursor` fetches the
+    next page with keyset pagination instead of OFFSET.
+    """
+    from ..services.metrics import get_course_metrics, get_flashcard_set_metrics, get_quiz_set_metrics
+
+    handlers = {
+        'flashcard': get_flashcard_set_metrics,
+        'quiz': get_quiz_set_metrics,
+        'course': get_course_metrics,
+    }
+    handler = handlers.get(item_kind)
+    if handler is None:
+        return jsonify({'success': False, 'error': 'Loại dữ liệu không hợp lệ.'}), 404
+
+    data = handler(
+        current_user.user_id,
+        container_id=request.args.get('container_id', type=int),
+        status=request.args.get('status'),
+        page=request.args.get('page', 1),
+        per_page=request.args.get('per_page', 10),
+        cursor=request.args.get('cursor') or None,
+    )
+    return jsonify({
+        'success': True,
+        'data': {str(container_id): metrics for container_id, metrics in data.items()}
+    })
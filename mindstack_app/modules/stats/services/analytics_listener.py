@@ -4,8 +4,9 @@ Listens to system signals and updates statistical models (UserMetric, DailyStat)
 This is the 'Writer' component of the Analytics system.
 """
 from datetime import datetime, timezone
-from mindstack_app.core.signals import session_completed, user_logged_in, score_awarded
+from mindstack_app.core.signals import session_completed, user_logged_in, score_awarded, study_logged
 from mindstack_app.modules.stats.services.metrics_kernel import MetricsKernel
+from mindstack_app.modules.stats.services.daily_rollup_service import DailyRollupService
 from flask import current_app
 
 def init_analytics_listener():
@@ -13,6 +14,7 @@ def init_analytics_listener():
     session_completed.connect(on_session_completed)
     user_logged_in.connect(on_user_logged_in)
     score_awarded.connect(on_score_awarded)
+    study_logged.connect(on_study_logged)
 
 def on_session_completed(sender, **kwargs):
     """
@@ -75,3 +77,27 @@ def on_score_awarded(sender, **kwargs):
         MetricsKernel.increment_user_metric(user_id, 'total_lifetime_score', amount)
     except Exception as e:
         current_app.logger.error(f"Error updating analytics for score: {e}")
+
+def on_study_logged(sender, **kwargs):
+    """
+    Handle a recorded StudyLog: update the daily rollups (DailyStat).
+    Payload: user_id, item_id, timestamp, learning_mode, is_correct,
+             review_duration, points, is_first_review
+    """
+    user_id = kwargs.get('user_id')
+    if not user_id:
+        return
+
+    try:
+        DailyRollupService.record_review(
+            user_id,
+            item_id=kwargs.get('item_id'),
+            timestamp=kwargs.get('timestamp'),
+            learning_mode=kwargs.get('learning_mode'),
+            is_correct=kwargs.get('is_correct', False),
+            review_duration=kwargs.get('review_duration', 0),
+            points=kwargs.get('points', 0),
+            is_first_review=kwargs.get('is_first_review', False)
+        )
+    except Exception as e:
+        current_app.logger.error(f"Error updating daily rollups: {e}")
@@ -0,0 +1,269 @@
+# File: mindstack_app/modules/stats/services/daily_rollup_service.py
+"""
+Daily Rollup Service
+====================
+Per-user, per-local-day counters built from StudyLog and stored in `DailyStat`
+(reviews, new items, correct, duration, points; total / per item type / per
+learning mode), plus an all-time hour-of-day histogram in `UserMetric`.
+
+- Write path: `record_review` runs for every StudyLog (`study_logged` signal)
+  inside the caller's transaction (no commit). The local day comes from the
+  user's profile timezone.
+- Read path: dashboard charts read a handful of DailyStat rows instead of
+  scanning StudyLog/ScoreLog.
+- Repair: `rebuild` recomputes the rollups from StudyLog (CLI + nightly job).
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from mindstack_app.core.extensions import db, scheduler
+from mindstack_app.models import User, LearningItem
+from mindstack_app.utils.db_session import safe_commit, upsert_increment
+from ..models import DailyStat, UserMetric
+from ..logics.rollup_logic import (
+    HOUR_METRIC_PREFIX, ROLLUP_METRICS,
+    expand_keys, hour_key, is_rollup_key, metric_key, review_increments, to_local
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DailyRollupService:
+    """Dịch vụ tổng hợp số liệu học tập theo ngày (rollup từ StudyLog)."""
+
+    # Days re-derived from StudyLog by the nightly repair job
+    REPAIR_WINDOW_DAYS = 3
+
+    # ── Write path ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _user_timezone(user_id: int) -> str:
+        user = db.session.get(User, user_id)
+        return (user.timezone if user and user.timezone else 'UTC')
+
+    @staticmethod
+    def _item_type(item_id: Optional[int]) -> Optional[str]:
+        if not item_id:
+            return None
+        item = db.session.get(LearningItem, item_id)
+        return item.item_type if item else None
+
+    @classmethod
+    def record_review(cls, user_id: int, item_id: Optional[int] = None, timestamp: Optional[datetime] = None,
+                      learning_mode: Optional[str] = None, is_correct: bool = False,
+                      review_duration: int = 0, points: int = 0, is_first_review: bool = False) -> None:
+        """
+        Add one StudyLog row to the user's rollups for its local day.
+        Does not commit: joins the caller's transaction together with the StudyLog.
+        """
+        local_ts = to_local(timestamp, cls._user_timezone(user_id))
+        increments = review_increments(is_correct, is_first_review, review_duration, points)
+        keys = expand_keys(increments, cls._item_type(item_id), learning_mode)
+
+        cls._add_daily({(user_id, local_ts.date(), key): value for key, value in keys.items()})
+        cls._add_hourly({(user_id, hour_key(local_ts.hour)): 1})
+
+    @staticmethod
+    def _add_daily(values: Dict[tuple, float]) -> None:
+        rows = [
+            {'user_id': user_id, 'date': day, 'metric_key': key, 'metric_value': float(value)}
+            for (user_id, day, key), value in values.items()
+        ]
+        upsert_increment(
+            db.session, DailyStat, rows,
+            key_columns=('user_id', 'date', 'metric_key'),
+            counter_columns=('metric_value',),
+        )
+
+    @staticmethod
+    def _add_hourly(values: Dict[tuple, float]) -> None:
+        rows = [
+            {'user_id': user_id, 'metric_key': key, 'metric_value': float(value)}
+            for (user_id, key), value in values.items()
+        ]
+        upsert_increment(
+            db.session, UserMetric, rows,
+            key_columns=('user_id', 'metric_key'),
+            counter_columns=('metric_value',),
+        )
+
+    # ── Read path ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def local_today(user_id: int) -> date:
+        """Today's date in the user's profile timezone (the day rollups are keyed by)."""
+        return to_local(None, DailyRollupService._user_timezone(user_id)).date()
+
+    @staticmethod
+    def get_daily_values(user_id: int, start_date: date, end_date: date,
+                         keys: Iterable[str]) -> Dict[str, Dict[date, float]]:
+        """{metric_key: {date: value}} for the requested keys in [start_date, end_date]."""
+        keys = list(keys)
+        result: Dict[str, Dict[date, float]] = {key: {} for key in keys}
+        if not keys:
+            return result
+
+        rows = db.session.query(DailyStat.metric_key, DailyStat.date, DailyStat.metric_value).filter(
+            DailyStat.user_id == user_id,
+            DailyStat.date >= start_date,
+            DailyStat.date <= end_date,
+            DailyStat.metric_key.in_(keys)
+        ).all()
+        for key, day, value in rows:
+            result[key][day] = value or 0
+        return result
+
+    @classmethod
+    def get_daily_map(cls, user_id: int, metric: str, start_date: date, end_date: date,
+                      item_types: Optional[List[str]] = None, learning_mode: Optional[str] = None) -> Dict[str, int]:
+        """
+        {'YYYY-MM-DD': value} for one metric, optionally summed over item types
+        or restricted to one learning mode.
+        """
+        if item_types:
+            keys = [metric_key(metric, item_type=item_type) for item_type in item_types]
+        elif learning_mode:
+            keys = [metric_key(metric, learning_mode=learning_mode)]
+        else:
+            keys = [metric_key(metric)]
+
+        totals: Dict[str, int] = defaultdict(int)
+        for per_day in cls.get_daily_values(user_id, start_date, end_date, keys).values():
+            for day, value in per_day.items():
+                totals[day.isoformat()] += int(value)
+        return dict(totals)
+
+    @staticmethod
+    def get_hourly_histogram(user_id: int) -> List[int]:
+        """All-time activity count per local hour of day (index 0-23)."""
+        rows = db.session.query(UserMetric.metric_key, UserMetric.metric_value).filter(
+            UserMetric.user_id == user_id,
+            UserMetric.metric_key.like(f"{HOUR_METRIC_PREFIX}%")
+        ).all()
+        counts = [0] * 24
+        for key, value in rows:
+            try:
+                hour = int(key[len(HOUR_METRIC_PREFIX):])
+            except ValueError:
+                continue
+            if 0 <= hour < 24:
+                counts[hour] = int(value or 0)
+        return counts
+
+    # ── Backfill / repair ─────────────────────────────────────────────
+
+    @classmethod
+    def rebuild(cls, user_id: Optional[int] = None, since: Optional[date] = None) -> Dict[str, Any]:
+        """
+        Recompute rollups from StudyLog and replace the stored ones.
+
+        since=None rebuilds every day and the hour histogram. Otherwise only
+        days >= `since` are rebuilt (StudyLog is read from one day earlier to
+        cover timezones ahead of UTC); the all-time histogram is left as is.
+        """
+        from mindstack_app.modules.learning_history.interface import LearningHistoryInterface
+
+        lower_bound = None
+        if since is not None:
+            lower_bound = datetime.combine(since - timedelta(days=1), time.min)
+
+        timezones: Dict[int, str] = {}
+        item_types: Dict[int, Optional[str]] = {}
+        daily: Dict[tuple, float] = defaultdict(float)
+        hourly: Dict[tuple, float] = defaultdict(float)
+        log_count = 0
+
+        for log in LearningHistoryInterface.iter_rollup_source(user_id=user_id, since=lower_bound):
+            uid = log['user_id']
+            if uid not in timezones:
+                timezones[uid] = cls._user_timezone(uid)
+            local_ts = to_local(log['timestamp'], timezones[uid])
+            if since is not None and local_ts.date() < since:
+                continue
+
+            item_id = log['item_id']
+            if item_id not in item_types:
+                item_types[item_id] = cls._item_type(item_id)
+
+            increments = review_increments(
+                log['is_correct'], log['is_first_review'], log['review_duration'], log['points']
+            )
+            for key, value in expand_keys(increments, item_types[item_id], log['learning_mode']).items():
+                daily[(uid, local_ts.date(), key)] += value
+            hourly[(uid, hour_key(local_ts.hour))] += 1
+            log_count += 1
+
+        cls._clear(user_id, since)
+        cls._add_daily(daily)
+        if since is None:
+            cls._add_hourly(hourly)
+        safe_commit(db.session)
+
+        return {'success': True, 'log_count': log_count, 'row_count': len(daily)}
+
+    @staticmethod
+    def _clear(user_id: Optional[int], since: Optional[date]) -> None:
+        """Delete the rollup-owned DailyStat keys (and the histogram on a full rebuild)."""
+        stale = DailyStat.query.filter(
+            DailyStat.metric_key.in_(ROLLUP_METRICS) |
+            DailyStat.metric_key.like('%:type:%') |
+            DailyStat.metric_key.like('%:mode:%')
+        )
+        if user_id is not None:
+            stale = stale.filter(DailyStat.user_id == user_id)
+        if since is not None:
+            stale = stale.filter(DailyStat.date >= since)
+
+        stale_ids = [stat.stat_id for stat in stale.with_entities(DailyStat.stat_id, DailyStat.metric_key)
+                     if is_rollup_key(stat.metric_key)]
+        for start in range(0, len(stale_ids), 500):
+            DailyStat.query.filter(DailyStat.stat_id.in_(stale_ids[start:start + 500])).delete(
+                synchronize_session=False
+            )
+
+        if since is None:
+            hours = UserMetric.query.filter(UserMetric.metric_key.like(f"{HOUR_METRIC_PREFIX}%"))
+            if user_id is not None:
+                hours = hours.filter(UserMetric.user_id == user_id)
+            hours.delete(synchronize_session=False)
+
+    @staticmethod
+    def delete_user_data(user_id: Optional[int] = None) -> None:
+        """Delete all DailyStat rows and the hour histogram of a user (everyone if None). No commit."""
+        stats = DailyStat.query
+        hours = UserMetric.query.filter(UserMetric.metric_key.like(f"{HOUR_METRIC_PREFIX}%"))
+        if user_id is not None:
+            stats = stats.filter(DailyStat.user_id == user_id)
+            hours = hours.filter(UserMetric.user_id == user_id)
+        stats.delete(synchronize_session=False)
+        hours.delete(synchronize_session=False)
+
+    @staticmethod
+    def run_repair():
+        """Scheduler job: re-derive the last few days of rollups from StudyLog."""
+        with scheduler.app.app_context():
+            try:
+                since = datetime.now(timezone.utc).date() - timedelta(days=DailyRollupService.REPAIR_WINDOW_DAYS)
+                result = DailyRollupService.rebuild(since=since)
+                logger.info(f"Daily rollup repair done: {result.get('log_count', 0)} logs.")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Daily rollup repair failed: {e}")
+
+    @staticmethod
+    def init_scheduler(app):
+        """Register the nightly repair job with APScheduler (03:45)."""
+        job_id = 'daily_rollup_repair'
+        if not scheduler.get_job(job_id):
+            scheduler.add_job(
+                id=job_id,
+                func=DailyRollupService.run_repair,
+                trigger='cron',
+                hour=3,
+                minute=45,
+                replace_existing=True
+            )
+            logger.info("Daily rollup repair job registered at 03:45.")
@@ -1,11 +1,23 @@
 from typing import List, Dict, Any, Optional
-from sqlalchemy import func, desc
 
-from mindstack_app.models import db, User, ScoreLog
-from ..logics.time_logic import TimeLogic
+from mindstack_app.models import User
+from mindstack_app.modules.gamification import interface as gamification_interface
 from ..config import StatsConfig
 
 class LeaderboardService:
+    @staticmethod
+    def _to_window(timeframe: str) -> str:
+        """Map Stats timeframes (TimeLogic semantics) to leaderboard windows."""
+        return '30d' if timeframe == 'month' else timeframe
+
+    @classmethod
+    def get_viewer_rank(cls, viewer_user: Optional[User], timeframe: str = None) -> Optional[Dict[str, Any]]:
+        """Thứ hạng của người xem (kể cả khi nằm ngoài top-N)."""
+        if not viewer_user:
+            return None
+        timeframe = timeframe or StatsConfig.DEFAULT_TIMEFRAME
+        return gamification_interface.get_leaderboard_rank(viewer_user.user_id, cls._to_window(timeframe))
+
     @classmethod
     def get_leaderboard(cls, timeframe: str = None, limit: int = None, viewer_user: Optional[User] = None) -> List[Dict[str, Any]]:
         """
@@ -14,52 +26,35 @@ class LeaderboardService:
         timeframe = timeframe or StatsConfig.DEFAULT_TIMEFRAME
         limit = limit or StatsConfig.LEADERBOARD_LIMIT
         
-        # Gọi tầng Logic để tính toán mốc thời gian
-        start_date = TimeLogic.get_timeframe_start(timeframe)
-
-        query = db.session.query(
-            User.user_id,
-            User.username,
-            User.user_role,
-            User.avatar_url,
-            func.sum(ScoreLog.score_change).label('score_val')
-        ).join(ScoreLog, User.user_id == ScoreLog.user_id)
-
-        if start_date:
-            # SQLite comparison: Convert to naive UTC
-            db_start_date = start_date.replace(tzinfo=None)
-            query = query.filter(ScoreLog.timestamp >= db_start_date)
-
-        results = (
-            query
-            .group_by(User.user_id, User.username, User.user_role, User.avatar_url)
-            .order_by(desc('score_val'))
-            .limit(limit)
-            .all()
+        # Đọc từ bảng xếp hạng dựng sẵn của Gamification (không quét ScoreLog).
+        # 'month' của Stats là 30 ngày gần nhất (xem TimeLogic) -> cửa sổ trượt '30d'.
+        results = gamification_interface.get_leaderboard_entries(
+            timeframe=cls._to_window(timeframe),
+            limit=limit
         )
 
         leaderboard = []
         viewer_id = viewer_user.user_id if viewer_user else None
         
-        for idx, row in enumerate(results, start=1):
+        for row in results:
             # Logic xử lý Avatar
             avatar_url = None
-            if row.avatar_url:
-                if row.avatar_url.startswith(('http://', 'https://')):
-                    avatar_url = row.avatar_url
+            if row['avatar_url']:
+                if row['avatar_url'].startswith(('http://', 'https://')):
+                    avatar_url = row['avatar_url']
                 else:
                     from flask import url_for
                     try:
-                        avatar_url = url_for('media_uploads', filename=row.avatar_url)
+                        avatar_url = url_for('media_uploads', filename=row['avatar_url'])
                     except: pass
             
             leaderboard.append({
-                'rank': idx,
-                'user_id': row.user_id,
-                'username': row.username,
+                'rank': row['rank'],
+                'user_id': row['user_id'],
+                'username': row['username'],
                 'avatar_url': avatar_url,
-                'score': int(row.score_val or 0),
-                'is_current_user': (row.user_id == viewer_id)
+                'score': row['score'],
+                'is_current_user': (row['user_id'] == viewer_id)
             })
             
         return leaderboard
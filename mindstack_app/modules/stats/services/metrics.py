@@ -4,7 +4,7 @@
 from datetime import datetime, timedelta, date, timezone
 from collections import defaultdict
 
-from sqlalchemy import func, case, or_
+from sqlalchemy import and_, func, case, or_
 
 from mindstack_app.models import (
     db,
@@ -23,6 +23,8 @@ from ..logics.chart_utils import (
     date_range,
     parse_history_datetime,
     sanitize_pagination,
+    encode_keyset_cursor,
+    decode_keyset_cursor,
 )
 
 
@@ -233,248 +235,192 @@ def get_activity_breakdown(user_id, timeframe='30d'):
     return {'timeframe': timeframe, 'total_entries': total_entries, 'total_score': total_score, 'average_score_per_entry': average_score_per_entry, 'buckets': buckets}
 
 
-def paginate_flashcard_items(user_id, container_id=None, status=None, page=1, per_page=10):
-    page, per_page = sanitize_pagination_args(page, per_page)
-    
-    # 1. Fetch Items query (Core Domain)
-    query = LearningItem.query.filter(
-        LearningItem.item_type == 'FLASHCARD'
+# Sort key for items the user has never seen (sorted last)
+LISTING_EPOCH = datetime(1970, 1, 1)
+
+
+def _item_listing_query(user_id, item_type, container_id):
+    """
+    LearningItem rows of one type joined with the user's memory states (one SQL query).
+    With a container the listing covers every item of the set (unseen = no state);
+    without one it covers only the user's own items (inner join), so the cost
+    depends on the user's states, not on every item in the system.
+    """
+    states = FsrsService.get_user_states_subquery(user_id)
+    sort_key = func.coalesce(states.c.last_review, states.c.created_at, LISTING_EPOCH)
+
+    query = (
+        db.session.query(
+            LearningItem.item_id,
+            LearningItem.container_id,
+            LearningItem.content,
+            LearningContainer.title.label('container_title'),
+            states.c.state, states.c.stability, states.c.difficulty,
+            states.c.due_date, states.c.last_review, states.c.created_at,
+            states.c.times_correct, states.c.times_incorrect, states.c.data,
+            sort_key.label('sort_key'),
+        )
+        .join(LearningContainer, LearningContainer.container_id == LearningItem.container_id)
+        .filter(LearningItem.item_type == item_type)
     )
     if container_id is not None:
+        query = query.outerjoin(states, states.c.item_id == LearningItem.item_id)
         query = query.filter(LearningItem.container_id == container_id)
-        
-    items_list = query.all()
-    item_ids = [item.item_id for item in items_list]
-    
-    # 2. Fetch FSRS States (FSRS Domain)
-    # We fetch ALL states for these items to support filtering/sorting in memory
-    memory_states = FsrsService.get_memory_states(user_id, item_ids)
-    
-    # 3. Merge Data
-    merged_rows = []
-    from datetime import datetime
-    now = datetime.now(timezone.utc)
-    
-    for item in items_list:
-        state = memory_states.get(item.item_id)
-        
-        # Determine status
-        fsrs_state = state.state if state else 0
-        fsrs_stability = state.stability if state else 0.0
-        fsrs_difficulty = state.difficulty if state else 0.0
-        due_date = state.due_date if state else None
-        last_review = state.last_review if state else None
-        created_at = state.created_at if state else None # Assuming we want to sort by created if new
-        
-        status_str = 'reviewing' # default
-        if fsrs_state == 0: status_str = 'new'
-        elif fsrs_state == 1 or fsrs_state == 3: status_str = 'learning'
-        elif fsrs_difficulty >= 8.0: status_str = 'hard'
-        elif fsrs_stability >= 21.0: status_str = 'mastered'
-        
-        # Apply Filters
-        if status and status != 'all':
-            s = status.lower()
-            if s == 'new' and status_str != 'new': continue
-            if s == 'learning' and status_str != 'learning': continue
-            if s == 'mastered' and status_str != 'mastered': continue
-            if s == 'hard' and status_str != 'hard': continue
-            if s == 'needs_review':
-                if not (due_date and due_date <= now): continue
-            if s == 'due_soon':
-                if not (due_date and due_date <= now + timedelta(days=1)): continue
-                
-        merged_rows.append({
-            'item_obj': item,
-            'state_obj': state,
-            'status': status_str,
-            'sort_key': last_review or created_at or datetime.min.replace(tzinfo=timezone.utc)
-        })
-        
-    # 4. Sort
-    # Original sort: coalesce(last_review, created_at) desc
-    merged_rows.sort(key=lambda x: x['sort_key'], reverse=True)
-    
-    # 5. Paginate
-    total = len(merged_rows)
-    start = (page - 1) * per_page
-    end = start + per_page
-    if start >= total:
-        paginated_rows = []
     else:
-        paginated_rows = merged_rows[start:end]
-        
-    # 6. Format Output
+        query = query.join(states, states.c.item_id == LearningItem.item_id)
+    return query, states, sort_key
+
+
+def _paginate_listing(query, sort_key, page, per_page, cursor):
+    """
+    COUNT + one page ordered by (sort_key DESC, item_id ASC).
+    A cursor from the previous page switches to keyset pagination (no OFFSET scan).
+    """
+    total = query.order_by(None).count()
+
+    query = query.order_by(sort_key.desc(), LearningItem.item_id.asc())
+    keyset = decode_keyset_cursor(cursor)
+    if keyset is not None:
+        cursor_key, cursor_id = keyset
+        query = query.filter(or_(
+            sort_key < cursor_key,
+            and_(sort_key == cursor_key, LearningItem.item_id > cursor_id)
+        ))
+    else:
+        query = query.offset((page - 1) * per_page)
+
+    rows = query.limit(per_page).all()
+    next_cursor = encode_keyset_cursor(rows[-1].sort_key, rows[-1].item_id) if len(rows) == per_page else None
+    return total, rows, next_cursor
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def paginate_flashcard_items(user_id, container_id=None, status=None, page=1, per_page=10, cursor=None):
+    page, per_page = sanitize_pagination_args(page, per_page)
+    query, states, sort_key = _item_listing_query(user_id, 'FLASHCARD', container_id)
+
+    fsrs_state = func.coalesce(states.c.state, 0)
+    status_expr = case(
+        (fsrs_state == 0, 'new'),
+        (fsrs_state.in_((1, 3)), 'learning'),
+        (func.coalesce(states.c.difficulty, 0.0) >= 8.0, 'hard'),
+        (func.coalesce(states.c.stability, 0.0) >= 21.0, 'mastered'),
+        else_='reviewing'
+    )
+    query = query.add_columns(status_expr.label('status'))
+
+    # SQLite stores naive UTC datetimes
+    now = datetime.utcnow()
+    s = (status or 'all').lower()
+    if s in ('new', 'learning', 'mastered', 'hard'):
+        query = query.filter(status_expr == s)
+    elif s == 'needs_review':
+        query = query.filter(states.c.due_date <= now)
+    elif s == 'due_soon':
+        query = query.filter(states.c.due_date <= now + timedelta(days=1))
+
+    total, rows, next_cursor = _paginate_listing(query, sort_key, page, per_page, cursor)
+
     records = []
-    for row in paginated_rows:
-        item = row['item_obj']
-        state = row['state_obj']
-        content = item.content or {}
-        
+    for row in rows:
+        content = row.content or {}
         records.append({
-            'container_id': item.container_id,
-            'container_title': item.container.title if item.container else "", # lazy load container
-            'item_id': item.item_id,
+            'container_id': row.container_id,
+            'container_title': row.container_title or "",
+            'item_id': row.item_id,
             'front': content.get('front'),
             'back': content.get('back'),
-            'status': row['status'],
-            'last_reviewed': state.last_review.isoformat() if state and state.last_review else None,
-            'first_seen': state.created_at.isoformat() if state and state.created_at else None,
-            'due_time': state.due_date.isoformat() if state and state.due_date else None,
+            'status': row.status,
+            'last_reviewed': _isoformat(row.last_review),
+            'first_seen': _isoformat(row.created_at),
+            'due_time': _isoformat(row.due_date),
         })
 
-    return {'status': status or 'all', 'page': page, 'per_page': per_page, 'total': total, 'records': records}
+    return {'status': status or 'all', 'page': page, 'per_page': per_page, 'total': total,
+            'records': records, 'next_cursor': next_cursor}
 
 
-def paginate_quiz_items(user_id, container_id=None, status=None, page=1, per_page=10):
+def paginate_quiz_items(user_id, container_id=None, status=None, page=1, per_page=10, cursor=None):
     page, per_page = sanitize_pagination_args(page, per_page)
-    
-    # 1. Fetch Items query
-    query = LearningItem.query.filter(LearningItem.item_type == 'QUIZ_MCQ')
-    if container_id is not None:
-        query = query.filter(LearningItem.container_id == container_id)
-        
-    items_list = query.all()
-    item_ids = [item.item_id for item in items_list]
-    
-    # 2. Fetch States
-    memory_states = FsrsService.get_memory_states(user_id, item_ids)
-    
-    # 3. Merge
-    merged_rows = []
-    from datetime import datetime
-    
-    for item in items_list:
-        state = memory_states.get(item.item_id)
-        
-        fsrs_state = state.state if state else 0
-        fsrs_stability = state.stability if state else 0.0
-        fsrs_difficulty = state.difficulty if state else 0.0
-        times_correct = state.times_correct if state else 0
-        times_incorrect = state.times_incorrect if state else 0
-        
-        status_str = 'reviewing'
-        if fsrs_state == 0: status_str = 'new'
-        elif fsrs_state == 1 or fsrs_state == 3: status_str = 'learning'
-        elif fsrs_stability >= 5.0: status_str = 'mastered'
-        elif fsrs_difficulty >= 8.0: status_str = 'hard'
-        
-        if status and status != 'all':
-            s = status.lower()
-            if s == 'new' and status_str != 'new': continue
-            if s == 'learning' and status_str != 'learning': continue
-            if s == 'mastered' and status_str != 'mastered': continue
-            if s == 'hard' and status_str != 'hard': continue
-            if s == 'needs_review':
-                # Custom logic for quiz review: learning OR wrong > right
-                is_needs_review = (fsrs_state in [1, 3]) or (times_incorrect > times_correct)
-                if not is_needs_review: continue
-        
-        merged_rows.append({
-            'item_obj': item,
-            'state_obj': state,
-            'status': status_str,
-            'sort_key': (state.last_review if state else None) or (state.created_at if state else None) or datetime.min.replace(tzinfo=timezone.utc)
-        })
-        
-    # 4. Sort
-    merged_rows.sort(key=lambda x: x['sort_key'], reverse=True)
-    
-    # 5. Paginate
-    total = len(merged_rows)
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_rows = merged_rows[start:end] if start < total else []
-    
-    # 6. Format
+    query, states, sort_key = _item_listing_query(user_id, 'QUIZ_MCQ', container_id)
+
+    fsrs_state = func.coalesce(states.c.state, 0)
+    status_expr = case(
+        (fsrs_state == 0, 'new'),
+        (fsrs_state.in_((1, 3)), 'learning'),
+        (func.coalesce(states.c.stability, 0.0) >= 5.0, 'mastered'),
+        (func.coalesce(states.c.difficulty, 0.0) >= 8.0, 'hard'),
+        else_='reviewing'
+    )
+    query = query.add_columns(status_expr.label('status'))
+
+    s = (status or 'all').lower()
+    if s in ('new', 'learning', 'mastered', 'hard'):
+        query = query.filter(status_expr == s)
+    elif s == 'needs_review':
+        # Custom logic for quiz review: learning OR wrong > right
+        query = query.filter(or_(
+            fsrs_state.in_((1, 3)),
+            func.coalesce(states.c.times_incorrect, 0) > func.coalesce(states.c.times_correct, 0)
+        ))
+
+    total, rows, next_cursor = _paginate_listing(query, sort_key, page, per_page, cursor)
+
     records = []
-    for row in paginated_rows:
-        item = row['item_obj']
-        state = row['state_obj']
-        content = item.content or {}
-        
+    for row in rows:
+        content = row.content or {}
         records.append({
-            'container_id': item.container_id,
-            'container_title': item.container.title if item.container else "",
-            'item_id': item.item_id,
+            'container_id': row.container_id,
+            'container_title': row.container_title or "",
+            'item_id': row.item_id,
             'question': content.get('question'),
-            'status': row['status'],
-            'times_correct': int((state.times_correct if state else 0)),
-            'times_incorrect': int((state.times_incorrect if state else 0)),
-            'last_reviewed': state.last_review.isoformat() if state and state.last_review else None,
-            'first_seen': state.created_at.isoformat() if state and state.created_at else None,
+            'status': row.status,
+            'times_correct': int(row.times_correct or 0),
+            'times_incorrect': int(row.times_incorrect or 0),
+            'last_reviewed': _isoformat(row.last_review),
+            'first_seen': _isoformat(row.created_at),
         })
 
-    return {'status': status or 'all', 'page': page, 'per_page': per_page, 'total': total, 'records': records}
+    return {'status': status or 'all', 'page': page, 'per_page': per_page, 'total': total,
+            'records': records, 'next_cursor': next_cursor}
 
 
-def paginate_course_items(user_id, container_id=None, status=None, page=1, per_page=10):
+def paginate_course_items(user_id, container_id=None, status=None, page=1, per_page=10, cursor=None):
     page, per_page = sanitize_pagination_args(page, per_page)
-    
-    # 1. Fetch Items
-    query = LearningItem.query.filter(LearningItem.item_type == 'LESSON')
-    if container_id is not None:
-        query = query.filter(LearningItem.container_id == container_id)
-        
-    items_list = query.all()
-    item_ids = [item.item_id for item in items_list]
-    
-    # 2. Fetch States
-    memory_states = FsrsService.get_memory_states(user_id, item_ids)
-    
-    # 3. Merge
-    merged_rows = []
-    for item in items_list:
-        state = memory_states.get(item.item_id)
-        
-        data = (state.data or {}) if state else {}
-        completion_pct = int(data.get('completion_percentage', 0))
-        
-        status_str = 'not_started'
-        if completion_pct >= 100: status_str = 'completed'
-        elif completion_pct > 0: status_str = 'in_progress'
-        
-        if status and status != 'all':
-            s = status.lower()
-            if s == 'completed' and status_str != 'completed': continue
-            if s == 'in_progress' and status_str != 'in_progress': continue
-            if s == 'not_started' and status_str != 'not_started': continue
-            
-        merged_rows.append({
-            'item_obj': item,
-            'state_obj': state,
-            'status': status_str,
-            'completion_pct': completion_pct,
-            'sort_key': (state.last_review if state else None) or (state.created_at if state else None) or datetime.min.replace(tzinfo=timezone.utc)
-        })
-        
-    # 4. Sort
-    merged_rows.sort(key=lambda x: x['sort_key'], reverse=True)
-    
-    # 5. Paginate
-    total = len(merged_rows)
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_rows = merged_rows[start:end] if start < total else []
-    
-    # 6. Format
+    query, states, sort_key = _item_listing_query(user_id, 'LESSON', container_id)
+
+    completion_pct = func.coalesce(states.c.data['completion_percentage'].as_integer(), 0)
+    status_expr = case(
+        (completion_pct >= 100, 'completed'),
+        (completion_pct > 0, 'in_progress'),
+        else_='not_started'
+    )
+    query = query.add_columns(status_expr.label('status'), completion_pct.label('completion_pct'))
+
+    s = (status or 'all').lower()
+    if s in ('completed', 'in_progress', 'not_started'):
+        query = query.filter(status_expr == s)
+
+    total, rows, next_cursor = _paginate_listing(query, sort_key, page, per_page, cursor)
+
     records = []
-    for row in paginated_rows:
-        item = row['item_obj']
-        state = row['state_obj']
-        content = item.content or {}
-        
+    for row in rows:
+        content = row.content or {}
         records.append({
-            'container_id': item.container_id,
-            'container_title': item.container.title if item.container else "",
-            'item_id': item.item_id,
+            'container_id': row.container_id,
+            'container_title': row.container_title or "",
+            'item_id': row.item_id,
             'title': content.get('title') or content.get('lesson_title'),
-            'status': row['status'],
-            'completion_percentage': row['completion_pct'],
-            'last_updated': state.last_review.isoformat() if state and state.last_review else None,
+            'status': row.status,
+            'completion_percentage': int(row.completion_pct or 0),
+            'last_updated': _isoformat(row.last_review),
         })
 
-    return {'status': status or 'all', 'page': page, 'per_page': per_page, 'total': int(total), 'records': records}
+    return {'status': status or 'all', 'page': page, 'per_page': per_page, 'total': int(total),
+            'records': records, 'next_cursor': next_cursor}
 
 
 def get_flashcard_activity_series(user_id, container_id, timeframe='30d'):
@@ -627,8 +573,12 @@ def get_course_activity_series(user_id, container_id, timeframe='30d'):
     return {'series': series, 'start_date': timeframe_start.isoformat(), 'end_date': timeframe_end.isoformat(), 'timeframe': timeframe or '30d'}
 
 
-def get_flashcard_set_metrics(user_id, container_id=None, status=None, page=1, per_page=10):
-    """Aggregate flashcard metrics per set for the provided user."""
+def get_flashcard_set_metrics(user_id, container_id=None, status=None, page=1, per_page=10, cursor=None):
+    """
+    Aggregate flashcard metrics per set for the provided user.
+    `cursor` (the `next_cursor` of the previous items page) applies to a single set.
+    """
+    cursor = cursor if container_id is not None else None
     # 1. Fetch Containers
     container_query = (
         db.session.query(LearningContainer.container_id, LearningContainer.title)
@@ -715,7 +665,9 @@ def get_flashcard_set_metrics(user_id, container_id=None, status=None, page=1, p
         items_payload = {'status': status or 'all', 'page': page, 'per_page': per_page, 'total': 0, 'records': []}
         # Only fetch items if we are looking at a specific container or if list is small?
         # The original code strictly did it. I will keep behavior.
-        items_payload = paginate_flashcard_items(user_id, container_id=cid, status=status, page=page, per_page=per_page)
+        items_payload = paginate_flashcard_items(
+            user_id, container_id=cid, status=status, page=page, per_page=per_page, cursor=cursor
+        )
         
         result[cid] = {
             'container_id': cid, 'container_title': container_map[cid],
@@ -727,8 +679,9 @@ def get_flashcard_set_metrics(user_id, container_id=None, status=None, page=1, p
     return result
 
 
-def get_quiz_set_metrics(user_id, container_id=None, status=None, page=1, per_page=10):
-    """Aggregate quiz metrics per set."""
+def get_quiz_set_metrics(user_id, container_id=None, status=None, page=1, per_page=10, cursor=None):
+    """Aggregate quiz metrics per set (`cursor` as in `get_flashcard_set_metrics`)."""
+    cursor = cursor if container_id is not None else None
     # 1. Fetch Containers
     container_query = (
         db.session.query(LearningContainer.container_id, LearningContainer.title)
@@ -778,7 +731,9 @@ def get_quiz_set_metrics(user_id, container_id=None, status=None, page=1, per_pa
         total_attempts = total_correct + total_incorrect
         accuracy_percent = round((total_correct / total_attempts) * 100, 1) if total_attempts > 0 else 0.0
         
-        items_payload = paginate_quiz_items(user_id, container_id=container_id, status=status, page=page, per_page=per_page)
+        items_payload = paginate_quiz_items(
+            user_id, container_id=container_id, status=status, page=page, per_page=per_page, cursor=cursor
+        )
         
         result[container_id] = {
             'container_id': container_id, 'container_title': container_map.get(container_id, ""),
@@ -795,8 +750,9 @@ def get_quiz_set_metrics(user_id, container_id=None, status=None, page=1, per_pa
     return result
 
 
-def get_course_metrics(user_id, container_id=None, status=None, page=1, per_page=10):
-    """Aggregate course metrics."""
+def get_course_metrics(user_id, container_id=None, status=None, page=1, per_page=10, cursor=None):
+    """Aggregate course metrics (`cursor` as in `get_flashcard_set_metrics`)."""
+    cursor = cursor if container_id is not None else None
     # REFAC: Use FsrsInterface
     # Original logic only showed ACTIVE courses (joined ItemMemoryState).
     # So we fetch stats first (which implies activity), then fetch headers.
@@ -829,7 +785,9 @@ def get_course_metrics(user_id, container_id=None, status=None, page=1, per_page
         progress = stats_map.get(cid, {})
         total_lessons = int(total_lessons_map.get(cid, 0) or 0)
         
-        items_payload = paginate_course_items(user_id, container_id=cid, status=status, page=page, per_page=per_page)
+        items_payload = paginate_course_items(
+            user_id, container_id=cid, status=status, page=page, per_page=per_page, cursor=cursor
+        )
 
         result[cid] = {
             'container_id': cid, 'container_title': title_map.get(cid, ""),
@@ -19,34 +19,30 @@ class VocabularyStatsService:
 
     @staticmethod
     def get_container_leaderboard(container_id: int, limit: int = 20, timeframe: str = 'all') -> list:
+        from mindstack_app.modules.gamification.interface import get_leaderboard_entries
+
         item_ids_query = db.session.query(LearningItem.item_id).filter(
             LearningItem.container_id == container_id
         ).subquery()
-        start_date = VocabularyStatsService._get_start_date(timeframe)
-        query = db.session.query(
-            User.user_id, User.username, User.avatar_url,
-            func.sum(ScoreLog.score_change).label('total_score'),
-            func.count(ScoreLog.log_id).label('review_count')
-        ).join(ScoreLog, User.user_id == ScoreLog.user_id).filter(ScoreLog.item_id.in_(item_ids_query))
-        if start_date: query = query.filter(ScoreLog.timestamp >= start_date)
-        score_results = query.group_by(User.user_id, User.username, User.avatar_url).order_by(desc('total_score')).limit(limit).all()
-        user_ids = [r.user_id for r in score_results]
+        # Per-container materialized leaderboard (calendar day/week/month, all-time)
+        score_results = get_leaderboard_entries(timeframe=timeframe, limit=limit, container_id=container_id)
+        user_ids = [r['user_id'] for r in score_results]
         mastered_map = {}
         if user_ids:
             # REFAC: Use FsrsInterface for mastery stats
             mastered_map = FsrsService.get_leaderboard_mastery(user_ids, item_ids_query)
 
         leaderboard = []
-        for idx, row in enumerate(score_results, start=1):
+        for row in score_results:
             avatar_url = None
-            if row.avatar_url:
-                if row.avatar_url.startswith(('http://', 'https://')): avatar_url = row.avatar_url
+            if row['avatar_url']:
+                if row['avatar_url'].startswith(('http://', 'https://')): avatar_url = row['avatar_url']
                 else:
-                    try: avatar_url = url_for('media_uploads', filename=row.avatar_url)
+                    try: avatar_url = url_for('media_uploads', filename=row['avatar_url'])
                     except: pass
             leaderboard.append({
-                'rank': idx, 'user_id': row.user_id, 'username': row.username, 'avatar_url': avatar_url,
-                'total_score': int(row.total_score or 0), 'review_count': int(row.review_count or 0), 'mastered_count': mastered_map.get(row.user_id, 0)
+                'rank': row['rank'], 'user_id': row['user_id'], 'username': row['username'], 'avatar_url': avatar_url,
+                'total_score': row['score'], 'review_count': row['review_count'], 'mastered_count': mastered_map.get(row['user_id'], 0)
             })
         return leaderboard
 
@@ -84,9 +80,9 @@ class VocabularyStatsService:
         # [NEW] Enhanced Global Retention Calculation
         avg_retention = 0.0
         if learned_item_ids:
-            states = FsrsService.get_memory_states(user_id, learned_item_ids)
-            total_r = sum(FsrsService.get_retrievability(s) for s in states.values())
-            avg_retention = round((total_r / len(learned_item_ids)) * 100, 1)
+            # Column-only query + one vectorized pass (no ORM objects per item)
+            _, r_values = FsrsService.get_retrievability_columns(user_id, learned_only=True)
+            avg_retention = round((float(r_values.sum()) / len(learned_item_ids)) * 100, 1)
 
         return {
             'total_learning_sets': learning_sets_count,
@@ -152,10 +148,13 @@ class VocabularyStatsService:
 
     @staticmethod
     def get_user_activity_heatmap(user_id: int, weeks: int = 12) -> list:
-        """Get activity data for a heatmap (reviews per day)."""
-        from mindstack_app.modules.learning_history.interface import LearningHistoryInterface
-        start_date = datetime.now(timezone.utc) - timedelta(weeks=weeks)
-        return LearningHistoryInterface.get_daily_activity_counts(user_id, start_date)
+        """Get activity data for a heatmap (reviews per local day, from the daily rollups)."""
+        from .daily_rollup_service import DailyRollupService
+        from ..logics.rollup_logic import METRIC_REVIEWS
+        end_date = DailyRollupService.local_today(user_id)
+        start_date = end_date - timedelta(weeks=weeks)
+        counts = DailyRollupService.get_daily_map(user_id, METRIC_REVIEWS, start_date, end_date)
+        return [{'date': day, 'count': count} for day, count in sorted(counts.items())]
 
     @staticmethod
     def get_mastery_distribution(user_id: int) -> dict:
@@ -170,50 +169,25 @@ class VocabularyStatsService:
 
     @staticmethod
     def get_full_stats(user_id: int, container_id: int) -> dict:
-        items = LearningItem.query.filter(LearningItem.container_id == container_id, LearningItem.item_type.in_(['FLASHCARD', 'VOCABULARY'])).all()
-        item_ids = [item.item_id for item in items]
-        total = len(item_ids)
-        if not item_ids: return VocabularyStatsService._empty_stats()
-        
-        # REFAC: Use FsrsInterface
-        progress_map = FsrsService.get_memory_states(user_id, item_ids)
+        total = LearningItem.query.filter(LearningItem.container_id == container_id, LearningItem.item_type.in_(['FLASHCARD', 'VOCABULARY'])).count()
+        if not total: return VocabularyStatsService._empty_stats()
         
-        now = datetime.now(timezone.utc)
-        new_count = learning_count = mastered_count = due_count = 0
-        total_retrievability = total_correct = total_incorrect = total_reviews = 0
-        last_reviewed = None
-        for item_id in item_ids:
-            p = progress_map.get(item_id)
-            if not p: new_count += 1
-            else:
-                stability = p.stability or 0.0
-                retrievability = FsrsService.get_retrievability(p)
-                total_retrievability += retrievability
-                if stability >= 21.0: mastered_count += 1
-                else: learning_count += 1
-                
-                due_date = p.due_date
-                if due_date and (due_date.replace(tzinfo=timezone.utc) if due_date.tzinfo is None else due_date) <= now:
-                    due_count += 1
-                    
-                total_correct += p.times_correct or 0
-                total_incorrect += p.times_incorrect or 0
-                total_reviews += (p.times_correct or 0) + (p.times_incorrect or 0)
-                if p.last_review:
-                    if not last_reviewed or p.last_review > last_reviewed: last_reviewed = p.last_review
-        learned_count = len(progress_map)
-        
-        # REFAC: Use FsrsService.get_hard_count
-        hard_count = FsrsService.get_hard_count(user_id, container_id)
+        # Counts from the FSRS container aggregate; retrievability still needs the states
+        stats = FsrsService.get_container_stats_map(user_id, [container_id])[container_id]
+        learned_count = stats['total']
+        total_correct, total_incorrect = stats['times_correct'], stats['times_incorrect']
+        last_reviewed = stats['last_review']
+        learned_states = FsrsService.get_learned_item_states_for_container(user_id, container_id)
+        total_retrievability = float(FsrsService.get_retrievability_batch(learned_states).sum()) if learned_states else 0.0
         
         return {
-            'total': total, 'new': new_count, 'learning': learning_count, 'mastered': mastered_count, 'due': due_count,
-            'hard': hard_count, 'learned': learned_count,
+            'total': total, 'new': max(0, total - learned_count), 'learning': learned_count - stats['mastered'],
+            'mastered': stats['mastered'], 'due': stats['due'], 'hard': stats['hard'], 'learned': learned_count,
             'completion_pct': round((learned_count / total * 100), 1) if total > 0 else 0,
             'retrievability_avg': round((total_retrievability / learned_count), 2) if learned_count > 0 else 0,
             'mastery_avg': round((total_retrievability / learned_count), 2) if learned_count > 0 else 0,
             'accuracy_pct': round((total_correct / (total_correct + total_incorrect) * 100), 1) if (total_correct + total_incorrect) > 0 else 0,
-            'total_reviews': total_reviews, 'total_correct': total_correct, 'total_incorrect': total_incorrect,
+            'total_reviews': total_correct + total_incorrect, 'total_correct': total_correct, 'total_incorrect': total_incorrect,
             'last_reviewed': last_reviewed.isoformat() if last_reviewed else None
         }
 
@@ -234,12 +208,8 @@ class VocabularyStatsService:
         # REFAC: Use FsrsInterface
         progress_map = FsrsService.get_memory_states(user_id, item_ids)
         
-        weak = medium = strong = 0
-        for p in progress_map.values():
-            r = FsrsService.get_retrievability(p)
-            if r < 0.7: weak += 1
-            elif r < 0.9: medium += 1
-            else: strong += 1
+        buckets = FsrsService.get_retrievability_distribution(list(progress_map.values()))
+        weak, medium, strong = buckets['weak'], buckets['medium'], buckets['strong']
         
         from mindstack_app.modules.learning_history.interface import LearningHistoryInterface
         
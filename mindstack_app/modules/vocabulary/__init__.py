@@ -34,6 +34,8 @@ def setup_module(app):
             DriverRegistry.register(mode, VocabularyDriver)
 
     # Register Signals, Context Processors, etc.
+    from .mcq import events  # Distractor index invalidation on content changes
+
     @app.context_processor
     def inject_vocab_metadata():
         return {'vocab_module': module_metadata}
@@ -1,2 +1,7 @@
 class DefaultConfig:
     VOCAB_ITEMS_PER_PAGE = 10
+
+    # MCQ distractor index cache (per container, per process)
+    VOCAB_MCQ_INDEX_MAX_CONTAINERS = 64
+    # How often a cached index re-checks the container's content fingerprint
+    VOCAB_MCQ_INDEX_CHECK_SECONDS = 30
@@ -168,17 +168,18 @@ class VocabularyDriver(BaseSessionDriver):
             # state.settings['filter'] usually holds the FSRS mode. Default to state.mode.
             fetch_mode = state.settings.get('filter') or state.mode
             
-            # get_next_batch returns a LIST of item dicts, or None
-            batch_items = FlashcardEngine.get_next_batch(
+            # Pops from the session's precomputed card queue (IDs only)
+            next_ids = FlashcardEngine.get_next_item_ids(
                 user_id=state.user_id,
                 set_id=target_set_ids,
                 mode=fetch_mode,
                 processed_ids=state.processed_ids,
+                db_session_id=state.session_id,
                 batch_size=1
             )
             
-            if batch_items and len(batch_items) > 0:
-                next_item_id = batch_items[0].get('item_id')
+            if next_ids:
+                next_item_id = next_ids[0]
                 is_last = False
 
         if not next_item_id:
@@ -202,11 +203,95 @@ class VocabularyDriver(BaseSessionDriver):
             settings=state.settings,
         )
 
+        current_pos = len(state.processed_ids) + 1
+        remaining_count = self._refresh_progress(state, remaining)
+
+        return InteractionPayload(
+            item_id=next_item_id,
+            interaction_type=state.mode,
+            data=interaction_data,
+            progress={
+                'current': current_pos,
+                'total': state.total_items,
+                'remaining': remaining_count,
+            },
+            is_last=is_last,
+        )
+
+    # ── optional: lookahead (prefetch) ───────────────────────────────
+
+    def get_lookahead(
+        self,
+        state: SessionState,
+        count: int,
+    ) -> List[InteractionPayload]:
+        """
+        Next *count* interactions, fetched and formatted in bulk.
+
+        Dynamic sessions read ahead in the flashcard card queue with the
+        picked items excluded (not processed), so nothing is consumed
+        until it is actually answered.
+        """
+        remaining = [
+            iid for iid in state.item_queue
+            if iid not in state.processed_ids
+        ]
+
+        item_ids: List[int] = []
+        if state.active_item_id and state.active_item_id not in state.processed_ids:
+            item_ids.append(state.active_item_id)
+        item_ids += [iid for iid in remaining if iid not in item_ids][:max(0, count - len(item_ids))]
+
+        is_dynamic = state.settings.get('filter') in ['due', 'new', 'review', 'available', 'srs', 'mixed', 'mixed_srs']
+        if not remaining and is_dynamic and len(item_ids) < count:
+            from mindstack_app.modules.vocabulary.flashcard.engine.core import FlashcardEngine
+            set_ids_override = state.settings.get('set_ids')
+            item_ids += FlashcardEngine.get_next_item_ids(
+                user_id=state.user_id,
+                set_id=set_ids_override if set_ids_override else [state.container_id],
+                mode=state.settings.get('filter') or state.mode,
+                processed_ids=state.processed_ids,
+                db_session_id=state.session_id,
+                batch_size=count - len(item_ids),
+                exclude_ids=item_ids
+            )
+        if not item_ids:
+            return []
+
+        items_data = self._load_items_data(item_ids)
+        all_items_data = self._load_all_items_data(state.container_id)
+        mode = ModeFactory.create(state.mode)
+        remaining_count = self._refresh_progress(state, remaining)
+        last_id = remaining[-1] if remaining else None
+
+        payloads = []
+        for item_id in item_ids:
+            item_data = items_data.get(item_id)
+            if item_data is None:
+                continue
+            payloads.append(InteractionPayload(
+                item_id=item_id,
+                interaction_type=state.mode,
+                data=mode.format_interaction(
+                    item=item_data,
+                    all_items=all_items_data,
+                    settings=state.settings,
+                ),
+                progress={
+                    'current': len(state.processed_ids) + len(payloads) + 1,
+                    'total': state.total_items,
+                    'remaining': max(0, remaining_count - len(payloads)),
+                },
+                is_last=bool(remaining) and item_id == last_id,
+            ))
+        return payloads
+
+    def _refresh_progress(self, state: SessionState, remaining: List[int]) -> int:
+        """Update ``state.total_items`` for dynamic sessions and return the remaining count."""
         # [FIX] Improve progress info for dynamic SRS
         # If dynamic, the 'total' should reflect the actual number of due/available cards
         is_dynamic = state.settings.get('filter') in ['srs', 'mixed', 'mixed_srs', 'due', 'new', 'review', 'available']
         
-        current_pos = len(state.processed_ids) + 1
         total_items = state.total_items
         
         if is_dynamic:
@@ -224,21 +309,8 @@ class VocabularyDriver(BaseSessionDriver):
             
             # Update state so it persists
             state.total_items = total_items
-            remaining_count = max(0, total_items - len(state.processed_ids))
-        else:
-            remaining_count = len(remaining) if remaining else max(0, state.total_items - len(state.processed_ids))
-
-        return InteractionPayload(
-            item_id=next_item_id,
-            interaction_type=state.mode,
-            data=interaction_data,
-            progress={
-                'current': current_pos,
-                'total': state.total_items,
-                'remaining': remaining_count,
-            },
-            is_last=is_last,
-        )
+            return max(0, total_items - len(state.processed_ids))
+        return len(remaining) if remaining else max(0, state.total_items - len(state.processed_ids))
 
     # ── lifecycle: process_submission ─────────────────────────────────
 
@@ -503,35 +575,41 @@ class VocabularyDriver(BaseSessionDriver):
     @staticmethod
     def _load_item_data(item_id: int) -> Optional[Dict[str, Any]]:
         """Load a single LearningItem as a plain dict."""
-        from mindstack_app.models import LearningItem, db
-        from sqlalchemy import func
+        return VocabularyDriver._load_items_data([item_id]).get(item_id)
 
-        item = LearningItem.query.get(item_id)
-        if item is None:
-            return None
+    @staticmethod
+    def _load_items_data(item_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Load LearningItems as plain dicts ({item_id: dict}), positions and AI text in bulk."""
+        from mindstack_app.models import LearningItem
+        from mindstack_app.modules.AI.interface import AIInterface
+        from .flashcard.engine.core import FlashcardEngine
+
+        items = LearningItem.query.filter(LearningItem.item_id.in_(item_ids)).all() if item_ids else []
+        if not items:
+            return {}
 
         # [NEW] Calculate ordinal position in set
-        item_position_in_set = 1
         try:
-            item_position_in_set = db.session.query(func.count(LearningItem.item_id)).filter(
-                LearningItem.container_id == item.container_id,
-                LearningItem.order_in_container < item.order_in_container
-            ).scalar() + 1
+            positions = FlashcardEngine.get_item_positions(items)
         except Exception:
-            pass
-
-        content = item.content or {}
-        return {
-            'item_id': item.item_id,
-            'front': content.get('front', ''),
-            'back': content.get('back', ''),
-            'content': content,
-            'item_type': item.item_type,
-            'container_id': item.container_id,
-            'order_in_container': item.order_in_container,
-            'item_position_in_set': item_position_in_set,
-            'ai_explanation': item.ai_explanation,
-        }
+            positions = {}
+        explanations = AIInterface.get_primary_explanations([item.item_id for item in items])
+
+        result = {}
+        for item in items:
+            content = item.content or {}
+            result[item.item_id] = {
+                'item_id': item.item_id,
+                'front': content.get('front', ''),
+                'back': content.get('back', ''),
+                'content': content,
+                'item_type': item.item_type,
+                'container_id': item.container_id,
+                'order_in_container': item.order_in_container,
+                'item_position_in_set': positions.get(item.item_id, 1),
+                'ai_explanation': explanations.get(item.item_id),
+            }
+        return result
 
     @staticmethod
     def _load_all_items_data(container_id: int) -> List[Dict[str, Any]]:
@@ -12,3 +12,9 @@ class DefaultConfig:
     SHOW_IMAGE_BY_DEFAULT = True
     
     SHOW_IMAGE_BY_DEFAULT = True
+
+    # Session card queue: how often items that became due mid-session are picked up
+    FLASHCARD_QUEUE_REFRESH_SECONDS = 60
+
+    # Max cards per /get_flashcard_batch request (client prefetch)
+    FLASHCARD_MAX_BATCH_SIZE = 10
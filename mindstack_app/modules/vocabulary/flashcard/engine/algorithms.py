@@ -37,13 +37,9 @@ def get_filtered_flashcard_sets(user_id, search_query, search_field, current_fil
 
     # Search
     if search_query:
-        if search_field == 'title':
-            query = query.filter(LearningContainer.title.ilike(f'%{search_query}%'))
-        else:
-            query = query.filter(or_(
-                LearningContainer.title.ilike(f'%{search_query}%'),
-                LearningContainer.description.ilike(f'%{search_query}%')
-            ))
+        from mindstack_app.modules.content_management.interface import ContentInterface
+        fields = ['title'] if search_field == 'title' else ['title', 'description']
+        query = ContentInterface.filter_containers_by_search(query, search_query, fields, ranked=True)
 
     # Filter tabs
     user_interacted = db.session.query(UserContainerState.container_id).filter(
@@ -70,17 +66,20 @@ def get_filtered_flashcard_sets(user_id, search_query, search_field, current_fil
     from mindstack_app.utils.pagination import get_pagination_data
     pagination = get_pagination_data(query, page, per_page)
     
-    # Augment with stats
+    # Augment with stats (batched for the whole page)
+    container_ids = [container.container_id for container in pagination.items]
+    item_counts = dict(db.session.query(
+        LearningItem.container_id, func.count(LearningItem.item_id)
+    ).filter(
+        LearningItem.container_id.in_(container_ids),
+        LearningItem.item_type.in_(['FLASHCARD', 'VOCABULARY'])
+    ).group_by(LearningItem.container_id).all()) if container_ids else {}
+    # REFAC: Use FsrsInterface container aggregates
+    memory_stats = FsrsInterface.get_container_stats_map(user_id, container_ids)
+
     for container in pagination.items:
-        total_items = LearningItem.query.filter(
-            LearningItem.container_id == container.container_id,
-            LearningItem.item_type.in_(['FLASHCARD', 'VOCABULARY'])
-        ).count()
-        
-        # REFAC: Use FsrsInterface
-        learned_count = 0
-        if total_items > 0:
-            learned_count = FsrsInterface.get_learned_count(user_id, container.container_id)
+        total_items = item_counts.get(container.container_id, 0)
+        learned_count = memory_stats[container.container_id]['learned'] if total_items > 0 else 0
             
         container.total_items = total_items
         container.completion_percentage = (learned_count / total_items * 100) if total_items > 0 else 0
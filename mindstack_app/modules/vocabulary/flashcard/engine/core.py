@@ -2,12 +2,12 @@
 # FlashcardEngine - Core logic for flashcard learning
 
 from datetime import datetime, timezone
-from sqlalchemy import func
+from sqlalchemy import case, func
 from typing import Dict, Any, List, Optional, Tuple, Union
 
 from mindstack_app.models import db, User, LearningItem, StudyLog
 from mindstack_app.core.signals import card_reviewed
-from mindstack_app.utils.db_session import safe_commit
+from mindstack_app.utils.db_session import safe_commit, unit_of_work
 from mindstack_app.modules.fsrs.interface import FSRSInterface
 from mindstack_app.modules.learning_history.interface import LearningHistoryInterface
 from mindstack_app.modules.learning.interface import LearningInterface
@@ -15,10 +15,9 @@ from mindstack_app.modules.learning.interface import LearningInterface
 from mindstack_app.services.config_service import get_runtime_config
 from mindstack_app.utils.content_renderer import render_content_dict
 from mindstack_app.utils.media_paths import build_relative_media_path
+from mindstack_app.utils.sampling import reservoir_sample
 
-from ..services.query_builder import FlashcardQueryBuilder
-from .algorithms import get_accessible_flashcard_set_ids
-from .vocab_flashcard_mode import get_flashcard_mode_by_id
+from ..services.card_queue_service import CardQueueService
 from flask import url_for, current_app
 
 class FlashcardEngine:
@@ -27,73 +26,161 @@ class FlashcardEngine:
     Handles answer processing, scoring, and statistics retrieval.
     """
 
+    @staticmethod
+    def get_next_item_ids(user_id: int, set_id: Union[int, str, List[int]], mode: str, processed_ids: List[int],
+                          db_session_id: Optional[int] = None, batch_size: int = 1,
+                          exclude_ids: Optional[List[int]] = None) -> List[int]:
+        """
+        IDs of the next items to study.
+        DB-backed sessions pop from their precomputed card queue; otherwise the
+        filtered query is run with the processed items excluded.
+        """
+        if db_session_id:
+            item_ids = CardQueueService.next_item_ids(
+                user_id, set_id, mode, db_session_id, processed_ids,
+                exclude_ids=exclude_ids, batch_size=batch_size
+            )
+            if item_ids is not None:
+                return item_ids
+
+        set_ids = CardQueueService.resolve_set_ids(user_id, set_id)
+        qb = CardQueueService.build_query(user_id, set_ids, CardQueueService.resolve_filter(mode))
+        qb.exclude_items(list(set(processed_ids or []) | set(exclude_ids or [])))
+        if qb.random_order:
+            rows = qb.get_query().with_entities(LearningItem.item_id)
+            return reservoir_sample((row.item_id for row in rows), batch_size)
+        return [row.item_id for row in qb.get_query().with_entities(LearningItem.item_id).limit(batch_size).all()]
+
     @staticmethod
     def get_next_batch(user_id: int, set_id: Union[int, str, List[int]], mode: str, processed_ids: List[int], 
-                      db_session_id: Optional[int] = None, batch_size: int = 1, current_db_item_id: Optional[int] = None):
+                      db_session_id: Optional[int] = None, batch_size: int = 1, current_db_item_id: Optional[int] = None,
+                      exclude_ids: Optional[List[int]] = None):
         """
         Stateless fetching of next flashcard items.
-        Handles resume logic (if db_session_id provided) and standard query building.
+        Handles resume logic (if db_session_id provided) and the session card queue.
         """
         # 1. RESUME LOGIC
-        items = []
+        item_ids = []
         if current_db_item_id and current_db_item_id not in processed_ids:
             # The session has a pending item stored in DB
-            item = LearningItem.query.get(current_db_item_id)
-            if item:
-                items = [item]
+            item_ids = [current_db_item_id]
 
         # 2. FETCH LOGIC
+        if not item_ids:
+            item_ids = FlashcardEngine.get_next_item_ids(
+                user_id, set_id, mode, processed_ids,
+                db_session_id=db_session_id, batch_size=batch_size, exclude_ids=exclude_ids
+            )
+
+        # 3. FORMAT RESPONSE
+        items_data = FlashcardEngine.assemble_batch(user_id, item_ids)
+        if not items_data and current_db_item_id and item_ids == [current_db_item_id]:
+            # Pending item no longer exists: fetch normally
+            items_data = FlashcardEngine.assemble_batch(user_id, FlashcardEngine.get_next_item_ids(
+                user_id, set_id, mode, processed_ids,
+                db_session_id=db_session_id, batch_size=batch_size, exclude_ids=exclude_ids
+            ))
+        return items_data or None
+
+    @staticmethod
+    def get_item_positions(items: List[LearningItem]) -> Dict[int, int]:
+        """
+        Ordinal position of each item in its set (1 + items with a smaller
+        order_in_container), for all items in one RANK() query.
+        """
         if not items:
-            qb = FlashcardQueryBuilder(user_id)
-            
-            # Resolve Set IDs
-            if set_id == 'all':
-                accessible_ids = get_accessible_flashcard_set_ids(user_id)
-                qb.filter_by_containers(accessible_ids)
-            else:
-                s_ids = set_id if isinstance(set_id, list) else [int(set_id)]
-                qb.filter_by_containers(s_ids)
-
-            # Apply Mode Filter
-            mode_obj = get_flashcard_mode_by_id(mode)
-            if mode_obj and hasattr(qb, mode_obj.filter_method):
-                filter_func = getattr(qb, mode_obj.filter_method)
-                filter_func()
-            else:
-                qb.filter_mixed()
-            
-            # Exclude processed
-            qb.exclude_items(processed_ids)
-            
-            items = qb.get_query().limit(batch_size).all()
-        
+            return {}
+        container_ids = {item.container_id for item in items}
+        has_order = LearningItem.order_in_container.isnot(None)
+        ranked = db.session.query(
+            LearningItem.item_id.label('item_id'),
+            case(
+                (has_order, func.rank().over(
+                    partition_by=(LearningItem.container_id, has_order),
+                    order_by=LearningItem.order_in_container
+                )),
+                else_=1
+            ).label('position')
+        ).filter(LearningItem.container_id.in_(container_ids)).subquery()
+        rows = db.session.query(ranked.c.item_id, ranked.c.position).filter(
+            ranked.c.item_id.in_([item.item_id for item in items])
+        ).all()
+        return {item_id: position for item_id, position in rows}
+
+    @staticmethod
+    def assemble_batch(user_id: int, item_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Build card payloads for N items with a fixed number of queries: items,
+        containers, user role, memory states, history counts/logs, primary AI
+        explanations and positions are each loaded once for the whole batch.
+        Payloads are returned in the order of `item_ids`.
+        """
+        from mindstack_app.models import LearningContainer
+        from mindstack_app.modules.AI.interface import AIInterface
+        from mindstack_app.utils.media_paths import resolve_media_in_content
+        from .renderer import FlashcardRenderer
+
+        item_ids = list(dict.fromkeys(item_ids or []))
+        if not item_ids:
+            return []
+
+        loaded = {item.item_id: item for item in LearningItem.query.filter(LearningItem.item_id.in_(item_ids))}
+        items = [loaded[item_id] for item_id in item_ids if item_id in loaded]
         if not items:
-            return None
+            return []
+        item_ids = [item.item_id for item in items]
 
-        # 3. FORMAT RESPONSE
-        items_data = []
-        user_role = getattr(User.query.get(user_id), 'user_role', 'user')
+        containers = {
+            c.container_id: c for c in LearningContainer.query.filter(
+                LearningContainer.container_id.in_({item.container_id for item in items})
+            )
+        }
+        user_role = getattr(db.session.get(User, user_id), 'user_role', 'user')
+
+        states = FSRSInterface.batch_get_memory_states(user_id, item_ids)
+        learned_states = {item_id: state for item_id, state in states.items() if state}
+        learned_ids = list(learned_states)
+        total_counts = LearningHistoryInterface.get_total_counts(user_id, learned_ids)
+        histories = LearningHistoryInterface.get_items_history(user_id, learned_ids, limit=50)
+        intervals = FSRSInterface.predict_next_intervals_for_states(user_id, learned_states)
+        explanations = AIInterface.get_primary_explanations(item_ids)
+        try:
+            positions = FlashcardEngine.get_item_positions(items)
+        except Exception as e:
+            current_app.logger.warning(f"Error calculating item position: {e}")
+            positions = {}
 
+        items_data = []
         for item in items:
+            container = containers.get(item.container_id)
+
             # Check permission
             can_edit = False
-            if item.container:
-                can_edit = (item.container.creator_user_id == user_id or user_role == 'admin')
+            if container:
+                can_edit = (container.creator_user_id == user_id or user_role == 'admin')
             
             edit_url = ''
             if can_edit:
                 edit_url = url_for('content_management.edit_item', container_id=item.container_id, item_id=item.item_id)
 
             # Initial Stats
-            initial_stats = FlashcardEngine.get_item_statistics(user_id, item.item_id)
+            state_record = learned_states.get(item.item_id)
+            if state_record:
+                initial_stats = FlashcardEngine.build_item_statistics(
+                    state_record,
+                    total_logs=total_counts.get(item.item_id, 0),
+                    logs=histories.get(item.item_id),
+                    predicted_intervals=intervals.get(item.item_id)
+                )
+            else:
+                initial_stats = FlashcardEngine.build_item_statistics(None)
             
             # First Time Check
             is_first_time_card = (initial_stats.get('status') == 'new' and initial_stats.get('times_reviewed') == 0)
 
             # Media Path Resolution (Dedicated fields & BBCode content)
-            from mindstack_app.utils.media_paths import resolve_media_in_content
-            audio_folder = item.container.media_audio_folder if item.container else None
-            image_folder = item.container.media_image_folder if item.container else None
+            audio_folder = container.media_audio_folder if container else None
+            image_folder = container.media_image_folder if container else None
             
             # First resolve relative paths for dedicated fields (front_img, etc.)
             resolved_content = resolve_media_in_content(dict(item.content) if item.content else {}, 
@@ -104,8 +191,6 @@ class FlashcardEngine:
             item_content = render_content_dict(resolved_content, audio_folder=audio_folder, image_folder=image_folder)
 
             # Backend Rendering [Refactor - Thin Client]
-            from .renderer import FlashcardRenderer
-            
             # Fetch container display settings if available
             display_settings = {
                 'can_edit': can_edit,
@@ -114,8 +199,8 @@ class FlashcardEngine:
                 'is_audio_autoplay': True
             }
             
-            if item.container and item.container.settings:
-                container_display = item.container.settings.get('display', {})
+            if container and container.settings:
+                container_display = container.settings.get('display', {})
                 display_settings.update(container_display)
 
             # Bridge for renderer
@@ -135,16 +220,6 @@ class FlashcardEngine:
                 'buttons_html': item_content.get('buttons_html', '')
             }
 
-            # [NEW] Calculate ordinal position in set
-            item_position_in_set = 1
-            try:
-                item_position_in_set = db.session.query(func.count(LearningItem.item_id)).filter(
-                    LearningItem.container_id == item.container_id,
-                    LearningItem.order_in_container < item.order_in_container
-                ).scalar() + 1
-            except Exception as e:
-                current_app.logger.warning(f"Error calculating item position: {e}")
-
             html_payload = FlashcardRenderer.render_item(item_for_renderer, initial_stats, display_settings=display_settings)
 
             item_dict = {
@@ -154,13 +229,13 @@ class FlashcardEngine:
                 'html_front': html_payload['front'],
                 'html_back': html_payload['back'],
                 'html_full': html_payload['full_html'],
-                'ai_explanation': item.ai_explanation,
+                'ai_explanation': explanations.get(item.item_id),
                 'can_edit': can_edit,
                 'edit_url': edit_url,
                 'initial_stats': initial_stats,
                 'initial_streak': initial_stats.get('current_streak', 0),
                 'is_first_time_card': is_first_time_card,
-                'item_position_in_set': item_position_in_set
+                'item_position_in_set': positions.get(item.item_id, 1)
             }
             items_data.append(item_dict)
 
@@ -183,7 +258,25 @@ class FlashcardEngine:
                       learning_mode: str = None):
         """
         Process a flashcard answer.
+
+        Runs as a single unit of work: the FSRS state, StudyLog, ScoreLog and
+        anything written by `card_reviewed` subscribers share one commit.
         """
+        with unit_of_work(db.session):
+            return cls._process_answer(
+                user_id, item_id, quality, current_user_total_score,
+                mode=mode, update_srs=update_srs, duration_ms=duration_ms,
+                user_answer_text=user_answer_text, session_id=session_id,
+                container_id=container_id, learning_mode=learning_mode
+            )
+
+    @classmethod
+    def _process_answer(cls, user_id: int, item_id: int, quality: int,
+                        current_user_total_score: int, mode: str = None,
+                        update_srs: bool = True,
+                        duration_ms: int = 0, user_answer_text: str = None,
+                        session_id: int = None, container_id: int = None,
+                        learning_mode: str = None):
         item = LearningItem.query.get(item_id)
         if not item:
             return 0, current_user_total_score, 'error', "Error: Item not found", None, None
@@ -320,7 +413,24 @@ class FlashcardEngine:
         Get detailed statistics for a flashcard item.
         """
         state_record = FSRSInterface.get_item_state(user_id, item_id)
-        
+        if not state_record:
+            return FlashcardEngine.build_item_statistics(None)
+
+        return FlashcardEngine.build_item_statistics(
+            state_record,
+            # User defined "Show Count" = total_user_item_logs (direct count, bypasses list limits)
+            total_logs=LearningHistoryInterface.get_total_count(user_id, item_id),
+            logs=LearningHistoryInterface.get_item_history(item_id, user_id=user_id, limit=50),
+            predicted_intervals=FSRSInterface.predict_next_intervals(user_id, item_id)
+        )
+
+    @staticmethod
+    def build_item_statistics(state_record, total_logs: int = 0, logs: Optional[List[dict]] = None,
+                              predicted_intervals: Optional[Dict[int, str]] = None) -> dict:
+        """
+        Compose item statistics from already loaded data (no DB access), so
+        single-card and batch loads produce the same payload.
+        """
         base_stats = {
             'times_reviewed': 0, 'correct_count': 0, 'incorrect_count': 0, 'vague_count': 0,
             'correct_rate': 0.0, 'current_streak': 0, 'longest_streak': 0,
@@ -362,8 +472,7 @@ class FlashcardEngine:
 
         # [DEFINITIVE MONOTONIC FIX] 
         # 1. Total interactions recorded in History (True Show Count for this user)
-        # We use a direct count(logs) to bypass any list-limiting logic or contamination.
-        total_user_item_logs = LearningHistoryInterface.get_total_count(user_id, item_id)
+        total_user_item_logs = total_logs or 0
         
         # 2. FSRS algorithm repetitions
         fsrs_reps = state_record.repetitions if state_record else 0
@@ -387,11 +496,10 @@ class FlashcardEngine:
             'interval': interval_val,
             'status': {0: 'new', 1: 'learning', 2: 'review', 3: 'relearning'}.get(state_record.state, 'new'),
             'custom_state': (state_record.data or {}).get('custom_state', 'new') if state_record.data else 'new',
-            'predicted_intervals': FSRSInterface.predict_next_intervals(user_id, item_id)
+            'predicted_intervals': predicted_intervals or {}
         })
 
-        # Fetch recent logs for Sparkline/History View (limit to 50 is fine here)
-        logs = LearningHistoryInterface.get_item_history(item_id, user_id=user_id, limit=50)
+        # Recent logs for Sparkline/History View (newest first, limit 50)
 
         review_qualities = []
         normalized_entries = []
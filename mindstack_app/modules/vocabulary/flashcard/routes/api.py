@@ -20,11 +20,12 @@ from ..engine.algorithms import (
 from ..engine.core import FlashcardEngine
 from ..engine.config import FlashcardLearningConfig
 from ..services import CardPresenter
+from ..config import DefaultConfig
 # External module interfaces
 from mindstack_app.modules.audio.interface import AudioInterface
 from mindstack_app.modules.media.interface import MediaInterface
 from mindstack_app.modules.session.interface import SessionInterface
-from mindstack_app.utils.db_session import safe_commit
+from mindstack_app.utils.db_session import safe_commit, unit_of_work
 from mindstack_app.utils.media_paths import (
     normalize_media_value_for_storage,
     build_relative_media_path,
@@ -273,6 +274,8 @@ def api_get_flashcard_batch():
         return jsonify({'message': 'Phiên học đã kết thúc.'}), 404
 
     batch_size = request.args.get('batch_size', default=1, type=int)
+    max_batch_size = current_app.config.get('FLASHCARD_MAX_BATCH_SIZE', DefaultConfig.FLASHCARD_MAX_BATCH_SIZE)
+    batch_size = max(1, min(batch_size or 1, max_batch_size))
 
     # [NEW] Handle client-side exclusions (for prefetching)
     exclude_items_str = request.args.get('exclude_items', '')
@@ -283,8 +286,7 @@ def api_get_flashcard_batch():
         except ValueError:
             pass
 
-    # Merge with DB processed IDs
-    processed_ids = list(set((db_sess.processed_item_ids or []) + client_excluded_ids))
+    processed_ids = list(db_sess.processed_item_ids or [])
     
     try:
         # 2. Get Next Batch using Stateless Engine
@@ -295,7 +297,8 @@ def api_get_flashcard_batch():
             processed_ids=processed_ids,
             db_session_id=db_id,
             batch_size=batch_size,
-            current_db_item_id=db_sess.current_item_id
+            current_db_item_id=db_sess.current_item_id,
+            exclude_ids=client_excluded_ids
         )
 
         # [DYNAMIC SRS] No Auto-Rescue. If no items found, session is complete.
@@ -358,81 +361,82 @@ def api_submit_flashcard_answer():
     except (TypeError, ValueError):
         db_id = session_data.get('db_session_id')
     
-    # 1. Access Update (Misc)
-    set_ids = session_data.get('set_id')
-    if set_ids:
-        s_list = set_ids if isinstance(set_ids, list) else ([set_ids] if set_ids != 'all' else [])
-        for s_id in s_list:
-            if isinstance(s_id, int):
-                ucs = UserContainerState.query.filter_by(user_id=current_user.user_id, container_id=s_id).first()
-                if not ucs:
-                    ucs = UserContainerState(user_id=current_user.user_id, container_id=s_id)
-                    db.session.add(ucs)
-                ucs.last_accessed = func.now()
-        safe_commit(db.session)
+    # All writes for this answer (access time, session counters, FSRS, StudyLog,
+    # ScoreLog, badges) share ONE transaction and are committed once below.
+    with unit_of_work(db.session):
+        # 1. Access Update (Misc)
+        set_ids = session_data.get('set_id')
+        if set_ids:
+            s_list = set_ids if isinstance(set_ids, list) else ([set_ids] if set_ids != 'all' else [])
+            for s_id in s_list:
+                if isinstance(s_id, int):
+                    ucs = UserContainerState.query.filter_by(user_id=current_user.user_id, container_id=s_id).first()
+                    if not ucs:
+                        ucs = UserContainerState(user_id=current_user.user_id, container_id=s_id)
+                        db.session.add(ucs)
+                    ucs.last_accessed = func.now()
+            safe_commit(db.session)
 
-    # [UPDATED] Mandatory 4-button UI for SRS
-    user_answer_quality = 3 # Default Good
-    normalized_answer = str(user_answer).lower()
-    quality_map = {'again': 1, 'hard': 2, 'good': 3, 'easy': 4}
-    user_answer_quality = quality_map.get(normalized_answer, 3)
+        # [UPDATED] Mandatory 4-button UI for SRS
+        user_answer_quality = 3 # Default Good
+        normalized_answer = str(user_answer).lower()
+        quality_map = {'again': 1, 'hard': 2, 'good': 3, 'easy': 4}
+        user_answer_quality = quality_map.get(normalized_answer, 3)
     
-    # [AFK DETECTION - BACKEND] 
-    # Use SessionInterface to get duration based on server-side activity delta
-    # This automatically caps idle time at 20s and updates last_activity.
-    effective_duration_ms = SessionInterface.update_progress(
-        db_id, item_id, 
-        'correct' if user_answer_quality >= 2 else 'incorrect', 
-        0 # Points will be updated by the engine below
-    )
+        # [AFK DETECTION - BACKEND] 
+        # Use SessionInterface to get duration based on server-side activity delta
+        # This automatically caps idle time at 20s and updates last_activity.
+        effective_duration_ms = SessionInterface.update_progress(
+            db_id, item_id, 
+            'correct' if user_answer_quality >= 2 else 'incorrect', 
+            0 # Points will be updated by the engine below
+        )
     
-    # 3. Call Stateless Engine with "Clean" duration
-    score_change, new_total, result_type, new_status, item_stats, srs_data = FlashcardEngine.process_answer(
-        user_id=current_user.user_id,
-        item_id=item_id,
-        quality=user_answer_quality,
-        current_user_total_score=current_user.total_score,
-        mode=session_data.get('mode'),
-        update_srs=True,
-        duration_ms=effective_duration_ms, # Use server-calculated duration
-        user_answer_text=user_answer,
-        session_id=db_id,
-        container_id=None,
-        learning_mode='flashcard'
-    )
+        # 3. Call Stateless Engine with "Clean" duration
+        score_change, new_total, result_type, new_status, item_stats, srs_data = FlashcardEngine.process_answer(
+            user_id=current_user.user_id,
+            item_id=item_id,
+            quality=user_answer_quality,
+            current_user_total_score=current_user.total_score,
+            mode=session_data.get('mode'),
+            update_srs=True,
+            duration_ms=effective_duration_ms, # Use server-calculated duration
+            user_answer_text=user_answer,
+            session_id=db_id,
+            container_id=None,
+            learning_mode='flashcard'
+        )
 
-    # 4. Sync final points back to session record
-    if score_change > 0:
-        db_sess = SessionInterface.get_session_by_id(db_id)
-        if db_sess:
-            db_sess.points_earned += score_change
-            db.session.add(db_sess)
-            db.session.commit()
+        # 4. Sync final points back to session record
+        if score_change > 0:
+            db_sess = SessionInterface.get_session_by_id(db_id)
+            if db_sess:
+                db_sess.points_earned += score_change
+                db.session.add(db_sess)
+                safe_commit(db.session)
     
-    # 5. Fetch updated session stats for response
-    db_sess = SessionInterface.get_session_by_id(db_id)
+        # 5. Fetch updated session stats for response
+        db_sess = SessionInterface.get_session_by_id(db_id)
     
-    # 6. Update Cookie Stats (Optional but good for fallback reading)
-    session_data['session_points'] = db_sess.points_earned
-    session_data['correct_answers'] = db_sess.correct_count
-    session_data['incorrect_answers'] = db_sess.incorrect_count
-    session_data['vague_answers'] = db_sess.vague_count
-    session.modified = True
-
-    # [NEW] SRS HUD Counts (same logic as dashboard "Cần ôn")
-    from ..engine.algorithms import get_session_srs_counts
-    srs_counts = get_session_srs_counts(
-        current_user.user_id,
-        session_data.get('set_id'),
-        processed_ids=list(db_sess.processed_item_ids or [])
-    )
-    # Persist new_learned_count in DB session_data (survives across devices)
-    extra = db_sess.session_data or {}
-    extra['new_learned_count'] = srs_counts['new_learned']
-    db_sess.session_data = extra
-    flag_modified(db_sess, 'session_data')
-    from mindstack_app.models import db
-    db.session.commit()
+        # 6. Update Cookie Stats (Optional but good for fallback reading)
+        session_data['session_points'] = db_sess.points_earned
+        session_data['correct_answers'] = db_sess.correct_count
+        session_data['incorrect_answers'] = db_sess.incorrect_count
+        session_data['vague_answers'] = db_sess.vague_count
+        session.modified = True
+
+        # [NEW] SRS HUD Counts (same logic as dashboard "Cần ôn")
+        from ..engine.algorithms import get_session_srs_counts
+        srs_counts = get_session_srs_counts(
+            current_user.user_id,
+            session_data.get('set_id'),
+            processed_ids=list(db_sess.processed_item_ids or [])
+        )
+        # Persist new_learned_count in DB session_data (survives across devices)
+        extra = db_sess.session_data or {}
+        extra['new_learned_count'] = srs_counts['new_learned']
+        db_sess.session_data = extra
+        flag_modified(db_sess, 'session_data')
 
     return jsonify({
         'success': True,
@@ -0,0 +1,213 @@
+"""
+CardQueueService - Precomputed per-session card queue
+=====================================================
+Builds the ordered list of item IDs for a flashcard session once (same
+filters and ORDER BY as FlashcardQueryBuilder; random-order modes such as
+cram are shuffled here instead of in SQL) and stores it with the
+session in `LearningSession.session_data['card_queue']`:
+
+    {
+        'key': 'filter_srs:12,15',   # filter method + sets the queue was built for
+        'set_ids': [12, 15],         # containers (for the due refresh)
+        'ids': [...],                # remaining queue, answered prefix trimmed
+        'due_again': [...],          # items that became due mid-session (served first)
+        'checked_at': '...',         # last due refresh (naive UTC ISO)
+    }
+
+Next-card pops from the queue instead of re-running the filtered query
+with a growing NOT IN (processed_ids). Items that become due while the
+session runs (including answered ones, as the old due exclusion allowed)
+are picked up by a cheap indexed refresh at most every
+FLASHCARD_QUEUE_REFRESH_SECONDS, or when the queue runs dry.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from flask import current_app
+
+from mindstack_app.models import LearningItem
+from mindstack_app.modules.fsrs.interface import FSRSInterface as FsrsInterface
+from ..config import DefaultConfig
+from .query_builder import FlashcardQueryBuilder
+
+
+class CardQueueService:
+    """Session card queue: build once, pop per card, refresh newly due items."""
+
+    SESSION_KEY = 'card_queue'
+    ITEM_TYPES = ['FLASHCARD', 'VOCABULARY']
+
+    # Filters that never admit due items (no refresh needed)
+    NO_DUE_REFRESH = {'filter_new_only'}
+
+    # ── Build ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def resolve_filter(mode: str) -> str:
+        """FlashcardQueryBuilder method for a mode id (same fallback as before: mixed)."""
+        from ..engine.vocab_flashcard_mode import get_flashcard_mode_by_id
+        mode_obj = get_flashcard_mode_by_id(mode)
+        if mode_obj and hasattr(FlashcardQueryBuilder, mode_obj.filter_method):
+            return mode_obj.filter_method
+        return 'filter_mixed'
+
+    @staticmethod
+    def resolve_set_ids(user_id: int, set_id: Union[int, str, List[int]]) -> List[int]:
+        if set_id == 'all':
+            from ..engine.algorithms import get_accessible_flashcard_set_ids
+            return list(get_accessible_flashcard_set_ids(user_id))
+        return [int(s) for s in set_id] if isinstance(set_id, list) else [int(set_id)]
+
+    @classmethod
+    def build_query(cls, user_id: int, set_ids: List[int], filter_method: str):
+        qb = FlashcardQueryBuilder(user_id)
+        qb.filter_by_containers(set_ids)
+        getattr(qb, filter_method)()
+        return qb
+
+    @classmethod
+    def build(cls, user_id: int, set_id: Union[int, str, List[int]], mode: str,
+              now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Run the mode's query once and return a fresh queue (IDs only)."""
+        now = now or datetime.utcnow()
+        filter_method = cls.resolve_filter(mode)
+        set_ids = cls.resolve_set_ids(user_id, set_id)
+        qb = cls.build_query(user_id, set_ids, filter_method)
+        ids = [row.item_id for row in qb.get_query().with_entities(LearningItem.item_id).all()]
+        if qb.random_order:
+            random.shuffle(ids)
+        return {
+            'key': cls.queue_key(filter_method, set_ids),
+            'set_ids': set_ids,
+            'ids': list(dict.fromkeys(ids)),
+            'due_again': [],
+            'checked_at': now.isoformat(),
+        }
+
+    @staticmethod
+    def queue_key(filter_method: str, set_ids: Iterable[int]) -> str:
+        """
+        >>> CardQueueService.queue_key('filter_srs', [15, 12])
+        'filter_srs:12,15'
+        """
+        return f"{filter_method}:{','.join(str(s) for s in sorted(set_ids))}"
+
+    # ── Pop / refresh (pure) ──────────────────────────────────────────
+
+    @staticmethod
+    def take(queue: Dict[str, Any], processed: set, excluded: set, batch_size: int) -> List[int]:
+        """
+        Pop up to `batch_size` IDs: newly due items first, then the queue in order.
+        Answered items at the head of the queue are trimmed; items the client
+        already holds (`excluded`) are skipped but kept.
+
+        >>> q = {'ids': [1, 2, 3, 4], 'due_again': [9]}
+        >>> CardQueueService.take(q, processed={1}, excluded={2}, batch_size=2), q
+        ([9, 3], {'ids': [2, 3, 4], 'due_again': []})
+        """
+        picked: List[int] = []
+        due_again = []
+        for item_id in queue.get('due_again', []):
+            if item_id in excluded or item_id in picked:
+                continue
+            if len(picked) < batch_size:
+                picked.append(item_id)
+            else:
+                due_again.append(item_id)
+        queue['due_again'] = due_again
+
+        ids = queue.get('ids', [])
+        start = 0
+        while start < len(ids) and ids[start] in processed:
+            start += 1
+        ids = ids[start:]
+        for item_id in ids:
+            if len(picked) >= batch_size:
+                break
+            if item_id not in processed and item_id not in excluded and item_id not in picked:
+                picked.append(item_id)
+        queue['ids'] = ids
+        return picked
+
+    @staticmethod
+    def merge_due(queue: Dict[str, Any], due_ids: Iterable[int], processed: set) -> bool:
+        """
+        Queue items that became due: answered ones (due again) and ones not in
+        the remaining queue. Returns True if anything was added.
+
+        >>> q = {'ids': [2, 3], 'due_again': []}
+        >>> CardQueueService.merge_due(q, [1, 3, 7], processed={1}), q['due_again']
+        (True, [1, 7])
+        """
+        remaining = {item_id for item_id in queue.get('ids', []) if item_id not in processed}
+        due_again = list(queue.get('due_again', []))
+        added = False
+        for item_id in due_ids:
+            if item_id in due_again or item_id in remaining:
+                continue
+            due_again.append(item_id)
+            added = True
+        queue['due_again'] = due_again
+        return added
+
+    # ── Session entry point ───────────────────────────────────────────
+
+    @staticmethod
+    def _refresh_interval() -> timedelta:
+        seconds = current_app.config.get('FLASHCARD_QUEUE_REFRESH_SECONDS', DefaultConfig.FLASHCARD_QUEUE_REFRESH_SECONDS)
+        return timedelta(seconds=seconds)
+
+    @classmethod
+    def _refresh(cls, user_id: int, queue: Dict[str, Any], processed: set, now: datetime,
+                 force: bool = False) -> bool:
+        """Add items that became due since the last check. Returns True if the queue changed."""
+        if queue['key'].split(':', 1)[0] in cls.NO_DUE_REFRESH:
+            return False
+        checked_at = datetime.fromisoformat(queue['checked_at'])
+        if not force and now - checked_at < cls._refresh_interval():
+            return False
+        due_ids = FsrsInterface.get_due_item_ids(
+            user_id, queue.get('set_ids', []), due_after=checked_at, due_before=now, item_types=cls.ITEM_TYPES
+        )
+        queue['checked_at'] = now.isoformat()
+        cls.merge_due(queue, due_ids, processed)
+        return True
+
+    @classmethod
+    def next_item_ids(cls, user_id: int, set_id: Union[int, str, List[int]], mode: str, session_id: int,
+                      processed_ids: Iterable[int], exclude_ids: Optional[Iterable[int]] = None,
+                      batch_size: int = 1) -> Optional[List[int]]:
+        """
+        Next item IDs for a DB-backed session ([] when finished).
+        Returns None if the session is not active (caller falls back to a query).
+        """
+        from mindstack_app.modules.session.interface import SessionInterface
+
+        db_sess = SessionInterface.get_session_by_id(session_id)
+        if not db_sess or db_sess.status != 'active' or db_sess.user_id != user_id:
+            return None
+
+        now = datetime.utcnow()
+        processed = set(processed_ids or [])
+        excluded = set(exclude_ids or [])
+
+        queue = (db_sess.session_data or {}).get(cls.SESSION_KEY)
+        filter_method = cls.resolve_filter(mode)
+        if not queue or not queue.get('key', '').startswith(f"{filter_method}:"):
+            queue = cls.build(user_id, set_id, mode, now)
+            changed = True
+        else:
+            queue = {**queue, 'ids': list(queue.get('ids', [])), 'due_again': list(queue.get('due_again', []))}
+            changed = cls._refresh(user_id, queue, processed, now)
+
+        before = (len(queue['ids']), len(queue['due_again']))
+        picked = cls.take(queue, processed, excluded, batch_size)
+        if not picked and cls._refresh(user_id, queue, processed, now, force=not changed):
+            picked = cls.take(queue, processed, excluded, batch_size)
+            changed = True
+
+        if changed or (len(queue['ids']), len(queue['due_again'])) != before:
+            SessionInterface.update_session_data(session_id, {cls.SESSION_KEY: queue})
+        return picked
@@ -19,6 +19,9 @@ class FlashcardQueryBuilder:
             LearningItem.item_type.in_(['FLASHCARD', 'VOCABULARY'])
         )
         self._joined_progress = False
+        # True when the mode wants a random order: callers shuffle/sample the IDs
+        # instead of ORDER BY random() over the whole set.
+        self.random_order = False
 
     def filter_by_containers(self, container_ids):
         """Filter items by a list of container IDs."""
@@ -74,9 +77,11 @@ class FlashcardQueryBuilder:
     def filter_cram(self):
         """
         Cram Mode: Randomly review learned items.
+        Ordering is dropped here; see `random_order`.
         """
         self._query = FsrsInterface.apply_memory_filter(self._query, self.user_id, 'review')
-        self._query = self._query.order_by(func.random())
+        self._query = self._query.order_by(None)
+        self.random_order = True
         return self
 
     def exclude_items(self, item_ids):
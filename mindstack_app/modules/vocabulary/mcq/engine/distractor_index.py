@@ -0,0 +1,344 @@
+"""
+Distractor Index for MCQ Generation.
+====================================
+Per-container, precomputed version of ``SmartDistractorSelector``.
+
+``SmartDistractorSelector.select`` strips BBCode, detects language and
+extracts tokens for every candidate on every question. The index does that
+work once per (container, answer side) and keeps inverted indexes:
+
+* exact-match maps  (cleaned front / back / text -> candidates)
+* token maps        (display / back / front token or kanji -> candidates)
+* shape buckets     (JP pattern, pattern + length, length, type -> candidates)
+
+A question then only touches the candidates that share a token with the
+correct answer (they are the only ones the hard filters or the token scores
+can affect) plus a few random draws from the shape buckets, which decide the
+score of every other candidate. Selection rules and scores are the same as
+``SmartDistractorSelector`` over the shuffled pool ``MCQEngine`` builds: a
+display text shared by several items is represented by one random candidate
+that survives the hard filters.
+
+Pure logic — no Database access, no Flask.
+"""
+
+import random
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from mindstack_app.utils.content_renderer import strip_bbcode
+from .selector import SmartDistractorSelector, _is_japanese
+
+_tokens = SmartDistractorSelector._extract_tokens
+_pattern = SmartDistractorSelector._get_jp_pattern
+_overlap_high = SmartDistractorSelector._tokens_overlap_high
+
+
+def _clean(value) -> str:
+    return strip_bbcode(str(value or '')).strip().lower()
+
+
+class _Entry:
+    """One candidate with everything the selector needs, normalized once."""
+
+    __slots__ = (
+        'item_id', 'text', 'reveal', 'front', 'back', 'raw_type', 'type',
+        'disp_lower', 'length', 'pattern', 'disp_tokens', 'back_tokens', 'front_tokens',
+        'clean_front', 'clean_back', 'clean_text',
+    )
+
+    def __init__(self, item_id: int, text: str, reveal: str, front: str, back: str, item_type: str):
+        self.item_id = item_id
+        self.text, self.reveal, self.front, self.back = text, reveal, front, back
+        self.raw_type = item_type or ''
+        self.type = self.raw_type.strip().lower()
+
+        disp = strip_bbcode(text).strip()
+        back_disp = strip_bbcode(back).strip()
+        self.disp_lower = disp.lower()
+        self.length = len(disp)
+        self.pattern = _pattern(disp)
+        self.disp_tokens = _tokens(disp)
+        # None = Japanese back text (meaning-overlap checks do not apply)
+        self.back_tokens = None if _is_japanese(back_disp) else _tokens(back_disp)
+        self.front_tokens = _tokens(strip_bbcode(front).strip())
+
+        self.clean_front = _clean(front)
+        self.clean_back = _clean(back)
+        self.clean_text = _clean(text)
+
+    def as_candidate(self) -> Dict:
+        """Same dict shape as the pool built by ``MCQEngine.generate_question``."""
+        return {
+            'text': self.text,
+            'reveal': self.reveal,
+            'front': self.front,
+            'back': self.back,
+            'item_id': self.item_id,
+            'type': self.raw_type,
+        }
+
+
+class DistractorIndex:
+    """
+    Distractor candidates of one container for one (answer_key, reveal_key).
+
+    >>> idx = DistractorIndex([
+    ...     {'item_id': 1, 'text': 'con mèo', 'front': 'cat', 'back': 'con mèo'},
+    ...     {'item_id': 2, 'text': 'con chó', 'front': 'dog', 'back': 'con chó'},
+    ...     {'item_id': 3, 'text': 'cái bàn', 'front': 'table', 'back': 'cái bàn'},
+    ... ])
+    >>> [c['item_id'] for c in idx.select({'item_id': 1, 'text': 'con mèo', 'front': 'cat', 'back': 'con mèo'}, 1)]
+    [3]
+    >>> len(idx)
+    3
+    """
+
+    def __init__(self, candidates: Iterable[Dict]):
+        self._entries: List[_Entry] = []
+        self._by_item_id: Dict[int, List[int]] = defaultdict(list)
+        self._by_display: Dict[str, List[int]] = defaultdict(list)
+        self._by_clean_front: Dict[str, List[int]] = defaultdict(list)
+        self._by_clean_back: Dict[str, List[int]] = defaultdict(list)
+        self._by_clean_text: Dict[str, List[int]] = defaultdict(list)
+        self._by_disp_token: Dict[str, List[int]] = defaultdict(list)
+        self._by_back_token: Dict[str, List[int]] = defaultdict(list)
+        self._by_front_token: Dict[str, List[int]] = defaultdict(list)
+        self._by_pattern: Dict[str, List[int]] = defaultdict(list)
+        self._by_pattern_length: Dict[tuple, List[int]] = defaultdict(list)
+        self._by_length: Dict[int, List[int]] = defaultdict(list)
+        self._by_type: Dict[str, List[int]] = defaultdict(list)
+
+        for cand in candidates:
+            if not cand.get('text'):
+                continue
+            entry = _Entry(cand.get('item_id'), cand.get('text', ''), cand.get('reveal', ''),
+                           cand.get('front', ''), cand.get('back', ''), cand.get('type', ''))
+            pos = len(self._entries)
+            self._entries.append(entry)
+            self._by_item_id[entry.item_id].append(pos)
+            self._by_display[entry.disp_lower].append(pos)
+
+            for mapping, key in ((self._by_clean_front, entry.clean_front),
+                                 (self._by_clean_back, entry.clean_back),
+                                 (self._by_clean_text, entry.clean_text)):
+                if key:
+                    mapping[key].append(pos)
+            for token in entry.disp_tokens:
+                self._by_disp_token[token].append(pos)
+            for token in entry.back_tokens or ():
+                self._by_back_token[token].append(pos)
+            for token in entry.front_tokens:
+                self._by_front_token[token].append(pos)
+            self._by_pattern[entry.pattern].append(pos)
+            self._by_pattern_length[(entry.pattern, entry.length)].append(pos)
+            self._by_length[entry.length].append(pos)
+            if entry.type:
+                self._by_type[entry.type].append(pos)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── Query ─────────────────────────────────────────────────────────
+
+    def select(self, correct_item: Dict, amount: int = 3, rng: Optional[random.Random] = None) -> List[Dict]:
+        """Same contract as ``SmartDistractorSelector.select`` over the indexed pool."""
+        if not self._entries or amount <= 0:
+            return []
+        rng = rng or random
+
+        c_disp = strip_bbcode(correct_item.get('text', '')).strip()
+        c_back = strip_bbcode(correct_item.get('back', '')).strip()
+        c_q_text = strip_bbcode(correct_item.get('q_text', '')).strip()
+        c_disp_lower = c_disp.lower()
+        c_pattern = _pattern(c_disp)
+        c_length = len(c_disp)
+        c_type = (correct_item.get('type', '') or '').strip().lower()
+        answer_is_jp = _is_japanese(c_disp)
+
+        c_tokens = _tokens(c_disp)
+        c_front_tokens = _tokens(strip_bbcode(correct_item.get('front', '')).strip())
+        c_back_tokens = _tokens(c_back) if not _is_japanese(c_back) else set()
+        c_q_tokens = _tokens(c_q_text) if c_q_text and not _is_japanese(c_q_text) else set()
+        c_disp_tokens_vn = c_tokens if not answer_is_jp else set()
+
+        excluded = self._excluded(correct_item, c_back_tokens, c_disp_tokens_vn, c_q_tokens, answer_is_jp)
+
+        # Display dedup: one random surviving candidate stands for each display text
+        representative: Dict[str, Optional[int]] = {}
+
+        def canonical(display: str) -> Optional[int]:
+            if display not in representative:
+                survivors = [pos for pos in self._by_display[display] if pos not in excluded]
+                representative[display] = rng.choice(survivors) if survivors else None
+            return representative[display]
+
+        # Display texts whose score may depend on shared tokens: scored one by one
+        touched = self._lookup(self._by_disp_token, c_tokens) | self._lookup(self._by_front_token, c_front_tokens)
+        claimed = {c_disp_lower}
+        affected = []
+        for pos in sorted(touched):
+            display = self._entries[pos].disp_lower
+            if display in claimed:
+                continue
+            claimed.add(display)
+            rep = canonical(display)
+            if rep is not None:
+                affected.append(rep)
+
+        def neutral_score(e: _Entry) -> int:
+            return (100 if e.pattern == c_pattern else 0) + (20 if e.length == c_length else 0) \
+                + (30 if c_type and e.type == c_type else 0)
+
+        def accept(pos: int) -> bool:
+            display = self._entries[pos].disp_lower
+            return display not in claimed and canonical(display) == pos
+
+        # Every other candidate scores by shape only: draw the best shape levels first
+        same_levels, other_levels = self._levels(c_pattern, c_length, c_type)
+        neutral_same = self._draw_levels(same_levels, accept, amount, claimed, rng)
+
+        same_displays = {self._entries[pos].disp_lower for pos in affected if self._entries[pos].pattern == c_pattern}
+        same_displays.discard(c_disp_lower)
+        same_only = len(same_displays) + len(neutral_same) >= amount
+
+        if same_only:
+            pool = [pos for pos in affected if self._entries[pos].pattern == c_pattern] + neutral_same
+        else:
+            neutral_other = self._draw_levels(other_levels, accept, amount - len(neutral_same), claimed, rng)
+            pool = affected + neutral_same + neutral_other
+
+        scored = []
+        for pos in pool:
+            e = self._entries[pos]
+            shared = len(c_tokens & e.disp_tokens)
+            score = neutral_score(e) + (shared * 150 if answer_is_jp else -shared * 200) \
+                + len(c_front_tokens & e.front_tokens) * 80
+            scored.append((score, e))
+
+        rng.shuffle(scored)
+        scored.sort(key=lambda x: x[0], reverse=True)
+
+        selected: List[Dict] = []
+        selected_texts: Set[str] = {c_disp_lower}
+        for _, e in scored:
+            if len(selected) >= amount:
+                break
+            if e.disp_lower not in selected_texts:
+                selected.append(e.as_candidate())
+                selected_texts.add(e.disp_lower)
+        return selected
+
+    # ── Helpers ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _lookup(mapping: Dict, keys: Iterable) -> Set[int]:
+        found: Set[int] = set()
+        for key in keys:
+            found.update(mapping.get(key, ()))
+        return found
+
+    def _excluded(self, correct_item: Dict, c_back_tokens: Set[str], c_disp_tokens_vn: Set[str],
+                  c_q_tokens: Set[str], answer_is_jp: bool) -> Set[int]:
+        """Hard filters of the selector, evaluated only on candidates they can hit."""
+        excluded: Set[int] = set()
+
+        # Self + exact identity (same front / back / text, or text/back == question / answer)
+        c_front, c_back, c_text = _clean(correct_item.get('front')), _clean(correct_item.get('back')), _clean(correct_item.get('text'))
+        c_q_text = _clean(correct_item.get('q_text'))
+        excluded.update(self._by_item_id.get(correct_item.get('item_id'), ()))
+        for mapping, key in ((self._by_clean_front, c_front), (self._by_clean_back, c_back),
+                             (self._by_clean_text, c_text), (self._by_clean_text, c_q_text),
+                             (self._by_clean_back, c_q_text), (self._by_clean_back, c_text)):
+            if key:
+                excluded.update(mapping.get(key, ()))
+
+        # Meaning overlap (multiple correct answers)
+        for pos in self._lookup(self._by_back_token, c_back_tokens | c_q_tokens):
+            e = self._entries[pos]
+            if c_back_tokens and _overlap_high(e.back_tokens, c_back_tokens):
+                excluded.add(pos)
+            elif c_q_tokens and e.back_tokens and _overlap_high(e.back_tokens, c_q_tokens):
+                excluded.add(pos)
+        if not answer_is_jp:
+            for pos in self._lookup(self._by_disp_token, c_disp_tokens_vn | c_q_tokens):
+                e = self._entries[pos]
+                if c_disp_tokens_vn and _overlap_high(e.disp_tokens, c_disp_tokens_vn):
+                    excluded.add(pos)
+                elif c_q_tokens and _overlap_high(e.disp_tokens, c_q_tokens):
+                    excluded.add(pos)
+        return excluded
+
+    def _levels(self, c_pattern: str, c_length: int, c_type: str):
+        """
+        Shape score levels, best first, as (source bucket, predicate) pairs:
+        pattern +100, same length +20, same type +30.
+        """
+        entries = self._entries
+        all_positions = range(len(entries))
+
+        def same_type(e):
+            return bool(c_type) and e.type == c_type
+
+        same = [
+            (self._by_pattern_length.get((c_pattern, c_length), ()), lambda e: same_type(e)),               # 150
+            (self._by_pattern.get(c_pattern, ()), lambda e: same_type(e) and e.length != c_length),          # 130
+            (self._by_pattern_length.get((c_pattern, c_length), ()), lambda e: not same_type(e)),           # 120
+            (self._by_pattern.get(c_pattern, ()), lambda e: not same_type(e) and e.length != c_length),      # 100
+        ]
+        other = [
+            (self._by_length.get(c_length, ()), lambda e: e.pattern != c_pattern and same_type(e)),          # 50
+            (self._by_type.get(c_type, ()) if c_type else (),
+             lambda e: e.pattern != c_pattern and e.length != c_length),                                     # 30
+            (self._by_length.get(c_length, ()), lambda e: e.pattern != c_pattern and not same_type(e)),      # 20
+            (all_positions, lambda e: e.pattern != c_pattern and e.length != c_length and not same_type(e)), # 0
+        ]
+        return same, other
+
+    def _draw_levels(self, levels, accept: Callable[[int], bool], need: int, claimed: Set[str],
+                     rng) -> List[int]:
+        """Random distinct-display picks, level by level, until `need` are found."""
+        picked: List[int] = []
+        for source, predicate in levels:
+            if len(picked) >= need:
+                break
+            for pos in self._draw(source, lambda p: accept(p) and predicate(self._entries[p]), need - len(picked), rng):
+                picked.append(pos)
+                claimed.add(self._entries[pos].disp_lower)
+        return picked
+
+    def _draw(self, source: Sequence[int], accept: Callable[[int], bool], need: int, rng) -> List[int]:
+        """
+        Up to `need` random accepted positions from `source` (distinct displays).
+        Random probing first; falls back to a shuffled scan for sparse buckets.
+        """
+        if need <= 0 or not source:
+            return []
+        picked: List[int] = []
+        displays: Set[str] = set()
+
+        def take(pos: int) -> bool:
+            display = self._entries[pos].disp_lower
+            if display in displays or not accept(pos):
+                return False
+            picked.append(pos)
+            displays.add(display)
+            return True
+
+        size = len(source)
+        if size > 8 * need:
+            seen: Set[int] = set()
+            for _ in range(8 * need + 16):
+                pos = source[rng.randrange(size)]
+                if pos in seen:
+                    continue
+                seen.add(pos)
+                if take(pos) and len(picked) >= need:
+                    return picked
+        rest = [pos for pos in source if pos not in picked]
+        rng.shuffle(rest)
+        for pos in rest:
+            if len(picked) >= need:
+                break
+            take(pos)
+        return picked
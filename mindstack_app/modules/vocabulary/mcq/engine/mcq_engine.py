@@ -4,14 +4,18 @@ Pure logic, no Database access.
 """
 
 import random
-from ..logics.algorithms import get_content_value, select_choices
+from ..logics.algorithms import get_content_value, select_choices, select_choices_from_index
 from mindstack_app.utils.bbcode_parser import bbcode_to_html
 
 class MCQEngine:
     @staticmethod
-    def generate_question(item_data: dict, all_items_data: list, config: dict) -> dict:
+    def generate_question(item_data: dict, all_items_data: list, config: dict, distractors=None) -> dict:
         """
         Generate a single MCQ question for an item based on configuration.
+
+        `distractors` (optional) is a container's cached distractor set
+        (``ContainerDistractors``); when given, choices come from its index and
+        `all_items_data` is not scanned.
         """
         content = item_data.get('content', {})
         mode = config.get('mode', 'front_back')
@@ -61,7 +65,7 @@ class MCQEngine:
         distractor_pool = []
         
         # Shuffle a copy to ensure predictability is gone for tie-breaking
-        shuffled_items = list(all_items_data)
+        shuffled_items = list(all_items_data) if distractors is None else []
         random.shuffle(shuffled_items)
         reveal_key = question_key
         for other in shuffled_items:
@@ -96,7 +100,12 @@ class MCQEngine:
             'type': content.get('type') or content.get('pos') or ''
         }
         
-        choices_data = select_choices(correct_item_data, distractor_pool, num_choices)
+        if distractors is not None:
+            choices_data = select_choices_from_index(
+                correct_item_data, distractors.for_keys(answer_key, reveal_key), num_choices
+            )
+        else:
+            choices_data = select_choices(correct_item_data, distractor_pool, num_choices)
         
         choices = [c['text'] for c in choices_data]
         choice_item_ids = [c.get('item_id') for c in choices_data]
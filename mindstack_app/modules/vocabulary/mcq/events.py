@@ -0,0 +1,44 @@
+"""
+Event Handlers for Vocabulary MCQ.
+
+Content changes drop the cached distractor index of the affected container.
+"""
+from flask import current_app
+from mindstack_app.modules.content_management.signals import (
+    container_content_changed, container_structure_changed, content_created, content_deleted, content_updated,
+)
+from .services.distractor_index_service import DistractorIndexService
+
+
+def _invalidate(kwargs):
+    container_id = kwargs.get('container_id')
+    try:
+        # Without a container (e.g. a container-level event) drop everything
+        DistractorIndexService.invalidate(container_id or None)
+    except Exception as e:
+        current_app.logger.warning(f"[MCQ] Distractor index invalidation failed: {e}")
+
+
+@content_created.connect
+def on_content_created(sender, **kwargs):
+    _invalidate(kwargs)
+
+
+@content_updated.connect
+def on_content_updated(sender, **kwargs):
+    _invalidate(kwargs)
+
+
+@content_deleted.connect
+def on_content_deleted(sender, **kwargs):
+    _invalidate(kwargs)
+
+
+@container_structure_changed.connect
+def on_container_structure_changed(sender, **kwargs):
+    _invalidate(kwargs)
+
+
+@container_content_changed.connect
+def on_container_content_changed(sender, **kwargs):
+    _invalidate(kwargs)
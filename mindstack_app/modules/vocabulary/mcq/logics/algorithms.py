@@ -52,5 +52,21 @@ def select_smart_choices(correct_item: dict, distractor_pool: list, num_choices:
     return choices_data
 
 
+def select_choices_from_index(correct_item: dict, distractor_index, num_choices: int = 4) -> list:
+    """
+    Same as ``select_smart_choices`` but queries a prebuilt ``DistractorIndex``
+    instead of scanning a candidate pool.
+    """
+    if not num_choices:
+        num_choices = random.choices([3, 4, 6], weights=[1, 3, 1], k=1)[0]
+
+    selected_items = distractor_index.select(correct_item, amount=num_choices - 1)
+
+    choices_data = [correct_item] + selected_items
+    random.shuffle(choices_data)
+
+    return choices_data
+
+
 # Alias for backward compatibility
 select_choices = select_smart_choices
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from mindstack_app.core.extensions import db
+
+
+class McqSessionState(db.Model):
+    """
+    Active vocabulary MCQ session of a user on a container (one per pair).
+    Holds only the session header; questions and answers live in
+    McqSessionQuestion rows so an answer rewrites one small row.
+    Replaces UserContainerState.settings['mcq_session_data'].
+    """
+    __tablename__ = 'vocab_mcq_session_states'
+
+    state_id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+    container_id = db.Column(db.Integer, db.ForeignKey('learning_containers.container_id', ondelete='CASCADE'), nullable=False)
+    db_session_id = db.Column(db.Integer, nullable=True)  # LearningSession.session_id
+
+    params = db.Column(db.JSON, nullable=True)
+    current_index = db.Column(db.Integer, default=0, nullable=False)
+    question_count = db.Column(db.Integer, default=0, nullable=False)
+    correct_count = db.Column(db.Integer, default=0, nullable=False)
+    wrong_count = db.Column(db.Integer, default=0, nullable=False)
+    points = db.Column(db.Integer, default=0, nullable=False)
+
+    created_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    updated_at = db.Column(db.DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    questions = db.relationship(
+        'McqSessionQuestion', backref='session_state', lazy='dynamic',
+        cascade='all, delete-orphan', passive_deletes=True,
+    )
+
+    __table_args__ = (db.UniqueConstraint('user_id', 'container_id', name='_vocab_mcq_session_user_container_uc'),)
+
+    def __repr__(self):
+        return f"<McqSessionState {self.state_id}: user={self.user_id} container={self.container_id}>"
+
+
+class McqSessionQuestion(db.Model):
+    """
+    One question slot of an MCQ session.
+    `payload` is the raw item until the question is generated, then the full
+    question (choices, correct_index, ...). `answer` is set once answered.
+    """
+    __tablename__ = 'vocab_mcq_session_questions'
+
+    state_id = db.Column(db.Integer, db.ForeignKey('vocab_mcq_session_states.state_id', ondelete='CASCADE'), primary_key=True)
+    position = db.Column(db.Integer, primary_key=True)
+    item_id = db.Column(db.Integer, nullable=True)
+    payload = db.Column(db.JSON, nullable=False)
+    answer = db.Column(db.JSON, nullable=True)
+
+    def __repr__(self):
+        return f"<McqSessionQuestion {self.state_id}#{self.position}: item={self.item_id}>"
@@ -191,6 +191,10 @@ def mcq_save_setup(set_id):
             
         if 'mcq_session_data' in new_settings:
             del new_settings['mcq_session_data']
+
+        # New settings start a new session
+        from ..services.mcq_session_manager import MCQSessionManager
+        MCQSessionManager.delete_stored(current_user.user_id, set_id)
             
         ucs.settings = new_settings
         
@@ -248,7 +252,7 @@ def mcq_api_get_items(set_id):
              # Check if current session was created with a limit (implied by total questions being exactly 10, often default)
              # Better: Check manager params if available
              current_count = manager.params.get('count', 10)
-             if current_count != 0 and len(manager.questions) <= 10:
+             if current_count != 0 and manager.question_count <= 10:
                  # Restart session to get full list
                  if manager.db_session_id:
                      SessionInterface.complete_session(manager.db_session_id)
@@ -311,10 +315,10 @@ def mcq_api_next_question(set_id):
 
     # Return the current question data (fully generated by manager.next_item)
     current_q = None
-    if manager.currentIndex < len(manager.questions):
+    if manager.currentIndex < manager.question_count:
         # Double check generation (safety)
         manager.ensure_question_generated(manager.currentIndex)
-        current_q = manager.questions[manager.currentIndex]
+        current_q = manager.get_question(manager.currentIndex)
 
     return jsonify({
         'success': success, 
@@ -0,0 +1,137 @@
+# File: mindstack_app/modules/vocabulary/mcq/services/distractor_index_service.py
+"""
+Distractor Index Service - per-container MCQ distractor indexes.
+
+Loads the container's distractor items once, builds a ``DistractorIndex`` per
+(answer side, reveal side) on first use and keeps them in a process-local LRU.
+A cached container is re-validated against a cheap SQL content fingerprint at
+most every ``VOCAB_MCQ_INDEX_CHECK_SECONDS``; content signals drop it at once.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from flask import current_app
+from sqlalchemy import Text, cast, func
+
+from mindstack_app.models import LearningItem, db
+from ...config import DefaultConfig
+from ..engine.distractor_index import DistractorIndex
+from ..logics.algorithms import get_content_value
+
+MCQ_ITEM_TYPES = ('FLASHCARD', 'VOCABULARY')
+
+
+class ContainerDistractors:
+    """Distractor items of one container, with lazily built indexes per key pair."""
+
+    def __init__(self, container_id: int, items: List[Dict], fingerprint: Tuple):
+        self.container_id = container_id
+        self.items = items
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+        self._indexes: Dict[Tuple[str, str], DistractorIndex] = {}
+        self._lock = threading.Lock()
+
+    def for_keys(self, answer_key: str, reveal_key: str) -> DistractorIndex:
+        """Index whose candidates show `answer_key` and reveal `reveal_key`."""
+        key = (answer_key, reveal_key)
+        index = self._indexes.get(key)
+        if index is None:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is None:
+                    index = DistractorIndex(self._candidates(answer_key, reveal_key))
+                    self._indexes[key] = index
+        return index
+
+    def _candidates(self, answer_key: str, reveal_key: str):
+        # Same candidate fields as the pool built in MCQEngine.generate_question
+        for item in self.items:
+            c = item.get('content', {})
+            yield {
+                'text': get_content_value(c, answer_key),
+                'reveal': get_content_value(c, reveal_key),
+                'front': get_content_value(c, 'front'),
+                'back': get_content_value(c, 'back'),
+                'item_id': item['item_id'],
+                'type': c.get('type') or c.get('pos') or '',
+            }
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+class DistractorIndexService:
+    """Process-wide cache of ``ContainerDistractors`` keyed by container_id."""
+
+    _containers: "OrderedDict[int, ContainerDistractors]" = OrderedDict()
+    _lock = threading.RLock()
+
+    @staticmethod
+    def _config(key: str):
+        return current_app.config.get(key, getattr(DefaultConfig, key))
+
+    @staticmethod
+    def fingerprint(container_id: int) -> Tuple:
+        """
+        Cheap content fingerprint of a container: one aggregate query.
+        Catches added/removed items and edits that change the stored JSON size.
+        """
+        row = db.session.query(
+            func.count(LearningItem.item_id),
+            func.sum(LearningItem.item_id),
+            func.sum(func.length(cast(LearningItem.content, Text))),
+            func.sum(func.length(cast(LearningItem.custom_data, Text))),
+        ).filter(
+            LearningItem.container_id == container_id,
+            LearningItem.item_type.in_(MCQ_ITEM_TYPES),
+        ).one()
+        return tuple(int(v or 0) for v in row)
+
+    @classmethod
+    def get(cls, container_id: int) -> Optional[ContainerDistractors]:
+        """Cached distractors of a container, reloaded when its content changed."""
+        if not container_id:
+            return None
+
+        with cls._lock:
+            cached = cls._containers.get(container_id)
+            if cached is not None:
+                cls._containers.move_to_end(container_id)
+
+        check_seconds = float(cls._config('VOCAB_MCQ_INDEX_CHECK_SECONDS'))
+        if cached is not None and (time.monotonic() - cached.checked_at) < check_seconds:
+            return cached
+
+        fingerprint = cls.fingerprint(container_id)
+        if cached is not None and cached.fingerprint == fingerprint:
+            cached.checked_at = time.monotonic()
+            return cached
+
+        from .mcq_service import MCQService
+        loaded = ContainerDistractors(container_id, MCQService.get_all_items_for_distractors(container_id), fingerprint)
+
+        max_containers = int(cls._config('VOCAB_MCQ_INDEX_MAX_CONTAINERS'))
+        with cls._lock:
+            cls._containers[container_id] = loaded
+            cls._containers.move_to_end(container_id)
+            while len(cls._containers) > max_containers:
+                cls._containers.popitem(last=False)
+        return loaded
+
+    @classmethod
+    def invalidate(cls, container_id: Optional[int] = None) -> None:
+        """Drop one container's index (all containers if None)."""
+        with cls._lock:
+            if container_id is None:
+                cls._containers.clear()
+            else:
+                cls._containers.pop(container_id, None)
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            return {'containers': len(cls._containers)}
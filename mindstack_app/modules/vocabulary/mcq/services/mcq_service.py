@@ -6,7 +6,6 @@ import random
 from mindstack_app.models import LearningItem, db
 from ..engine.mcq_engine import MCQEngine
 from ..logics.algorithms import get_content_value
-import asyncio
 from flask import current_app
 from mindstack_app.modules.audio.interface import AudioInterface
 
@@ -14,7 +13,8 @@ class MCQService:
     @staticmethod
     def ensure_audio_urls(item, container: 'LearningContainer' = None, q_key: str = None, a_key: str = None) -> dict:
         """
-        Pre-generate audio if missing for specific content keys.
+        Resolve audio URLs for specific content keys; missing files are queued
+        for background pre-generation (left empty in this response).
         Returns the content dict with resolved absolute URLs.
         """
         from flask import url_for
@@ -49,24 +49,16 @@ class MCQService:
         front_url = content.get('front_audio') or content.get('front_audio_url')
         back_url = content.get('back_audio') or content.get('back_audio_url')
 
-        def _gen(text: str, filename: str, target_dir: str):
+        def _gen(text: str, filename: str, target_dir: str, field: str):
+            # Never synthesize in the request: existing file or queue it for the background worker
             if not text:
                 return None
             try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                result = loop.run_until_complete(
-                    AudioInterface.generate_audio(
-                        text=str(text), 
-                        auto_voice_parsing=True,
-                        custom_filename=filename,
-                        target_dir=target_dir
-                    )
+                return AudioInterface.get_or_queue_audio_url(
+                    str(text), filename=filename, target_dir=target_dir, item_id=item_id, field=field
                 )
-                loop.close()
-                return result.url if result and result.status in ('generated', 'exists') else None
             except Exception as e:
-                current_app.logger.warning(f"Failed to generate audio in MCQ: {e}")
+                current_app.logger.warning(f"Failed to resolve audio in MCQ: {e}")
                 return None
 
         # Determine target directory and convention
@@ -113,21 +105,21 @@ class MCQService:
                 audio_key = f"{key}_audio"
                 if not content.get(audio_key) and content.get(key):
                     filename = f"{key}_{item_id}.mp3" if item_id else None
-                    url = _gen(content.get(key), filename, audio_folder)
+                    url = _gen(content.get(key), filename, audio_folder, key)
                     if url:
                         content[audio_key] = url
 
         # Fallback to standard front/back generation
         if front_text and not front_url and str(front_text).strip():
             filename = f"front_{item_id}.mp3" if item_id else None
-            url = _gen(front_text, filename, audio_folder)
+            url = _gen(front_text, filename, audio_folder, 'front')
             if url:
                 content['front_audio'] = url
                 content['front_audio_url'] = url
             
         if back_text and not back_url and str(back_text).strip():
             filename = f"back_{item_id}.mp3" if item_id else None
-            url = _gen(back_text, filename, audio_folder)
+            url = _gen(back_text, filename, audio_folder, 'back')
             if url:
                 content['back_audio'] = url
                 content['back_audio_url'] = url
@@ -300,11 +292,12 @@ class MCQService:
             except Exception as e:
                 current_app.logger.error(f"[MCQService] Failed to fetch FSRS states: {e}")
 
-        # 3. Get all items (Distractors Source) - Whole container
-        all_distractors = MCQService.get_all_items_for_distractors(container_id)
+        # 3. Get all items (Distractors Source) - Whole container, cached index
+        from .distractor_index_service import DistractorIndexService
+        distractors = DistractorIndexService.get(container_id)
         
         # Ensure we have enough distractors in total (though engine handles graceful degradation)
-        if len(all_distractors) < 2:
+        if len(distractors) < 2:
              return []
 
         random.shuffle(eligible_questions)
@@ -343,8 +336,8 @@ class MCQService:
             if isinstance(item, dict):
                 item['content'] = updated_content
             
-            # Pass ALL items as distractor pool
-            question = MCQEngine.generate_question(item, all_distractors, merged_config)
+            # Choices come from the container's distractor index
+            question = MCQEngine.generate_question(item, [], merged_config, distractors=distractors)
             questions.append(question)
             
         return questions
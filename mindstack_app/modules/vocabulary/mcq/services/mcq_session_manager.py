@@ -9,20 +9,86 @@ from ..interface import VocabMCQInterface
 class MCQSessionManager:
     """
     Manages the state of an MCQ (Multiple Choice Quiz) session.
-    Persists data in the Database (UserContainerState.settings).
+    Persists data in McqSessionState (header) + McqSessionQuestion (one row per
+    question): each save writes only the rows that changed.
+    Questions of a restored session are loaded lazily, row by row.
     """
     
     def __init__(self, user_id, set_id, params=None, questions=None, currentIndex=0, stats=None, answers=None, db_session_id=None):
         self.user_id = user_id
         self.set_id = set_id
         self.params = params or {}
-        self.questions = questions or []
         self.currentIndex = currentIndex
         # stats includes 'correct', 'wrong', and now 'points'
         self.stats = stats or {'correct': 0, 'wrong': 0, 'points': 0}
-        self.answers = answers or {} # Map: currentIndex (str) -> {'user_answer_index': int, ...}
         self.db_session_id = db_session_id
 
+        # Persistence state
+        self._state = None            # McqSessionState row (None = not stored yet)
+        self._rewrite = True          # Store every question row on next save
+        self._dirty = set()           # Positions whose row changed since last save
+        self._loaded_all = True
+
+        self._payloads = {}           # position -> question payload
+        self._answers = answers or {}  # Map: currentIndex (str) -> {'user_answer_index': int, ...}
+        self.question_count = 0
+        self.questions = questions or []
+
+    # ── Question / answer access (lazy for restored sessions) ────────
+
+    @property
+    def questions(self):
+        self._load_all()
+        return [self._payloads[i] for i in range(self.question_count)]
+
+    @questions.setter
+    def questions(self, value):
+        self._payloads = dict(enumerate(value or []))
+        self.question_count = len(self._payloads)
+        self._loaded_all = True
+        self._rewrite = True
+
+    @property
+    def answers(self):
+        self._load_all()
+        return self._answers
+
+    def get_question(self, index):
+        """Question payload at `index`, loading only its row if needed."""
+        if index < 0 or index >= self.question_count:
+            return None
+        if index not in self._payloads and not self._loaded_all:
+            from mindstack_app.models import McqSessionQuestion
+            row = McqSessionQuestion.query.filter_by(state_id=self._state.state_id, position=index).first()
+            if row is None:
+                return None
+            self._remember_row(row)
+        return self._payloads.get(index)
+
+    def _set_question(self, index, payload):
+        self._payloads[index] = payload
+        self._dirty.add(index)
+
+    def _set_answer(self, index, answer):
+        self._answers[str(index)] = answer
+        self._dirty.add(index)
+
+    def _remember_row(self, row):
+        self._payloads[row.position] = row.payload
+        if row.answer is not None:
+            self._answers[str(row.position)] = row.answer
+
+    def _load_all(self):
+        if self._loaded_all:
+            return
+        from mindstack_app.models import McqSessionQuestion
+        rows = McqSessionQuestion.query.filter_by(state_id=self._state.state_id).order_by(McqSessionQuestion.position).all()
+        for row in rows:
+            if row.position not in self._payloads:
+                self._remember_row(row)
+        self.question_count = len(self._payloads)
+        self._loaded_all = True
+
     def to_dict(self):
         return {
             'user_id': self.user_id,
@@ -93,50 +159,111 @@ class MCQSessionManager:
             db_session_id=data.get('db_session_id')
         )
 
+    @classmethod
+    def from_state(cls, state):
+        """Restores a manager from its header row; questions stay in the DB until needed."""
+        manager = cls(
+            user_id=state.user_id,
+            set_id=state.container_id,
+            params=state.params or {},
+            currentIndex=state.current_index or 0,
+            stats={'correct': state.correct_count or 0, 'wrong': state.wrong_count or 0, 'points': state.points or 0},
+            db_session_id=state.db_session_id,
+        )
+        manager._state = state
+        manager._rewrite = False
+        manager._loaded_all = False
+        manager.question_count = state.question_count or 0
+        return manager
+
     @classmethod
     def load_from_db(cls, user_id, set_id):
-        """Loads session state from the database (UserContainerState)."""
+        """Loads session state from the database (McqSessionState)."""
+        from mindstack_app.models import McqSessionState
+        state = McqSessionState.query.filter_by(user_id=user_id, container_id=set_id).first()
+        if state:
+            return cls.from_state(state)
+        return cls._import_legacy(user_id, set_id)
+
+    @classmethod
+    def _import_legacy(cls, user_id, set_id):
+        """
+        One-time move of a session saved by older versions in
+        UserContainerState.settings['mcq_session_data'] into the new tables.
+        """
         from mindstack_app.models import UserContainerState
         ucs = UserContainerState.query.filter_by(user_id=user_id, container_id=set_id).first()
-        if ucs and ucs.settings and 'mcq_session_data' in ucs.settings:
-            data = ucs.settings['mcq_session_data']
-            if data:
-                return cls.from_dict(data)
-        return None
+        data = (ucs.settings or {}).get('mcq_session_data') if ucs else None
+        if not data:
+            return None
+
+        manager = cls.from_dict(data)
+        new_settings = dict(ucs.settings)
+        del new_settings['mcq_session_data']
+        ucs.settings = new_settings
+        manager.save_to_db()
+        return manager
 
     def save_to_db(self):
-        """Saves current state to the database (UserContainerState)."""
-        from mindstack_app.models import UserContainerState, db
-        from mindstack_app.utils.db_session import safe_commit
-        import datetime
+        """Writes the changes since the last save (header + changed question rows)."""
+        from mindstack_app.models import McqSessionState, McqSessionQuestion, db
+        from mindstack_app.utils.db_session import safe_commit, safe_rollback
 
         try:
-            ucs = UserContainerState.query.filter_by(user_id=self.user_id, container_id=self.set_id).first()
-            if not ucs:
-                ucs = UserContainerState(user_id=self.user_id, container_id=self.set_id, settings={})
-                db.session.add(ucs)
-            
-            # Use current settings if they exist, or initialize
-            if ucs.settings is None: ucs.settings = {}
-            
-            # [CRITICAL] Modify the settings dict directly to ensure we are using the live object
-            ucs.settings['mcq_session_data'] = self.to_dict()
-            
-            # Trigger SQLAlchemy change detection for JSON
-            from sqlalchemy.orm.attributes import flag_modified
-            flag_modified(ucs, "settings")
-            
-            db.session.commit()
-            
-            # [DEBUG] [V3] Verify what was actually saved
-            db.session.refresh(ucs)
-            saved_data = (ucs.settings or {}).get('mcq_session_data', {})
-            saved_answers = saved_data.get('answers', {})
-            current_app.logger.info(f"[VOCAB_MCQ] [V3] DB SAVE success for set_id={self.set_id}. Current index {self.currentIndex}. Answers recorded: {len(saved_answers)}")
-            if str(self.currentIndex) in saved_answers:
-                 current_app.logger.info(f"[VOCAB_MCQ] [V3] Index {self.currentIndex} data in DB: {saved_answers[str(self.currentIndex)]}")
+            if self._state is None:
+                # New session replaces any previous one of this user on this container
+                self.delete_stored(self.user_id, self.set_id)
+                self._state = McqSessionState(user_id=self.user_id, container_id=self.set_id)
+                db.session.add(self._state)
+
+            state = self._state
+            state.params = self.params
+            state.current_index = self.currentIndex
+            state.question_count = self.question_count
+            state.correct_count = self.stats.get('correct', 0)
+            state.wrong_count = self.stats.get('wrong', 0)
+            state.points = self.stats.get('points', 0)
+            state.db_session_id = self.db_session_id
+            db.session.flush()
+
+            if self._rewrite:
+                McqSessionQuestion.query.filter_by(state_id=state.state_id).delete(synchronize_session=False)
+                db.session.bulk_insert_mappings(McqSessionQuestion, [
+                    {
+                        'state_id': state.state_id,
+                        'position': index,
+                        'item_id': payload.get('item_id'),
+                        'payload': payload,
+                        'answer': self._answers.get(str(index)),
+                    }
+                    for index, payload in sorted(self._payloads.items())
+                ])
+            else:
+                for index in sorted(self._dirty):
+                    McqSessionQuestion.query.filter_by(state_id=state.state_id, position=index).update({
+                        'payload': self._payloads.get(index),
+                        'answer': self._answers.get(str(index)),
+                    }, synchronize_session=False)
+
+            safe_commit(db.session)
+            self._rewrite = False
+            self._dirty.clear()
         except Exception as e:
-            current_app.logger.error(f"[VOCAB_MCQ] [V3] DB SAVE ERROR: {str(e)}")
+            safe_rollback(db.session)
+            current_app.logger.error(f"[VOCAB_MCQ] DB SAVE ERROR: {str(e)}")
+
+    @staticmethod
+    def delete_stored(user_id, set_id):
+        """Deletes the stored session of a user on a container (rows + header)."""
+        from mindstack_app.models import McqSessionState, McqSessionQuestion
+        state_ids = [sid for (sid,) in McqSessionState.query.with_entities(McqSessionState.state_id).filter_by(
+            user_id=user_id, container_id=set_id
+        ).all()]
+        if not state_ids:
+            return False
+        McqSessionQuestion.query.filter(McqSessionQuestion.state_id.in_(state_ids)).delete(synchronize_session=False)
+        McqSessionState.query.filter(McqSessionState.state_id.in_(state_ids)).delete(synchronize_session=False)
+        return True
 
     def initialize_session(self, count, mode, choices, custom_pairs, study_mode='review'):
         """Generates raw items and sets up the session (Lazy Generation)."""
@@ -165,7 +292,8 @@ class MCQSessionManager:
         self.questions = raw_items
         self.currentIndex = 0
         self.stats = {'correct': 0, 'wrong': 0, 'points': 0}
-        self.answers = {}
+        self._answers = {}
+        self._state = None
         
         # [NEW] Create DB Session via Service
         try:
@@ -175,7 +303,7 @@ class MCQSessionManager:
                 learning_mode='mcq',
                 mode_config_id=mode,
                 set_id_data=self.set_id,
-                total_items=len(self.questions),
+                total_items=self.question_count,
                 extra_data={'mode': study_mode}
             )
             if db_session:
@@ -186,7 +314,7 @@ class MCQSessionManager:
         self.save_to_db()
         
         duration = time.time() - start_time
-        current_app.logger.info(f"[VOCAB_MCQ] [LAZY] Session initialized in {duration:.4f}s for {len(self.questions)} items.")
+        current_app.logger.info(f"[VOCAB_MCQ] [LAZY] Session initialized in {duration:.4f}s for {self.question_count} items.")
         
         return True, "Session initialized"
 
@@ -195,10 +323,9 @@ class MCQSessionManager:
         Just-In-Time Generation: Ensures the question at the given index 
         has full MCQ payload (choices, correct_index, etc.)
         """
-        if index < 0 or index >= len(self.questions):
+        question = self.get_question(index)
+        if question is None:
             return False
-            
-        question = self.questions[index]
         
         # Check if already generated (contains choices)
         if 'choices' in question and 'correct_index' in question:
@@ -229,8 +356,9 @@ class MCQSessionManager:
                 'image_folder': container.media_image_folder if container else None,
             }
 
-            # 2. Get distractors pool (Lazy: Fetch only when needed or use a cached pool)
-            all_distractors = MCQService.get_all_items_for_distractors(self.set_id)
+            # 2. Get distractors (cached per-container index)
+            from ..services.distractor_index_service import DistractorIndexService
+            distractors = DistractorIndexService.get(self.set_id)
             
             # 3. Ensure audio URLs for the specific item
             updated_content = MCQService.ensure_audio_urls(
@@ -242,7 +370,7 @@ class MCQSessionManager:
             question['content'] = updated_content
             
             # 4. Generate the specific MCQ question
-            generated = MCQEngine.generate_question(question, all_distractors, merged_config)
+            generated = MCQEngine.generate_question(question, [], merged_config, distractors=distractors)
             
             # [NEW] Fetch LATEST SRS state from DB to ensure accurate counts
             try:
@@ -263,8 +391,8 @@ class MCQSessionManager:
                 # Fallback: keep existing SRS if available
                 if 'srs' in question: generated['srs'] = question['srs']
 
-            # 5. Update the question in the list
-            self.questions[index] = generated
+            # 5. Update the question slot
+            self._set_question(index, generated)
                 
             # [CRITICAL] Save immediately to ensure correct_index is persisted for check_answer
             self.save_to_db()
@@ -284,7 +412,7 @@ class MCQSessionManager:
             'currentIndex': self.currentIndex,
             'stats': self.stats,
             'answers': self.answers,
-            'total': len(self.questions),
+            'total': self.question_count,
             'db_session_id': self.db_session_id
         }
 
@@ -293,13 +421,13 @@ class MCQSessionManager:
         from mindstack_app.modules.scoring.interface import ScoringInterface
         from ..engine.mcq_engine import MCQEngine
         
-        if self.currentIndex >= len(self.questions):
+        if self.currentIndex >= self.question_count:
             return {'success': False, 'message': 'Index out of bounds'}
             
         # Ensure generated (Safety check)
         self.ensure_question_generated(self.currentIndex)
             
-        question = self.questions[self.currentIndex]
+        question = self.get_question(self.currentIndex)
         
         # Use simplified engine check (Pure logic)
         result = MCQEngine.check_answer(question['correct_index'], user_answer_index)
@@ -316,10 +444,10 @@ class MCQSessionManager:
             self.stats['wrong'] += 1
             
         # Record the answer (as string key for JSON compatibility in session)
-        self.answers[str(self.currentIndex)] = {
+        self._set_answer(self.currentIndex, {
             'user_answer_index': user_answer_index,
             'is_correct': is_correct
-        }
+        })
         
         # [NEW] Update DB Session Progress
         if self.db_session_id:
@@ -337,7 +465,7 @@ class MCQSessionManager:
                 )
                 
                 # Check for completion
-                if self.currentIndex >= len(self.questions) - 1:
+                if self.currentIndex >= self.question_count - 1:
                     SessionInterface.complete_session(self.db_session_id)
                     
             except Exception as e:
@@ -356,15 +484,16 @@ class MCQSessionManager:
     def update_answer_srs(self, index, srs_data):
         """Updates a specific answer with SRS metadata and persists to DB."""
         key = str(index)
-        if key in self.answers:
-            self.answers[key].update(srs_data)
+        self.get_question(index)  # Loads the row (and its answer) if needed
+        if key in self._answers:
+            self._set_answer(index, {**self._answers[key], **srs_data})
             self.save_to_db()
             return True
         return False
 
     def next_item(self):
         """Advances the index if possible."""
-        if self.currentIndex < len(self.questions) - 1:
+        if self.currentIndex < self.question_count - 1:
             self.currentIndex += 1
             # [LAZY] Prefetch next question for smoothness
             self.ensure_question_generated(self.currentIndex)
@@ -377,9 +506,11 @@ class MCQSessionManager:
         Reshuffles the current questions and starts a new cycle.
         Preserves the question pool but changes the order.
         """
-        if self.questions:
+        if self.question_count:
             # Fisher-Yates shuffle (random.shuffle is in-place)
-            random.shuffle(self.questions)
+            questions = self.questions
+            random.shuffle(questions)
+            self.questions = questions
             self.currentIndex = 0
             self.save_to_db()
             return True
@@ -387,44 +518,32 @@ class MCQSessionManager:
 
     def clear_session(self):
         """Clears the session data from the database."""
-        from mindstack_app.models import UserContainerState, db
-        from mindstack_app.utils.db_session import safe_commit
-        
-        try:
-            ucs = UserContainerState.query.filter_by(user_id=self.user_id, container_id=self.set_id).first()
-            if ucs and ucs.settings and 'mcq_session_data' in ucs.settings:
-                new_settings = dict(ucs.settings)
-                del new_settings['mcq_session_data']
-                ucs.settings = new_settings
-                
-                from sqlalchemy.orm.attributes import flag_modified
-                flag_modified(ucs, "settings")
-                
-                safe_commit(db.session)
-        except Exception as e:
-            print(f"Error clearing MCQ session: {e}")
+        if self.static_clear_session(self.user_id, self.set_id):
+            self._state = None
+            self._rewrite = True
 
-    @staticmethod
-    def static_clear_session(user_id, set_id):
+    @classmethod
+    def static_clear_session(cls, user_id, set_id):
         """
         Statically clears session data. 
         Useful when load_from_db fails but we still want to clean up.
         """
         from mindstack_app.models import UserContainerState, db
-        from mindstack_app.utils.db_session import safe_commit
+        from mindstack_app.utils.db_session import safe_commit, safe_rollback
         
         try:
+            cls.delete_stored(user_id, set_id)
+
+            # Sessions saved by older versions
             ucs = UserContainerState.query.filter_by(user_id=user_id, container_id=set_id).first()
             if ucs and ucs.settings and 'mcq_session_data' in ucs.settings:
                 new_settings = dict(ucs.settings)
                 del new_settings['mcq_session_data']
                 ucs.settings = new_settings
                 
-                from sqlalchemy.orm.attributes import flag_modified
-                flag_modified(ucs, "settings")
-                
-                safe_commit(db.session)
-                return True
+            safe_commit(db.session)
+            return True
         except Exception as e:
+            safe_rollback(db.session)
             print(f"Error static clearing MCQ session: {e}")
         return False
@@ -59,10 +59,17 @@ class MCQMode(BaseVocabMode):
             'image_folder': container.media_image_folder if container else None,
         }
 
+        # Container items come from the cached distractor index when possible
+        distractors = None
+        if container_id:
+            from mindstack_app.modules.vocabulary.mcq.services.distractor_index_service import DistractorIndexService
+            distractors = DistractorIndexService.get(container_id)
+
         question_data = MCQEngine.generate_question(
             item_data=item,
             all_items_data=all_items or [],
             config=config,
+            distractors=distractors,
         )
 
         return {
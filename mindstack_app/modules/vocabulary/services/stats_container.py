@@ -53,86 +53,46 @@ class VocabularyContainerStats:
     def get_full_stats(user_id: int, container_id: int) -> dict:
         """
         Get comprehensive statistics for a vocabulary container.
+        Counts come from the FSRS container aggregate; only the average
+        retrievability (time-dependent) is computed from the memory states.
         """
-        items = LearningItem.query.filter(
+        total = LearningItem.query.filter(
             LearningItem.container_id == container_id,
             LearningItem.item_type.in_(['FLASHCARD', 'VOCABULARY'])
-        ).all()
-        
-        item_ids = [item.item_id for item in items]
-        total = len(item_ids)
+        ).count()
         
-        if not item_ids:
+        if not total:
             return VocabularyContainerStats._empty_stats()
         
-        # REFAC: Use FsrsService to get states
-        progress_map = FsrsService.get_memory_states(user_id, item_ids)
+        # REFAC: Use FsrsService aggregate (one row per user/container)
+        stats = FsrsService.get_container_stats_map(user_id, [container_id])[container_id]
+        learned_count = stats['total']  # Items with a memory state
+        mastered_count = stats['mastered']
+        total_correct = stats['times_correct']
+        total_incorrect = stats['times_incorrect']
+        last_reviewed = stats['last_review']
         
-        now = datetime.now(timezone.utc)
+        # One vectorized pass instead of an engine per item
+        learned_states = FsrsService.get_learned_item_states_for_container(user_id, container_id)
+        total_retrievability = float(FsrsService.get_retrievability_batch(learned_states).sum()) if learned_states else 0.0
         
-        # Calculate counts
-        new_count = 0
-        learning_count = 0
-        mastered_count = 0
-        due_count = 0
-        
-        total_retrievability = 0.0
-        total_correct = 0
-        total_incorrect = 0
-        total_reviews = 0
-        last_reviewed = None
-        
-        for item_id in item_ids:
-            progress = progress_map.get(item_id)
-            if not progress:
-                new_count += 1
-            else:
-                stability = progress.stability or 0.0
-                retrievability = FsrsService.get_retrievability(progress)
-                total_retrievability += retrievability
-                
-                if stability >= 21.0:
-                    mastered_count += 1
-                else:
-                    learning_count += 1
-                
-                if progress.due_date:
-                    # Ensure progress.due_date is aware for comparison
-                    due_val = progress.due_date
-                    if due_val.tzinfo is None:
-                        due_val = due_val.replace(tzinfo=timezone.utc)
-                    if due_val <= now:
-                        due_count += 1
-                
-                total_correct += progress.times_correct or 0
-                total_incorrect += progress.times_incorrect or 0
-                total_reviews += (progress.times_correct or 0) + (progress.times_incorrect or 0)
-                
-                if progress.last_review:
-                    if not last_reviewed or progress.last_review > last_reviewed:
-                        last_reviewed = progress.last_review
-        
-        learned_count = len(progress_map)
         completion_pct = (learned_count / total * 100) if total > 0 else 0
         retrievability_avg = (total_retrievability / learned_count) if learned_count > 0 else 0
         accuracy_pct = (total_correct / (total_correct + total_incorrect) * 100) if (total_correct + total_incorrect) > 0 else 0
         
-        # REFAC: Use FsrsService directly
-        hard_count = FsrsService.get_hard_count(user_id, container_id)
-        
         return {
             'total': total,
-            'new': new_count,
-            'learning': learning_count,
+            'new': max(0, total - learned_count),
+            'learning': learned_count - mastered_count,
             'mastered': mastered_count,
-            'due': due_count,
-            'hard': hard_count,
+            'due': stats['due'],
+            'hard': stats['hard'],
             'learned': learned_count,
             'completion_pct': round(completion_pct, 1),
             'retrievability_avg': round(retrievability_avg, 2),
             'mastery_avg': round(retrievability_avg, 2),
             'accuracy_pct': round(accuracy_pct, 1),
-            'total_reviews': total_reviews,
+            'total_reviews': total_correct + total_incorrect,
             'total_correct': total_correct,
             'total_incorrect': total_incorrect,
             'last_reviewed': last_reviewed.isoformat() if last_reviewed else None
@@ -175,12 +135,8 @@ class VocabularyContainerStats:
         # REFAC: Use FsrsService
         progress_map = FsrsService.get_memory_states(user_id, item_ids)
         
-        weak_count = medium_count = strong_count = 0
-        for progress in progress_map.values():
-            retrievability = FsrsService.get_retrievability(progress)
-            if retrievability < 0.7: weak_count += 1
-            elif retrievability < 0.9: medium_count += 1
-            else: strong_count += 1
+        buckets = FsrsService.get_retrievability_distribution(list(progress_map.values()))
+        weak_count, medium_count, strong_count = buckets['weak'], buckets['medium'], buckets['strong']
         
         now = datetime.now(timezone.utc)
         timeline_data = defaultdict(list)
@@ -1,5 +1,5 @@
 from mindstack_app.models import (
-    db, LearningContainer, LearningItem, User, UserContainerState, ItemMemoryState
+    db, LearningContainer, LearningItem, User, UserContainerState
 )
 
 from mindstack_app.modules.fsrs.interface import FSRSInterface as FsrsInterface
@@ -18,10 +18,8 @@ class VocabularyService:
         try:
             query = LearningContainer.query.filter(LearningContainer.container_type == 'FLASHCARD_SET')
             if search:
-                query = query.filter(or_(
-                    LearningContainer.title.ilike(f'%{search}%'),
-                    LearningContainer.description.ilike(f'%{search}%')
-                ))
+                from mindstack_app.modules.content_management.interface import ContentInterface
+                query = ContentInterface.filter_containers_by_search(query, search, ['title', 'description'], ranked=True)
             
             if category == 'my':
                 query = query.filter(LearningContainer.creator_user_id == user_id)
@@ -66,21 +64,23 @@ class VocabularyService:
             )
             
             sets_data = []
+            container_ids = [c.container_id for c in pagination.items]
+            card_counts = dict(db.session.query(
+                LearningItem.container_id, func.count(LearningItem.item_id)
+            ).filter(
+                LearningItem.container_id.in_(container_ids),
+                LearningItem.item_type.in_(['FLASHCARD', 'VOCABULARY'])
+            ).group_by(LearningItem.container_id).all()) if container_ids else {}
+            # Learned counts for the whole page from the FSRS container aggregates
+            memory_stats = FsrsInterface.get_container_stats_map(user_id, container_ids)
+            creators = {u.user_id: u for u in User.query.filter(
+                User.user_id.in_({c.creator_user_id for c in pagination.items})
+            )} if container_ids else {}
+
             for c in pagination.items:
-                card_count = LearningItem.query.filter(
-                    LearningItem.container_id == c.container_id,
-                    LearningItem.item_type.in_(['FLASHCARD', 'VOCABULARY'])
-                ).count()
-                creator = User.query.get(c.creator_user_id)
-                
-                # Get learned count for this user in this container
-                learned_count = db.session.query(func.count(ItemMemoryState.state_id)).join(
-                    LearningItem, LearningItem.item_id == ItemMemoryState.item_id
-                ).filter(
-                    LearningItem.container_id == c.container_id,
-                    ItemMemoryState.user_id == user_id,
-                    ItemMemoryState.state != 0
-                ).scalar() or 0
+                card_count = card_counts.get(c.container_id, 0)
+                creator = creators.get(c.creator_user_id)
+                learned_count = memory_stats[c.container_id]['learned']
 
                 sets_data.append(VocabSetDTO(
                     id=c.container_id,
@@ -8,16 +8,33 @@ for the duration of a transaction which can occasionally surface as a
 roughly the same time.  The :func:`safe_commit` helper retries the commit
 with
 exponential backoff so short lived locks are retried transparently.
+
+:func:`unit_of_work` groups several service calls (e.g. FSRS update, study
+log, score log, badges and session counters for one answer) into a single
+transaction.  While a unit of work is open, :func:`safe_commit` only flushes,
+so nested services and signal subscribers enlist into the outer transaction
+and the database sees exactly one commit.  On SQLite the unit takes the write
+lock when it opens (with the same retry as :func:`safe_commit`), so its
+flushes never fail on a lock.  Enlisted work that may fail on its own runs in
+a :func:`savepoint`, which rolls back only that part.
+
+:func:`upsert_increment` adds to counter columns of aggregate rows (rollups,
+materialized leaderboards) with a single ``INSERT ... ON CONFLICT`` statement;
+:func:`insert_ignore` creates rows unless they already exist.
 """
 
 from __future__ import annotations
 
 import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Sequence
 
+from sqlalchemy import func
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm.session import Session
 
 LOCKED_MESSAGES = {"database is locked", "database is busy"}
+UNIT_OF_WORK_KEY = "mindstack_unit_of_work_depth"
 
 
 def _is_lock_error(error: OperationalError) -> bool:
@@ -27,6 +44,12 @@ def _is_lock_error(error: OperationalError) -> bool:
     return any(token in message for token in LOCKED_MESSAGES)
 
 
+def in_unit_of_work(session: Session) -> bool:
+    """Return ``True`` while a :func:`unit_of_work` is open on ``session``."""
+
+    return session.info.get(UNIT_OF_WORK_KEY, 0) > 0
+
+
 def safe_commit(
     session: Session,
     retries: int = 5,
@@ -34,6 +57,10 @@ def safe_commit(
 ) -> None:
     """Commit the current transaction, retrying when SQLite is locked.
 
+    Inside a :func:`unit_of_work` the commit is deferred: pending changes are
+    flushed (so generated ids are available) and the outermost unit of work
+    commits them together.
+
     Args:
         session: The SQLAlchemy session to commit.
         retries: Maximum number of attempts before the error is re-raised.
@@ -46,6 +73,10 @@ def safe_commit(
             SQLite locking.
     """
 
+    if in_unit_of_work(session):
+        session.flush()
+        return
+
     delay = initial_delay
     for attempt in range(retries):
         try:
@@ -59,3 +90,212 @@ def safe_commit(
             time.sleep(delay)
             delay *= 2
 
+
+
+def _begin_write(
+    session: Session,
+    retries: int = 5,
+    initial_delay: float = 0.1,
+) -> None:
+    """Open an SQLite write transaction (``BEGIN IMMEDIATE``) on ``session``.
+
+    pysqlite only emits ``BEGIN`` before the first DML statement, so a
+    transaction that has just read is not one yet on the database: a later
+    flush could fail on the lock, and a ``SAVEPOINT`` would start (and its
+    release commit) a transaction of its own.  No-op on other databases or
+    when the connection is already in a transaction.
+    """
+
+    connection = session.connection()
+    if connection.dialect.name != "sqlite":
+        return
+    if connection.connection.dbapi_connection.in_transaction:
+        return
+
+    delay = initial_delay
+    for attempt in range(retries):
+        try:
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+            return
+        except OperationalError as exc:  # pragma: no cover - retriable path
+            if attempt == retries - 1 or not _is_lock_error(exc):
+                raise
+
+            time.sleep(delay)
+            delay *= 2
+
+
+def safe_rollback(session: Session) -> None:
+    """Roll back, unless a :func:`unit_of_work` owns the transaction.
+
+    Enlisted services must not discard work done by their siblings.  Inside a
+    unit of work the error is left for the owner: if the session is no longer
+    usable the final commit fails and the whole unit is rolled back.
+    """
+
+    if not in_unit_of_work(session):
+        session.rollback()
+
+
+@contextmanager
+def unit_of_work(session: Session) -> Iterator[Session]:
+    """Run the enclosed block as one transaction with a single commit.
+
+    Nested units of work join the outermost one.  On exception the outermost
+    unit rolls everything back and re-raises.
+
+    Example::
+
+        with unit_of_work(db.session):
+            FSRSInterface.process_review(...)
+            LearningHistoryInterface.record_log(...)
+            card_reviewed.send(...)  # each subscriber runs in a savepoint
+    """
+
+    depth = session.info.get(UNIT_OF_WORK_KEY, 0)
+    if depth == 0:
+        _begin_write(session)
+    session.info[UNIT_OF_WORK_KEY] = depth + 1
+    try:
+        yield session
+        session.info[UNIT_OF_WORK_KEY] = depth
+        if depth == 0:
+            # A failed commit (constraint, database locked) is rolled back too
+            safe_commit(session)
+    except Exception:
+        session.info[UNIT_OF_WORK_KEY] = depth
+        if depth == 0:
+            safe_rollback(session)
+        raise
+
+
+@contextmanager
+def savepoint(session: Session) -> Iterator[Session]:
+    """Run enlisted work so that its failure only undoes its own writes.
+
+    Inside a :func:`unit_of_work` the block runs in a ``SAVEPOINT``: on
+    exception, or if the block swallowed a failed flush, only the savepoint is
+    rolled back and the unit stays usable.  Exceptions are re-raised.  Outside
+    a unit of work the block runs as is (it owns its commits).
+
+    Example::
+
+        with savepoint(db.session):
+            BadgeService.check_badges(user_id)
+    """
+
+    if not in_unit_of_work(session):
+        yield session
+        return
+
+    nested = session.begin_nested()
+    try:
+        yield session
+        if nested.is_active:
+            nested.commit()
+        else:
+            # A flush failed inside the block and the error was caught there
+            nested.rollback()
+    except Exception:
+        nested.rollback()
+        raise
+
+
+def upsert_increment(
+    session: Session,
+    model: Any,
+    rows: List[Dict[str, Any]],
+    key_columns: Sequence[str],
+    counter_columns: Sequence[str],
+) -> None:
+    """Insert ``rows`` or add their counters to the existing rows.
+
+    ``key_columns`` must be covered by a unique constraint of ``model``.  On
+    SQLite and PostgreSQL this is one ``INSERT ... ON CONFLICT DO UPDATE``
+    statement; other backends fall back to read-modify-write.  Does not
+    commit: the rows join the caller's transaction.
+
+    Args:
+        session: The SQLAlchemy session.
+        model: Mapped class of the aggregate table.
+        rows: Column dicts (keys + counters) to add.
+        key_columns: Columns identifying an aggregate row.
+        counter_columns: Numeric columns that are incremented.
+    """
+
+    if not rows:
+        return
+
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        stmt = dialect_insert(model)
+        set_ = {
+            column: getattr(model, column) + getattr(stmt.excluded, column)
+            for column in counter_columns
+        }
+        if hasattr(model, "updated_at"):
+            set_["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(index_elements=list(key_columns), set_=set_)
+        session.execute(stmt, rows)
+        return
+
+    for row in rows:
+        entry = (
+            session.query(model)
+            .filter_by(**{column: row[column] for column in key_columns})
+            .first()
+        )
+        if entry is None:
+            session.add(model(**row))
+            continue
+        for column in counter_columns:
+            setattr(entry, column, (getattr(entry, column) or 0) + row[column])
+
+
+def insert_ignore(
+    session: Session,
+    model: Any,
+    rows: List[Dict[str, Any]],
+    key_columns: Sequence[str],
+) -> None:
+    """Insert ``rows``, skipping those whose key already exists.
+
+    Lazily built rows (e.g. aggregates created on first read) can be built by
+    two requests at once; the second insert is then a no-op instead of an
+    ``IntegrityError``.  ``INSERT ... ON CONFLICT DO NOTHING`` on SQLite and
+    PostgreSQL, read-then-insert elsewhere.  Does not commit.
+
+    Args:
+        session: The SQLAlchemy session.
+        model: Mapped class of the table.
+        rows: Column dicts to insert.
+        key_columns: Columns of a unique constraint (or the primary key).
+    """
+
+    if not rows:
+        return
+
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+        stmt = dialect_insert(model).on_conflict_do_nothing(index_elements=list(key_columns))
+        session.execute(stmt, rows)
+        return
+
+    for row in rows:
+        exists = (
+            session.query(model)
+            .filter_by(**{column: row[column] for column in key_columns})
+            .first()
+        )
+        if exists is None:
+            session.add(model(**row))
@@ -1,7 +1,7 @@
 """Helper utilities for working with Excel files in content management flows."""
 from __future__ import annotations
 
-from typing import List, Tuple, Optional, Any
+from typing import Any, Iterator, List, Optional, Tuple
 import logging
 
 import pandas as pd
@@ -33,18 +33,15 @@ def read_excel_with_formulas(
     """
     try:
         # Strategy 1: Use openpyxl with data_only=True
-        # This reads cached formula results (if file was saved by Excel)
-        wb = load_workbook(file_path, data_only=True)
-        
-        if sheet_name not in wb.sheetnames:
-            raise ValueError(f"Sheet '{sheet_name}' not found in Excel file")
-        
-        ws = wb[sheet_name]
-        
-        # Convert worksheet to list of lists
-        data = []
-        for row in ws.iter_rows(values_only=True):
-            data.append(list(row))
+        # This reads cached formula results (if file was saved by Excel).
+        # read_only streams the sheet instead of building the full cell tree.
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            if sheet_name not in wb.sheetnames:
+                raise ValueError(f"Sheet '{sheet_name}' not found in Excel file")
+            data = [list(row) for row in wb[sheet_name].iter_rows(values_only=True)]
+        finally:
+            wb.close()
         
         if not data:
             return pd.DataFrame()
@@ -65,25 +62,24 @@ def read_excel_with_formulas(
             filtered_row = [row[i] if i < len(row) else None for i in valid_indices]
             rows.append(filtered_row)
         
-        # Check if any cells have None values that might be uncalculated formulas
-        # by also loading without data_only and comparing
-        wb_formulas = load_workbook(file_path, data_only=False)
-        ws_formulas = wb_formulas[sheet_name]
-        
+        # Empty cells might be uncalculated formulas: only then open the
+        # workbook a second time (still streaming) to look at the formulas
         has_uncalculated = False
-        for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), start=0):
-            for col_idx, cell_value in enumerate(row):
-                if cell_value is None:
-                    # Check if the original cell has a formula
-                    formula_cell = ws_formulas.cell(row=row_idx + 2, column=col_idx + 1)
-                    if formula_cell.value and str(formula_cell.value).startswith('='):
-                        has_uncalculated = True
+        if any(value is None for row in data[1:] for value in row):
+            wb_formulas = load_workbook(file_path, read_only=True, data_only=False)
+            try:
+                formula_rows = wb_formulas[sheet_name].iter_rows(min_row=2, values_only=True)
+                for row, formula_row in zip(data[1:], formula_rows):
+                    for col_idx, cell_value in enumerate(row):
+                        if cell_value is None and col_idx < len(formula_row):
+                            formula = formula_row[col_idx]
+                            if formula and str(formula).startswith('='):
+                                has_uncalculated = True
+                                break
+                    if has_uncalculated:
                         break
-            if has_uncalculated:
-                break
-        
-        wb.close()
-        wb_formulas.close()
+            finally:
+                wb_formulas.close()
         
         # If we found uncalculated formulas, try using formulas library
         if has_uncalculated:
@@ -131,6 +127,51 @@ def read_excel_with_formulas(
         return pd.read_excel(file_path, sheet_name=sheet_name, **pandas_kwargs)
 
 
+def iter_excel_rows(
+    file_path: Any,
+    sheet_name: Optional[str] = 'Data',
+    chunk_size: int = 500
+) -> Iterator[List[dict]]:
+    """
+    Stream a sheet as chunks of ``{header: value}`` dicts.
+
+    The workbook is opened in openpyxl ``read_only`` / ``data_only`` mode, so
+    memory stays flat for large sheets and formulas yield their cached values
+    (use :func:`read_excel_with_formulas` when formulas must be computed).
+    Columns without a header and completely empty rows are dropped.
+    With ``sheet_name=None`` the ``Data`` sheet is used, or the first sheet.
+
+    Raises:
+        ValueError: if the sheet does not exist.
+    """
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if sheet_name is None:
+            sheet_name = 'Data' if 'Data' in wb.sheetnames else wb.sheetnames[0]
+        if sheet_name not in wb.sheetnames:
+            raise ValueError(f"Sheet '{sheet_name}' not found in Excel file")
+
+        rows = wb[sheet_name].iter_rows(values_only=True)
+        raw_headers = next(rows, None)
+        if not raw_headers:
+            return
+        headers = [(i, str(h).strip()) for i, h in enumerate(raw_headers) if h is not None and str(h).strip()]
+
+        chunk: List[dict] = []
+        for row in rows:
+            record = {name: (row[i] if i < len(row) else None) for i, name in headers}
+            if all(value is None or (isinstance(value, str) and not value.strip()) for value in record.values()):
+                continue
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    finally:
+        wb.close()
+
+
 def _get_column_letter(col_idx: int) -> str:
     """Convert 1-based column index to Excel column letter (A, B, ..., Z, AA, AB, ...)."""
     result = ""
@@ -150,9 +191,11 @@ def extract_info_sheet_mapping(file_path: str) -> Tuple[dict[str, str], List[str
     """
     warnings: List[str] = []
     try:
-        df_info = read_excel_with_formulas(file_path, sheet_name="Info")
+        # Small sheet: stream it instead of loading the whole workbook
+        info_rows = [row for chunk in iter_excel_rows(file_path, sheet_name="Info") for row in chunk]
+        df_info = pd.DataFrame(info_rows)
     except ValueError as ve:
-        # read_excel_with_formulas raises ValueError if sheet not found
+        # iter_excel_rows raises ValueError if sheet not found
         if "not found" in str(ve).lower():
             warnings.append(
                 "Không tìm thấy sheet 'Info'. Hãy giữ nguyên sheet này khi tải file từ hệ thống."
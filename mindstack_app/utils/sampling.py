@@ -0,0 +1,106 @@
+"""Random sampling helpers used instead of ``ORDER BY random()``.
+
+``ORDER BY random()`` makes the database read and sort every matching row
+just to return a few of them. These helpers work on a light list of IDs that
+the caller fetches (or caches) once:
+
+* :func:`reservoir_sample` draws ``k`` elements from an iterable in one pass.
+* :func:`sample_where` draws ``k`` distinct elements of a sequence that pass a
+  predicate, probing random offsets first, so the cost depends on ``k`` and
+  not on the size of the sequence while most elements are still eligible.
+* :func:`group_ids` turns ``(item_id, group_id)`` rows into groups, so whole
+  groups can be sampled together.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+
+def reservoir_sample(iterable: Iterable[Any], k: int, rng: Optional[random.Random] = None) -> List[Any]:
+    """Return ``k`` random elements of ``iterable`` (all of them if fewer), in random order.
+
+    >>> sorted(reservoir_sample(range(5), 10, random.Random(1)))
+    [0, 1, 2, 3, 4]
+    >>> picked = reservoir_sample(range(1000), 3, random.Random(1))
+    >>> len(picked), len(set(picked)), all(0 <= x < 1000 for x in picked)
+    (3, 3, True)
+    """
+    rng = rng or random
+    if k <= 0:
+        return []
+    reservoir: List[Any] = []
+    for seen, element in enumerate(iterable):
+        if seen < k:
+            reservoir.append(element)
+        else:
+            slot = rng.randint(0, seen)
+            if slot < k:
+                reservoir[slot] = element
+    rng.shuffle(reservoir)
+    return reservoir
+
+
+def sample_where(
+    population: Sequence[Any],
+    k: int,
+    accept: Optional[Callable[[Any], bool]] = None,
+    rng: Optional[random.Random] = None,
+) -> List[Any]:
+    """Return up to ``k`` distinct random elements of ``population`` accepted by ``accept``.
+
+    Random offsets are probed first; when too many probes are rejected (most
+    of the population is filtered out) the remaining elements are scanned once
+    with a reservoir.
+
+    >>> rng = random.Random(7)
+    >>> picked = sample_where(list(range(100)), 5, lambda x: x % 2 == 0, rng)
+    >>> len(picked), all(x % 2 == 0 for x in picked), len(set(picked))
+    (5, True, 5)
+    >>> sample_where(list(range(10)), 5, lambda x: x in (3, 8), rng) in ([3, 8], [8, 3])
+    True
+    >>> sample_where([], 3)
+    []
+    """
+    rng = rng or random
+    size = len(population)
+    if k <= 0 or size == 0:
+        return []
+
+    picked: List[Any] = []
+    tried = set()
+    if size > 4 * k:
+        for _ in range(4 * k + 16):
+            offset = rng.randrange(size)
+            if offset in tried:
+                continue
+            tried.add(offset)
+            element = population[offset]
+            if accept is None or accept(element):
+                picked.append(element)
+                if len(picked) >= k:
+                    return picked
+
+    rest = (
+        population[offset] for offset in range(size)
+        if offset not in tried and (accept is None or accept(population[offset]))
+    )
+    picked.extend(reservoir_sample(rest, k - len(picked), rng))
+    rng.shuffle(picked)
+    return picked
+
+
+def group_ids(rows: Iterable[Tuple[int, Optional[Hashable]]]) -> List[List[int]]:
+    """Group ``(item_id, group_id)`` rows; items without a group form their own group.
+
+    >>> group_ids([(1, None), (2, 7), (3, 7), (4, None), (2, 7)])
+    [[1], [2, 3], [4]]
+    """
+    groups: Dict[Hashable, List[int]] = {}
+    for item_id, group_id in rows:
+        key = ('group', group_id) if group_id else ('single', item_id)
+        members = groups.setdefault(key, [])
+        if item_id not in members:
+            members.append(item_id)
+    return list(groups.values())
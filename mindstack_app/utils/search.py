@@ -4,6 +4,29 @@
 
 from sqlalchemy import or_
 
+# Full-text backends theo tên bảng: resolver(query, search_query, field_names, operator) -> query,
+# hoặc None để dùng LIKE (ví dụ: không phải SQLite).
+_FULL_TEXT_RESOLVERS = {}
+
+
+def register_full_text_resolver(table_name, resolver):
+    """Đăng ký backend full-text (FTS) cho các cột của một bảng."""
+    _FULL_TEXT_RESOLVERS[table_name] = resolver
+
+
+def _full_text_resolver(fields):
+    """Resolver của bảng chứa tất cả các cột được tìm (None nếu không có)."""
+    tables = set()
+    for field in fields:
+        columns = getattr(getattr(field, 'property', None), 'columns', None)
+        if not columns:
+            return None
+        tables.add(columns[0].table.name)
+    if len(tables) != 1:
+        return None
+    return _FULL_TEXT_RESOLVERS.get(tables.pop())
+
+
 def apply_search_filter(query, search_query, search_field_map, search_field='all'):
     """
     Áp dụng bộ lọc tìm kiếm cho một truy vấn SQLAlchemy, có hỗ trợ tìm kiếm theo trường cụ thể.
@@ -29,7 +52,14 @@ def apply_search_filter(query, search_query, search_field_map, search_field='all
         fields_to_search.append(search_field_map[search_field])
     else:
         # Mặc định hoặc nếu chọn 'all', tìm trên tất cả các trường
-        fields_to_search = search_field_map.values()
+        fields_to_search = list(search_field_map.values())
+
+    # Ưu tiên chỉ mục full-text (không quét toàn bảng như '%term%')
+    resolver = _full_text_resolver(fields_to_search)
+    if resolver:
+        filtered = resolver(query, search_query, [field.key for field in fields_to_search], 'OR')
+        if filtered is not None:
+            return filtered
 
     for term in search_terms:
         for field in fields_to_search: